@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Gemeinsame Hilfen für die Benchmark-Skripte."""
+import os
+import sys
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE)  # Paket token_minimierung importierbar machen
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: satzausgerichtetes Chunking mit Worker-Pool (kompression_chunking_saetze).
+Laufzeit auf 100K+ Token-Dokumenten gegen kompression_chunking (Token-Grenzen,
+ein Kern) für 1, 2, 4 … Worker bis os.cpu_count(). Gleiche Ausgabe je Modus und
+Chunks an Satzgrenzen prüft tests/test_chunking.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_chunking_parallel.py [Tokens in Tausend ...]
+"""
+import os
+import sys
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import dokument_erzeugen
+from token_minimierung.chunking import kompression_chunking, kompression_chunking_saetze
+from token_minimierung.tokenizer import token_anzahl
+
+TAUSEND_TOKENS = [100, 400]
+PARAMETER = dict(chunk_groesse=200, overlap=40, saetze_pro_chunk=3)
+
+
+def _zeit(funktion, wiederholungen=2):
+    beste = float('inf')
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        ergebnis = funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste, ergebnis
+
+
+def skalierung(tausend_tokens):
+    kerne = os.cpu_count() or 1
+    worker_stufen = sorted({1, 2, 4, kerne} - {w for w in (2, 4) if w > max(kerne, 1) * 2})
+    print(f"\nSkalierung ({kerne} Kern(e) verfügbar), {PARAMETER}:")
+    print(f"{'Tokens':>8} {'Variante':<34} {'Worker':>6} {'Dauer s':>8} {'Speedup':>8} {'Abschnitte':>11}")
+    for tausend in tausend_tokens:
+        text = dokument_erzeugen(tausend * 1000, seed=tausend)
+        tokens = token_anzahl(text)
+        t_alt, alt = _zeit(lambda: kompression_chunking(text, **PARAMETER))
+        print(f"{tokens:>8} {'kompression_chunking (Token-Grenzen)':<34} {1:>6} {t_alt:>8.2f} {'':>8} "
+              f"{alt.count('[Abschnitt '):>11}")
+        basis = None
+        for worker in worker_stufen:
+            modus = 'seriell' if worker == 1 else 'prozesse'
+            dauer, neu = _zeit(lambda: kompression_chunking_saetze(text, modus=modus, worker=worker, **PARAMETER))
+            basis = basis or dauer
+            print(f"{tokens:>8} {'kompression_chunking_saetze':<34} {worker:>6} {dauer:>8.2f} "
+                  f"{basis / dauer:>7.2f}x {neu.count('[Abschnitt '):>11}")
+    if kerne == 1:
+        print("Nur ein Kern verfügbar: mehrere Worker zeigen hier nur den Overhead des Pools.")
+
+
+def main():
+    tausend_tokens = [int(a) for a in sys.argv[1:]] or TAUSEND_TOKENS
+    skalierung(tausend_tokens)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: kompression_chunking_stream auf großen Dateien.
+Spitzenspeicher (tracemalloc) und Durchsatz für wachsende Dateien, gelesen per
+mmap – der Spitzenspeicher soll von der Eingabegröße unabhängig sein. Dass das
+Streaming dieselben Chunks wie kompression_chunking liefert, prüft
+tests/test_chunking.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_chunking_stream.py [MB ...]
+"""
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import text_erzeugen
+from token_minimierung.chunking import kompression_chunking_stream
+
+DATEI_MB = [1, 5, 20]
+
+
+def speicher(groessen_mb):
+    stream = kompression_chunking_stream
+    print(f"\n{'Datei (MB)':>10} {'Abschnitte':>11} {'Zeit (s)':>9} {'MB/s':>7} {'Peak (MB)':>10}")
+    print("-" * 52)
+    with tempfile.TemporaryDirectory() as tmp:
+        for mb in groessen_mb:
+            pfad = pathlib.Path(tmp) / f"eingabe_{mb}mb.txt"
+            block = text_erzeugen(20_000, mb).encode('utf-8')
+            with open(pfad, 'wb') as f:
+                for _ in range(max(1, mb * (1 << 20) // len(block))):
+                    f.write(block)
+            groesse = os.path.getsize(pfad) / (1 << 20)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            anzahl = 0
+            for _ in stream(pfad, 100, 20):
+                anzahl += 1
+            dauer = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{groesse:>10.1f} {anzahl:>11} {dauer:>9.2f} {groesse / dauer:>7.2f} {peak / (1 << 20):>10.2f}")
+
+
+def main():
+    groessen = [int(a) for a in sys.argv[1:]] or DATEI_MB
+    speicher(groessen)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Lastgenerator für den Kompressionsdienst (token_minimierung.kompressionsdienst).
+- Startet den Dienst als eigenen Prozess (einmal mit Mikro-Batching, einmal mit
+  max_batch=1 als Vergleich); er nimmt Verbindungen erst nach dem Laden des Modells an
+- 1 / 10 / 100 gleichzeitige Clients mit Keep-Alive-Verbindungen senden für eine
+  feste Dauer Anfragen mit jeweils neuen Prompts (keine Embedding-Cache-Treffer)
+- Ausgabe je Stufe: Durchsatz, p50/p99-Latenz, Anteil 429, mittlere Batch-Größe
+  (aus /metrics)
+
+Aufruf (aus dem Projektordner):
+    python benchmarks/benchmark_dienst.py --strategie strukturiert --dauer 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from _gemeinsam import BASE
+
+STUFEN = [1, 10, 100]
+_SUBJEKTE = ["Der Kunde", "Die Bestellung", "Das Paket", "Unser Team", "Die Rechnung", "Der Bericht"]
+_VERBEN = ["wurde geprüft", "ist angekommen", "fehlt leider", "wird bearbeitet", "enthält Fehler"]
+_RESTE = ["laut Tracking", "für das Projekt", "gegenüber dem Vorjahr", "in Höhe von {} €", "mit Nr. ORD-{}"]
+
+
+def prompt_erzeugen(rnd: random.Random, saetze: int = 12) -> str:
+    """Prompt aus eindeutigen Sätzen (Zufallszahlen), damit jeder Satz neu eingebettet wird."""
+    return ' '.join(
+        f"{rnd.choice(_SUBJEKTE)} {rnd.choice(_VERBEN)} {rnd.choice(_RESTE).format(rnd.randint(1, 10**6))} "
+        f"(Vorgang {rnd.randint(1, 10**9)})." for _ in range(saetze))
+
+
+async def _anfrage(reader, writer, koerper: bytes):
+    writer.write(b"POST /komprimieren HTTP/1.1\r\nHost: lokal\r\nContent-Type: application/json\r\n"
+                 b"Content-Length: " + str(len(koerper)).encode() + b"\r\n\r\n" + koerper)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    laenge = 0
+    while True:
+        zeile = await reader.readline()
+        if zeile in (b"\r\n", b""):
+            break
+        if zeile.lower().startswith(b"content-length:"):
+            laenge = int(zeile.split(b":")[1])
+    await reader.readexactly(laenge)
+    return status
+
+
+async def _client(host, port, strategie, parameter, ende, seed, latenzen, status_zaehler):
+    rnd = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < ende:
+            koerper = json.dumps({"strategie": strategie, "prompt": prompt_erzeugen(rnd),
+                                  "parameter": parameter}).encode()
+            start = time.perf_counter()
+            status = await _anfrage(reader, writer, koerper)
+            if status == 200:
+                latenzen.append((time.perf_counter() - start) * 1000)
+            status_zaehler[status] = status_zaehler.get(status, 0) + 1
+            if status == 429:
+                await asyncio.sleep(0.01)
+    finally:
+        writer.close()
+
+
+async def _metrik(host, port, name):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /metrics HTTP/1.1\r\nHost: lokal\r\nConnection: close\r\n\r\n")
+    text = (await reader.read()).decode()
+    writer.close()
+    werte = dict(re.findall(rf"^{name}_(sum|count) (\S+)$", text, re.MULTILINE))
+    return float(werte.get("sum", 0)), float(werte.get("count", 0))
+
+
+async def stufe(host, port, clients, strategie, parameter, dauer):
+    latenzen, status_zaehler = [], {}
+    summe0, anzahl0 = await _metrik(host, port, "kompression_batch_groesse")
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, strategie, parameter, start + dauer, i, latenzen, status_zaehler)
+                           for i in range(clients)))
+    gesamt = time.perf_counter() - start
+    summe1, anzahl1 = await _metrik(host, port, "kompression_batch_groesse")
+    batch = (summe1 - summe0) / (anzahl1 - anzahl0) if anzahl1 > anzahl0 else 1.0
+    lat = np.array(latenzen) if latenzen else np.zeros(1)
+    return {
+        "clients": clients,
+        "anfragen_pro_s": len(latenzen) / gesamt,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "abgelehnt_429": status_zaehler.get(429, 0),
+        "fehler": sum(n for s, n in status_zaehler.items() if s not in (200, 429)),
+        "mittlere_batch_groesse": batch,
+    }
+
+
+def dienst_starten(port, max_batch, max_wartezeit_ms, max_warteschlange):
+    prozess = subprocess.Popen(
+        [sys.executable, "-m", "token_minimierung.kompressionsdienst", "--port", str(port),
+         "--max-batch", str(max_batch), "--max-wartezeit-ms", str(max_wartezeit_ms),
+         "--max-warteschlange", str(max_warteschlange)],
+        cwd=BASE, stdout=subprocess.DEVNULL)
+    for _ in range(600):
+        try:
+            socket.create_connection(("127.0.0.1", port), 1).close()
+            return prozess
+        except OSError:
+            if prozess.poll() is not None:
+                raise RuntimeError("Dienst konnte nicht gestartet werden")
+            time.sleep(0.2)
+    prozess.kill()
+    raise RuntimeError("Dienst antwortet nicht")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--strategie", default="strukturiert")
+    parser.add_argument("--parameter", default="{}", help="JSON, z. B. '{\"ziel_tokens\": 80}'")
+    parser.add_argument("--stufen", type=int, nargs="+", default=STUFEN)
+    parser.add_argument("--dauer", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-wartezeit-ms", type=float, default=5.0)
+    parser.add_argument("--max-warteschlange", type=int, default=1024)
+    parser.add_argument("--ohne-vergleich", action="store_true", help="nur mit Mikro-Batching messen")
+    args = parser.parse_args()
+    parameter = json.loads(args.parameter)
+
+    konfigurationen = [("mikro-batching", 64)] + ([] if args.ohne_vergleich else [("einzeln", 1)])
+    ergebnisse = []
+    print(f"{'Dienst':<16} {'Clients':>8} {'Anfr./s':>9} {'p50 ms':>9} {'p99 ms':>9} {'429':>6} "
+          f"{'Fehler':>7} {'Batch Ø':>8}")
+    print("-" * 80)
+    for name, max_batch in konfigurationen:
+        prozess = dienst_starten(args.port, max_batch, args.max_wartezeit_ms, args.max_warteschlange)
+        try:
+            for clients in args.stufen:
+                e = asyncio.run(stufe("127.0.0.1", args.port, clients, args.strategie, parameter, args.dauer))
+                e["dienst"] = name
+                ergebnisse.append(e)
+                print(f"{name:<16} {clients:>8} {e['anfragen_pro_s']:>9.1f} {e['p50_ms']:>9.1f} "
+                      f"{e['p99_ms']:>9.1f} {e['abgelehnt_429']:>6} {e['fehler']:>7} "
+                      f"{e['mittlere_batch_groesse']:>8.1f}")
+        finally:
+            prozess.terminate()
+            prozess.wait()
+
+    ausgabe = os.path.join(BASE, "benchmarks", "ergebnisse")
+    os.makedirs(ausgabe, exist_ok=True)
+    pfad = os.path.join(ausgabe, f"dienst_{args.strategie}.json")
+    with open(pfad, "w", encoding="utf-8") as f:
+        json.dump({"strategie": args.strategie, "parameter": parameter, "dauer_s": args.dauer,
+                   "ergebnisse": ergebnisse}, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Ergebnisse gespeichert: {pfad}")
+
+
+if __name__ == "__main__":
+    main()
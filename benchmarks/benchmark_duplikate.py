@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Near-Duplicate-Entfernung (token_minimierung.deduplizierung).
+1. Skalierung bis 100.000 Sätze: Laufzeit, µs je Satz, entfernter Anteil
+2. Als Strategie in run_experiment (über strategie_funktion)
+Den Abgleich mit der exakten paarweisen Jaccard-Berechnung prüft tests/test_duplikate.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_duplikate.py [max. Satzanzahl]
+"""
+import sys
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import saetze_mit_duplikaten
+from token_minimierung.deduplizierung import duplikate_finden, kompression_duplikate
+from token_minimierung.experiment import run_experiment, strategie_funktion
+from token_minimierung.qualitaet import erhalt_metriken
+
+GROESSEN = [10_000, 30_000, 100_000]
+
+
+def skalierung(max_saetze):
+    print(f"\n{'Sätze':>9} {'Dauer s':>8} {'µs/Satz':>8} {'entfernt':>9}")
+    for anzahl in [g for g in GROESSEN if g <= max_saetze] or [max_saetze]:
+        saetze = saetze_mit_duplikaten(anzahl, seed=2)
+        start = time.perf_counter()
+        duplikat = duplikate_finden(saetze)
+        dauer = time.perf_counter() - start
+        print(f"{anzahl:>9} {dauer:>8.2f} {dauer / anzahl * 1e6:>8.1f} {duplikat.mean()*100:>8.1f}%")
+
+
+def experiment():
+    prompt = ' '.join(saetze_mit_duplikaten(400, anteil_duplikate=0.4, seed=3))
+    ergebnis = run_experiment("duplikate", prompt, strategie_funktion("kompression_duplikate", {"schwelle": 0.8}),
+                              "Near-Duplicates (0.8)", parameter={"schwelle": 0.8})
+    erhalt = erhalt_metriken(prompt, [kompression_duplikate(prompt)])
+    print(f"\nrun_experiment ({ergebnis.strategie}): {ergebnis.original_tokens} → "
+          f"{ergebnis.komprimierte_tokens} Tokens, Rate {ergebnis.kompressionsrate:.2f}, "
+          f"Latenz {ergebnis.latenz_ms:.1f} ms, Inhaltswörter erhalten {erhalt.token_recall[0]*100:.1f}%, "
+          f"Zahlen/IDs erhalten {erhalt.entitaeten_erhalt[0]*100:.1f}%")
+
+
+def main():
+    max_saetze = int(sys.argv[1]) if len(sys.argv) > 1 else GROESSEN[-1]
+    skalierung(max_saetze)
+    experiment()
+
+
+if __name__ == "__main__":
+    main()
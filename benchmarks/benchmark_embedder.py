@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Embedding-Backends (token_minimierung.embedder).
+1. Je Backend: Startzeit (Laden + erster Aufruf) und Durchsatz in Sätzen/s
+2. Übereinstimmung der Centrality-Rankings mit dem Referenz-Backend je Dokument:
+   Spearman-Korrelation, Überlappung der behaltenen Sätze der strukturierten
+   Kompression und Anteil identischer Ausgaben
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_embedder.py [Backend ...]
+Nicht installierte Backends (z. B. ohne sentence-transformers) werden übersprungen.
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import satz_vorlagen, saetze_erzeugen
+from token_minimierung.dokument import dokument_analysieren
+from token_minimierung.embedder import backends
+from token_minimierung.embedding import EmbeddingDienst
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.strukturiert import _auswahl_nach_centrality, _centrality_scores
+
+REFERENZ = "sentence-transformers"
+SAETZE = 5_000
+DOKUMENTE = 50
+
+
+def dokumente_erzeugen(anzahl, seed=0):
+    """Test-Prompts plus Dokumente aus 8 bis allen Sätzen der Test-Prompts (ohne Wiederholung, gemischt)."""
+    rnd = random.Random(seed)
+    vorlagen = satz_vorlagen()
+    erzeugt = [' '.join(rnd.sample(vorlagen, rnd.randint(8, len(vorlagen)))) for _ in range(anzahl)]
+    return [dokument_analysieren(t) for t in list(TEST_PROMPTS.values()) + erzeugt]
+
+
+def _rang(x):
+    return np.argsort(np.argsort(x)).astype(float)
+
+
+def spearman(a, b):
+    if len(a) < 3:
+        return 1.0
+    ra, rb = _rang(a), _rang(b)
+    ra -= ra.mean()
+    rb -= rb.mean()
+    return float(ra @ rb / (np.linalg.norm(ra) * np.linalg.norm(rb) + 1e-12))
+
+
+def messen(backend, saetze, dokumente):
+    start = time.perf_counter()
+    dienst = EmbeddingDienst(backend=backend, max_eintraege=0)
+    dienst.encode(["Start."])
+    start_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    dienst.encode(saetze, batch_size=256)
+    durchsatz = len(saetze) / (time.perf_counter() - start)
+    scores = [_centrality_scores(dienst.encode(doc.saetze)) for doc in dokumente]
+    return start_ms, durchsatz, scores
+
+
+def main():
+    gewaehlt = sys.argv[1:] or backends()
+    saetze = saetze_erzeugen(SAETZE)
+    dokumente = dokumente_erzeugen(DOKUMENTE)
+
+    ergebnisse = {}
+    print(f"\n{'Backend':<24} {'Start ms':>9} {'Sätze/s':>10}")
+    print("-" * 45)
+    for backend in gewaehlt:
+        try:
+            ergebnisse[backend] = messen(backend, saetze, dokumente)
+        except RuntimeError as e:
+            print(f"{backend:<24} nicht verfügbar ({e.__cause__ or e})")
+            continue
+        start_ms, durchsatz, _ = ergebnisse[backend]
+        print(f"{backend:<24} {start_ms:>9.1f} {durchsatz:>10.0f}")
+
+    referenz = ergebnisse.get(REFERENZ)
+    if referenz is None:
+        print(f"\nKein Ranking-Vergleich: Referenz-Backend {REFERENZ!r} nicht verfügbar")
+        return
+    print(f"\nCentrality gegen {REFERENZ} ({len(dokumente)} Dokumente, strukturiert mit ziel_anteil=0.45):")
+    print(f"{'Backend':<24} {'Spearman Ø':>11} {'min':>7} {'Satz-Überlappung':>17} {'gleiche Ausgabe':>16}")
+    for backend, (_, _, scores) in ergebnisse.items():
+        if backend == REFERENZ:
+            continue
+        korrelationen, ueberlappung, gleich = [], [], 0
+        for doc, s_ref, s in zip(dokumente, referenz[2], scores):
+            korrelationen.append(spearman(s_ref, s))
+            ziel = max(50, int(doc.token_anzahl * 0.45))
+            aus_ref = _auswahl_nach_centrality(doc.saetze, s_ref, ziel, 2, doc.satz_token_laengen)
+            aus = _auswahl_nach_centrality(doc.saetze, s, ziel, 2, doc.satz_token_laengen)
+            a, b = set(saetze_zerlegen(aus_ref)), set(saetze_zerlegen(aus))
+            ueberlappung.append(len(a & b) / max(len(a | b), 1))
+            gleich += aus_ref == aus
+        print(f"{backend:<24} {np.mean(korrelationen):>11.3f} {np.min(korrelationen):>7.3f} "
+              f"{np.mean(ueberlappung)*100:>16.1f}% {gleich / len(dokumente)*100:>15.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: spaltenorientierter ErgebnisSpeicher gegen den bisherigen Weg
+(Liste von ExperimentResult → DataFrame → groupby, Szenario per Re-Tokenisierung).
+Synthetische Läufe mit bis zu 10M Zeilen: Anhängen, Aggregation, Kostenneuberechnung
+und Spitzenspeicher; der alte Weg nur bis zur angegebenen Grenze (Objekte pro Zeile).
+Gleiche Mittelwerte und Kosten wie pandas groupby prüft tests/test_ergebnisspeicher.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_ergebnisspeicher.py [Zeilen ...]
+"""
+import sys
+import time
+import tracemalloc
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import alter_weg, spalten_erzeugen, speicher_fuellen
+from token_minimierung.auswertung import PREIS_PRO_1K_TOKENS
+
+ZEILEN = [10_000, 1_000_000, 10_000_000]
+ALT_BIS = 1_000_000  # darüber wird der Listen-/DataFrame-Weg nicht mehr gemessen
+
+
+def neu(spalten):
+    zeiten = {}
+    start = time.perf_counter()
+    speicher = speicher_fuellen(spalten)
+    zeiten['anhaengen'] = time.perf_counter() - start
+    start = time.perf_counter()
+    speicher.kosten_neu_berechnen(PREIS_PRO_1K_TOKENS)
+    zeiten['kosten'] = time.perf_counter() - start
+    start = time.perf_counter()
+    namen, mittel = speicher.mittelwerte('strategie')
+    zeiten['aggregation'] = time.perf_counter() - start
+    return zeiten, speicher, namen, mittel
+
+
+def main():
+    zeilen = [int(a) for a in sys.argv[1:]] or ZEILEN
+    print(f"\n{'Zeilen':>11} {'Weg':<8} {'Anhängen s':>11} {'Kosten s':>10} "
+          f"{'Aggregation s':>14} {'Peak MB':>9}")
+    print("-" * 68)
+    for n in zeilen:
+        spalten = spalten_erzeugen(n)
+        wege = [('speicher', neu)] + ([('alt', alter_weg)] if n <= ALT_BIS else [])
+        for weg, funktion in wege:
+            tracemalloc.start()
+            zeiten = funktion(spalten)[0]
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{n:>11} {weg:<8} {zeiten['anhaengen']:>11.3f} {zeiten['kosten']:>10.3f} "
+                  f"{zeiten['aggregation']:>14.3f} {peak / (1 << 20):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Import-Budget: misst in frischen Interpretern, was der Import einzelner Module
+von token_minimierung kostet, und zeigt mit `python -X importtime` und sys.modules,
+welche schweren Module dabei geladen werden. Der regelbasierte Kompressor soll
+innerhalb weniger Millisekunden importierbar sein; dass er keine schweren
+Abhängigkeiten (tiktoken, numpy, pandas, matplotlib, sentence-transformers)
+mitzieht, prüft tests/test_importe.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_importzeit.py [Budget-ms]
+"""
+import sys
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import IMPORTE, SCHWER, importzeit
+
+BUDGET_MS = 20.0
+WIEDERHOLUNGEN = 5
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    print(f"{'Import':<55} {'min ms':>8} {'Budget':>8}  schwere Module")
+    print("-" * 100)
+    ueberschritten = []
+    for anweisung, pruefen in IMPORTE:
+        messungen = [importzeit(anweisung) for _ in range(WIEDERHOLUNGEN)]
+        ms = min(m[0] for m in messungen)
+        schwer = sorted(set(SCHWER) & messungen[0][1])
+        print(f"{anweisung:<55} {ms:>8.1f} {f'{budget_ms:.0f}' if pruefen else '-':>8}  "
+              f"{', '.join(schwer) or '–'}")
+        if pruefen and ms > budget_ms:
+            ueberschritten.append(f"{anweisung}: {ms:.1f} ms > {budget_ms:.0f} ms")
+    if ueberschritten:
+        print("\nImport-Budget überschritten:\n  " + "\n  ".join(ueberschritten))
+    else:
+        print("\nImport-Budget eingehalten")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Instrumentierung der Pipeline (token_minimierung.instrumentierung).
+1. Overhead: Kosten eines stufe()-Aufrufs abgeschaltet/eingeschaltet und Laufzeit
+   je Strategie über alle Test-Prompts (aus, an)
+2. Stufen einer Experiment-Runde (bericht) und Sampling-Profil derselben Runde
+Histogramm-Genauigkeit, Exporte und unveränderte Ergebnisse prüft
+tests/test_instrumentierung.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_instrumentierung.py [Wiederholungen]
+"""
+import sys
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import STRATEGIEN_ALLE
+from token_minimierung import instrumentierung
+from token_minimierung.experiment import TEST_PROMPTS, run_experiment, strategie_funktion
+from token_minimierung.instrumentierung import get_instrumentierung, profilieren, stufe
+from token_minimierung.qualitaet import qualitaet_semantische_aehnlichkeit
+
+WIEDERHOLUNGEN = 200
+AUFRUFE = 200_000
+RUNDEN = 5
+
+
+def _zeit(funktion, anzahl):
+    start = time.perf_counter()
+    funktion(anzahl)
+    return (time.perf_counter() - start) / anzahl
+
+
+def overhead(wiederholungen):
+    def aufrufe(n):
+        for _ in range(n):
+            with stufe('x'):
+                pass
+
+    def leer(n):
+        for _ in range(n):
+            pass
+
+    instrumentierung.aktivieren(False)
+    basis = _zeit(leer, AUFRUFE)
+    aus = _zeit(aufrufe, AUFRUFE) - basis
+    instrumentierung.aktivieren(True)
+    an = _zeit(aufrufe, AUFRUFE) - basis
+    instrumentierung.aktivieren(False)
+    print(f"\nstufe() je Aufruf: abgeschaltet {aus * 1e9:.0f} ns, eingeschaltet {an * 1e9:.0f} ns")
+
+    print(f"\nLaufzeit je Aufruf ({wiederholungen} × {len(TEST_PROMPTS)} Prompts, aus/an abwechselnd, "
+          f"bestes von {RUNDEN}); 'aus geschätzt' = Stufen je Aufruf × Kosten abgeschaltet:")
+    print(f"{'Strategie':<28} {'Stufen':>7} {'aus ms':>8} {'an ms':>8} {'an':>7} {'aus geschätzt':>14}")
+    for s, f, kw in STRATEGIEN_ALLE:
+        funktion = strategie_funktion(f, kw)
+
+        def lauf(n):
+            for _ in range(n):
+                for text in TEST_PROMPTS.values():
+                    funktion(text)
+        lauf(3)  # Caches füllen
+        instrumentierung.aktivieren(True)
+        get_instrumentierung().zuruecksetzen()
+        lauf(1)
+        stufen = sum(h.anzahl for h in get_instrumentierung().histogramme.values()) / len(TEST_PROMPTS)
+        zeiten = {False: [], True: []}
+        for _ in range(RUNDEN):
+            for an_aus in (False, True):
+                instrumentierung.aktivieren(an_aus)
+                zeiten[an_aus].append(_zeit(lauf, wiederholungen) / len(TEST_PROMPTS))
+        t_aus, t_an = min(zeiten[False]), min(zeiten[True])
+        print(f"{s:<28} {stufen:>7.1f} {t_aus * 1000:>8.3f} {t_an * 1000:>8.3f} {(t_an / t_aus - 1) * 100:>6.1f}% "
+              f"{stufen * aus / t_aus * 100:>13.2f}%")
+    instrumentierung.aktivieren(False)
+
+
+def stufen_und_profil():
+    get_instrumentierung().zuruecksetzen()
+    with profilieren(intervall_s=0.001) as profil:
+        for _ in range(20):
+            for name, text in TEST_PROMPTS.items():
+                for s, f, kw in STRATEGIEN_ALLE:
+                    run_experiment(name, text, strategie_funktion(f, kw), s,
+                                   qualitaets_fn=qualitaet_semantische_aehnlichkeit, parameter=kw)
+    print(f"\nStufen (20 Runden, {len(TEST_PROMPTS)} Prompts × {len(STRATEGIEN_ALLE)} Strategien):")
+    print(get_instrumentierung().bericht(min_anteil=0.005))
+    print(f"\nProfil: {profil.proben} Proben in {profil.dauer_s:.2f} s; je Stufe:")
+    for pfad, n in profil.stufen.most_common(6):
+        print(f"  {n / profil.proben * 100:5.1f}%  {pfad}")
+    print("innerste Funktionen:")
+    for funktion, n in profil.top(5):
+        print(f"  {n / profil.proben * 100:5.1f}%  {funktion}")
+
+
+def main():
+    wiederholungen = int(sys.argv[1]) if len(sys.argv) > 1 else WIEDERHOLUNGEN
+    overhead(wiederholungen)
+    stufen_und_profil()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Kompressions-Cache (token_minimierung.kompressions_cache).
+1. RAG-Last: Anfragen auf Wissensbasis-Dokumente und System-Prompts mit
+   Zipf-verteilter Häufigkeit – ohne Cache, Speicherstufe, Festplattenstufe
+   (kalt) und Festplattenstufe aus einem früheren Lauf (neue Instanz)
+2. Geänderte Dokumente (je ein Absatz neu): ganzes Dokument als Schlüssel gegen
+   abschnittsweise, Trefferquote und Dauer des zweiten Durchlaufs
+Ergebnisse wie der direkte Strategie-Aufruf und die Grenzen der Stufen prüft
+tests/test_kompressions_cache.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_kompressions_cache.py [Anfragen]
+"""
+import random
+import sys
+import tempfile
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import CACHE_STRATEGIE, satz_vorlagen, wissensbasis, wissensdokument_erzeugen
+from token_minimierung.experiment import strategie_funktion
+from token_minimierung.kompressions_cache import KompressionsCache, absaetze
+from token_minimierung.tokenizer import get_token_zaehler
+
+ANFRAGEN = 5_000
+DOKUMENTE = 200
+SYSTEM_PROMPTS = 5
+
+
+def abfolge(dokumente, system, anzahl, seed=1):
+    """Jede Anfrage: ein System-Prompt und ein Dokument (Zipf, s ≈ 1.1)."""
+    rnd = random.Random(seed)
+    gewichte = [1 / (r + 1) ** 1.1 for r in range(len(dokumente))]
+    gewaehlt = rnd.choices(dokumente, weights=gewichte, k=anzahl)
+    return [t for d in gewaehlt for t in (rnd.choice(system), d)]
+
+
+def _lauf(anfragen, cache):
+    funktionsname, parameter = CACHE_STRATEGIE
+    start = time.perf_counter()
+    if cache is None:
+        direkt = strategie_funktion(funktionsname, parameter)
+        for t in anfragen:
+            direkt(t)
+    else:
+        for t in anfragen:
+            cache.komprimieren(t, funktionsname, parameter)
+    return time.perf_counter() - start
+
+
+def rag_last(dokumente, system, anzahl):
+    anfragen = abfolge(dokumente, system, anzahl)
+    megabyte = sum(len(t.encode('utf-8')) for t in anfragen) / 1e6
+    print(f"\nRAG-Last: {len(anfragen)} Aufrufe ({anzahl} Anfragen × System-Prompt + Dokument, "
+          f"{megabyte:.1f} MB, {len(set(anfragen))} verschiedene Texte), {CACHE_STRATEGIE[0]}")
+    print(f"{'Variante':<30} {'Dauer s':>8} {'Aufrufe/s':>10} {'Treffer':>8} {'gespart MB':>11} {'Tokens gespart':>15}")
+    t_ohne = _lauf(anfragen, None)
+    print(f"{'ohne Cache':<30} {t_ohne:>8.2f} {len(anfragen) / t_ohne:>10.0f}")
+    with tempfile.TemporaryDirectory() as pfad:
+        varianten = [("Speicherstufe", lambda: KompressionsCache()),
+                     ("Speicher + Festplatte (kalt)", lambda: KompressionsCache(speicher_pfad=pfad)),
+                     ("Festplatte aus früherem Lauf", lambda: KompressionsCache(speicher_pfad=pfad))]
+        for name, neu in varianten:
+            get_token_zaehler().leeren()  # jede Variante zählt ihre Fehlschläge selbst
+            cache = neu()
+            dauer = _lauf(anfragen, cache)
+            s = cache.statistik()
+            print(f"{name:<30} {dauer:>8.2f} {len(anfragen) / dauer:>10.0f} {s['trefferquote']*100:>7.1f}% "
+                  f"{s['gesparte_bytes'] / 1e6:>11.1f} {s['gesparte_tokens']:>15}")
+
+
+def geaenderte_dokumente(dokumente):
+    rnd = random.Random(5)
+    vorlagen = satz_vorlagen()
+    geaendert = []
+    for d in dokumente:
+        teile = absaetze(d)
+        teile[rnd.randrange(len(teile))] = wissensdokument_erzeugen(rnd, vorlagen, 1, 1)
+        geaendert.append('\n\n'.join(teile))
+    funktionsname, parameter = CACHE_STRATEGIE
+    print(f"\nGeänderte Dokumente ({len(dokumente)}, je ein Absatz neu), zweiter Durchlauf:")
+    print(f"{'Schlüssel':<16} {'Dauer s':>8} {'Trefferquote':>13}")
+    for name, abschnitte in (("ganzes Dokument", False), ("je Absatz", True)):
+        cache = KompressionsCache(tokens_zaehlen=False)
+        for d in dokumente:
+            cache.komprimieren(d, funktionsname, parameter, abschnitte=abschnitte)
+        vorher = cache.statistik()
+        start = time.perf_counter()
+        for d in geaendert:
+            cache.komprimieren(d, funktionsname, parameter, abschnitte=abschnitte)
+        dauer = time.perf_counter() - start
+        s = cache.statistik()
+        treffer = s['treffer'] - vorher['treffer']
+        anfragen = treffer + s['fehlschlaege'] - vorher['fehlschlaege']
+        print(f"{name:<16} {dauer:>8.2f} {treffer / anfragen * 100:>12.1f}%")
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else ANFRAGEN
+    dokumente, system = wissensbasis(anzahl=DOKUMENTE, system_prompts=SYSTEM_PROMPTS)
+    rag_last(dokumente, system, anzahl)
+    geaenderte_dokumente(dokumente)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: inkrementelle Gesprächskompression (token_minimierung.konversation).
+Kosten je Turn bei wachsendem Verlauf: Konversation (anhaengen bleibt konstant,
+die Auswahl sortiert alle Scores) gegen kompression_strukturiert über den ganzen
+Verlauf, dazu die Größe des serialisierten Zustands. Dieselbe Auswahl wie eine
+Neuberechnung prüft tests/test_konversation.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_konversation.py [Turns]
+"""
+import json
+import sys
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import turns_erzeugen
+from token_minimierung.konversation import Konversation
+from token_minimierung.strukturiert import kompression_strukturiert
+
+TURNS = 500
+MESSPUNKTE = [10, 50, 100, 200, 500]
+FENSTER = 5  # Turns je Messpunkt
+
+
+def kosten_je_turn(anzahl):
+    turns = turns_erzeugen(anzahl, seed=2)
+    messpunkte = [m for m in MESSPUNKTE if m <= anzahl] or [anzahl]
+    k = Konversation()
+    inkrementell = {}
+    verlauf = []
+    naiv = {}
+    for i, t in enumerate(turns, 1):
+        start = time.perf_counter()
+        k.anhaengen(t)
+        mitte = time.perf_counter()
+        k.komprimiert()
+        dauer = (mitte - start, time.perf_counter() - mitte)
+        verlauf.append(t)
+        for m in messpunkte:
+            if m - FENSTER < i <= m:
+                inkrementell.setdefault(m, []).append(dauer)
+        if i in messpunkte:
+            start = time.perf_counter()
+            kompression_strukturiert('\n'.join(verlauf))
+            naiv[i] = time.perf_counter() - start
+            naiv[i, 'zustand'] = len(json.dumps(k.zustand()))
+            naiv[i, 'saetze'] = len(k)
+    print(f"\nKosten je Turn ({anzahl} Turns, Mittel über {FENSTER} Turns je Messpunkt):")
+    print(f"{'Turn':>6} {'Sätze':>7} {'anhaengen ms':>13} {'Auswahl ms':>11} {'ganzer Verlauf ms':>18} "
+          f"{'Faktor':>7} {'Zustand KB':>11}")
+    for m in messpunkte:
+        anhaengen = sum(a for a, _ in inkrementell[m]) / len(inkrementell[m])
+        auswahl = sum(b for _, b in inkrementell[m]) / len(inkrementell[m])
+        print(f"{m:>6} {naiv[m, 'saetze']:>7} {anhaengen*1000:>13.2f} {auswahl*1000:>11.2f} {naiv[m]*1000:>18.1f} "
+              f"{naiv[m] / (anhaengen + auswahl):>7.0f} {naiv[m, 'zustand'] / 1024:>11.0f}")
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else TURNS
+    kosten_je_turn(anzahl)
+
+
+if __name__ == "__main__":
+    main()
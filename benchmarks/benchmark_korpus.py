@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Korpus-Lader (token_minimierung.korpus).
+Durchsatz des Laders (MB/s, Datensätze/s) und Spitzenspeicher (tracemalloc) bei
+wachsender Korpusgröße – der Speicher bleibt konstant. Shards, Stichproben und
+korpus_ausfuehren gegen den ErgebnisSpeicher prüft tests/test_korpus.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_korpus.py [Datensätze]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import korpus_schreiben
+from token_minimierung.korpus import Korpus
+
+DATENSAETZE = 200_000
+GROESSEN = [10_000, 50_000]
+
+
+def durchsatz(verzeichnis, groessen):
+    print("\nLader (nur lesen, JSONL):")
+    print(f"{'Datensätze':>11} {'MB':>8} {'Dauer s':>8} {'MB/s':>7} {'Datensätze/s':>13} {'Spitze KB':>10}")
+    for anzahl in groessen:
+        pfad = korpus_schreiben(verzeichnis, anzahl, seed=anzahl)['jsonl']
+        megabyte = os.path.getsize(pfad) / 1e6
+        tracemalloc.start()
+        start = time.perf_counter()
+        sum(1 for _ in Korpus(pfad))
+        dauer = time.perf_counter() - start
+        _, spitze = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{anzahl:>11} {megabyte:>8.1f} {dauer:>8.2f} {megabyte / dauer:>7.1f} {anzahl / dauer:>13.0f} "
+              f"{spitze / 1024:>10.0f}")
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else DATENSAETZE
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        durchsatz(verzeichnis, [g for g in GROESSEN if g < anzahl] + [anzahl])
+
+
+if __name__ == "__main__":
+    main()
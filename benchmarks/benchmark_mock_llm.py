@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Latenz-/Kostenmodell und Mock-LLM unter Last (llm_modell, mock_llm).
+1. Strategien unter Last: p50/p99, Wartezeit und Durchsatz bei steigender QPS
+   (gleiche Poisson-Ankünfte für alle Strategien, Zeitraffer)
+2. Kosten je 1M Anfragen je Modell der Preistabelle
+Modellformel, Preistabelle, Bedienzeit, 503 und 429 prüft tests/test_mock_llm.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_mock_llm.py [Anfragen]
+"""
+import sys
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from token_minimierung.experiment import STRATEGIEN, TEST_PROMPTS, strategie_funktion
+from token_minimierung.llm_modell import get_llm_modell, preistabelle
+from token_minimierung.mock_llm import last_tabelle, last_vergleich
+from token_minimierung.tokenizer import token_anzahl
+
+ANFRAGEN = 300
+ZEITFAKTOR = 0.05
+# Modell → QPS-Stufen bis über die Kapazität (8 parallel / Bedienzeit) hinaus
+MODELLE = {'gpt-3.5-turbo': [2, 5, 8, 12], 'gpt-4o-mini': [1, 2, 3, 4]}
+
+
+def last(anzahl):
+    for modell, qps_stufen in MODELLE.items():
+        m = get_llm_modell(modell)
+        print(f"\n{modell}: {m.basis_ms:g} ms + {m.prefill_ms_pro_token:g} ms/Eingabe-Token + "
+              f"{m.decode_ms_pro_token:g} ms × {m.ausgabe_tokens} Ausgabe-Tokens, 8 parallel, "
+              f"{anzahl} Anfragen je Strategie und QPS (Zeitraffer {ZEITFAKTOR:g})")
+        for qps in qps_stufen:
+            tabelle = last_tabelle(last_vergleich(TEST_PROMPTS, STRATEGIEN, qps, anzahl, modell=modell,
+                                                  zeitfaktor=ZEITFAKTOR))
+            print(tabelle if qps == qps_stufen[0] else tabelle.split('\n', 1)[1])
+
+
+def kosten():
+    tabelle = preistabelle()
+    print("\nKosten je 1M Anfragen (Mittel über TEST_PROMPTS, erwartete Ausgabe-Tokens je Modell):")
+    print(f"{'Strategie':<32}" + "".join(f" {name:>14}" for name in tabelle))
+    for name, funktionsname, kwargs in STRATEGIEN:
+        funktion = strategie_funktion(funktionsname, kwargs)
+        tokens = sum(token_anzahl(funktion(t)) for t in TEST_PROMPTS.values()) / len(TEST_PROMPTS)
+        print(f"{name:<32}" + "".join(f" {m.kosten_euro(tokens) * 1e6:>12.0f} €" for m in tabelle.values()))
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else ANFRAGEN
+    last(anzahl)
+    kosten()
+
+
+if __name__ == "__main__":
+    main()
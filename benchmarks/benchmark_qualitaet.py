@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Qualitätsbewertung (token_minimierung.qualitaet).
+1. Viele Paare (Sweep-Ausgaben aller Strategien): einzeln (zwei Modellaufrufe je
+   Paar) gegen gebündelt, jeweils mit leerem Embedding-Cache; dazu der Durchsatz
+   der Erhalt-Metriken und Beispiele für erkannte Zahlen/IDs/Beträge
+2. Vorfilter im Sweep: Laufzeit, eingebettete Ausgaben und erhaltene Front-Punkte
+   je Schwelle min_erhalt
+Gleiche Werte wie die Einzelbewertung und wie Mengen prüft tests/test_qualitaet.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_qualitaet.py
+"""
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import bewertung_einzeln, sweep_paare
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.qualitaet import _get_qualitaets_model, entitaeten, erhalt_metriken, qualitaet_paare
+from token_minimierung.sweep import parameter_sweep
+
+SCHWELLEN = [None, 0.3, 0.5, 0.7]
+
+
+def durchsatz(paare):
+    model = _get_qualitaets_model()
+    model.leeren()
+    start = time.perf_counter()
+    einzeln = [bewertung_einzeln(o, k) for o, k in paare]
+    t_einzeln = time.perf_counter() - start
+    model.leeren()
+    start = time.perf_counter()
+    qualitaet_paare(paare)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for original in TEST_PROMPTS.values():
+        erhalt_metriken(original, [k for o, k in paare if o == original])
+    t_erhalt = time.perf_counter() - start
+    eindeutig = len(set(paare))
+    print(f"\n{len(paare)} Paare ({eindeutig} eindeutig):")
+    print(f"  einzeln (2 Modellaufrufe je Paar)   {t_einzeln:>7.2f} s  {len(paare) / t_einzeln:>9.0f} Paare/s")
+    print(f"  qualitaet_paare (1 Modellaufruf)    {t_batch:>7.2f} s  {len(paare) / t_batch:>9.0f} Paare/s")
+    print(f"  erhalt_metriken (ohne Modell)       {t_erhalt:>7.2f} s  {len(paare) / t_erhalt:>9.0f} Paare/s")
+    print(f"  Entitäten (kundensupport): {sorted(set(entitaeten(TEST_PROMPTS['kundensupport'])))}")
+
+
+def vorfilter():
+    print(f"\n{'min_erhalt':>10} {'Dauer s':>8} {'eingebettet':>12} {'vorgefiltert':>13} {'Front':>6} "
+          f"{'davon wie ohne Filter':>22}")
+    referenz = None
+    for schwelle in SCHWELLEN:
+        _get_qualitaets_model().leeren()
+        e = parameter_sweep(TEST_PROMPTS, fortschritt=False, min_erhalt=schwelle)
+        front = {(p.szenario, p.strategie, tuple(sorted(p.parameter.items())))
+                 for f in e.front.values() for p in f}
+        referenz = front if referenz is None else referenz
+        s = e.statistik
+        print(f"{str(schwelle):>10} {s['gesamt_s']:>8.2f} {s['bewertete_ausgaben']:>12} {s['vorgefiltert']:>13} "
+              f"{len(front):>6} {len(front & referenz):>22}")
+
+
+def main():
+    paare = sweep_paare()
+    durchsatz(paare)
+    vorfilter()
+
+
+if __name__ == "__main__":
+    main()
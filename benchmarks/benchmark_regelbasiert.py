@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: regelbasierte Kompression (kompilierter Regelsatz) gegen die
+bisherige Implementierung (Grußformel-Suche über den ganzen Text, zwei
+Leerraum-Durchläufe und lower()/strip() in einer Python-Schleife pro Wort).
+Durchsatz auf 10K/100K/1M Wörtern und für viele kurze Prompts (Batch).
+Identische Ausgaben prüft tests/test_regelbasiert.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_regelbasiert.py
+"""
+import random
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import regelbasiert_referenz
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.regelbasiert import kompression_manuell, kompression_manuell_batch
+
+WORTANZAHLEN = [10_000, 100_000, 1_000_000]
+BATCH = 10_000
+WIEDERHOLUNGEN = 5
+
+
+def _bestzeit(funktion, *args):
+    zeiten = []
+    for _ in range(WIEDERHOLUNGEN):
+        start = time.perf_counter()
+        funktion(*args)
+        zeiten.append(time.perf_counter() - start)
+    return min(zeiten)
+
+
+def durchsatz():
+    woerter = ' '.join(TEST_PROMPTS.values()).split(' ')
+    rnd = random.Random(42)
+    print(f"\n{'Eingabe':<22} {'bisher (ms)':>12} {'neu (ms)':>10} {'Faktor':>8}")
+    print("-" * 56)
+    for anzahl in WORTANZAHLEN:
+        text = ' '.join(rnd.choice(woerter) for _ in range(anzahl))
+        t_alt = _bestzeit(regelbasiert_referenz, text)
+        t_neu = _bestzeit(kompression_manuell, text)
+        print(f"{f'{anzahl} Wörter':<22} {t_alt * 1000:>12.1f} {t_neu * 1000:>10.1f} {t_alt / t_neu:>7.1f}x")
+
+    prompts = [' '.join(rnd.choice(woerter) for _ in range(rnd.randint(10, 80))) for _ in range(BATCH)]
+    t_alt = _bestzeit(lambda ps: [regelbasiert_referenz(p) for p in ps], prompts)
+    t_neu = _bestzeit(kompression_manuell_batch, prompts)
+    print(f"{f'{BATCH} Prompts (Batch)':<22} {t_alt * 1000:>12.1f} {t_neu * 1000:>10.1f} {t_alt / t_neu:>7.1f}x")
+
+
+def main():
+    durchsatz()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: adaptiver Strategie-Router (router.py) gegen „immer strukturiert“.
+Gemischter Korpus (Fragen, E-Mails, Berichte, Code-Reviews, Formulare): Router
+ohne Beobachtungen (nur Prior) und nach lernen() auf einer Trainingshälfte gegen
+kompression_strukturiert auf der Testhälfte – Rechenzeit, eingebettete Texte
+(Embedding-Aufrufe ohne Cache), Budget- und Qualitätsquote, mittlere Qualität,
+gewählte Strategien. Die Millisekunden hängen stark vom Embedding-Backend ab,
+die eingebetteten Texte nicht.
+
+Unveränderte Prompts im Budget, erhaltene Code-Blöcke, Merkmale und Zustand
+prüft tests/test_router.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_router.py [Prompts]
+"""
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from token_minimierung.embedding import get_embedding_dienst
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.qualitaet import qualitaet_paare
+from token_minimierung.router import StrategieRouter
+from token_minimierung.segmentierung import saetze_zerlegen
+from token_minimierung.strukturiert import kompression_strukturiert
+from token_minimierung.tokenizer import token_anzahl
+
+PROMPTS = 80
+ZIEL_TOKENS = 400
+MIN_QUALITAET = 0.85
+
+
+def korpus_erzeugen(anzahl, seed=0):
+    """Gemischte Prompts: kurze Fragen, E-Mails, lange Berichte, Code-Reviews, Formulare."""
+    rnd = random.Random(seed)
+    saetze = [s for name, t in TEST_PROMPTS.items() if name != 'code_review' for s in saetze_zerlegen(t)]
+    code = TEST_PROMPTS['code_review'][TEST_PROMPTS['code_review'].index('```'):].split('\n\n')[0]
+
+    def text(von, bis):
+        # Sätze ohne Schlusszeichen (Satzmitte) wieder mit Punkt, damit die Segmentierung sie trennt
+        return ' '.join(s if s[-1] in '.!?' else s + '.' for s in (rnd.choice(saetze) for _ in range(rnd.randint(von, bis))))
+
+    arten = {
+        'frage': lambda: text(1, 3),
+        'email': lambda: f"Sehr geehrte Damen und Herren,\n\n{text(3, 8)}\n\n{text(2, 5)}\n\n"
+                         f"Mit freundlichen Grüßen\nErika Musterfrau",
+        'bericht': lambda: '\n\n'.join(text(4, 8) for _ in range(rnd.randint(3, 8))),
+        'code': lambda: f"Bitte prüfe den folgenden Code. {text(0, 2)}\n\n{code}\n\n{text(1, 4)}",
+        'formular': lambda: '\n'.join(f"{feld}: {rnd.randint(1000, 99999)}" for feld in
+                                      rnd.sample(['Kundennummer', 'Auftrag', 'Rechnung', 'Telefon',
+                                                  'Betrag', 'Filiale', 'Vertrag'], 4)) + f"\n\n{text(2, 6)}",
+    }
+    namen = list(arten)
+    return [(art, arten[art]()) for art in (namen[i % len(namen)] for i in range(anzahl))]
+
+
+def _gemessen(funktion):
+    """(Ergebnis, Rechenzeit in ms, eingebettete Texte) bei leerem In-Process-Cache."""
+    dienst = get_embedding_dienst()
+    dienst.leeren()  # gleiche Ausgangslage: keine vorab berechneten Embeddings
+    vorher = dienst.fehlschlaege
+    start = time.perf_counter()
+    ergebnis = funktion()
+    return ergebnis, (time.perf_counter() - start) * 1000, dienst.fehlschlaege - vorher
+
+
+def _auswerten(name, prompts, lauf, strategien=None):
+    ausgaben, rechen_ms, eingebettet = lauf
+    get_embedding_dienst().leeren()
+    qualitaet = np.asarray(qualitaet_paare(list(zip(prompts, ausgaben))))
+    im_budget = np.array([token_anzahl(a) <= ZIEL_TOKENS for a in ausgaben])
+    gesamt = (im_budget & (qualitaet >= MIN_QUALITAET)).mean()
+    print(f"{name:<28} {rechen_ms:>10.0f} {eingebettet:>11} {im_budget.mean() * 100:>9.0f}% "
+          f"{(qualitaet >= MIN_QUALITAET).mean() * 100:>9.0f}% {gesamt * 100:>7.0f}% {qualitaet.mean() * 100:>8.1f}%"
+          + (f"  {dict(strategien)}" if strategien else ''))
+
+
+def _router_lauf(router, prompts):
+    entscheidungen, dauer, eingebettet = _gemessen(
+        lambda: [router.entscheiden(p, ZIEL_TOKENS, min_qualitaet=MIN_QUALITAET) for p in prompts])
+    return ([e.text for e in entscheidungen], dauer, eingebettet), Counter(e.kandidat for e in entscheidungen)
+
+
+def korpus(anzahl):
+    daten = korpus_erzeugen(anzahl)
+    training = [p for i, (_, p) in enumerate(daten) if i % 2 == 0]
+    test = [p for i, (_, p) in enumerate(daten) if i % 2 == 1]
+    tokens = [token_anzahl(p) for p in test]
+    print(f"Korpus: {len(training)} Trainings-, {len(test)} Test-Prompts "
+          f"({Counter(a for a, _ in daten)}), Test-Tokens {min(tokens)}–{max(tokens)}, "
+          f"Budget {ZIEL_TOKENS} Tokens, Qualität ≥ {MIN_QUALITAET:.0%}")
+
+    strukturiert = _gemessen(lambda: [kompression_strukturiert(p, ziel_anteil=min(1.0, ZIEL_TOKENS / n))
+                                      for p, n in zip(test, tokens)])
+    ohne_daten, ohne_daten_wahl = _router_lauf(StrategieRouter(), test)
+    router = StrategieRouter()
+    start = time.perf_counter()
+    beobachtungen = router.lernen(training)
+    t_lernen = time.perf_counter() - start
+    gelernt, gelernt_wahl = _router_lauf(router, test)
+
+    print(f"\n{'Variante':<28} {'Rechen ms':>10} {'eingebettet':>11} {'im Budget':>10} {'Qualität ok':>10} "
+          f"{'beides':>8} {'Qualität Ø':>9}")
+    _auswerten('immer strukturiert', test, strukturiert)
+    _auswerten('Router (nur Prior)', test, ohne_daten, ohne_daten_wahl)
+    _auswerten('Router (gelernt)', test, gelernt, gelernt_wahl)
+    print(f"\nlernen(): {beobachtungen} Beobachtungen in {t_lernen:.1f} s")
+    for name, (_, ms, eingebettet) in (('gelernt', gelernt), ('nur Prior', ohne_daten)):
+        print(f"Gespart gegenüber immer strukturiert ({name}): Rechenzeit {(1 - ms / strukturiert[1]) * 100:.0f}%, "
+              f"eingebettete Texte {(1 - eingebettet / max(strukturiert[2], 1)) * 100:.0f}%")
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else PROMPTS
+    korpus(anzahl)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark-Suite für die Kompressionsstrategien aus token_minimierung.
+- Synthetische Korpora (Deutsch, Englisch, Code) mit 1K, 10K, 100K und 1M Tokens
+- Pro Strategie und Größe: Warm-up, N Wiederholungen, p50/p95/p99-Latenz,
+  Tokens/s und Spitzenspeicher (tracemalloc, separater Lauf)
+- Ergebnisse als JSON (mit Commit-Hash) zum Vergleich über Commits hinweg,
+  dazu ein Log-Log-Plot Latenz vs. Eingabegröße je Strategie (Skalierungskurven)
+
+Aufruf (aus dem Projektordner):
+    python benchmarks/benchmark_strategien.py --groessen 1000 10000 --wiederholungen 5
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+from _gemeinsam import BASE
+
+import token_minimierung
+from token_minimierung.strukturiert import _get_embedding_model
+from token_minimierung.tokenizer import get_encoder, tokenisieren
+
+GROESSEN = [1_000, 10_000, 100_000, 1_000_000]
+KORPORA = ["deutsch", "englisch", "code"]
+
+# (Name, Funktionsname, kwargs) – wie token_minimierung.experiment.STRATEGIEN
+STRATEGIEN = [
+    ("manuell", "kompression_manuell", {}),
+    ("strukturiert", "kompression_strukturiert", {}),
+    ("token_budget", "kompression_token_budget", {"ziel_tokens": 100}),
+    ("chunking", "kompression_chunking", {"chunk_groesse": 100, "overlap": 20}),
+]
+
+_DE = {
+    "subjekt": ["Der Kunde", "Die Bestellung", "Das Paket", "Unser Team", "Die Rechnung", "Der Bericht"],
+    "verb": ["wurde geprüft", "ist angekommen", "fehlt leider", "wird bearbeitet", "enthält Fehler",
+             "zeigt einen Anstieg von 17%"],
+    "rest": ["am 15. Januar 2024", "laut Tracking", "für das Projekt", "in Höhe von 89,99 €",
+             "mit der Nr. ORD-2024-001598", "gegenüber dem Vorjahr", "z.B. bei Solarenergie"],
+}
+_EN = {
+    "subjekt": ["The customer", "The order", "Our team", "The invoice", "The report", "The service"],
+    "verb": ["was reviewed", "has arrived", "is missing", "is being processed", "contains errors",
+             "shows an increase of 17%"],
+    "rest": ["on January 15, 2024", "according to tracking", "for the project", "worth $89.99",
+             "with ID ORD-2024-001598", "compared to last year", "e.g. for solar energy"],
+}
+
+
+def _prosa(woerter, rnd, anzahl_saetze):
+    saetze = []
+    for i in range(anzahl_saetze):
+        satz = f"{rnd.choice(woerter['subjekt'])} {rnd.choice(woerter['verb'])} {rnd.choice(woerter['rest'])}"
+        saetze.append(satz + rnd.choice([".", ".", ".", "!", "?"]))
+        if i % 7 == 6:
+            saetze.append("\n\n")
+    return " ".join(saetze)
+
+
+def _code(rnd, anzahl_funktionen):
+    teile = []
+    for i in range(anzahl_funktionen):
+        name = rnd.choice(["berechne", "lade", "pruefe", "verarbeite"]) + f"_{rnd.choice(['daten', 'summe', 'datei'])}_{i}"
+        teile.append(
+            f"def {name}(daten):\n"
+            f"    summe = 0\n"
+            f"    for eintrag in daten:\n"
+            f"        if eintrag['typ'] == '{rnd.choice(['einnahme', 'ausgabe'])}':\n"
+            f"            summe += eintrag['betrag'] * {rnd.randint(1, 99)}\n"
+            f"    return summe\n"
+        )
+    return "```python\n" + "\n".join(teile) + "```\nBitte analysiere den Code. Er berechnet Summen."
+
+
+def korpus_erzeugen(encoder, art, ziel_tokens, seed=0):
+    """Erzeugt einen Text mit genau ziel_tokens Tokens (deterministisch)."""
+    rnd = random.Random(f"{art}-{seed}")
+    einheiten = max(1, ziel_tokens // 10)
+    while True:
+        if art == "deutsch":
+            text = _prosa(_DE, rnd, einheiten)
+        elif art == "englisch":
+            text = _prosa(_EN, rnd, einheiten)
+        else:
+            text = _code(rnd, max(1, einheiten // 5))
+        tokens = tokenisieren(text)
+        if len(tokens) >= ziel_tokens:
+            return encoder.decode(tokens[:ziel_tokens])
+        einheiten *= 2
+
+
+def _commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return "unbekannt"
+
+
+def messen(funktion, text, warmup, wiederholungen):
+    """Latenzen (ms) nach Warm-up; Spitzenspeicher in einem separaten Lauf."""
+    for _ in range(warmup):
+        funktion(text)
+    latenzen = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion(text)
+        latenzen.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    funktion(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.array(latenzen), peak
+
+
+def skalierung_plotten(ergebnisse, pfad):
+    """Log-Log-Plot p50-Latenz vs. Eingabe-Tokens, eine Kurve pro Strategie und Korpus."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, len(KORPORA), figsize=(6 * len(KORPORA), 4.5), sharey=True)
+    for ax, korpus in zip(np.atleast_1d(axes), KORPORA):
+        for strategie, _, _ in STRATEGIEN:
+            punkte = sorted((e["tokens"], e["p50_ms"]) for e in ergebnisse
+                            if e["korpus"] == korpus and e["strategie"] == strategie)
+            if punkte:
+                x, y = zip(*punkte)
+                ax.plot(x, y, marker="o", label=strategie)
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_title(korpus, fontweight="bold")
+        ax.set_xlabel("Eingabe (Tokens)")
+        ax.grid(True, alpha=0.3, which="both")
+    np.atleast_1d(axes)[0].set_ylabel("p50-Latenz (ms)")
+    np.atleast_1d(axes)[0].legend(fontsize=9)
+    plt.tight_layout()
+    plt.savefig(pfad, dpi=120, bbox_inches="tight")
+    plt.close("all")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--groessen", type=int, nargs="+", default=GROESSEN)
+    parser.add_argument("--korpora", nargs="+", default=KORPORA, choices=KORPORA)
+    parser.add_argument("--strategien", nargs="+", default=[s[0] for s in STRATEGIEN],
+                        choices=[s[0] for s in STRATEGIEN])
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--ausgabe", default=os.path.join(BASE, "benchmarks", "ergebnisse"))
+    parser.add_argument("--kein-plot", action="store_true")
+    args = parser.parse_args()
+
+    encoder = get_encoder()
+    if "strukturiert" in args.strategien:
+        _get_embedding_model().modell  # Modell-Ladezeit nicht mitmessen
+
+    ergebnisse = []
+    print(f"{'Strategie':<14} {'Korpus':<9} {'Tokens':>9} {'p50 ms':>10} {'p95 ms':>10} "
+          f"{'p99 ms':>10} {'Tokens/s':>12} {'Peak MB':>8}")
+    print("-" * 90)
+    for korpus in args.korpora:
+        for groesse in args.groessen:
+            text = korpus_erzeugen(encoder, korpus, groesse)
+            for name, funktionsname, kwargs in STRATEGIEN:
+                if name not in args.strategien:
+                    continue
+                funktion = getattr(token_minimierung, funktionsname)
+                if name == "strukturiert":
+                    # Embedding-Cache je Messung leeren, sonst misst jede Wiederholung nur Treffer
+                    dienst = _get_embedding_model()
+                    def funktion(t, _f=funktion, _d=dienst, _kw=kwargs):
+                        _d.leeren()
+                        return _f(t, **_kw)
+                elif kwargs:
+                    def funktion(t, _f=funktion, _kw=kwargs):
+                        return _f(t, **_kw)
+                latenzen, peak = messen(funktion, text, args.warmup, args.wiederholungen)
+                p50, p95, p99 = np.percentile(latenzen, [50, 95, 99])
+                eintrag = {
+                    "strategie": name,
+                    "korpus": korpus,
+                    "tokens": groesse,
+                    "wiederholungen": args.wiederholungen,
+                    "p50_ms": float(p50),
+                    "p95_ms": float(p95),
+                    "p99_ms": float(p99),
+                    "mittel_ms": float(latenzen.mean()),
+                    "std_ms": float(latenzen.std()),
+                    "tokens_pro_s": float(groesse / (p50 / 1000)) if p50 > 0 else float("inf"),
+                    "peak_mb": peak / (1 << 20),
+                }
+                ergebnisse.append(eintrag)
+                print(f"{name:<14} {korpus:<9} {groesse:>9} {p50:>10.2f} {p95:>10.2f} {p99:>10.2f} "
+                      f"{eintrag['tokens_pro_s']:>12.0f} {eintrag['peak_mb']:>8.2f}")
+
+    # Skalierungsexponent: Steigung von log(p50) über log(Tokens) je Strategie/Korpus
+    print("\nSkalierung (p50 ~ Tokens^k):")
+    for korpus in args.korpora:
+        for name in args.strategien:
+            punkte = [(e["tokens"], e["p50_ms"]) for e in ergebnisse
+                      if e["korpus"] == korpus and e["strategie"] == name and e["p50_ms"] > 0]
+            if len(punkte) >= 2:
+                x, y = np.log(np.array(punkte)).T
+                print(f"  {name:<14} {korpus:<9} k = {np.polyfit(x, y, 1)[0]:.2f}")
+
+    commit = _commit()
+    os.makedirs(args.ausgabe, exist_ok=True)
+    pfad = os.path.join(args.ausgabe, f"strategien_{commit}.json")
+    with open(pfad, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "datum": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "plattform": platform.platform(),
+                "warmup": args.warmup,
+            },
+            "ergebnisse": ergebnisse,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Benchmark-Ergebnisse gespeichert: {pfad}")
+    if not args.kein_plot:
+        plot_pfad = os.path.join(args.ausgabe, f"strategien_{commit}.png")
+        skalierung_plotten(ergebnisse, plot_pfad)
+        print(f"✅ Skalierungskurven gespeichert: {plot_pfad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: kompression_strukturiert (ein Prompt pro Aufruf) vs.
+kompression_strukturiert_batch (viele Prompts pro Modellaufruf).
+Misst den Durchsatz (Prompts/s) bei Batch-Größen 1, 32 und 256; identische
+Ausgaben beider Varianten prüft tests/test_strukturiert.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_strukturiert_batch.py
+"""
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import prompts_erzeugen
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.strukturiert import (
+    _get_embedding_model, kompression_strukturiert, kompression_strukturiert_batch,
+)
+
+BATCH_GROESSEN = [1, 32, 256]
+
+
+def main():
+    einzeln = kompression_strukturiert
+    batch = kompression_strukturiert_batch
+    _get_embedding_model().modell  # Modell vorab laden (nicht mitmessen)
+
+    prompts = prompts_erzeugen(TEST_PROMPTS, max(BATCH_GROESSEN))
+
+    dienst = _get_embedding_model()
+    print(f"{'Batch':>6} {'Einzeln (Prompts/s)':>20} {'Batch (Prompts/s)':>18} {'Faktor':>8}")
+    print("-" * 57)
+    for groesse in BATCH_GROESSEN:
+        teil = prompts[:groesse]
+
+        dienst.leeren()  # Cache leeren: beide Varianten rechnen ohne Vorwissen
+        start = time.perf_counter()
+        for p in teil:
+            einzeln(p)
+        t_einzeln = time.perf_counter() - start
+
+        dienst.leeren()
+        start = time.perf_counter()
+        batch(teil)
+        t_batch = time.perf_counter() - start
+
+        print(f"{groesse:>6} {groesse / t_einzeln:>20.1f} {groesse / t_batch:>18.1f} "
+              f"{t_einzeln / t_batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Parameter-Sweep (token_minimierung.sweep) mit 10K+ Konfigurationen.
+Großes Raster auf den Test-Prompts je Modus: Zellen/s, per Dedup nicht erneut
+und per Dominanz-Pruning gar nicht bewertete Konfigurationen, Größe der Pareto-Fronten; dazu der naive Weg (jede Zelle
+einzeln über run_experiment) auf einer Teilmenge als Vergleich.
+
+Pareto-Front und Zellwerte gegen die Referenzen prüft tests/test_sweep.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_sweep.py [Modus ...]
+"""
+import random
+import sys
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from token_minimierung.experiment import TEST_PROMPTS, run_experiment, strategie_funktion
+from token_minimierung.qualitaet import qualitaet_semantische_aehnlichkeit
+from token_minimierung.sweep import bereich, konfigurationen, parameter_sweep
+
+MODI = ["seriell", "prozesse"]
+NAIV_STICHPROBE = 300
+
+# Feines Raster: ≈ 3.500 Konfigurationen je Szenario, > 10K insgesamt
+GROSSE_RAEUME = [
+    ("Manuelle Prompt-Kompression", "kompression_manuell", {"stopwords_entfernen": [False, True]}),
+    ("Strukturierte Kompression", "kompression_strukturiert",
+     {"ziel_anteil": bereich(0.05, 0.95, 91), "min_saetze": [1, 2, 3, 4]}),
+    ("Token-Budget", "kompression_token_budget",
+     {"ziel_tokens": range(10, 501, 10), "position_weight": [True, False],
+      "relevanz_gewicht": bereich(0.0, 1.0, 11), "verfahren": ["optimal", "greedy"]}),
+    ("Chunking", "kompression_chunking",
+     {"chunk_groesse": range(40, 401, 20), "overlap": range(0, 81, 10), "saetze_pro_chunk": [1, 2, 3, 4, 5]}),
+]
+
+
+def naiv(anzahl, seed=0):
+    """Jede Zelle einzeln: Prompt als Text (erneut analysiert), Qualität je Zelle."""
+    rnd = random.Random(seed)
+    zellen = [(name, raum, kw) for name in TEST_PROMPTS for raum in GROSSE_RAEUME
+              for kw in konfigurationen(raum)]
+    start = time.perf_counter()
+    for name, (strategie, funktionsname, _), kwargs in rnd.sample(zellen, anzahl):
+        run_experiment(name, TEST_PROMPTS[name], strategie_funktion(funktionsname, kwargs), strategie,
+                       qualitaets_fn=qualitaet_semantische_aehnlichkeit)
+    return anzahl / (time.perf_counter() - start)
+
+
+def main():
+    modi = sys.argv[1:] or MODI
+    ergebnisse = {}
+    for modus in modi:
+        ergebnisse[modus] = parameter_sweep(TEST_PROMPTS, GROSSE_RAEUME, modus=modus, fortschritt=False)
+
+    print(f"\n{'Modus':<10} {'Zellen':>8} {'Dauer s':>9} {'Zellen/s':>10} {'bewertet':>9} "
+          f"{'Dedup':>10} {'dominiert':>10} {'Front':>6}")
+    print("-" * 79)
+    for modus, e in ergebnisse.items():
+        s = e.statistik
+        print(f"{modus:<10} {s['zellen']:>8} {s['gesamt_s']:>9.1f} {s['zellen'] / s['gesamt_s']:>10.0f} "
+              f"{s['bewertete_ausgaben']:>9} {s['dedupliziert']:>10} {s['dominiert']:>10} {s['front_punkte']:>6}")
+    print(f"{'naiv':<10} {NAIV_STICHPROBE:>8} {'':>9} {naiv(NAIV_STICHPROBE):>10.0f}   "
+          f"(run_experiment je Zelle, Stichprobe)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: optimale Satzauswahl (Rucksack, token_minimierung.auswahl) gegen die
+bisherige Greedy-Auswahl in kompression_token_budget.
+Dokumente mit 100 bis 50K Sätzen und Budgets von 10 % / 30 % der Tokens:
+tatsächlich verbrauchte Tokens der Ausgabe, erreichte Score-Summe, Güte gegen
+die LP-Schranke, Laufzeit. Das Optimum auf kleinen Zufallsinstanzen (Vollsuche)
+prüft tests/test_token_budget.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_token_budget.py [Satzanzahl ...]
+"""
+import random
+import sys
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from token_minimierung.auswahl import budget_auswahl, greedy_auswahl
+from token_minimierung.dokument import dokument_analysieren
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.segmentierung import saetze_zerlegen
+from token_minimierung.token_budget import kompression_token_budget, satz_scores
+from token_minimierung.tokenizer import token_anzahl
+
+SATZANZAHLEN = [100, 1_000, 10_000, 50_000]
+BUDGET_ANTEILE = [0.1, 0.3]
+
+
+def dokument_erzeugen(anzahl_saetze, seed=0):
+    rnd = random.Random(seed)
+    vorlagen = [s for t in TEST_PROMPTS.values() for s in saetze_zerlegen(t) if len(s) > 3]
+    return '. '.join(rnd.choice(vorlagen) for _ in range(anzahl_saetze)) + '.'
+
+
+def main():
+    anzahlen = [int(a) for a in sys.argv[1:]] or SATZANZAHLEN
+    print(f"{'Sätze':>7} {'Budget':>8} {'Verfahren':<9} {'Tokens':>8} {'Score':>10} "
+          f"{'Güte':>7} {'Zeit (ms)':>10}")
+    print("-" * 66)
+    for anzahl in anzahlen:
+        doc = dokument_analysieren(dokument_erzeugen(anzahl))
+        scores = satz_scores(doc)
+        for anteil in BUDGET_ANTEILE:
+            budget = int(doc.token_anzahl * anteil)
+            for verfahren, auswahl_fn in (("greedy", greedy_auswahl), ("optimal", budget_auswahl)):
+                start = time.perf_counter()
+                ergebnis = kompression_token_budget(doc, budget, verfahren=verfahren)
+                dauer = (time.perf_counter() - start) * 1000
+                auswahl = auswahl_fn(scores, doc.satz_token_laengen, budget)
+                tokens = token_anzahl(ergebnis)
+                guete = f"{auswahl.guete:.4f}" if verfahren == "optimal" else "-"
+                markierung = " ⚠ über Budget" if tokens > budget else ""
+                print(f"{anzahl:>7} {budget:>8} {verfahren:<9} {tokens:>8} {auswahl.score:>10.1f} "
+                      f"{guete:>7} {dauer:>10.1f}{markierung}")
+
+
+if __name__ == "__main__":
+    main()
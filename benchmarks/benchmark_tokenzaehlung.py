@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Token-Buchhaltung (token_minimierung.tokenizer).
+1. Zählen wie in den Experimenten (jeder Prompt je Strategie erneut, dazu
+   wiederkehrende Ausgaben): direkt encode je Aufruf gegen den LRU-Cache
+2. Viele eindeutige Sätze: encode je Satz gegen encode_ordinary_batch (Threads)
+3. Schätzer: Fehlergrenzen auf den Kalibriertexten und auf neuen Texten,
+   Anteil der Budget-Prüfungen, die ohne Tokenisierung entschieden werden
+
+Dass token_anzahlen und im_budget mit len(encoder.encode(...)) übereinstimmen,
+prüft tests/test_tokenizer.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_tokenzaehlung.py [Satzanzahl]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import texte_erzeugen
+from token_minimierung.experiment import STRATEGIEN, TEST_PROMPTS
+from token_minimierung.segmentierung import saetze_zerlegen
+from token_minimierung.tokenizer import BATCH_THREADS, TokenZaehler, get_encoder, get_schaetzer, im_budget
+
+SATZANZAHL = 50_000
+
+
+def experiment_zaehlung(wiederholungen=20):
+    """Zählungen eines Experimentlaufs: Original je Strategie, Ausgaben teils wiederholt."""
+    encoder = get_encoder()
+    aufrufe = []
+    for prompt in TEST_PROMPTS.values():
+        saetze = saetze_zerlegen(prompt)
+        for k in range(len(STRATEGIEN)):
+            aufrufe.append(prompt)
+            aufrufe.append(' '.join(saetze[k % 2::2]))
+    aufrufe *= wiederholungen
+
+    start = time.perf_counter()
+    for t in aufrufe:
+        len(encoder.encode(t))
+    t_direkt = time.perf_counter() - start
+    zaehler = TokenZaehler()
+    start = time.perf_counter()
+    for t in aufrufe:
+        zaehler.anzahl(t)
+    t_cache = time.perf_counter() - start
+    s = zaehler.statistik()
+    print(f"Experiment-Zählungen ({len(aufrufe)} Aufrufe): direkt {t_direkt*1000:.1f} ms, "
+          f"mit Cache {t_cache*1000:.1f} ms ({t_direkt / t_cache:.1f}×), "
+          f"Trefferquote {s['trefferquote']*100:.0f}%")
+
+
+def batch_zaehlung(anzahl):
+    texte = texte_erzeugen(anzahl, seed=1, max_saetze=1)
+    encoder = get_encoder()
+    start = time.perf_counter()
+    for t in texte:
+        len(encoder.encode(t))
+    t_einzeln = time.perf_counter() - start
+    start = time.perf_counter()
+    TokenZaehler().anzahlen(texte)
+    t_batch = time.perf_counter() - start
+    print(f"Eindeutige Sätze ({anzahl}): encode je Satz {t_einzeln:.2f} s, "
+          f"anzahlen ({BATCH_THREADS} Threads) {t_batch:.2f} s ({t_einzeln / t_batch:.1f}×)")
+
+
+def schaetzer_bericht(anzahl):
+    schaetzer = get_schaetzer()
+    f = schaetzer.fehler
+    print(f"\nSchätzer (kalibriert auf {f['texte']} Texten): relativer Fehler p50 {f['p50']*100:.1f}%, "
+          f"p95 {f['p95']*100:.1f}%, max {f['max']*100:.1f}%; "
+          f"Faktoren exakt/geschätzt [{schaetzer.faktor_unten:.3f}, {schaetzer.faktor_oben:.3f}], "
+          f"Marge {schaetzer.marge*100:.0f}%")
+
+    texte = texte_erzeugen(anzahl, seed=2)
+    exakt = np.asarray(TokenZaehler().anzahlen(texte))
+    schaetzung = schaetzer.schaetzen_viele(texte)
+    relativ = np.abs(exakt - schaetzung) / np.maximum(exakt, 1)
+    unten, oben = schaetzer.grenzen(texte)
+    ausserhalb = int(((exakt < unten) | (exakt > oben)).sum())
+    print(f"Neue Texte ({anzahl}): relativer Fehler p50 {np.percentile(relativ, 50)*100:.1f}%, "
+          f"p95 {np.percentile(relativ, 95)*100:.1f}%, max {relativ.max()*100:.1f}%; "
+          f"{ausserhalb} außerhalb der Grenzen")
+
+    print(f"\n{'Budget':>8} {'ohne Tokenisierung':>19} {'im_budget ms':>13} {'exakt ms':>9} {'Fehler':>7}")
+    encoder = get_encoder()
+    for budget in (25, 50, 100, 200, 400):
+        start = time.perf_counter()
+        vorfilter = im_budget(texte, budget)
+        t_vorfilter = time.perf_counter() - start
+        start = time.perf_counter()
+        referenz = np.array([len(encoder.encode(t)) <= budget for t in texte])
+        t_exakt = time.perf_counter() - start
+        unten, oben = schaetzer.grenzen(texte)
+        entschieden = ((oben <= budget) | (unten > budget)).mean()
+        print(f"{budget:>8} {entschieden*100:>18.1f}% {t_vorfilter*1000:>13.1f} {t_exakt*1000:>9.1f} "
+              f"{int((vorfilter != referenz).sum()):>7}")
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else SATZANZAHL
+    experiment_zaehlung()
+    batch_zaehlung(anzahl)
+    schaetzer_bericht(min(anzahl, 20_000))
+
+
+if __name__ == "__main__":
+    main()
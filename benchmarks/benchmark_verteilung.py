@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Perzentile, Bootstrap-Intervalle und Verteilungs-Export (verteilung.py).
+Laufzeit auf synthetischen Zeilen (bis 10M): Perzentile allein, mit Bootstrap,
+pandas groupby().quantile() bis zur angegebenen Grenze, CDF-/Boxplot-PNG.
+Perzentile wie pandas, Überdeckung der Intervalle und das JSON-Schema prüft
+tests/test_verteilung.py.
+
+Aufruf (aus dem Projektordner): python benchmarks/benchmark_verteilung.py [Zeilen ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import _gemeinsam  # noqa: F401 – setzt sys.path auf den Projektordner
+from tests.hilfen import spalten_langschwaenzig, speicher_fuellen
+from token_minimierung.auswertung import verteilungen_visualisieren
+from token_minimierung.verteilung import PERZENTILE
+
+ZEILEN = [10_000, 1_000_000, 10_000_000]
+PANDAS_BIS = 1_000_000
+
+
+def laufzeit(zeilen_liste):
+    print(f"\n{'Zeilen':>11} {'Perzentile s':>13} {'+Bootstrap s':>13} {'pandas s':>9} {'Plot s':>7}")
+    for n in zeilen_liste:
+        speicher = speicher_fuellen(spalten_langschwaenzig(n))
+        start = time.perf_counter()
+        speicher.verteilung('latenz_ms', ('strategie', 'szenario'), bootstrap=0)
+        t_perzentile = time.perf_counter() - start
+        start = time.perf_counter()
+        latenz = speicher.verteilung('latenz_ms')
+        qualitaet = speicher.verteilung('qualitaets_score')
+        t_bootstrap = (time.perf_counter() - start) / 2
+        t_pandas = float('nan')
+        if n <= PANDAS_BIS:
+            df = speicher.als_dataframe()
+            start = time.perf_counter()
+            df.groupby(['Strategie', 'Szenario'])['Latenz (ms)'].quantile([p / 100 for p in PERZENTILE])
+            t_pandas = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as ordner:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                verteilungen_visualisieren(latenz, qualitaet, os.path.join(ordner, 'v.png'))
+            t_plot = time.perf_counter() - start
+        print(f"{n:>11,} {t_perzentile:>13.3f} {t_bootstrap:>13.3f} {t_pandas:>9.3f} {t_plot:>7.2f}")
+
+
+def main():
+    zeilen = [int(a) for a in sys.argv[1:]] or ZEILEN
+    laufzeit(zeilen)
+
+
+if __name__ == "__main__":
+    main()
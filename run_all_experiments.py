@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
-"""Führt alle Experiment-Skripte nacheinander im gleichen Namensraum aus."""
+"""Führt die komplette Experiment-Pipeline aus dem Paket token_minimierung aus."""
+import contextlib
 import os
 import sys
-import io
 
 # Arbeitsverzeichnis = Ordner dieses Skripts
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -33,28 +33,119 @@ LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'experiment_
 _tee = TeeWriter(LOG_PATH, sys.stdout)
 sys.stdout = _tee
 
-g = {"__name__": "__main__", "__builtins__": __builtins__}
+from token_minimierung import auswertung
+from token_minimierung import instrumentierung
+from token_minimierung.ergebnisspeicher import ErgebnisSpeicher
+from token_minimierung.experiment import STRATEGIEN, TEST_PROMPTS
+from token_minimierung.qualitaet import _get_qualitaets_model
+from token_minimierung.runner import experimente_ausfuehren
+from token_minimierung.tokenizer import token_anzahlen
+from token_minimierung.zellen_cache import get_zellen_cache
 
-scripts = [
-    "1token_berechnung_anfragen.py",
-    "2Kompressionsstrategien.py",
-    "3schaetzung_qualitat_aufgrund_kompression.py",
-    "4ergebnisse_pandas.py",
-    "5visualisierung.py",
-    "6ergebnisse_detail.py",
-    "7finale_ergebnisse.py",
-]
+# Ausführungsmodus: seriell (Standard), threads oder prozesse
+EXPERIMENT_MODUS = os.environ.get('EXPERIMENT_MODUS', 'seriell')
+EXPERIMENT_WORKER = int(os.environ.get('EXPERIMENT_WORKER', '0')) or None
+# Stufen-Latenzen ausgeben (INSTRUMENTIERUNG=1); PROFIL_PFAD: Sampling-Profil dieses Laufs
+# als gefaltete Stacks (flamegraph.pl/speedscope) schreiben
+PROFIL_PFAD = os.environ.get('PROFIL_PFAD')
+# Last-Simulation gegen den Mock-LLM-Endpunkt (LAST_QPS, z. B. "5,10"; Modell: LLM_MODELL),
+# im Zeitraffer LAST_ZEITFAKTOR, LAST_ANFRAGEN Anfragen je Strategie und QPS
+LAST_QPS = [float(q) for q in os.environ.get('LAST_QPS', '').split(',') if q]
+LAST_ANFRAGEN = int(os.environ.get('LAST_ANFRAGEN', '200'))
+LAST_ZEITFAKTOR = float(os.environ.get('LAST_ZEITFAKTOR', '0.1'))
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-for path in scripts:
+
+def schritt(titel):
     print("\n" + "=" * 60)
-    print(f"Führe aus: {path}")
+    print(f"Schritt: {titel}")
     print("=" * 60)
-    with open(path, encoding="utf-8") as f:
-        code = f.read()
-    exec(compile(code, path, "exec"), g)
+
+
+schritt("Test-Prompts und Strategien")
+print("Test-Prompts geladen:")
+for name, anzahl in zip(TEST_PROMPTS, token_anzahlen(TEST_PROMPTS.values())):
+    print(f"  {name}: {anzahl} Tokens")
+
+print("\nKompressionsstrategien implementiert:")
+print("  1. Regelbasierte Kompression (Floskeln, Redundanzen, optional Stoppwörter)")
+print("  2. Strukturierte Kompression (LLMLingua-inspiriert: Embedding-Centrality, auch als Batch)")
+print("  3. Token-Budget (Selective Context / Lost in the Middle: positionsbasiert)")
+print("  4. Chunking mit Überlappung (LongLLMLingua-inspiriert: Chunk-Repräsentationen)")
+
+schritt("Experimente (Qualität über semantische Ähnlichkeit)")
+# Zellen-Cache (ZELLEN_CACHE_PFAD): nur neue oder veraltete Zellen rechnen
+zellen_cache = get_zellen_cache()
+
+# Einmal Modell laden (damit erste Messung nicht die Laufzeit verfälscht);
+# im Prozess-Modus lädt jeder Worker sein eigenes Modell, mit Zellen-Cache
+# lädt der Runner es nur, wenn tatsächlich Zellen zu rechnen sind
+if EXPERIMENT_MODUS != 'prozesse' and zellen_cache is None:
+    print("Lade Embedding-Modell für Qualitätsbewertung …")
+    _get_qualitaets_model().modell
+    print("Modell geladen.")
+
+with (instrumentierung.profilieren(alle_threads=EXPERIMENT_MODUS == 'threads') if PROFIL_PFAD
+      else contextlib.nullcontext()) as profil:
+    alle_ergebnisse = experimente_ausfuehren(
+        TEST_PROMPTS, STRATEGIEN, modus=EXPERIMENT_MODUS, worker=EXPERIMENT_WORKER,
+        zellen_cache=zellen_cache,
+    )
+auswertung.experiment_ergebnisse_ausgeben(alle_ergebnisse, TEST_PROMPTS, STRATEGIEN)
+
+if EXPERIMENT_MODUS != 'prozesse':
+    _cache = _get_qualitaets_model().statistik()
+    print(f"Embedding-Cache: {_cache['treffer'] + _cache['disk_treffer']} Treffer "
+          f"({_cache['disk_treffer']} von Festplatte), {_cache['fehlschlaege']} Fehlschläge, "
+          f"Trefferquote {_cache['trefferquote']*100:.1f}%")
+
+if instrumentierung.aktiv() or profil is not None:  # profilieren() misst die Stufen mit
+    print("\nStufen-Latenzen (ms):")
+    print(instrumentierung.get_instrumentierung().bericht())
+if profil is not None:
+    with open(PROFIL_PFAD, 'w', encoding='utf-8') as f:
+        f.write(profil.gefaltet())
+    print(f"\nProfil: {profil.proben} Proben in {profil.dauer_s:.1f} s → {PROFIL_PFAD}")
+    for pfad, n in profil.stufen.most_common(8):
+        print(f"  {n / max(profil.proben, 1) * 100:5.1f}%  {pfad}")
+
+schritt("DataFrame und aggregierte Statistiken")
+# Spaltenspeicher: Szenario und Parameter je Zeile, Auswertung ohne erneutes Tokenisieren
+speicher = ErgebnisSpeicher.aus_ergebnissen(alle_ergebnisse)
+df, agg_stats = auswertung.ergebnis_dataframe(speicher)
+
+schritt("Visualisierung")
+auswertung.visualisierung_erstellen(df, agg_stats, os.path.join(OUTPUT_DIR, 'experiment_ergebnisse.png'))
+
+schritt("Verteilungen (Tail-Latenz, Qualität)")
+latenz_verteilung, qualitaets_verteilung = auswertung.verteilungen_ausgeben(speicher)
+auswertung.verteilungen_visualisieren(latenz_verteilung, qualitaets_verteilung,
+                                      os.path.join(OUTPUT_DIR, 'experiment_verteilungen.png'))
+
+schritt("Kostenanalyse")
+df = auswertung.kostenanalyse(speicher)
+
+if LAST_QPS:
+    from token_minimierung.mock_llm import last_tabelle, last_vergleich
+    schritt("Last-Simulation (Mock-LLM)")
+    for qps in LAST_QPS:
+        print(f"\n{qps:g} QPS, {LAST_ANFRAGEN} Anfragen je Strategie:")
+        print(last_tabelle(last_vergleich(TEST_PROMPTS, STRATEGIEN, qps, LAST_ANFRAGEN, zeitfaktor=LAST_ZEITFAKTOR)))
+
+schritt("Finale Ergebnisse")
+auswertung.finale_ergebnisse(speicher, [s[0] for s in STRATEGIEN],
+                             os.path.join(OUTPUT_DIR, 'experiment_daten.json'))
+
+if zellen_cache is not None:
+    _zellen = zellen_cache.statistik()
+    print(f"\nZellen-Cache: {_zellen['treffer']} geladen, {_zellen['neu']} neu, "
+          f"{_zellen['veraltet']} veraltet (neu gerechnet), Trefferquote {_zellen['trefferquote']*100:.1f}%, "
+          f"~{_zellen['gesparte_s']:.1f} s Rechenzeit gespart, {_zellen['eintraege']} Einträge")
+    if _zellen['treffer'] and not zellen_cache.latenz_neu_messen:
+        print("  Latenzen geladener Zellen stammen aus früheren Läufen (ZELLEN_CACHE_LATENZ=messen misst neu).")
 
 print("\n" + "=" * 60)
-print("Alle Skripte abgeschlossen.")
+print("Alle Schritte abgeschlossen.")
 print("=" * 60)
 print(f"\n✅ Gesamte Ausgabe gespeichert: experiment_ausgabe.txt")
 
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Parameter-Sweep über alle Strategien auf den Test-Prompts: Pareto-Front
+(Kompressionsrate, Qualität, Latenz) je Szenario als Tabelle, JSON und Plot.
+"""
+import json
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from token_minimierung.auswertung import FARBEN
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.sweep import STANDARD_RAEUME, parameter_sweep
+
+EXPERIMENT_MODUS = os.environ.get('EXPERIMENT_MODUS', 'seriell')
+EXPERIMENT_WORKER = int(os.environ.get('EXPERIMENT_WORKER', '0')) or None
+# Vorfilter: nur Ausgaben mit mindestens diesem Wort- und Zahlen-/ID-Erhalt einbetten (0 = aus)
+SWEEP_MIN_ERHALT = float(os.environ.get('SWEEP_MIN_ERHALT', '0')) or None
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def front_ausgeben(ergebnis):
+    for szenario, punkte in ergebnis.front.items():
+        print(f"\n📈 Pareto-Front: {szenario.upper()} ({len(punkte)} Punkte)")
+        print("-" * 100)
+        print(f"{'Strategie':<30} {'Rate':>7} {'Qualität':>9} {'Latenz':>10}  Parameter")
+        for p in punkte:
+            print(f"{p.strategie:<30} {p.kompressionsrate:>6.2f}x {p.qualitaets_score*100:>8.1f}% "
+                  f"{p.latenz_ms:>7.1f} ms  {json.dumps(p.parameter, ensure_ascii=False)}")
+
+
+def front_plotten(ergebnis, pfad):
+    """Je Szenario alle Konfigurationen (blass) und die Front (Rate vs. Qualität)."""
+    strategien = [r[0] for r in STANDARD_RAEUME]
+    farben = dict(zip(strategien, FARBEN[1:]))
+    fig, axes = plt.subplots(1, len(ergebnis.front), figsize=(6 * len(ergebnis.front), 5), squeeze=False)
+    for ax, (szenario, front) in zip(axes[0], ergebnis.front.items()):
+        for strategie in strategien:
+            alle = [p for p in ergebnis.punkte if p.szenario == szenario and p.strategie == strategie]
+            ax.scatter([p.kompressionsrate for p in alle], [p.qualitaets_score * 100 for p in alle],
+                       s=10, alpha=0.25, color=farben.get(strategie, '#333'), label=strategie)
+        ax.plot([p.kompressionsrate for p in front], [p.qualitaets_score * 100 for p in front],
+                color='black', marker='o', markersize=4, linewidth=1.2, label='Pareto-Front')
+        ax.set_title(szenario, fontweight='bold')
+        ax.set_xlabel('Kompressionsrate (×)')
+        ax.grid(True, alpha=0.3)
+    axes[0][0].set_ylabel('Qualität (%)')
+    axes[0][0].legend(fontsize=8)
+    plt.tight_layout()
+    plt.savefig(pfad, dpi=130, bbox_inches='tight')
+    plt.close('all')
+
+
+if __name__ == '__main__':
+    ergebnis = parameter_sweep(TEST_PROMPTS, modus=EXPERIMENT_MODUS, worker=EXPERIMENT_WORKER,
+                               min_erhalt=SWEEP_MIN_ERHALT)
+    front_ausgeben(ergebnis)
+
+    export = {
+        szenario: [{
+            'strategie': p.strategie,
+            'parameter': p.parameter,
+            'kompressionsrate': p.kompressionsrate,
+            'qualitaet_prozent': p.qualitaets_score * 100,
+            'latenz_ms': p.latenz_ms,
+            'komprimierte_tokens': p.komprimierte_tokens,
+        } for p in front]
+        for szenario, front in ergebnis.front.items()
+    }
+    with open(os.path.join(OUTPUT_DIR, 'sweep_pareto.json'), 'w', encoding='utf-8') as f:
+        json.dump({'statistik': ergebnis.statistik, 'front': export}, f, indent=2, ensure_ascii=False)
+    front_plotten(ergebnis, os.path.join(OUTPUT_DIR, 'sweep_pareto.png'))
+    print("\n✅ Pareto-Fronten gespeichert: sweep_pareto.json, sweep_pareto.png")
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """
 Erzeugt ein Scatter-Plot (Punktdiagramm): Qualität vs. Kompressionsrate
-für die Präsentation. Zeigt den Trade-off auf einen Blick.
+für die Präsentation. Zeigt den Trade-off auf einen Blick; enthält
+experiment_daten.json Verteilungen, markieren Fehlerbalken p5–p95 der Qualität
+und ein × die schlechteste Qualität.
 """
 import matplotlib
 matplotlib.use('Agg')
@@ -19,6 +21,7 @@ LABELS = {
     "Manuelle Prompt-Kompression": "Regelbasiert",
     "Strukturierte Kompression": "Strukturiert",
     "Token-Budget (100 Tokens)": "Token-Budget",
+    "Token-Budget optimal (100 Tokens)": "Token-Budget optimal",
     "Chunking (100 Tokens)": "Chunking",
 }
 COLORS = {
@@ -26,6 +29,7 @@ COLORS = {
     "Regelbasiert": "#2ecc71",
     "Strukturiert": "#3498db",
     "Token-Budget": "#f39c12",
+    "Token-Budget optimal": "#e67e22",
     "Chunking": "#9b59b6",
 }
 
@@ -39,6 +43,11 @@ for key, d in data.items():
     size = max(80, d["kosten_euro_pro_1m"] * 0.8)  # Bubble-Größe ~ Kosten
     ax.scatter(x, y, s=size, c=color, edgecolors="black", linewidths=1.2,
                zorder=5, alpha=0.9)
+    qualitaet = d.get("verteilung", {}).get("qualitaet_prozent")
+    if qualitaet:
+        ax.errorbar(x, y, yerr=[[max(y - qualitaet["p5"], 0)], [max(qualitaet["p95"] - y, 0)]],
+                    fmt="none", ecolor=color, elinewidth=1.5, capsize=4, zorder=4)
+        ax.scatter(x, qualitaet["min"], marker="x", c=color, zorder=4)
     # Label mit Offset
     offset_y = 2.5 if label != "Token-Budget" else -4
     ax.annotate(label, (x, y), textcoords="offset points",
@@ -50,7 +59,9 @@ ax.set_xlabel("Kompressionsrate (×)", fontsize=13, fontweight="bold")
 ax.set_ylabel("Semantische Qualität (%)", fontsize=13, fontweight="bold")
 ax.set_title("Trade-off: Kompressionsrate vs. Qualität", fontsize=15, fontweight="bold")
 ax.set_xlim(0.5, 6.5)
-ax.set_ylim(50, 105)
+untergrenze = min([50] + [d["verteilung"]["qualitaet_prozent"]["min"] - 5
+                           for d in data.values() if "verteilung" in d])
+ax.set_ylim(untergrenze, 105)
 ax.axhline(y=90, color="#27ae60", linestyle="--", alpha=0.4, label="Schwelle: 90 % Qualität")
 ax.legend(fontsize=10, loc="lower left")
 ax.grid(True, alpha=0.3)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsame Einstellungen der Tests.
+- Projektordner importierbar (token_minimierung; tests.hilfen mit Datengeneratoren
+  und Referenz-Implementierungen, die auch die Benchmarks benutzen)
+- Ohne Vorgabe rechnen die Tests mit dem n-Gramm-Embedder (kein Modell-Download);
+  geprüft werden Gleichheiten, die vom Backend nicht abhängen
+- Keine persistenten Caches oder Router-Zustände aus der Umgebung
+"""
+import os
+import sys
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE)
+os.environ.setdefault('EMBEDDING_BACKEND', 'ngram')
+for name in ('EMBEDDING_CACHE_PFAD', 'KOMPRESSIONS_CACHE_PFAD', 'ZELLEN_CACHE_PFAD', 'ROUTER_ZUSTAND_PFAD',
+             'LLM_PREISTABELLE', 'LLM_MODELL'):
+    os.environ.pop(name, None)
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+Datengeneratoren und Referenz-Implementierungen der Tests.
+Die Benchmarks erzeugen ihre Last mit denselben Generatoren und messen gegen
+dieselben Referenzen; sie importieren sie von hier (tests.hilfen).
+"""
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from token_minimierung.auswertung import BASELINE, berechne_kosten
+from token_minimierung.ergebnisspeicher import KENNZAHLEN, ErgebnisSpeicher
+from token_minimierung.experiment import STRATEGIEN, TEST_PROMPTS, ExperimentResult, strategie_funktion
+from token_minimierung.qualitaet import _get_qualitaets_model
+from token_minimierung.regelbasiert import ANREDEN_DE_EN, GRUSSFORMELN_DE_EN, STOPWORDS_DE_EN
+from token_minimierung.segmentierung import saetze_zerlegen
+from token_minimierung.sweep import STANDARD_RAEUME, parameter_sweep
+from token_minimierung.tokenizer import token_anzahl
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def satz_vorlagen():
+    """Alle Sätze der Test-Prompts."""
+    return [s for t in TEST_PROMPTS.values() for s in saetze_zerlegen(t)]
+
+
+# --- Chunking ---
+
+WOERTER = ("Die Lieferung ist angekommen, aber das Produkt fehlt. Bitte prüfen Sie z.B. Nr. 5 "
+           "bzw. den Status! Was ist passiert? The order was shipped on time. Wir haben 89,99 € "
+           "bezahlt und warten seit 3 Wochen.\nNeue Zeile: ORD-2024-001598 (Größe 42).").split(' ')
+
+
+def dokument_erzeugen(ziel_tokens, seed=0):
+    """Absätze aus Sätzen der Test-Prompts mit Nummern, bis etwa ziel_tokens."""
+    rnd = random.Random(seed)
+    vorlagen = [s.rstrip('.!?') for s in satz_vorlagen()]
+    absaetze, tokens = [], 0
+    while tokens < ziel_tokens:
+        absatz = ' '.join(f"{rnd.choice(vorlagen)} (Nr. {rnd.randint(1, 10**6)})."
+                          for _ in range(rnd.randint(2, 8)))
+        absaetze.append(absatz)
+        tokens += token_anzahl(absatz)
+    return '\n\n'.join(absaetze)
+
+
+def text_erzeugen(anzahl_woerter, seed):
+    """Wörter mit Satzzeichen, Abkürzungen, Beträgen und Zeilenumbrüchen in zufälliger Folge."""
+    rnd = random.Random(seed)
+    return ' '.join(rnd.choice(WOERTER) for _ in range(anzahl_woerter))
+
+
+# --- Near-Duplicates, Embeddings ---
+
+def saetze_mit_duplikaten(anzahl, anteil_duplikate=0.3, seed=0):
+    """Neue Sätze aus 8–20 Wörtern der Test-Prompts plus Zahl; ein Teil wiederholt einen früheren leicht verändert."""
+    rnd = random.Random(seed)
+    woerter_alle = sorted({w.strip('.,:;!?()') for t in TEST_PROMPTS.values() for w in t.split()} - {''})
+    saetze = []
+    for _ in range(anzahl):
+        if saetze and rnd.random() < anteil_duplikate:
+            woerter = rnd.choice(saetze).split()
+            art = rnd.randrange(4)
+            if art == 0 and len(woerter) > 3:
+                del woerter[rnd.randrange(len(woerter))]           # Wort fehlt
+            elif art == 1:
+                woerter[-1] = f"({rnd.randint(1, 10**6)})."         # andere Zahl
+            elif art == 2:
+                woerter = [w.upper() if rnd.random() < 0.2 else w for w in woerter]
+            saetze.append(' '.join(woerter))                        # art 3: wörtlich
+        else:
+            saetze.append(' '.join(rnd.choices(woerter_alle, k=rnd.randint(8, 20))) + f" ({rnd.randint(1, 10**6)}).")
+    return saetze
+
+
+def saetze_erzeugen(anzahl, seed=0):
+    """Je zwei Sätze der Test-Prompts plus Zahl (kaum Cache-Treffer)."""
+    rnd = random.Random(seed)
+    vorlagen = satz_vorlagen()
+    return [f"{rnd.choice(vorlagen)} {rnd.choice(vorlagen)} ({rnd.randint(1, 10**6)})" for _ in range(anzahl)]
+
+
+# --- ErgebnisSpeicher, Verteilungen ---
+
+SPALTEN_STRATEGIEN = [BASELINE, 'Manuelle Prompt-Kompression', 'Strukturierte Kompression',
+                      'Token-Budget (100 Tokens)', 'Chunking (100 Tokens)']
+SPALTEN_SZENARIEN = ['email', 'technisch', 'code', 'dokument', 'chat']
+
+
+def _zeilen_kopf(n):
+    return {
+        'strategie': np.array(SPALTEN_STRATEGIEN, dtype=object)[np.arange(n) % len(SPALTEN_STRATEGIEN)],
+        'szenario': np.array(SPALTEN_SZENARIEN, dtype=object)[
+            (np.arange(n) // len(SPALTEN_STRATEGIEN)) % len(SPALTEN_SZENARIEN)],
+    }
+
+
+def spalten_erzeugen(n, seed=0):
+    """Synthetische Ergebniszeilen als Spalten, Strategien und Szenarien im Wechsel."""
+    rng = np.random.default_rng(seed)
+    original = rng.integers(50, 2000, n)
+    komprimiert = (original * rng.uniform(0.2, 1.0, n)).astype(np.int64)
+    return {
+        **_zeilen_kopf(n),
+        'original_tokens': original,
+        'komprimierte_tokens': komprimiert,
+        'latenz_ms': rng.gamma(2.0, 5.0, n),
+        'qualitaets_score': rng.uniform(0.5, 1.0, n),
+        'kosten_euro': komprimiert / 1000 * 0.0015,
+        'kompressionsrate': original / np.maximum(komprimiert, 1),
+    }
+
+
+def spalten_langschwaenzig(n, seed=0):
+    """Wie spalten_erzeugen, mit langschwänziger Latenz (Lognormal) und gelegentlichen Qualitätsausreißern."""
+    rng = np.random.default_rng(seed)
+    original = rng.integers(50, 2000, n)
+    komprimiert = (original * rng.uniform(0.2, 1.0, n)).astype(np.int64)
+    qualitaet = np.where(rng.random(n) < 0.02, rng.uniform(0.2, 0.6, n), rng.uniform(0.8, 1.0, n))
+    return {
+        **_zeilen_kopf(n),
+        'original_tokens': original,
+        'komprimierte_tokens': komprimiert,
+        'latenz_ms': 50 + komprimiert * 2 * rng.lognormal(0, 0.5, n),
+        'qualitaets_score': qualitaet,
+        'kosten_euro': komprimiert / 1000 * 0.00138,
+        'kompressionsrate': original / np.maximum(komprimiert, 1),
+    }
+
+
+def speicher_fuellen(spalten, block=1_000_000):
+    """Blockweise anhängen, wie ein Runner, der Ergebnisse in Stapeln liefert."""
+    speicher = ErgebnisSpeicher()
+    for von in range(0, len(spalten['original_tokens']), block):
+        teil = {k: v[von:von + block] for k, v in spalten.items()}
+        speicher.spalten_anhaengen(teil.pop('strategie'), teil.pop('szenario'), **teil)
+    return speicher
+
+
+def alter_weg(spalten):
+    """
+    Bisheriger Weg: ein ExperimentResult je Zeile, Kosten je Objekt, Mittelwerte
+    über pandas groupby. Liefert die Dauer je Schritt und die Mittelwerte.
+    """
+    import pandas as pd
+    zeiten = {}
+    start = time.perf_counter()
+    ergebnisse = [
+        ExperimentResult(s, o, k, l, q, c, r)
+        for s, o, k, l, q, c, r in zip(spalten['strategie'], spalten['original_tokens'].tolist(),
+                                       spalten['komprimierte_tokens'].tolist(),
+                                       spalten['latenz_ms'].tolist(),
+                                       spalten['qualitaets_score'].tolist(),
+                                       spalten['kosten_euro'].tolist(),
+                                       spalten['kompressionsrate'].tolist())
+    ]
+    zeiten['anhaengen'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for r in ergebnisse:
+        r.kosten_euro = berechne_kosten(r.komprimierte_tokens)
+    zeiten['kosten'] = time.perf_counter() - start
+    start = time.perf_counter()
+    df = pd.DataFrame([{'strategie': r.strategie, **{k: getattr(r, k) for k in KENNZAHLEN}}
+                       for r in ergebnisse])
+    mittel = df.groupby('strategie').mean()
+    zeiten['aggregation'] = time.perf_counter() - start
+    return zeiten, mittel
+
+
+# --- Importzeit ---
+
+# (Import-Anweisung, Budget prüfen? – sonst nur messen)
+IMPORTE = [
+    ("import token_minimierung", True),
+    ("from token_minimierung import kompression_manuell", True),
+    ("import token_minimierung.regelbasiert", True),
+    ("import token_minimierung.strukturiert", False),
+    ("import token_minimierung.auswertung", False),
+]
+SCHWER = ("tiktoken", "numpy", "pandas", "matplotlib", "sentence_transformers", "torch")
+
+
+def importzeit(anweisung):
+    """
+    Importzeit (ms) der Anweisung in einem frischen Interpreter (ohne dessen Start)
+    und die Top-Level-Namen aller laut -X importtime geladenen Module.
+    Die Zeit wird im Prozess gemessen, da -X importtime Importe über
+    importlib.import_module (Lazy-Exporte des Pakets) nicht aufführt.
+    """
+    code = ("import time; _t = time.perf_counter()\n"
+            f"{anweisung}\n"
+            "print((time.perf_counter() - _t) * 1000)")
+    prozess = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE, capture_output=True, text=True, check=True,
+    )
+    module = set()
+    for zeile in prozess.stderr.splitlines():
+        teile = zeile.split("|")
+        if zeile.startswith("import time:") and len(teile) == 3 and teile[1].strip().isdigit():
+            module.add(teile[2].strip().split(".")[0])
+    # Nachträglich geladene Module (importlib.import_module) über sys.modules erfassen
+    nachgeladen = subprocess.run(
+        [sys.executable, "-c", f"{anweisung}\nimport sys; print(' '.join(sys.modules))"],
+        cwd=BASE, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    module.update(name.split(".")[0] for name in nachgeladen)
+    return float(prozess.stdout.strip().splitlines()[-1]), module
+
+
+# --- Instrumentierung ---
+
+STRATEGIEN_ALLE = [s for s in STRATEGIEN if s[1] is not None] + [
+    ("Token-Budget (Relevanz)", "kompression_token_budget", {"ziel_tokens": 100, "relevanz_gewicht": 0.5}),
+    ("Near-Duplicates", "kompression_duplikate", {}),
+]
+
+
+# --- Kompressions-Cache ---
+
+CACHE_STRATEGIE = ("kompression_chunking", {"chunk_groesse": 200, "overlap": 20, "saetze_pro_chunk": 2})
+
+
+def wissensdokument_erzeugen(rnd, vorlagen, absaetze_min=6, absaetze_max=12):
+    """Absätze aus 3–6 nummerierten Sätzen der Vorlagen."""
+    return '\n\n'.join(
+        ' '.join(f"{rnd.choice(vorlagen)} (Nr. {rnd.randint(1, 10**6)})." for _ in range(rnd.randint(3, 6)))
+        for _ in range(rnd.randint(absaetze_min, absaetze_max)))
+
+
+def wissensbasis(seed=0, anzahl=200, system_prompts=5):
+    """anzahl Wissensbasis-Dokumente und system_prompts kurze System-Prompts."""
+    rnd = random.Random(seed)
+    vorlagen = satz_vorlagen()
+    dokumente = [wissensdokument_erzeugen(rnd, vorlagen) for _ in range(anzahl)]
+    system = [wissensdokument_erzeugen(rnd, vorlagen, 1, 2) for _ in range(system_prompts)]
+    return dokumente, system
+
+
+# --- Konversation ---
+
+def turns_erzeugen(anzahl, seed=0):
+    """Turns aus 1–5 Sätzen der Test-Prompts, je mit Nummer (keine wörtlichen Wiederholungen)."""
+    rnd = random.Random(seed)
+    vorlagen = [s.rstrip('.!?') for s in satz_vorlagen()]
+    return [' '.join(f"{rnd.choice(vorlagen)} (Nr. {rnd.randint(1, 10**6)})." for _ in range(rnd.randint(1, 5)))
+            for _ in range(anzahl)]
+
+
+# --- Korpus ---
+
+def korpus_schreiben(verzeichnis, anzahl, seed=0, kaputt=0):
+    """JSONL (Szenario je Zeile), Absatz- und Zeilendatei mit denselben Texten; liefert die Pfade."""
+    rnd = random.Random(seed)
+    vorlagen = {name: [s.rstrip('.!?') for s in saetze_zerlegen(t)] for name, t in TEST_PROMPTS.items()}
+    szenarien = list(vorlagen)
+    pfade = {f: os.path.join(verzeichnis, f"korpus_{seed}.{f}") for f in ('jsonl', 'txt', 'zeilen')}
+    with open(pfade['jsonl'], 'w', encoding='utf-8') as j, open(pfade['txt'], 'w', encoding='utf-8') as a, \
+            open(pfade['zeilen'], 'w', encoding='utf-8') as z:
+        for i in range(anzahl):
+            szenario = szenarien[i % len(szenarien)]
+            text = ' '.join(f"{rnd.choice(vorlagen[szenario])} (Nr. {rnd.randint(1, 10**6)})."
+                            for _ in range(rnd.randint(1, 12)))
+            j.write(json.dumps({"id": f"t{i}", "szenario": szenario, "text": text}, ensure_ascii=False) + "\n")
+            if kaputt and i % kaputt == 0:
+                j.write('{"id": "kaputt", "text": \n')
+            # Absätze über mehrere Zeilen, teils mit mehreren Leerzeilen dazwischen
+            a.write(text.replace('. ', '.\n', 1) + "\n\n" + ("\n" if i % 5 == 0 else ""))
+            z.write(text + "\n")
+    return pfade
+
+
+# --- Qualitätsbewertung ---
+
+def bewertung_einzeln(original, komprimiert):
+    """Bisherige Bewertung: Original und Fassung in zwei Modellaufrufen."""
+    if not original.strip() or not komprimiert.strip():
+        return 0.0
+    model = _get_qualitaets_model()
+    v_orig = model.encode(original.strip(), normalize_embeddings=True)
+    v_comp = model.encode(komprimiert.strip(), normalize_embeddings=True)
+    v_orig = v_orig / (np.linalg.norm(v_orig) + 1e-9)
+    v_comp = v_comp / (np.linalg.norm(v_comp) + 1e-9)
+    return max(0.0, min(1.0, float(np.dot(v_orig, v_comp))))
+
+
+def sweep_paare():
+    """(Original, Ausgabe) je Sweep-Zelle; Ausgaben wiederholen sich wie im echten Sweep."""
+    ergebnis = parameter_sweep(TEST_PROMPTS, fortschritt=False)
+    funktionen = {r[0]: r[1] for r in STANDARD_RAEUME}
+    return [(TEST_PROMPTS[p.szenario], strategie_funktion(funktionen[p.strategie], p.parameter)(
+        TEST_PROMPTS[p.szenario])) for p in ergebnis.punkte]
+
+
+# --- Regelbasierte Kompression ---
+
+FLOSKEL_ANFANG = re.compile(r'^(' + '|'.join(ANREDEN_DE_EN) + r')\s*', re.IGNORECASE)
+FLOSKEL_ENDE = re.compile(r'\s*(' + '|'.join(GRUSSFORMELN_DE_EN) + r')\s*[.\s]*$', re.IGNORECASE)
+REDUNDANTE_LEERZEICHEN = re.compile(r'[ \t]+')
+
+
+def regelbasiert_referenz(prompt, stopwords_entfernen=True):
+    """Bisherige Implementierung von kompression_manuell (Stand vor dem kompilierten Regelsatz)."""
+    if not prompt or not prompt.strip():
+        return prompt
+    text = prompt.strip()
+    text = FLOSKEL_ANFANG.sub('', text)
+    text = FLOSKEL_ENDE.sub('', text)
+    text = REDUNDANTE_LEERZEICHEN.sub(' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text).strip()
+    if not stopwords_entfernen:
+        return text
+    woerter = text.split()
+    gefiltert = []
+    for w in woerter:
+        w_norm = w.lower().strip('.,;:!?()"\'-')
+        if w_norm and w_norm not in STOPWORDS_DE_EN:
+            gefiltert.append(w)
+        elif w_norm in STOPWORDS_DE_EN and len(woerter) > 30:
+            continue
+        else:
+            gefiltert.append(w)
+    return ' '.join(gefiltert)
+
+
+# --- Strukturierte Kompression ---
+
+def prompts_erzeugen(test_prompts, anzahl, seed=42):
+    """Variiert die Test-Prompts (Satzreihenfolge, Zahlen), damit kein Prompt doppelt ist."""
+    rnd = random.Random(seed)
+    vorlagen = [saetze_zerlegen(t) for t in test_prompts.values()]
+    prompts = []
+    for i in range(anzahl):
+        saetze = list(rnd.choice(vorlagen))
+        rnd.shuffle(saetze)
+        prompts.append('. '.join(saetze) + f'. Ticket {i}.')
+    return prompts
+
+
+# --- Token-Zählung ---
+
+def texte_erzeugen(anzahl, seed=0, max_saetze=12):
+    """Neue Texte aus 1..max_saetze zufälligen Sätzen der Test-Prompts, mit Zahlen (keine Cache-Treffer)."""
+    rnd = random.Random(seed)
+    vorlagen = satz_vorlagen()
+    return [' '.join(f"{rnd.choice(vorlagen)} ({rnd.randint(1, 10**6)})"
+                     for _ in range(rnd.randint(1, max_saetze))) for _ in range(anzahl)]
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Chunking: Streaming wie kompression_chunking, satzausgerichtete Chunks im Worker-Pool."""
+import io
+
+import pytest
+
+from tests.hilfen import dokument_erzeugen, text_erzeugen
+from token_minimierung.chunking import (_chunk_bereiche, _segment_analysieren, _segment_grenzen,
+                                        kompression_chunking, kompression_chunking_saetze,
+                                        kompression_chunking_stream)
+from token_minimierung.dokument import dokument_analysieren
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.segmentierung import saetze_zerlegen
+
+STREAM_PARAMETER = [(100, 20, 3), (37, 5, 2), (64, 16, 1)]
+PARAMETER = dict(chunk_groesse=200, overlap=40, saetze_pro_chunk=3)
+
+
+def _stream_texte():
+    return list(TEST_PROMPTS.values()) + [text_erzeugen(n, seed) for seed, n in enumerate([3, 40, 400, 3000])]
+
+
+@pytest.mark.parametrize('block', [7, 100, 4096])
+@pytest.mark.parametrize('groesse, overlap, saetze', STREAM_PARAMETER)
+def test_stream_wie_kompression_chunking(groesse, overlap, saetze, block):
+    for text in _stream_texte():
+        teile = list(kompression_chunking_stream(io.StringIO(text), groesse, overlap, saetze,
+                                                 kopfzeile=False, block_zeichen=block))
+        if len(teile) == 1 and teile[0] == text:
+            ergebnis = text
+        else:
+            ergebnis = '\n\n'.join(f"[Abschnitt {i+1}/{len(teile)}] {t}" for i, t in enumerate(teile))
+        assert ergebnis == kompression_chunking(text, groesse, overlap, saetze)
+
+
+def _aus_ganzen_saetzen(darstellung, saetze):
+    """True, wenn darstellung eine Auswahl der saetze (in Reihenfolge, durch Leerzeichen verbunden) ist."""
+    pos = 0
+    for satz in saetze:
+        if darstellung.startswith(satz, pos) and darstellung[pos + len(satz):pos + len(satz) + 1] in ('', ' '):
+            pos += len(satz) + 1
+    return pos >= len(darstellung)
+
+
+@pytest.fixture(scope='module')
+def dokument():
+    text = dokument_erzeugen(20_000, seed=1)
+    segment_zeichen = len(text) // 16  # viele Segmente auch bei kleinem Text
+    grenzen = _segment_grenzen(text, segment_zeichen)
+    analysen = [_segment_analysieren(text[a:b], b == len(text)) for a, b in zip(grenzen, grenzen[1:])]
+    saetze = [s for satz_liste, _ in analysen for s in satz_liste]
+    laengen = [n for _, laengen_liste in analysen for n in laengen_liste]
+    return text, segment_zeichen, len(grenzen) - 1, saetze, laengen
+
+
+def test_segmente_ergeben_die_saetze_des_ganzen_texts(dokument):
+    text, _, segmente, saetze, _ = dokument
+    assert segmente >= 15
+    assert saetze == saetze_zerlegen(text)
+
+
+def test_chunk_bereiche_an_satzgrenzen_im_toleranzfenster(dokument):
+    _, _, _, saetze, laengen = dokument
+    bereiche = _chunk_bereiche(laengen, PARAMETER['chunk_groesse'], PARAMETER['overlap'], 0.25)
+    assert bereiche[0][0] == 0 and bereiche[-1][1] == len(saetze)
+    for (a, b), (c, d) in zip(bereiche, bereiche[1:]):
+        assert a < c <= b < d  # Überlappung höchstens bis zum Ende, stets Fortschritt
+    for a, b in bereiche[:-1]:
+        summen = [sum(laengen[a:e]) for e in range(a + 1, len(saetze) + 1)]
+        im_fenster = [s for s in summen if 150 <= s <= 250]
+        # außerhalb des Fensters nur, wenn dort keine Satzgrenze liegt
+        assert 150 <= sum(laengen[a:b]) <= 250 or not im_fenster or b - a == 1, sum(laengen[a:b])
+
+
+@pytest.mark.parametrize('auswahl', ['rand', 'centrality'])
+def test_saetze_gleich_fuer_alle_modi(dokument, auswahl):
+    text, segment_zeichen, _, saetze, laengen = dokument
+    erwartet = kompression_chunking_saetze(text, auswahl=auswahl, modus='seriell',
+                                           segment_zeichen=segment_zeichen, **PARAMETER)
+    for modus, worker in (('threads', 2), ('threads', 4), ('prozesse', 2), ('prozesse', 3)):
+        assert kompression_chunking_saetze(text, auswahl=auswahl, modus=modus, worker=worker,
+                                           segment_zeichen=segment_zeichen, **PARAMETER) == erwartet, (modus, worker)
+    bereiche = _chunk_bereiche(laengen, PARAMETER['chunk_groesse'], PARAMETER['overlap'], 0.25)
+    abschnitte = erwartet.split('\n\n')
+    assert len(abschnitte) == len(bereiche)
+    for abschnitt, (a, b) in zip(abschnitte, bereiche):
+        assert _aus_ganzen_saetzen(abschnitt.split('] ', 1)[1], saetze[a:b]), abschnitt
+
+
+def test_saetze_kurzer_prompt_unveraendert():
+    kurz = TEST_PROMPTS['kundensupport']
+    assert kompression_chunking_saetze(kurz, chunk_groesse=10_000) == kurz
+
+
+def test_segment_laengen_wie_ganzer_text(dokument):
+    text, _, _, saetze, laengen = dokument
+    doc = dokument_analysieren(text)
+    assert doc.saetze == saetze
+    assert laengen == doc.satz_token_laengen.tolist()
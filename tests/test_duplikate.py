@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Near-Duplicates: MinHash/LSH gegen die exakte paarweise Jaccard-Berechnung."""
+import numpy as np
+import pytest
+
+from tests.hilfen import saetze_mit_duplikaten
+from token_minimierung.deduplizierung import duplikate_finden, kompression_duplikate
+from token_minimierung.dokument import dokument_analysieren
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.segmentierung import saetze_zerlegen
+
+RAND = 0.05
+
+
+def _shingles(satz, k=5):
+    t = (' ' + satz.lower() + ' ').ljust(k)
+    return {t[i:i + k] for i in range(len(t) - k + 1)}
+
+
+def max_jaccard(saetze):
+    """Referenz: je Satz die größte Jaccard-Ähnlichkeit zu einem früheren Satz (alle Paare)."""
+    mengen = [_shingles(s) for s in saetze]
+    ergebnis = np.zeros(len(saetze))
+    for i, a in enumerate(mengen):
+        ergebnis[i] = max((len(a & b) / len(a | b) for b in mengen[:i]), default=0.0)
+    return ergebnis
+
+
+@pytest.fixture(scope='module')
+def saetze_und_jaccard():
+    saetze = saetze_mit_duplikaten(1_000, seed=1)
+    return saetze, max_jaccard(saetze)
+
+
+@pytest.mark.parametrize('schwelle', [0.5, 0.7, 0.8, 0.9])
+def test_wie_exakte_jaccard(saetze_und_jaccard, schwelle):
+    saetze, jaccard = saetze_und_jaccard
+    falsch = duplikate_finden(saetze, schwelle) != (jaccard >= schwelle)
+    # Schätzfehler nahe der Schwelle sind bei MinHash zu erwarten, deutlich daneben kaum
+    deutlich = int((falsch & (np.abs(jaccard - schwelle) > RAND)).sum())
+    assert deutlich <= 0.005 * len(saetze)
+
+
+def test_reihenfolge_und_erstes_vorkommen(saetze_und_jaccard):
+    text = ' '.join(saetze_und_jaccard[0][:300])
+    ausgabe = kompression_duplikate(text)
+    behalten = [s for s, d in zip(saetze_zerlegen(text), duplikate_finden(saetze_zerlegen(text))) if not d]
+    assert saetze_zerlegen(ausgabe) == behalten  # Reihenfolge, erstes Vorkommen, Satzgrenzen
+    assert ausgabe.endswith('.')
+    assert kompression_duplikate(dokument_analysieren(text)) == ausgabe
+
+
+def test_prompts_ohne_duplikate_unveraendert():
+    for prompt in TEST_PROMPTS.values():
+        assert kompression_duplikate(prompt) == prompt
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Embedding-Backends und Embedding-Dienst."""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from tests.hilfen import saetze_erzeugen
+from token_minimierung.embedder import NgramEmbedder
+from token_minimierung.embedding import EmbeddingDienst, _DiskSpeicher
+
+
+def test_ngram_deterministisch():
+    texte = saetze_erzeugen(600, seed=3)
+    a = NgramEmbedder().encode(texte)
+    assert np.array_equal(NgramEmbedder().encode(texte), a)
+    assert np.array_equal(NgramEmbedder(block=37).encode(texte), a)
+    assert np.array_equal(NgramEmbedder().encode(texte[5]), a[5])
+    assert np.allclose(np.linalg.norm(a, axis=1), 1.0, atol=1e-5)
+
+
+def _vektoren(n, dim=8, seed=0):
+    return {f'k{i}': v for i, v in enumerate(np.random.default_rng(seed).random((n, dim), dtype=np.float32))}
+
+
+def test_disk_speicher_zwischen_instanzen(tmp_path):
+    a = _DiskSpeicher.oeffnen(str(tmp_path), 'm', 8, 100)
+    b = _DiskSpeicher.oeffnen(str(tmp_path), 'm', None, 100)
+    eintraege = _vektoren(10)
+    a.speichern(eintraege)
+    gefunden = b.holen(list(eintraege) + ['fehlt'])  # b liest die angehängten Journalzeilen nach
+    assert set(gefunden) == set(eintraege)
+    assert all(np.array_equal(gefunden[k], v) for k, v in eintraege.items())
+    assert len(_DiskSpeicher.oeffnen(str(tmp_path), 'm', None, 100)) == 10
+
+
+def test_disk_speicher_verdraengt_am_laengsten_ungenutzte(tmp_path):
+    speicher = _DiskSpeicher.oeffnen(str(tmp_path), 'm', 8, 4)
+    eintraege = _vektoren(6)
+    speicher.speichern({k: eintraege[k] for k in ('k0', 'k1', 'k2', 'k3')})
+    speicher.holen(['k0'])  # k0 zuletzt benutzt
+    speicher.speichern({k: eintraege[k] for k in ('k4', 'k5')})
+    assert set(speicher.holen(list(eintraege))) == {'k0', 'k3', 'k4', 'k5'}
+    neu = _DiskSpeicher.oeffnen(str(tmp_path), 'm', None, 4)
+    gefunden = neu.holen(list(eintraege))
+    assert set(gefunden) == {'k0', 'k3', 'k4', 'k5'}
+    assert all(np.array_equal(gefunden[k], eintraege[k]) for k in gefunden)
+
+
+def test_disk_speicher_journal_verdichtet(tmp_path):
+    speicher = _DiskSpeicher.oeffnen(str(tmp_path), 'm', 8, 8)
+    eintraege = _vektoren(3000)
+    for i in range(0, 3000, 4):  # viele Verdrängungen: Journal wächst über die Schwelle
+        speicher.speichern({k: eintraege[k] for k in list(eintraege)[i:i + 4]})
+    assert speicher._journal_zeilen <= 4 * len(speicher) + 1024
+    with open(speicher._journal_pfad, encoding='utf-8') as f:
+        assert sum(1 for _ in f) == speicher._journal_zeilen
+    neu = _DiskSpeicher.oeffnen(str(tmp_path), 'm', None, 8)
+    erwartet = list(eintraege)[-8:]
+    gefunden = neu.holen(list(eintraege))
+    assert set(gefunden) == set(erwartet)
+    assert all(np.array_equal(gefunden[k], eintraege[k]) for k in erwartet)
+
+
+def test_disk_speicher_uebernimmt_json_index(tmp_path):
+    speicher = _DiskSpeicher.oeffnen(str(tmp_path), 'm', 8, 4)
+    eintraege = _vektoren(2)
+    speicher._matrix[[2, 0]] = np.stack([eintraege['k0'], eintraege['k1']])
+    speicher._matrix.flush()
+    with open(os.path.join(speicher.pfad, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({'k0': [2, 5.0], 'k1': [0, 3.0]}, f)
+    neu = _DiskSpeicher(speicher.pfad, 'm', 8, 4)
+    assert list(neu._index) == ['k1', 'k0'] and neu._frei == {1} and neu._hoch == 3
+    assert np.array_equal(neu.holen(['k0'])['k0'], eintraege['k0'])
+    assert not os.path.exists(os.path.join(speicher.pfad, 'index.json'))
+
+
+def test_dienst_mit_festplatten_cache(tmp_path):
+    texte = saetze_erzeugen(50, seed=4)
+    erster = EmbeddingDienst(speicher_pfad=str(tmp_path), backend='ngram')
+    erwartet = erster.encode(texte)
+    zweiter = EmbeddingDienst(speicher_pfad=str(tmp_path), backend='ngram')
+    assert np.allclose(zweiter.encode(texte), erwartet)
+    assert zweiter.fehlschlaege == 0 and zweiter.disk_treffer == len(set(texte))
+
+
+def test_dienst_parallel_mit_kleinem_lru(tmp_path):
+    texte = saetze_erzeugen(400, seed=5)
+    erwartet = EmbeddingDienst(backend='ngram').encode(texte)
+    dienst = EmbeddingDienst(backend='ngram', max_eintraege=16, speicher_pfad=str(tmp_path))
+
+    def laufen(versatz):
+        reihenfolge = texte[versatz:] + texte[:versatz]
+        return [dienst.encode(reihenfolge[i:i + 7]) for i in range(0, len(reihenfolge), 7)], versatz
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for bloecke, versatz in pool.map(laufen, range(0, 400, 25)):
+            assert np.allclose(np.concatenate(bloecke), np.roll(erwartet, -versatz, axis=0), atol=1e-6)
+    assert len(dienst._lru) <= 16
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""ErgebnisSpeicher: Mittelwerte und Kosten wie der bisherige Weg über pandas groupby."""
+import numpy as np
+
+from tests.hilfen import SPALTEN_STRATEGIEN, SPALTEN_SZENARIEN, alter_weg, spalten_erzeugen, speicher_fuellen
+from token_minimierung.auswertung import PREIS_PRO_1K_TOKENS
+from token_minimierung.ergebnisspeicher import KENNZAHLEN
+
+
+def test_mittelwerte_und_kosten_wie_pandas():
+    spalten = spalten_erzeugen(50_000, seed=1)
+    speicher = speicher_fuellen(spalten)
+    speicher.kosten_neu_berechnen(PREIS_PRO_1K_TOKENS)
+    namen, mittel = speicher.mittelwerte('strategie')
+    _, referenz = alter_weg(spalten)
+    assert namen == list(referenz.index)
+    for name in KENNZAHLEN:
+        assert np.allclose(mittel[name], referenz[name].values, rtol=1e-12), name
+    n = len(SPALTEN_SZENARIEN) * len(SPALTEN_STRATEGIEN)
+    assert [r.szenario for r in list(speicher.zeilen())[:n]] == list(spalten['szenario'][:n])
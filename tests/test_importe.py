@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Import-Budget: der regelbasierte Kompressor zieht keine schweren Abhängigkeiten."""
+import pytest
+
+from tests.hilfen import IMPORTE, SCHWER, importzeit
+
+
+@pytest.mark.parametrize('anweisung', [a for a, pruefen in IMPORTE if pruefen])
+def test_keine_schweren_module(anweisung):
+    _, module = importzeit(anweisung)
+    assert not set(SCHWER) & module
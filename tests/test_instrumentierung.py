@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Instrumentierung: HdrHistogramm gegen exakte Perzentile, Exporte, Ergebnisse unverändert."""
+import json
+import math
+import random
+import re
+
+from tests.hilfen import STRATEGIEN_ALLE
+from token_minimierung import instrumentierung
+from token_minimierung.experiment import TEST_PROMPTS, strategie_funktion
+from token_minimierung.instrumentierung import HdrHistogramm, get_instrumentierung
+
+_ZEILE = re.compile(r'^[a-z_]+(\{([a-z]+="([^"\\]|\\.)*",?)+\})? [0-9.e+-]+$')
+
+
+def test_histogramm_perzentile_und_zusammenfuehren():
+    rnd = random.Random(0)
+    werte = [int(rnd.lognormvariate(12, 2)) for _ in range(200_000)]
+    h, a, b = HdrHistogramm(), HdrHistogramm(), HdrHistogramm()
+    for i, w in enumerate(werte):
+        h.beobachten(w)
+        (a if i % 2 else b).beobachten(w)
+    a.zusammenfuehren(b)
+    assert a.buckets == h.buckets
+    assert (a.anzahl, a.summe, a.minimum, a.maximum) == (h.anzahl, h.summe, h.minimum, h.maximum)
+    werte.sort()
+    for q in instrumentierung.QUANTILE:
+        exakt = werte[math.ceil(q * len(werte)) - 1]
+        assert abs(h.perzentil(q) - exakt) / exakt <= 0.01, q
+
+
+def test_ergebnisse_mit_und_ohne_instrumentierung_gleich():
+    vorher = instrumentierung.aktivieren(False)
+    try:
+        ohne = {(name, s): strategie_funktion(f, kw)(text) for name, text in TEST_PROMPTS.items()
+                for s, f, kw in STRATEGIEN_ALLE}
+        instrumentierung.aktivieren(True)
+        get_instrumentierung().zuruecksetzen()
+        mit = {(name, s): strategie_funktion(f, kw)(text) for name, text in TEST_PROMPTS.items()
+               for s, f, kw in STRATEGIEN_ALLE}
+        assert mit == ohne
+        text = get_instrumentierung().prometheus()
+        assert all(z.startswith('# TYPE') or _ZEILE.match(z) for z in text.splitlines()), text
+        daten = json.loads(get_instrumentierung().als_json())
+        stufen = {pfad.rsplit('/', 1)[-1] for pfad in daten['stufen']}
+        assert {'tokenisierung', 'segmentierung', 'embedding', 'centrality', 'scoring', 'auswahl', 'dekodierung',
+                'regeln', 'minhash', 'lsh'} <= stufen, stufen
+    finally:
+        instrumentierung.aktivieren(vorher)
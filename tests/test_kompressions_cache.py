@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Kompressions-Cache: Ergebnisse wie der direkte Aufruf, Grenzen der Stufen, Dienst mit Cache."""
+import asyncio
+import json
+import time
+
+import pytest
+
+from tests.hilfen import CACHE_STRATEGIE, wissensbasis
+from token_minimierung.experiment import TEST_PROMPTS, strategie_funktion
+from token_minimierung.kompressions_cache import KompressionsCache, absaetze
+from token_minimierung.kompressionsdienst import Kompressionsdienst
+
+STRATEGIEN = [
+    ("kompression_manuell", {"stopwords_entfernen": True}),
+    ("kompression_chunking", {"chunk_groesse": 100, "overlap": 20}),
+    ("kompression_token_budget", {"ziel_tokens": 100}),
+    ("kompression_duplikate", {}),
+]
+
+
+@pytest.fixture(scope='module')
+def dokumente():
+    return wissensbasis()[0]
+
+
+@pytest.mark.parametrize('funktionsname, parameter', STRATEGIEN)
+def test_wie_direkter_aufruf(dokumente, funktionsname, parameter, tmp_path):
+    texte = dokumente[:20] + list(TEST_PROMPTS.values())
+    direkt = strategie_funktion(funktionsname, parameter)
+    erwartet = [direkt(t) for t in texte]
+    cache = KompressionsCache(speicher_pfad=str(tmp_path))
+    assert [cache.komprimieren(t, funktionsname, parameter) for t in texte] == erwartet  # kalt
+    assert [cache.komprimieren(t, funktionsname, parameter) for t in texte] == erwartet  # warm
+    neu = KompressionsCache(speicher_pfad=str(tmp_path))
+    assert [neu.komprimieren(t, funktionsname, parameter) for t in texte] == erwartet
+    assert neu.statistik()['disk_treffer'] == len(set(texte))
+    je_absatz = ['\n\n'.join(direkt(a) for a in absaetze(t)) if len(absaetze(t)) > 1 else direkt(t)
+                 for t in texte]
+    assert [cache.komprimieren(t, funktionsname, parameter, abschnitte=True) for t in texte] == je_absatz
+
+
+def test_ttl(dokumente):
+    funktionsname, parameter = CACHE_STRATEGIE
+    cache = KompressionsCache(ttl_s=0.05, tokens_zaehlen=False)
+    cache.komprimieren(dokumente[0], funktionsname, parameter)
+    time.sleep(0.1)
+    cache.komprimieren(dokumente[0], funktionsname, parameter)
+    assert cache.statistik()['abgelaufen'] == 1 and cache.statistik()['fehlschlaege'] == 2
+
+
+def test_byte_grenze_der_speicherstufe(dokumente):
+    funktionsname, parameter = CACHE_STRATEGIE
+    cache = KompressionsCache(max_bytes=20_000, tokens_zaehlen=False)
+    for t in dokumente[:50]:
+        cache.komprimieren(t, funktionsname, parameter)
+    s = cache.statistik()
+    assert s['bytes_speicher'] <= 20_000 and s['verdraengt'] > 0
+
+
+def test_kapazitaet_der_festplattenstufe(dokumente, tmp_path):
+    funktionsname, parameter = CACHE_STRATEGIE
+    cache = KompressionsCache(speicher_pfad=str(tmp_path), max_disk_eintraege=30, tokens_zaehlen=False)
+    for t in dokumente[:100]:
+        cache.komprimieren(t, funktionsname, parameter)
+    assert len(KompressionsCache(speicher_pfad=str(tmp_path))._disk) <= 30
+
+
+async def _antwort_lesen(reader) -> bytes:
+    await reader.readline()
+    laenge = 0
+    while True:
+        zeile = await reader.readline()
+        if zeile in (b"\r\n", b""):
+            break
+        if zeile.lower().startswith(b"content-length:"):
+            laenge = int(zeile.split(b":")[1])
+    return await reader.readexactly(laenge)
+
+
+async def _dienst_mit_cache(texte):
+    dienst = Kompressionsdienst(vorwaermen=False, cache=KompressionsCache())
+    server = await dienst.start_tcp('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    gecacht = []
+    try:
+        for text in texte + texte:
+            koerper = json.dumps({"strategie": "chunking", "prompt": text}).encode()
+            writer.write(b"POST /komprimieren HTTP/1.1\r\nContent-Length: " + str(len(koerper)).encode()
+                         + b"\r\n\r\n" + koerper)
+            await writer.drain()
+            gecacht.append(json.loads(await _antwort_lesen(reader))['gecacht'])
+        writer.write(b"GET /metrics HTTP/1.1\r\n\r\n")
+        await writer.drain()
+        metriken = (await _antwort_lesen(reader)).decode()
+    finally:
+        writer.close()
+        server.close()
+        await dienst.schliessen()
+    return gecacht, metriken
+
+
+def test_dienst_mit_cache(dokumente):
+    gecacht, metriken = asyncio.run(_dienst_mit_cache(dokumente[:5]))
+    assert gecacht == [False] * 5 + [True] * 5
+    assert 'kompression_cache_anfragen_total{ergebnis="treffer"} 5' in metriken
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Kompressionsdienst: HTTP-Kopf, Körpergrenze und Parameterprüfung."""
+import asyncio
+import json
+
+import pytest
+
+from token_minimierung import kompressionsdienst
+from token_minimierung.kompressionsdienst import Kompressionsdienst, UngueltigeAnfrage, anfrage_pruefen
+
+
+async def _antwort_lesen(reader):
+    """(Status, Kopfzeilen, Körper) einer HTTP-Antwort."""
+    status = int((await reader.readline()).split()[1])
+    kopf = {}
+    while True:
+        zeile = await reader.readline()
+        if zeile in (b"\r\n", b""):
+            break
+        name, _, wert = zeile.decode('latin-1').partition(':')
+        kopf[name.strip().lower()] = wert.strip()
+    return status, kopf, await reader.readexactly(int(kopf.get('content-length', 0)))
+
+
+async def _senden(anfragen):
+    """Schickt die Rohanfragen nacheinander über eine Verbindung; Antworten bis zum Verbindungsende."""
+    dienst = Kompressionsdienst(vorwaermen=False)
+    server = await dienst.start_tcp('127.0.0.1', 0)
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+    antworten = []
+    try:
+        for anfrage in anfragen:
+            writer.write(anfrage)
+            await writer.drain()
+            antworten.append(await _antwort_lesen(reader))
+            if antworten[-1][1].get('connection') == 'close':
+                assert await reader.read() == b''  # Dienst hat die Verbindung geschlossen
+                break
+    finally:
+        writer.close()
+        server.close()
+        await dienst.schliessen()
+    return antworten
+
+
+def _post(koerper: bytes, laenge=None) -> bytes:
+    laenge = str(len(koerper)) if laenge is None else laenge
+    return f"POST /komprimieren HTTP/1.1\r\nContent-Length: {laenge}\r\n\r\n".encode() + koerper
+
+
+def _json(daten) -> bytes:
+    return json.dumps(daten).encode()
+
+
+@pytest.mark.parametrize('laenge', ['abc', '-5', '1e3', '²'])
+def test_ungueltiger_content_length(laenge):
+    (status, kopf, inhalt), = asyncio.run(_senden([_post(b'{}', laenge)]))
+    assert status == 400 and kopf['connection'] == 'close'
+    assert 'Content-Length' in json.loads(inhalt)['fehler']
+
+
+def test_zu_grosser_koerper_ungelesen(monkeypatch):
+    monkeypatch.setattr(kompressionsdienst, 'MAX_KOERPER_BYTES', 100)
+    # Nur ein Teil des angekündigten Körpers wird gesendet: die Antwort kommt trotzdem sofort
+    (status, kopf, _), = asyncio.run(_senden([_post(b'x' * 10, laenge='1000000')]))
+    assert status == 413 and kopf['connection'] == 'close'
+
+
+@pytest.mark.parametrize('parameter', [
+    {'chunk_groesse': 'abc'}, {'chunk_groesse': 1.5}, {'overlap': True}, {'overlap': None},
+])
+def test_falscher_parametertyp(parameter):
+    with pytest.raises(UngueltigeAnfrage):
+        anfrage_pruefen({'strategie': 'chunking', 'prompt': 'Text.', 'parameter': parameter})
+
+
+def test_parameterwerte_ergeben_400():
+    anfragen = [
+        _json({'strategie': 'chunking', 'prompt': 'Ein Satz. Noch einer.', 'parameter': {'chunk_groesse': 'abc'}}),
+        _json({'strategie': 'token_budget', 'prompt': 'Ein Satz.', 'parameter': {'relevanz_gewicht': 'hoch'}}),
+        _json({'strategie': 'manuell', 'prompt': 'Ein Satz.', 'parameter': {'regelsatz': 42}}),
+        _json({'strategie': 'chunking', 'prompt': 'Ein Satz. Noch einer.', 'parameter': {'chunk_groesse': 50}}),
+        # Werte, mit denen das Chunking nicht vorankäme
+        _json({'strategie': 'chunking', 'prompt': 'Ein Satz. Noch einer.',
+               'parameter': {'chunk_groesse': 20, 'overlap': 20}}),
+        _json({'strategie': 'chunking', 'prompt': 'Ein Satz. Noch einer.',
+               'parameter': {'chunk_groesse': 20, 'overlap': 30}}),
+        _json({'strategie': 'chunking', 'prompt': 'Ein Satz. Noch einer.',
+               'parameter': {'chunk_groesse': 0, 'overlap': -5}}),
+        _json({'strategie': 'chunking', 'prompt': 'Ein Satz. Noch einer.', 'parameter': {'overlap': -1}}),
+        # Aufwand der Deduplizierung begrenzt
+        _json({'strategie': 'duplikate', 'prompt': 'Ein Satz. Ein Satz. Noch einer.',
+               'parameter': {'permutationen': 10**9}}),
+        _json({'strategie': 'duplikate', 'prompt': 'Ein Satz. Ein Satz. Noch einer.',
+               'parameter': {'shingle': 10**9}}),
+        _json({'strategie': 'duplikate', 'prompt': 'Ein Satz. Ein Satz. Noch einer.', 'parameter': {'shingle': 0}}),
+    ]
+    antworten = asyncio.run(_senden([_post(k) for k in anfragen]))
+    assert [status for status, _, _ in antworten] == [400, 400, 400, 200] + [400] * 7
+    assert all(kopf['connection'] == 'keep-alive' for _, kopf, _ in antworten)
+
+
+def test_float_parameter_nimmt_ganzzahl():
+    assert anfrage_pruefen({'strategie': 'strukturiert', 'prompt': 'Text.',
+                            'parameter': {'ziel_anteil': 1}})[2] == {'ziel_anteil': 1}
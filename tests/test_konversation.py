@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Konversation: inkrementelle Auswahl wie eine Neuberechnung über den ganzen Verlauf."""
+import json
+
+from tests.hilfen import turns_erzeugen
+from token_minimierung.konversation import Konversation
+from token_minimierung.segmentierung import saetze_zerlegen
+from token_minimierung.strukturiert import _auswahl_nach_centrality, _centrality_scores, _get_embedding_model
+from token_minimierung.tokenizer import token_anzahlen
+
+TURNS = 40
+
+
+def neu_berechnet(saetze, ziel_anteil=0.45, min_saetze=2):
+    """Referenz: Auswahl über alle Sätze des Verlaufs, alles neu gerechnet."""
+    if len(saetze) <= min_saetze:
+        return ' '.join(saetze)
+    laengen = token_anzahlen(saetze)
+    scores = _centrality_scores(_get_embedding_model().encode(saetze))
+    ziel = max(50, int(sum(laengen) * ziel_anteil))
+    return _auswahl_nach_centrality(saetze, scores, ziel, min_saetze, token_laengen=laengen)
+
+
+def test_jeder_turn_wie_neuberechnung_auch_nach_zustand():
+    k = Konversation()
+    saetze = []
+    for i, t in enumerate(turns_erzeugen(TURNS, seed=1)):
+        k.anhaengen(t, 'user' if i % 2 == 0 else 'assistant')
+        saetze.extend(s for s in saetze_zerlegen(t) if s)
+        assert k.saetze == saetze and k.turn_saetze(i) == [s for s in saetze_zerlegen(t) if s]
+        assert k.komprimiert() == neu_berechnet(saetze), i
+        if i == TURNS // 2:
+            k = Konversation.aus_zustand(json.loads(json.dumps(k.zustand())))
+
+
+def test_festes_budget():
+    budget = Konversation(ziel_tokens=120)
+    for t in turns_erzeugen(TURNS, seed=1):
+        budget.anhaengen(t)
+    assert budget.token_gesamt == sum(token_anzahlen(budget.saetze))
+    auswahl = budget.auswahl().tolist()
+    assert sum(token_anzahlen([budget.saetze[i] for i in auswahl])) + len(auswahl) <= 120 or len(auswahl) == 2
+
+
+def test_leerer_zustand():
+    leer = Konversation.aus_zustand(Konversation().zustand())
+    leer.anhaengen(turns_erzeugen(1, seed=1)[0])
+    assert leer.komprimiert() == neu_berechnet(leer.saetze)
+
+
+def test_gleicher_score_frueherer_satz_zuerst():
+    k = Konversation(ziel_tokens=1, min_saetze=3)  # genau min_saetze Sätze
+    turn = turns_erzeugen(1, seed=2)[0]
+    for _ in range(50):
+        k.anhaengen(turn)  # jeder Satz 50-mal, mit gleichem Score
+    n = len(k.saetze) // 50
+    bester = int(k.scores()[:n].argmax())
+    assert k.auswahl().tolist() == [bester, bester + n, bester + 2 * n]  # die ersten Kopien
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Korpus-Lader: Shards, Stichproben, Buckets; korpus_ausfuehren wie der ErgebnisSpeicher."""
+import pytest
+
+from tests.hilfen import korpus_schreiben
+from token_minimierung.ergebnisspeicher import ErgebnisSpeicher
+from token_minimierung.experiment import STRATEGIEN, TEST_PROMPTS
+from token_minimierung.korpus import Korpus, korpus_ausfuehren, laengen_bucket
+from token_minimierung.runner import experimente_ausfuehren
+from token_minimierung.tokenizer import token_anzahl
+
+STRATEGIEN_KLEIN = [s for s in STRATEGIEN if s[1] in (None, "kompression_manuell", "kompression_chunking")]
+JE_SZENARIO = 12
+
+
+def _ids(korpus):
+    return [d.id for d in korpus]
+
+
+@pytest.fixture(scope='module')
+def pfade(tmp_path_factory):
+    return korpus_schreiben(str(tmp_path_factory.mktemp('korpus')), 2_000, kaputt=97)
+
+
+def test_shards_vollstaendig_und_disjunkt(pfade):
+    texte = None
+    for format, pfad in (('jsonl', pfade['jsonl']), ('absatz', pfade['txt']), ('zeile', pfade['zeilen'])):
+        korpus = Korpus(pfad, format=format)
+        alle = list(korpus)
+        assert len(alle) == 2_000, format
+        ids = [d.id for d in alle]
+        for n in (2, 3, 7):
+            assert sum((_ids(korpus.shard(i, n)) for i in range(n)), []) == ids, (format, n)
+        verschachtelt = [_ids(korpus.shard(i, 3).shard(j, 2)) for i in range(3) for j in range(2)]
+        assert sum(verschachtelt, []) == ids, format
+        if format == 'jsonl':
+            assert korpus.fehlerhaft == 2_000 // 97 + 1
+            assert {d.szenario for d in alle} == set(TEST_PROMPTS)
+            texte = [d.text for d in alle]
+        else:
+            assert [d.text.replace('\n', ' ') for d in alle] == texte, format
+
+
+def test_shards_ueber_dateigrenzen(pfade, tmp_path):
+    weitere = korpus_schreiben(str(tmp_path), 500, seed=1)
+    korpus = Korpus([pfade['jsonl'], weitere['jsonl']])
+    ids = _ids(korpus)
+    assert len(ids) == 2_500 and sum((_ids(korpus.shard(i, 4)) for i in range(4)), []) == ids
+
+
+def test_stichprobe_reservoir_und_grenze(pfade):
+    stichprobe = Korpus(pfade['jsonl'], anteil=0.1, seed=3)
+    ids = _ids(stichprobe)
+    assert ids == _ids(Korpus(pfade['jsonl'], anteil=0.1, seed=3)) and 120 < len(ids) < 280
+    assert sum((_ids(stichprobe.shard(i, 3)) for i in range(3)), []) == ids
+    assert len(Korpus(pfade['jsonl']).stichprobe(50, seed=1)) == 50
+    assert len(_ids(Korpus(pfade['jsonl'], max_anzahl=10))) == 10
+    # max_anzahl gilt für den ganzen Korpus, nicht je Shard
+    for anzahl in (4, 3, 16):
+        begrenzt = Korpus(pfade['jsonl'], max_anzahl=10)
+        assert sum(len(_ids(begrenzt.shard(i, anzahl))) for i in range(anzahl)) == 10
+    verschachtelt = Korpus(pfade['jsonl'], max_anzahl=10).shard(1, 2)
+    assert sum(len(_ids(verschachtelt.shard(i, 3))) for i in range(3)) == len(_ids(verschachtelt)) == 5
+    aggregat = korpus_ausfuehren(Korpus(pfade['jsonl'], max_anzahl=10), STRATEGIEN_KLEIN, modus="threads",
+                                 worker=4, melden_alle=0)
+    assert aggregat.datensaetze == 10
+
+
+def test_buckets(pfade):
+    gefiltert = list(Korpus(pfade['txt'], buckets=['mittel']))
+    erwartet = [d for d in Korpus(pfade['txt']) if laengen_bucket(token_anzahl(d.text)) == 'mittel']
+    assert [d.id for d in gefiltert] == [d.id for d in erwartet] and gefiltert
+    assert all(256 <= d.tokens < 1024 for d in gefiltert)
+
+
+def test_ausfuehren_wie_ergebnisspeicher(tmp_path):
+    korpus = Korpus(korpus_schreiben(str(tmp_path), len(TEST_PROMPTS) * JE_SZENARIO, seed=7)['jsonl'])
+    seriell = korpus_ausfuehren(korpus, STRATEGIEN_KLEIN, melden_alle=0)
+    threads = korpus_ausfuehren(korpus, STRATEGIEN_KLEIN, modus="threads", worker=3, melden_alle=0)
+    assert seriell.datensaetze == threads.datensaetze == len(TEST_PROMPTS) * JE_SZENARIO
+
+    spalten_ohne_latenz = ['Original Tokens', 'Komprimierte Tokens', 'Kompressionsrate', 'Kosten (€)', 'Qualität (%)']
+    for szenario in TEST_PROMPTS:
+        prompts = {d.id: d.text for d in korpus if d.szenario == szenario}
+        erwartet = ErgebnisSpeicher.aus_ergebnissen(
+            experimente_ausfuehren(prompts, STRATEGIEN_KLEIN, fortschritt=False)).mittelwerte_dataframe()
+        for aggregat in (seriell, threads):
+            df = aggregat.mittelwerte_dataframe(szenario)
+            assert list(df.index) == list(erwartet.index) and list(df.columns) == list(erwartet.columns)
+            abweichung = (df[spalten_ohne_latenz] - erwartet[spalten_ohne_latenz]).abs().max().max()
+            assert abweichung < 1e-3, szenario
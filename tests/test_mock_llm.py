@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""LLM-Latenz-/Kostenmodell und Mock-LLM (Bedienzeit, Warteschlange, Rate-Limit)."""
+import asyncio
+import json
+import time
+
+from token_minimierung import llm_modell
+from token_minimierung.experiment import TEST_PROMPTS, gesamt_latenz_ms, run_experiment, strategie_funktion
+from token_minimierung.llm_modell import get_llm_modell, llm_modell_setzen, preistabelle
+from token_minimierung.mock_llm import MockLLM, _lesen
+from token_minimierung.tokenizer import token_anzahl
+
+ZEITFAKTOR = 0.05
+
+
+def test_standardmodell_wie_bisherige_formel():
+    modell = get_llm_modell()
+    for tokens in (0, 1, 73, 451, 1168, 10_000):
+        assert modell.latenz_ms(tokens) == 50 + tokens * 2
+        assert gesamt_latenz_ms(1.5, tokens) == 1.5 + 50 + tokens * 2
+        assert modell.kosten_euro(tokens) == (tokens / 1000) * 0.00138
+    for name, text in TEST_PROMPTS.items():
+        e = run_experiment(name, text, strategie_funktion(None, {}), "Baseline")
+        assert e.kosten_euro == (e.original_tokens / 1000) * 0.00138
+
+
+def test_preistabelle_aus_umgebung(tmp_path, monkeypatch):
+    pfad = tmp_path / 'preise.json'
+    pfad.write_text(json.dumps({'gpt-4o': {'eingabe_euro_pro_1k': 0.002}, 'eigen': {'eingabe_euro_pro_1k': 0.01}}))
+    monkeypatch.setenv('LLM_PREISTABELLE', str(pfad))
+    monkeypatch.setattr(llm_modell, '_tabelle', None)
+    assert preistabelle()['gpt-4o'].eingabe_euro_pro_1k == 0.002
+    assert preistabelle()['gpt-4o'].ausgabe_euro_pro_1k == llm_modell.PREISTABELLE['gpt-4o'].ausgabe_euro_pro_1k
+    vorher = llm_modell_setzen('eigen')
+    try:
+        assert run_experiment('x', 'Hallo Welt', strategie_funktion(None, {}), 'B').kosten_euro == \
+            token_anzahl('Hallo Welt') / 1000 * 0.01
+    finally:
+        llm_modell_setzen(vorher)
+        llm_modell._tabelle = None
+
+
+async def _post(port, prompt, max_tokens=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    daten = {'prompt': prompt} if max_tokens is None else {'prompt': prompt, 'max_tokens': max_tokens}
+    koerper = json.dumps(daten).encode()
+    writer.write(b"POST /v1/completions HTTP/1.1\r\nContent-Length: " + str(len(koerper)).encode()
+                 + b"\r\n\r\n" + koerper)
+    await writer.drain()
+    start = time.perf_counter()
+    status, inhalt = await _lesen(reader)
+    dauer = time.perf_counter() - start
+    writer.close()
+    await writer.wait_closed()
+    return status, json.loads(inhalt), dauer
+
+
+async def _bedienzeit_und_warteschlange():
+    prompt = TEST_PROMPTS['kundensupport']
+    tokens = token_anzahl(prompt)
+    modell = get_llm_modell('gpt-4o-mini')
+    soll_s = modell.latenz_ms(tokens) / 1000 * ZEITFAKTOR
+    mock = MockLLM(modell, max_parallel=4, max_warteschlange=4, zeitfaktor=ZEITFAKTOR)
+    server = await mock.start_tcp('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        status, antwort, dauer = await _post(port, prompt)
+        assert status == 200 and antwort['eingabe_tokens'] == tokens and antwort['ausgabe_tokens'] == 150
+        assert soll_s <= dauer < soll_s * 1.5 + 0.02, (dauer, soll_s)
+        # 2 × max_parallel gleichzeitig: die zweite Hälfte wartet eine Bedienzeit
+        ergebnisse = await asyncio.gather(*(_post(port, prompt) for _ in range(8)))
+        wartezeiten = sorted(a['warteschlange_ms'] for _, a, _ in ergebnisse)
+        soll_ms = soll_s / ZEITFAKTOR * 1000
+        assert all(w < 0.2 * soll_ms for w in wartezeiten[:4]), wartezeiten
+        assert all(0.9 * soll_ms < w < 1.5 * soll_ms for w in wartezeiten[4:]), (wartezeiten, soll_ms)
+        status = [s for s, _, _ in await asyncio.gather(*(_post(port, prompt) for _ in range(12)))]
+        assert status.count(503) == 4 and status.count(200) == 8, status
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_bedienzeit_und_volle_warteschlange():
+    asyncio.run(_bedienzeit_und_warteschlange())
+
+
+async def _rate_limit():
+    mock = MockLLM(get_llm_modell('gpt-4o-mini'), anfragen_pro_s=5, zeitfaktor=ZEITFAKTOR)
+    server = await mock.start_tcp('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        status = [s for s, _, _ in await asyncio.gather(*(_post(port, 'Hallo', 0) for _ in range(8)))]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"GET /metrics HTTP/1.1\r\n\r\n")
+        await writer.drain()
+        metriken = (await _lesen(reader))[1].decode()
+        writer.close()
+        await writer.wait_closed()
+    finally:
+        server.close()
+        await server.wait_closed()
+    return status, metriken
+
+
+def test_rate_limit_und_metriken():
+    status, metriken = asyncio.run(_rate_limit())
+    assert status.count(429) == 3, status
+    assert 'mock_llm_anfragen_total{ergebnis="rate_limit"} 3' in metriken
+    assert 'mock_llm_anfragen_total{ergebnis="erfolgreich"} 5' in metriken
+
+
+async def _abgelehnt_ohne_kontingent():
+    # Echte Zeit (zeitfaktor 1): während der Ablehnungen füllt sich der Anfragen-Eimer kaum nach
+    mock = MockLLM(get_llm_modell('gpt-4o-mini'), anfragen_pro_s=2, tokens_pro_min=300, zeitfaktor=1.0)
+    server = await mock.start_tcp('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        zu_lang = [await _post(port, 'Hallo Welt. ' * 500, 0) for _ in range(3)]
+        kurz = await asyncio.gather(*(_post(port, 'Hallo', 0) for _ in range(2)))
+    finally:
+        server.close()
+        await server.wait_closed()
+    return zu_lang, kurz, mock.zaehler
+
+
+def test_abgelehnte_anfrage_verbraucht_kein_kontingent():
+    zu_lang, kurz, zaehler = asyncio.run(_abgelehnt_ohne_kontingent())
+    assert [s for s, _, _ in zu_lang] == [429] * 3
+    assert all('Tokens' in antwort['fehler'] for _, antwort, _ in zu_lang)
+    # Die abgelehnten Anfragen haben den Anfragen-Eimer (Kapazität 2) nicht geleert
+    assert [s for s, _, _ in kurz] == [200, 200]
+    assert (zaehler['rate_limit'], zaehler['erfolgreich']) == (3, 2)
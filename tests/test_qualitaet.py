@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Qualitätsbewertung: gebündelt wie einzeln, Erhalt-Metriken wie Mengen."""
+import numpy as np
+import pytest
+
+from tests.hilfen import bewertung_einzeln, sweep_paare
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.qualitaet import entitaeten, erhalt_metriken, inhaltswoerter, qualitaet_paare
+
+
+def _erhalt_mengen(original, komprimiert, zerlegen):
+    o = set(zerlegen(original))
+    return len(o & set(zerlegen(komprimiert))) / len(o) if o else 1.0
+
+
+@pytest.fixture(scope='module')
+def paare():
+    return sweep_paare()
+
+
+def test_paare_wie_einzelbewertung(paare):
+    stichprobe = paare[::7] + [("", "x"), ("x", " "), ("gleich", "gleich")]
+    erwartet = np.array([bewertung_einzeln(o, k) for o, k in stichprobe])
+    assert np.allclose(qualitaet_paare(stichprobe), erwartet, atol=1e-5)
+
+
+def test_erhalt_metriken_wie_mengen(paare):
+    for original in TEST_PROMPTS.values():
+        fassungen = [k for o, k in paare if o == original][:200] + ["", original]
+        m = erhalt_metriken(original, fassungen)
+        assert np.allclose(m.token_recall, [_erhalt_mengen(original, k, inhaltswoerter) for k in fassungen])
+        assert np.allclose(m.entitaeten_erhalt, [_erhalt_mengen(original, k, entitaeten) for k in fassungen])
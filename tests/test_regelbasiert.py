@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Regelbasierte Kompression: kompilierter Regelsatz wie die bisherige Implementierung."""
+import random
+
+import pytest
+
+from tests.hilfen import regelbasiert_referenz
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.regelbasiert import kompression_manuell, kompression_manuell_batch
+
+BAUSTEINE = ['Hallo,', 'Sehr geehrte Damen und Herren,', 'Mit freundlichen Grüßen', 'Best regards.',
+             'DER', 'Die.', '(das)', '-und-', 'İst', 'ſind', 'KÖNNEN', 'DAẞ', 'der-der', "'", '\n\n\n',
+             '\t', '  ', 'Sie', 'SIE.', 'ist?', 'über,', '"the"', 'Bestellung', 'ORD-2024-001598',
+             'Mit', 'freundlichen', 'Grüßen', 'Viele', 'Grüße', 'Sincerely,', '. .', '...', '\u3000']
+
+
+@pytest.fixture(scope='module')
+def texte():
+    """Zufällige Texte mit Floskeln, Satzzeichen, Groß-/Kleinschreibung und Sonderzeichen."""
+    rnd = random.Random(0)
+    texte = list(TEST_PROMPTS.values()) + ['', '   ', 'Hallo']
+    for _ in range(5_000):
+        texte.append(''.join(rnd.choice(BAUSTEINE) + rnd.choice([' ', '', '\n'])
+                             for _ in range(rnd.randint(0, 60))))
+    return texte
+
+
+@pytest.mark.parametrize('stopwords_entfernen', [True, False])
+def test_wie_bisherige_implementierung(texte, stopwords_entfernen):
+    for text in texte:
+        assert kompression_manuell(text, stopwords_entfernen) == regelbasiert_referenz(text, stopwords_entfernen), text
+
+
+def test_batch_wie_einzeln(texte):
+    assert kompression_manuell_batch(texte) == [regelbasiert_referenz(t) for t in texte]
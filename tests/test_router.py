@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Strategie-Router: Budget, Code-Blöcke, Merkmale und Zustand."""
+import pytest
+
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.router import KANDIDATEN, StrategieRouter, _ausfuehren, _teile, merkmale
+from token_minimierung.tokenizer import token_anzahl
+
+
+def test_prompt_im_budget_unveraendert():
+    kurz = "Wie spät ist es in Berlin?"
+    e = StrategieRouter().entscheiden(kurz, ziel_tokens=100)
+    assert e.kandidat == 'Baseline' and e.text == kurz and e.ausprobiert == ['Baseline']
+
+
+@pytest.mark.parametrize('kandidat', KANDIDATEN, ids=lambda k: k.name)
+def test_code_bloecke_erhalten(kandidat):
+    code_prompt = TEST_PROMPTS['code_review']
+    m = merkmale(code_prompt, 50)
+    ausgabe = _ausfuehren(kandidat, code_prompt, 50, m)
+    assert all(t in ausgabe for code, t in _teile(code_prompt) if code)
+
+
+def test_merkmale():
+    m = merkmale(TEST_PROMPTS['code_review'], 50)
+    assert m.code_bloecke == 1 and 0.3 < m.code_anteil < 0.9 and m.ziel_anteil < 1
+    assert merkmale(TEST_PROMPTS['kundensupport']).floskeln == 2
+    assert merkmale("Name: A\nOrt: B\nText ohne Muster").struktur_anteil == 2 / 3
+
+
+def test_zustand_gleiche_vorhersagen():
+    router = StrategieRouter()
+    router.lernen([TEST_PROMPTS['dokumentenzusammenfassung'], TEST_PROMPTS['code_review']],
+                  qualitaets_fn=lambda paare: [0.9] * len(paare))
+    kopie = StrategieRouter.aus_zustand(router.zustand())
+    for prompt in TEST_PROMPTS.values():
+        m = merkmale(prompt, 200)
+        assert router.vorhersagen(m) == kopie.vorhersagen(m)
+
+
+@pytest.mark.parametrize('kandidat', [k for k in KANDIDATEN if k.funktionsname], ids=lambda k: k.name)
+def test_trenner_um_code_bloecke_erhalten(kandidat):
+    prompt = TEST_PROMPTS['code_review']
+    ausgabe = _ausfuehren(kandidat, prompt, 50, merkmale(prompt, 50))
+    for code, t in _teile(prompt):
+        if code:
+            vorher, _, nachher = prompt.partition(t)
+            rand = (vorher[len(vorher.rstrip()):], nachher[:len(nachher) - len(nachher.lstrip())])
+            assert rand[0] + t + rand[1] in ausgabe
+
+
+def test_teile_ergeben_den_prompt():
+    prompt = TEST_PROMPTS['code_review']
+    assert ''.join(t for _, t in _teile(prompt)) == prompt
+
+
+def test_rueckfall_misst_alle_kandidaten():
+    # Code allein länger als das Budget: kein Kandidat hält es ein
+    prompt = TEST_PROMPTS['code_review']
+    ziel_tokens = int(token_anzahl(prompt) * 0.3)
+    e = StrategieRouter().entscheiden(prompt, ziel_tokens)
+    assert sorted(e.ausprobiert) == sorted(k.name for k in KANDIDATEN)
+    assert not e.budget_erreicht
+    kuerzeste = min(token_anzahl(_ausfuehren(k, prompt, ziel_tokens, e.merkmale)) for k in KANDIDATEN)
+    assert token_anzahl(e.text) == kuerzeste
+
+
+@pytest.mark.parametrize('anteil', [0.3, 0.6, 0.9])
+def test_budget_erreicht_wie_exakte_zaehlung(anteil):
+    for prompt in TEST_PROMPTS.values():
+        ziel_tokens = max(1, int(token_anzahl(prompt) * anteil))
+        e = StrategieRouter().entscheiden(prompt, ziel_tokens)
+        assert e.budget_erreicht == (token_anzahl(e.text) <= ziel_tokens)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Runner: gleiche Ergebnisse in allen Modi, Qualität gebündelt und als Stufe 'bewertung' gemessen."""
+from dataclasses import asdict
+
+import pytest
+
+from token_minimierung import instrumentierung
+from token_minimierung.experiment import STRATEGIEN, TEST_PROMPTS, run_experiment, strategie_funktion
+from token_minimierung.instrumentierung import get_instrumentierung
+from token_minimierung.qualitaet import qualitaet_semantische_aehnlichkeit
+from token_minimierung.runner import _prompt_ausfuehren, experimente_ausfuehren
+
+
+def _ohne_latenz(ergebnisse):
+    """Alles außer der Latenz (enthält die gemessene Kompressionszeit)."""
+    return [{k: v for k, v in asdict(r).items() if k != 'latenz_ms'} for r in ergebnisse]
+
+
+@pytest.fixture(scope='module')
+def seriell():
+    return experimente_ausfuehren(TEST_PROMPTS, STRATEGIEN, modus='seriell', fortschritt=False)
+
+
+def test_seriell_wie_run_experiment(seriell):
+    erwartet = [run_experiment(name, text, strategie_funktion(f, kw), s,
+                               qualitaets_fn=None if f is None else qualitaet_semantische_aehnlichkeit,
+                               parameter=kw)
+                for name, text in TEST_PROMPTS.items() for s, f, kw in STRATEGIEN]
+    for r, e in zip(_ohne_latenz(seriell), _ohne_latenz(erwartet)):
+        assert r.pop('qualitaets_score') == pytest.approx(e.pop('qualitaets_score'), abs=1e-6)
+        assert r == e
+
+
+@pytest.mark.parametrize('modus', ['threads', 'prozesse'])
+def test_modi_wie_seriell(seriell, modus):
+    ergebnisse = experimente_ausfuehren(TEST_PROMPTS, STRATEGIEN, modus=modus, worker=2, fortschritt=False)
+    assert _ohne_latenz(ergebnisse) == _ohne_latenz(seriell)
+
+
+def test_bewertung_gebuendelt_je_prompt():
+    name, text = next(iter(TEST_PROMPTS.items()))
+    instrumentierung.aktivieren(True)
+    try:
+        get_instrumentierung().zuruecksetzen()
+        ergebnisse, bewertung_ms = _prompt_ausfuehren(name, text, STRATEGIEN)
+        histogramme = get_instrumentierung().histogramme
+    finally:
+        instrumentierung.aktivieren(False)
+    assert len(ergebnisse) == len(STRATEGIEN)
+    assert bewertung_ms > 0
+    # Ein Qualitäts-Batch je Prompt, nicht ein Platzhalter je Zelle
+    assert histogramme['bewertung'].anzahl == 1
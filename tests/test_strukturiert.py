@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""Strukturierte Kompression: Batch-Variante wie Einzelaufrufe."""
+import pytest
+
+from tests.hilfen import prompts_erzeugen
+from token_minimierung.experiment import TEST_PROMPTS
+from token_minimierung.strukturiert import (_get_embedding_model, kompression_strukturiert,
+                                            kompression_strukturiert_batch)
+
+
+@pytest.mark.parametrize('groesse', [1, 32, 100])
+def test_batch_wie_einzeln(groesse):
+    prompts = prompts_erzeugen(TEST_PROMPTS, groesse)
+    _get_embedding_model().leeren()
+    erwartet = [kompression_strukturiert(p) for p in prompts]
+    _get_embedding_model().leeren()
+    assert kompression_strukturiert_batch(prompts) == erwartet
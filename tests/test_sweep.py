@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Parameter-Sweep: Pareto-Front und Zellwerte gegen Referenzen."""
+import random
+
+import numpy as np
+import pytest
+
+from token_minimierung.experiment import TEST_PROMPTS, run_experiment, strategie_funktion
+from token_minimierung.qualitaet import qualitaet_semantische_aehnlichkeit
+from token_minimierung.sweep import _dominanz_pruning, bereich, pareto_maske, parameter_sweep
+
+KLEINE_RAEUME = [
+    ("Manuelle Prompt-Kompression", "kompression_manuell", {"stopwords_entfernen": [False, True]}),
+    ("Strukturierte Kompression", "kompression_strukturiert",
+     {"ziel_anteil": bereich(0.1, 0.9, 5), "min_saetze": [1, 3]}),
+    ("Token-Budget", "kompression_token_budget",
+     {"ziel_tokens": [20, 80, 200], "relevanz_gewicht": [0.0, 0.5], "verfahren": ["optimal", "greedy"]}),
+    ("Chunking", "kompression_chunking",
+     {"chunk_groesse": [40, 200], "overlap": [0, 40], "saetze_pro_chunk": [1, 3]}),
+]
+
+
+def _dominiert(a, b):
+    """b dominiert a (Rate, Qualität maximieren; Latenz minimieren)."""
+    return (b[0] >= a[0] and b[1] >= a[1] and b[2] <= a[2]) and (b[0] > a[0] or b[1] > a[1] or b[2] < a[2])
+
+
+def test_pareto_maske_wie_paarweise():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n = int(rng.integers(1, 60))
+        punkte = rng.integers(0, 6, (n, 3)).astype(float)  # viele Gleichstände
+        maske = pareto_maske(punkte[:, 0], punkte[:, 1], punkte[:, 2])
+        for i in range(n):
+            erwartet = not any(_dominiert(punkte[i], punkte[j]) for j in range(n))
+            assert not (maske[i] and not erwartet)
+            if erwartet and not maske[i]:
+                # nur Duplikate eines Front-Punkts dürfen fehlen
+                assert any(maske[j] and (punkte[j] == punkte[i]).all() for j in range(n))
+
+
+def test_dominanz_pruning_gleiche_front():
+    rng = np.random.default_rng(1)
+    verworfen = 0
+    for _ in range(200):
+        n = int(rng.integers(1, 60))
+        rate, latenz = rng.integers(0, 6, (2, n)).astype(float)
+        qualitaet = rng.integers(0, 6, n) / 5  # Qualität 1.0 kommt vor
+        aufrufe = []
+
+        def bewerten(ids):
+            aufrufe.append(ids)
+            return qualitaet[ids].tolist()
+        bewertet = _dominanz_pruning(rate, latenz, bewerten, 1.0)
+        assert len(aufrufe) == 2 and not set(aufrufe[0]) & set(aufrufe[1])
+        assert all(q == qualitaet[i] for i, q in bewertet.items())
+        ids = np.array(sorted(bewertet), dtype=int)
+        verworfen += n - len(ids)
+        alle = pareto_maske(rate, qualitaet, latenz)
+        teil = pareto_maske(rate[ids], qualitaet[ids], latenz[ids])
+        erwartet = {(rate[i], qualitaet[i], latenz[i]) for i in np.flatnonzero(alle)}
+        assert {(rate[i], qualitaet[i], latenz[i]) for i in ids[teil]} == erwartet
+    assert verworfen > 0
+
+
+@pytest.fixture(scope='module')
+def ergebnis():
+    return parameter_sweep(TEST_PROMPTS, KLEINE_RAEUME, modus='seriell', fortschritt=False)
+
+
+def test_zellen_wie_run_experiment(ergebnis):
+    for p in random.Random(0).sample(ergebnis.punkte, 30):
+        funktionsname = next(r[1] for r in KLEINE_RAEUME if r[0] == p.strategie)
+        referenz = run_experiment(p.szenario, TEST_PROMPTS[p.szenario],
+                                  strategie_funktion(funktionsname, p.parameter), p.strategie,
+                                  qualitaets_fn=qualitaet_semantische_aehnlichkeit)
+        assert referenz.komprimierte_tokens == p.komprimierte_tokens, (p.strategie, p.parameter)
+        assert referenz.qualitaets_score == pytest.approx(p.qualitaets_score, abs=1e-5)
+
+
+def test_statistik_zaehlt_jede_zelle(ergebnis):
+    s = ergebnis.statistik
+    assert s['zellen'] == s['vorgefiltert'] + s['dominiert'] + s['dedupliziert'] + s['bewertete_ausgaben']
+    assert len(ergebnis.punkte) == s['zellen'] - s['vorgefiltert'] - s['dominiert']
+    ohne = parameter_sweep(TEST_PROMPTS, KLEINE_RAEUME, fortschritt=False, qualitaet_obergrenze=None)
+    assert ohne.statistik['dominiert'] == 0 and len(ohne.punkte) == s['zellen']
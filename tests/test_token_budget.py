@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Optimale Satzauswahl (Rucksack) gegen Vollsuche und LP-Schranke."""
+import itertools
+
+import numpy as np
+
+from token_minimierung.auswahl import budget_auswahl
+
+
+def _vollsuche(scores, kosten, budget):
+    beste = 0.0
+    for r in range(len(scores) + 1):
+        for teil in itertools.combinations(range(len(scores)), r):
+            teil = list(teil)
+            if kosten[teil].sum() <= budget:
+                beste = max(beste, scores[teil].sum())
+    return beste
+
+
+def test_budget_auswahl_optimal():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        n = int(rng.integers(0, 11))
+        scores, kosten = rng.uniform(0, 2, n), rng.integers(0, 30, n)
+        budget = int(rng.integers(0, 80))
+        auswahl = budget_auswahl(scores, kosten, budget)
+        assert auswahl.exakt and auswahl.kosten <= budget
+        assert abs(auswahl.score - _vollsuche(scores, kosten, budget)) < 1e-9
+        # Kern-Verfahren (kleiner Kern): Budget eingehalten, mindestens halbe LP-Schranke
+        kern = budget_auswahl(scores, kosten, budget, kern_groesse=2)
+        assert kern.kosten <= budget and kern.score >= kern.obere_schranke / 2 - 1e-9
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Token-Buchhaltung: Anzahlen und Budget-Prüfungen wie encode."""
+import random
+
+import numpy as np
+import pytest
+
+from tests.hilfen import texte_erzeugen
+from token_minimierung.chunking import kompression_chunking, kompression_chunking_saetze, kompression_chunking_stream
+from token_minimierung.dokument import dokumente_analysieren
+from token_minimierung.tokenizer import (TokenZaehler, get_encoder, get_schaetzer, im_budget, token_anzahl,
+                                         tokenisieren)
+
+
+@pytest.fixture(scope='module')
+def texte():
+    return texte_erzeugen(2_000)
+
+
+@pytest.fixture(scope='module')
+def exakt(texte):
+    encoder = get_encoder()
+    return np.array([len(encoder.encode(t)) for t in texte])
+
+
+@pytest.fixture(scope='module')
+def gemischt(texte):
+    """Zahlen, CJK, Code und Prosa gemischt – nicht aus den Kalibriertexten."""
+    rnd = random.Random(7)
+    zahlen = [' '.join(str(rnd.randrange(10 ** rnd.randint(1, 9))) for _ in range(rnd.randint(1, 12)))
+              for _ in range(100)]
+    cjk = [''.join(chr(rnd.randint(0x4E00, 0x9FFF)) for _ in range(rnd.randint(3, 40))) for _ in range(100)]
+    code = [f"def f{i}(x):\n    return x * {i} + len({t[:20]!r})" for i, t in enumerate(texte[:100])]
+    vorrat = zahlen + cjk + code + texte[:300]
+    return [rnd.choice([' ', '\n']).join(rnd.sample(vorrat, rnd.randint(1, 4))) for _ in range(500)]
+
+
+def test_anzahlen_wie_encode(texte, exakt):
+    zaehler = TokenZaehler(max_eintraege=len(texte) // 2)  # mit Verdrängung
+    assert zaehler.anzahlen(texte) == exakt.tolist()
+    assert zaehler.anzahlen(texte[::-1]) == exakt[::-1].tolist()
+    assert [zaehler.anzahl(t) for t in texte[:200]] == exakt[:200].tolist()
+
+
+def test_wiederholte_anzahl_aus_cache(texte, exakt):
+    zaehler = TokenZaehler()
+    assert [zaehler.anzahl(t) for t in texte[:100] * 3] == exakt[:100].tolist() * 3
+    assert zaehler.statistik()['trefferquote'] > 0.6
+
+
+@pytest.mark.parametrize('budget', [10, 40, 80, 160])
+def test_im_budget_wie_encode(texte, exakt, budget):
+    assert (im_budget(texte, budget) == (exakt <= budget)).all()
+
+
+@pytest.mark.parametrize('budget', [10, 40, 80, 160])
+def test_im_budget_gemischte_textarten(gemischt, budget):
+    exakt = np.array([len(tokenisieren(t)) for t in gemischt])
+    assert (im_budget(gemischt, budget) == (exakt <= budget)).all()
+    # Die Schätzung entscheidet weiterhin einen Großteil ohne Tokenisierung
+    unten, oben = get_schaetzer().grenzen(gemischt)
+    assert ((oben <= budget) | (unten > budget)).mean() > 0.5
+
+
+def test_sondertoken_text_als_gewoehnlicher_text(texte):
+    # Nutzertext darf "<|endoftext|>" enthalten; encode würde hier eine Ausnahme auslösen
+    text = ' '.join(texte[:40]) + ' Ende <|endoftext|> des Texts. ' + ' '.join(texte[40:80])
+    doc, = dokumente_analysieren([text])
+    assert len(doc.tokens) == token_anzahl(text)
+    for ergebnis in (kompression_chunking(text, 50, 10), kompression_chunking_saetze(text, 50, 10, modus='seriell'),
+                     '\n\n'.join(kompression_chunking_stream(text, 50, 10))):
+        assert ergebnis.startswith('[Abschnitt 1')
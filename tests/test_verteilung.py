@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Verteilungen: Perzentile wie pandas, Bootstrap-Intervalle, Export in finale_ergebnisse."""
+import contextlib
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+from tests.hilfen import spalten_langschwaenzig, speicher_fuellen
+from token_minimierung.auswertung import finale_ergebnisse
+from token_minimierung.verteilung import PERZENTILE, verteilung_berechnen
+
+
+@pytest.fixture(scope='module')
+def spalten_und_speicher():
+    spalten = spalten_langschwaenzig(20_000, seed=3)
+    return spalten, speicher_fuellen(spalten)
+
+
+def test_perzentile_wie_pandas(spalten_und_speicher):
+    pd = pytest.importorskip('pandas')
+    spalten, speicher = spalten_und_speicher
+    df = pd.DataFrame({'s': spalten['strategie'], 'z': spalten['szenario'], 'w': spalten['latenz_ms']})
+    gruppiert = df.groupby(['s', 'z'])['w']
+    erwartet = gruppiert.quantile([p / 100 for p in PERZENTILE]).unstack()
+    v = speicher.verteilung('latenz_ms', ('strategie', 'szenario'))
+    assert v.gruppen == list(erwartet.index)
+    assert np.allclose(v.werte, erwartet.values, rtol=1e-12)
+    assert np.allclose(v.mittel, gruppiert.mean().values)
+    assert np.array_equal(v.minimum, gruppiert.min().values)
+    assert np.array_equal(v.maximum, gruppiert.max().values)
+    assert np.all(np.diff(v.cdf, axis=1) >= 0)
+    assert np.all((v.mittel_ki[:, 0] <= v.mittel) & (v.mittel <= v.mittel_ki[:, 1]))
+
+
+def test_bootstrap_ueberdeckung_und_reproduzierbar():
+    # 300 Gruppen à 200 Werte aus einer Gamma-Verteilung (Mittel 10)
+    rng = np.random.default_rng(7)
+    codes = np.repeat(np.arange(300), 200)
+    werte = rng.gamma(2.0, 5.0, len(codes))
+    gruppen = [(str(i),) for i in range(300)]
+    v = verteilung_berechnen(codes, werte, gruppen, bootstrap=500, seed=1)
+    ueberdeckung = np.mean((v.mittel_ki[:, 0] <= 10) & (10 <= v.mittel_ki[:, 1]))
+    assert 0.9 <= ueberdeckung <= 0.98
+    wieder = verteilung_berechnen(codes, werte, gruppen, bootstrap=500, seed=1)
+    assert np.array_equal(v.mittel_ki, wieder.mittel_ki) and np.array_equal(v.perzentile_ki, wieder.perzentile_ki)
+    assert np.all(np.isnan(verteilung_berechnen(codes, werte, gruppen, bootstrap=0).mittel_ki))
+
+
+def test_rangklassen_aendern_intervalle_kaum():
+    # 20.000 Werte in 1024 Klassen gegen 20.000 Klassen (exakt)
+    werte = np.random.default_rng(7).lognormal(3, 1, 20_000)
+    codes = np.zeros(len(werte), dtype=np.int64)
+    grob = verteilung_berechnen(codes, werte, [('x',)], seed=2)
+    exakt = verteilung_berechnen(codes, werte, [('x',)], seed=2, klassen=len(werte))
+    breite = exakt.mittel_ki[0, 1] - exakt.mittel_ki[0, 0]
+    assert abs(grob.mittel_ki[0] - exakt.mittel_ki[0]).max() < 0.1 * breite
+    p99 = PERZENTILE.index(99)
+    assert abs(grob.perzentile_ki[0, p99] - exakt.perzentile_ki[0, p99]).max() < 0.02 * exakt.werte[0, p99]
+
+
+def test_finale_ergebnisse_schema(spalten_und_speicher, tmp_path):
+    spalten, speicher = spalten_und_speicher
+    pfad = os.path.join(tmp_path, 'daten.json')
+    with contextlib.redirect_stdout(io.StringIO()):
+        export = finale_ergebnisse(speicher, speicher.namen('strategie'), pfad)
+    with open(pfad, encoding='utf-8') as f:
+        geladen = json.load(f)
+    namen, mittel = speicher.mittelwerte('strategie')
+    for i, strategie in enumerate(namen):
+        eintrag = geladen[strategie]
+        assert eintrag['latenz_ms'] == float(mittel['latenz_ms'][i])
+        assert eintrag['verteilung']['latenz_ms']['anzahl'] == int((speicher.spalte('strategie') ==
+                                                                     speicher.namen('strategie').index(strategie)).sum())
+        assert abs(eintrag['verteilung']['qualitaet_prozent']['mittel'] - eintrag['qualitaet_prozent']) < 1e-9
+        assert set(eintrag['szenarien']) == set(spalten['szenario'])
+        assert 'cdf' in eintrag['verteilung']['latenz_ms']
+    assert export == geladen
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Zellen-Cache: Treffer im zweiten Lauf, veraltete Zellen nach Änderungen, Latenz neu messen, paralleles Speichern."""
+from dataclasses import asdict
+
+import pytest
+
+from token_minimierung import llm_modell, zellen_cache
+from token_minimierung.experiment import STRATEGIEN, TEST_PROMPTS
+from token_minimierung.llm_modell import get_llm_modell
+from token_minimierung.runner import experimente_ausfuehren
+from token_minimierung.zellen_cache import ZellenCache, get_zellen_cache
+
+STRATEGIEN_KLEIN = [s for s in STRATEGIEN if s[1] in (None, "kompression_manuell", "kompression_chunking")]
+ZELLEN = len(TEST_PROMPTS) * len(STRATEGIEN_KLEIN)
+
+
+def _lauf(pfad, strategien=STRATEGIEN_KLEIN):
+    cache = ZellenCache(str(pfad))
+    return experimente_ausfuehren(TEST_PROMPTS, strategien, fortschritt=False, zellen_cache=cache), cache
+
+
+def _ohne_latenz(ergebnisse):
+    return [{k: v for k, v in asdict(r).items() if k not in ('latenz_ms', 'latenz_gecacht')} for r in ergebnisse]
+
+
+def test_treffer_im_zweiten_lauf(tmp_path):
+    erster, cache = _lauf(tmp_path)
+    assert cache.statistik()['neu'] == ZELLEN and len(cache) == ZELLEN
+    zweiter, cache = _lauf(tmp_path)
+    s = cache.statistik()
+    assert (s['treffer'], s['neu'], s['veraltet']) == (ZELLEN, 0, 0)
+    assert s['gesparte_s'] > 0
+    assert _ohne_latenz(zweiter) == _ohne_latenz(erster)
+    assert [r.latenz_ms for r in zweiter] == [r.latenz_ms for r in erster]
+    assert all(r.latenz_gecacht for r in zweiter) and not any(r.latenz_gecacht for r in erster)
+
+
+def test_geaenderte_kwargs_neu_gerechnet(tmp_path):
+    _lauf(tmp_path)
+    geaendert = [(s, f, dict(kw, chunk_groesse=50)) if f == "kompression_chunking" else (s, f, kw)
+                 for s, f, kw in STRATEGIEN_KLEIN]
+    ergebnisse, cache = _lauf(tmp_path, geaendert)
+    s = cache.statistik()
+    assert (s['treffer'], s['neu']) == (ZELLEN - len(TEST_PROMPTS), len(TEST_PROMPTS))
+    assert all(not r.latenz_gecacht for r in ergebnisse if r.parameter.get('chunk_groesse') == 50)
+
+
+@pytest.mark.parametrize('aenderung', ['quelle', 'modell', 'llm'])
+def test_neue_version_macht_zellen_veraltet(tmp_path, monkeypatch, aenderung):
+    _lauf(tmp_path)
+    if aenderung == 'quelle':
+        quelle = zellen_cache.quellcode_hash
+        monkeypatch.setattr(zellen_cache, 'quellcode_hash',
+                            lambda f: quelle(f) + 'x' if f == "kompression_manuell" else quelle(f))
+        erwartet = len(TEST_PROMPTS)
+    elif aenderung == 'modell':
+        monkeypatch.setattr(zellen_cache, 'modell_kennung', lambda: {'embedding': 'anderes-modell'})
+        erwartet = ZELLEN
+    else:
+        monkeypatch.setattr(llm_modell, '_aktiv', get_llm_modell('gpt-4o'))
+        erwartet = ZELLEN
+    ergebnisse, cache = _lauf(tmp_path)
+    s = cache.statistik()
+    assert (s['veraltet'], s['treffer'], s['neu']) == (erwartet, ZELLEN - erwartet, 0)
+    assert sum(not r.latenz_gecacht for r in ergebnisse) == erwartet
+    # Neu gerechnete Zellen ersetzen die veralteten Einträge
+    _, cache = _lauf(tmp_path)
+    assert cache.statistik()['treffer'] == ZELLEN
+
+
+def test_latenz_neu_messen(tmp_path, monkeypatch):
+    erster, _ = _lauf(tmp_path)
+    monkeypatch.setattr(zellen_cache, 'ZELLEN_CACHE_PFAD', str(tmp_path))
+    monkeypatch.setattr(zellen_cache, 'ZELLEN_CACHE_LATENZ', 'messen')
+    cache = get_zellen_cache()
+    assert cache.latenz_neu_messen
+    zweiter = experimente_ausfuehren(TEST_PROMPTS, STRATEGIEN_KLEIN, fortschritt=False, zellen_cache=cache)
+    assert cache.statistik()['treffer'] == ZELLEN
+    assert not any(r.latenz_gecacht for r in zweiter)
+    assert _ohne_latenz(zweiter) == _ohne_latenz(erster)
+
+
+def test_paralleles_speichern_fuehrt_zusammen(tmp_path):
+    # Zwei Instanzen mit demselben (leeren) Stand: das zweite speichern() übernimmt die Einträge des ersten
+    a, b = ZellenCache(str(tmp_path)), ZellenCache(str(tmp_path))
+    haelfte = len(STRATEGIEN_KLEIN) // 2
+    experimente_ausfuehren(TEST_PROMPTS, STRATEGIEN_KLEIN[:haelfte], fortschritt=False, zellen_cache=a)
+    experimente_ausfuehren(TEST_PROMPTS, STRATEGIEN_KLEIN[haelfte:], fortschritt=False, zellen_cache=b)
+    assert len(ZellenCache(str(tmp_path))) == ZELLEN
+    _, cache = _lauf(tmp_path)
+    assert cache.statistik()['treffer'] == ZELLEN
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Token-Minimierungsstrategien als importierbares Paket.
+- regelbasiert: Strategie 1 (Floskeln, Stopwörter) – nur Standardbibliothek
+- strukturiert, token_budget, chunking, deduplizierung: Strategien 2–5
+- qualitaet, experiment, runner: Qualitätsmetrik und Experiment-Durchführung
+- auswertung: DataFrame, Visualisierung, Kosten- und finale Auswertung
+Die Namen unten werden erst beim ersten Zugriff aus ihrem Modul geladen, damit
+z.B. `from token_minimierung import kompression_manuell` weder tiktoken noch
+numpy, pandas, matplotlib oder sentence-transformers importiert.
+"""
+import importlib
+
+_EXPORTE = {
+    # Strategien
+    'kompression_manuell': 'regelbasiert',
+    'kompression_manuell_batch': 'regelbasiert',
+    'Regelsatz': 'regelbasiert',
+    'regelsatz_registrieren': 'regelbasiert',
+    'kompression_strukturiert': 'strukturiert',
+    'kompression_strukturiert_batch': 'strukturiert',
+    'kompression_token_budget': 'token_budget',
+    'budget_auswahl': 'auswahl',
+    'kompression_chunking': 'chunking',
+    'kompression_chunking_stream': 'chunking',
+    'kompression_chunking_saetze': 'chunking',
+    'kompression_adaptiv': 'router',
+    'StrategieRouter': 'router',
+    'textbloecke_aus_datei': 'chunking',
+    'kompression_duplikate': 'deduplizierung',
+    'duplikate_finden': 'deduplizierung',
+    # Analyse und Tokenizer
+    'Document': 'dokument',
+    'dokument_analysieren': 'dokument',
+    'dokumente_analysieren': 'dokument',
+    'saetze_zerlegen': 'segmentierung',
+    'get_encoder': 'tokenizer',
+    'token_anzahl': 'tokenizer',
+    'token_anzahlen': 'tokenizer',
+    'TokenZaehler': 'tokenizer',
+    'TokenSchaetzer': 'tokenizer',
+    'schaetzer_kalibrieren': 'tokenizer',
+    'im_budget': 'tokenizer',
+    'get_embedding_dienst': 'embedding',
+    'EmbeddingDienst': 'embedding',
+    'NgramEmbedder': 'embedder',
+    'embedder_registrieren': 'embedder',
+    # Experiment
+    'qualitaet_semantische_aehnlichkeit': 'qualitaet',
+    'qualitaet_semantische_aehnlichkeit_batch': 'qualitaet',
+    'qualitaet_paare': 'qualitaet',
+    'erhalt_metriken': 'qualitaet',
+    'ErhaltMetriken': 'qualitaet',
+    'ExperimentResult': 'experiment',
+    'TEST_PROMPTS': 'experiment',
+    'STRATEGIEN': 'experiment',
+    'run_experiment': 'experiment',
+    'experimente_ausfuehren': 'runner',
+    'ErgebnisSpeicher': 'ergebnisspeicher',
+    'ZellenCache': 'zellen_cache',
+    'KompressionsCache': 'kompressions_cache',
+    'komprimieren_gecacht': 'kompressions_cache',
+    'Konversation': 'konversation',
+    'stufe': 'instrumentierung',
+    'profilieren': 'instrumentierung',
+    'get_instrumentierung': 'instrumentierung',
+    'Korpus': 'korpus',
+    'korpus_ausfuehren': 'korpus',
+    'LLMModell': 'llm_modell',
+    'get_llm_modell': 'llm_modell',
+    'llm_modell_setzen': 'llm_modell',
+    'MockLLM': 'mock_llm',
+    'last_vergleich': 'mock_llm',
+    'Verteilung': 'verteilung',
+    'parameter_sweep': 'sweep',
+    'pareto_maske': 'sweep',
+}
+
+__all__ = list(_EXPORTE)
+
+
+def __getattr__(name):
+    modul = _EXPORTE.get(name)
+    if modul is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    wert = getattr(importlib.import_module(f'.{modul}', __name__), name)
+    globals()[name] = wert
+    return wert
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
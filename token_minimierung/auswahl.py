@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Satzauswahl unter Token-Budget (0/1-Rucksackproblem):
+maximiere die Summe der Satz-Scores, ohne das Budget zu überschreiten.
+- Sätze nach Score pro Token sortieren; die klar besseren fest nehmen, die klar
+  schlechteren weglassen und nur einen Kern um den kritischen Satz exakt per
+  dynamischer Programmierung lösen (O(n log n) + O(Kern × Budget))
+- Passen alle Kandidaten in den Kern (kurze Dokumente), ist das Ergebnis exakt optimal
+- Garantie: mindestens die Hälfte der LP-Schranke (Vergleich mit dem besten
+  Einzelsatz); die erreichte Güte wird als score / obere_schranke ausgewiesen
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+MAX_DP_ZELLEN = 4_000_000  # Kern × (Budget + 1), bestimmt Zeit und Speicher der DP
+KERN_GROESSE = 512
+
+
+@dataclass
+class Auswahl:
+    indizes: np.ndarray        # gewählte Sätze in Originalreihenfolge
+    score: float               # erreichte Score-Summe
+    kosten: int                # Token-Summe der gewählten Sätze
+    obere_schranke: float      # LP-Schranke (kein Ergebnis kann besser sein)
+    exakt: bool                # True, wenn das Optimum per DP nachgewiesen ist
+
+    @property
+    def guete(self) -> float:
+        """Anteil der oberen Schranke, der mindestens erreicht ist (1.0 = optimal)."""
+        return self.score / self.obere_schranke if self.obere_schranke > 0 else 1.0
+
+
+def positions_scores(n: int, position_weight: bool = True) -> np.ndarray:
+    """U-förmiges Positionsgewicht (Anfang und Ende höher, „Lost in the Middle“)."""
+    if not position_weight:
+        return np.ones(n)
+    pos = np.arange(1, n + 1) / n
+    return 2 * np.maximum(pos, 1 - pos)
+
+
+def _dp(werte: np.ndarray, kosten: np.ndarray, budget: int) -> np.ndarray:
+    """Exakter 0/1-Rucksack über die Kapazität (eine numpy-Zeile je Satz); liefert die Auswahlmaske."""
+    n = len(werte)
+    beste = np.zeros(budget + 1)
+    genommen = np.zeros((n, budget + 1), dtype=bool)
+    for i in range(n):
+        c = int(kosten[i])
+        if c > budget:
+            continue
+        kandidat = beste[:budget + 1 - c] + werte[i]
+        besser = kandidat > beste[c:]
+        genommen[i, c:] = besser
+        beste[c:] = np.where(besser, kandidat, beste[c:])
+    maske = np.zeros(n, dtype=bool)
+    rest = budget
+    for i in range(n - 1, -1, -1):
+        if genommen[i, rest]:
+            maske[i] = True
+            rest -= int(kosten[i])
+    return maske
+
+
+def budget_auswahl(scores, kosten, budget: int, max_dp_zellen: int = MAX_DP_ZELLEN,
+                   kern_groesse: int = KERN_GROESSE) -> Auswahl:
+    """
+    Wählt Sätze mit maximaler Score-Summe und Token-Summe ≤ budget.
+    scores: Score je Satz (≥ 0), kosten: Tokens je Satz (ganzzahlig ≥ 0).
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    kosten = np.asarray(kosten, dtype=np.int64)
+    budget = max(int(budget), 0)
+    n = len(scores)
+
+    maske = np.zeros(n, dtype=bool)
+    gratis = (kosten == 0) & (scores > 0)
+    maske[gratis] = True
+    kandidaten = np.flatnonzero(~gratis & (kosten <= budget) & (scores > 0))
+    if len(kandidaten) == 0:
+        return _ergebnis(maske, scores, kosten, float(scores[gratis].sum()), True)
+
+    # Nach Score pro Token absteigend; LP-Schranke aus dem kritischen Satz
+    verhaeltnis = scores[kandidaten] / kosten[kandidaten]
+    reihenfolge = kandidaten[np.argsort(-verhaeltnis, kind='stable')]
+    kum_kosten = np.cumsum(kosten[reihenfolge])
+    kritisch = int(np.searchsorted(kum_kosten, budget, side='right'))
+    obere_schranke = float(scores[gratis].sum() + scores[reihenfolge[:kritisch]].sum())
+    if kritisch == len(reihenfolge):
+        maske[reihenfolge] = True  # alles passt
+        return _ergebnis(maske, scores, kosten, obere_schranke, True)
+    rest = budget - (int(kum_kosten[kritisch - 1]) if kritisch else 0)
+    obere_schranke += float(scores[reihenfolge[kritisch]]) * rest / int(kosten[reihenfolge[kritisch]])
+
+    # Kern um den kritischen Satz exakt lösen, davor fest nehmen, danach weglassen;
+    # umfasst der Kern alle Kandidaten, ist das Ergebnis das exakte Optimum
+    breite = max(1, min(kern_groesse, max_dp_zellen // (budget + 1)))
+    von = max(0, min(kritisch - breite // 2, len(reihenfolge) - breite))
+    bis = min(len(reihenfolge), von + breite)
+    fest = reihenfolge[:von]
+    kern = reihenfolge[von:bis]
+    maske[fest] = True
+    maske[kern] = _dp(scores[kern], kosten[kern], budget - int(kosten[fest].sum()))
+    exakt = von == 0 and bis == len(reihenfolge)
+
+    # Halbe LP-Schranke garantiert: mindestens so gut wie der beste Einzelsatz
+    bester = kandidaten[np.argmax(scores[kandidaten])]
+    if not exakt and scores[bester] > scores[maske & ~gratis].sum():
+        maske[:] = gratis
+        maske[bester] = True
+    return _ergebnis(maske, scores, kosten, obere_schranke, exakt)
+
+
+def _ergebnis(maske, scores, kosten, obere_schranke, exakt) -> Auswahl:
+    score = float(scores[maske].sum())
+    return Auswahl(np.flatnonzero(maske), score, int(kosten[maske].sum()),
+                   max(obere_schranke, score), exakt)
+
+
+def greedy_auswahl(scores, kosten, budget: int) -> Auswahl:
+    """
+    Bisherige Auswahl (Referenz für Benchmarks): Score absteigend, je Satz
+    t_len + 1 Tokens gezählt, der erste Satz wird immer genommen.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    kosten = np.asarray(kosten, dtype=np.int64)
+    maske = np.zeros(len(scores), dtype=bool)
+    tokens_aktuell = 0
+    for i in np.argsort(-scores, kind='stable').tolist():
+        t_len = int(kosten[i])
+        if tokens_aktuell + t_len <= budget or tokens_aktuell == 0:
+            maske[i] = True
+            tokens_aktuell += t_len + 1
+    return _ergebnis(maske, scores, kosten, float('nan'), False)
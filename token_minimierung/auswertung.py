@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+Auswertung der Experiment-Ergebnisse: Konsolenausgabe, pandas DataFrame mit
+aggregierten Statistiken, Visualisierung, Kostenanalyse und finaler JSON-Export.
+Neben Mittelwerten Verteilungen je Strategie (verteilung.py): Tail-Latenzen,
+schlechteste Qualität, Bootstrap-Intervalle, Latenz-CDFs und Qualitäts-Boxplots.
+Die Auswertung liest einen ErgebnisSpeicher (Szenario steht in jeder Zeile, kein
+erneutes Tokenisieren); Listen von ExperimentResult werden einmal umgewandelt.
+pandas und matplotlib werden erst beim Aufruf der jeweiligen Funktion geladen.
+"""
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .experiment import ExperimentResult, StrategieSpec
+from .llm_modell import PREISTABELLE, STANDARD_MODELL, LLMModell, get_llm_modell, preistabelle
+
+BASELINE = 'Baseline (keine Kompression)'
+
+# OpenAI GPT-3.5 Turbo Preise (Stand 2024): $0.0015 pro 1K Input-Token
+# Umgerechnet bei ~0.92 €/$: ~0.00138 € pro 1K Input-Token
+# Weitere Modelle und eigene Preise: llm_modell.PREISTABELLE / LLM_PREISTABELLE
+PREIS_PRO_1K_TOKENS = PREISTABELLE[STANDARD_MODELL].eingabe_euro_pro_1k  # Euro
+
+# --- Kurzlabels für die X-Achse (keine Überlappung) ---
+KURZLABELS = {
+    'Baseline (keine Kompression)': 'Baseline',
+    'Chunking (100 Tokens)': 'Chunking',
+    'Manuelle Prompt-Kompression': 'Manuell',
+    'Strukturierte Kompression': 'Strukturiert',
+    'Token-Budget (100 Tokens)': 'Token-Budget',
+    'Token-Budget optimal (100 Tokens)': 'TB optimal',
+}
+FARBEN = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#e67e22']
+
+
+def experiment_ergebnisse_ausgeben(
+    alle_ergebnisse: List[ExperimentResult],
+    prompts: Dict[str, str],
+    strategien: List[StrategieSpec],
+):
+    """Konsolenausgabe je Szenario und Strategie (Reihenfolge prompts × strategien)."""
+    print("=" * 80)
+    print("EXPERIMENT-ERGEBNISSE: Token-Minimierungsstrategien (maschinelle Qualität)")
+    print("=" * 80)
+
+    ergebnisse_iter = iter(alle_ergebnisse)
+    for prompt_name in prompts:
+        print(f"\n📋 Test-Szenario: {prompt_name.upper()}")
+        print("-" * 60)
+
+        for strategie_name, _, _ in strategien:
+            result = next(ergebnisse_iter)
+            print(f"\n  {strategie_name}:")
+            print(f"    Original: {result.original_tokens} Tokens → Komprimiert: {result.komprimierte_tokens} Tokens")
+            print(f"    Kompressionsrate: {result.kompressionsrate:.2f}x")
+            print(f"    Latenz: {result.latenz_ms:.1f} ms{' (aus Zellen-Cache)' if result.latenz_gecacht else ''}")
+            print(f"    Kosten: {result.kosten_euro:.6f} €")
+            print(f"    Qualität (semant. Ähnlichkeit): {result.qualitaets_score*100:.1f}%")
+
+    print("\n" + "=" * 80)
+
+
+def _speicher(ergebnisse: Union['ErgebnisSpeicher', Iterable[ExperimentResult]]) -> 'ErgebnisSpeicher':
+    from .ergebnisspeicher import ErgebnisSpeicher
+    if isinstance(ergebnisse, ErgebnisSpeicher):
+        return ergebnisse
+    return ErgebnisSpeicher.aus_ergebnissen(ergebnisse)
+
+
+def ergebnis_dataframe(ergebnisse: Union['ErgebnisSpeicher', List[ExperimentResult]]):
+    """DataFrame (eine Zeile pro Zelle) und agg_stats (Mittelwerte je Strategie)."""
+    speicher = _speicher(ergebnisse)
+    df = speicher.als_dataframe()
+    agg_stats = speicher.mittelwerte_dataframe(4)
+    print("DataFrame und agg_stats erzeugt (für Visualisierung und Detailauswertung).")
+    return df, agg_stats
+
+
+def visualisierung_erstellen(df, agg_stats, pfad: str):
+    """Kosteneinsparungen ausgeben und 2×2-Übersicht als PNG speichern."""
+    import matplotlib
+    matplotlib.use('Agg')  # Nicht-interaktives Backend (kein Fenster)
+    import matplotlib.pyplot as plt
+
+    # Kosten in Mikro-Euro umrechnen für bessere Darstellung
+    df['Kosten (μ€)'] = df['Kosten (€)'] * 1000000
+    agg_stats['Kosten (μ€)'] = agg_stats['Kosten (€)'] * 1000000
+
+    print("KOSTENEINSPARUNGEN (in Mikro-Euro):")
+    print("-" * 60)
+    baseline_kosten_ue = agg_stats.loc[BASELINE, 'Kosten (μ€)']
+    for strategie in agg_stats.index:
+        if strategie != BASELINE:
+            einsparung = (1 - agg_stats.loc[strategie, 'Kosten (μ€)'] / baseline_kosten_ue) * 100
+            print(f"  {strategie}:")
+            print(f"    Kosten: {agg_stats.loc[strategie, 'Kosten (μ€)']:.1f} μ€ (Baseline: {baseline_kosten_ue:.1f} μ€)")
+            print(f"    Einsparung: {einsparung:.1f}%")
+            print()
+
+    kurz_namen = [KURZLABELS.get(s, s) for s in agg_stats.index]
+    colors = FARBEN
+
+    # Visualisierungen erstellen
+    fig, axes = plt.subplots(2, 2, figsize=(16, 11))
+    fig.suptitle('Ergebnisse: Token-Minimierungsstrategien',
+                 fontsize=16, fontweight='bold', y=0.98)
+
+    # --- 1. Kompressionsrate ---
+    ax1 = axes[0, 0]
+    kompressionsraten = agg_stats['Kompressionsrate'].values
+    bars1 = ax1.bar(kurz_namen, kompressionsraten, color=colors, edgecolor='black', linewidth=1.2)
+    ax1.set_ylabel('Kompressionsrate (x)', fontweight='bold')
+    ax1.set_title('Kompressionsrate', fontweight='bold', fontsize=12)
+    ax1.axhline(y=1, color='red', linestyle='--', alpha=0.5, label='Baseline (1x)')
+    ax1.legend(fontsize=9)
+    y_max1 = max(kompressionsraten) * 1.25
+    ax1.set_ylim(0, y_max1)
+    for bar, val in zip(bars1, kompressionsraten):
+        ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + y_max1 * 0.02,
+                 f'{val:.2f}x', ha='center', va='bottom', fontweight='bold', fontsize=10)
+    ax1.tick_params(axis='x', labelsize=10)
+
+    # --- 2. Latenz ---
+    ax2 = axes[0, 1]
+    latenzen = agg_stats['Latenz (ms)'].values
+    bars2 = ax2.bar(kurz_namen, latenzen, color=colors, edgecolor='black', linewidth=1.2)
+    ax2.set_ylabel('Latenz (ms)', fontweight='bold')
+    ax2.set_title('Latenzreduktion', fontweight='bold', fontsize=12)
+    y_max2 = max(latenzen) * 1.20
+    ax2.set_ylim(0, y_max2)
+    for bar, val in zip(bars2, latenzen):
+        ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + y_max2 * 0.02,
+                 f'{val:.0f} ms', ha='center', va='bottom', fontweight='bold', fontsize=10)
+    ax2.tick_params(axis='x', labelsize=10)
+
+    # --- 3. Kosteneinsparungen ---
+    ax3 = axes[1, 0]
+    kosten = agg_stats['Kosten (μ€)'].values
+    bars3 = ax3.bar(kurz_namen, kosten, color=colors, edgecolor='black', linewidth=1.2)
+    ax3.set_ylabel('Kosten (μ€)', fontweight='bold')
+    ax3.set_title('Kosteneinsparungen', fontweight='bold', fontsize=12)
+    y_max3 = max(kosten) * 1.25
+    ax3.set_ylim(0, y_max3)
+    for bar, val in zip(bars3, kosten):
+        ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + y_max3 * 0.02,
+                 f'{val:.1f} μ€', ha='center', va='bottom', fontweight='bold', fontsize=10)
+    ax3.tick_params(axis='x', labelsize=10)
+
+    # --- 4. Qualität – Semantische Ähnlichkeit ---
+    ax4 = axes[1, 1]
+    qualitaeten = agg_stats['Qualität (%)'].values
+    bars4 = ax4.bar(kurz_namen, qualitaeten, color=colors, edgecolor='black', linewidth=1.2)
+    ax4.set_ylabel('Qualität (%)', fontweight='bold')
+    ax4.set_title('Qualität – Semantische Ähnlichkeit', fontweight='bold', fontsize=12)
+    ax4.set_ylim(0, 115)
+    for bar, val in zip(bars4, qualitaeten):
+        ax4.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1.5,
+                 f'{val:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=10)
+    ax4.tick_params(axis='x', labelsize=10)
+
+    # --- Legende unter dem Plot ---
+    legend_labels = [f'{KURZLABELS.get(s, s)}' for s in agg_stats.index]
+    fig.legend(bars1, legend_labels, loc='lower center', ncol=len(legend_labels),
+               fontsize=10, frameon=True, fancybox=True, shadow=True,
+               bbox_to_anchor=(0.5, -0.02))
+
+    plt.tight_layout(rect=[0, 0.04, 1, 0.95])
+    plt.savefig(pfad, dpi=150, bbox_inches='tight')
+    plt.close('all')
+    print(f"\n✅ Visualisierung gespeichert: {os.path.basename(pfad)}")
+
+
+def verteilungen_ausgeben(ergebnisse: Union['ErgebnisSpeicher', List[ExperimentResult]],
+                          nach='strategie') -> Tuple['Verteilung', 'Verteilung']:
+    """Tail-Latenz und Qualitätsverteilung je Gruppe ausgeben; liefert (latenz, qualitaet)."""
+    speicher = _speicher(ergebnisse)
+    latenz = speicher.verteilung('latenz_ms', nach)
+    qualitaet = speicher.verteilung('qualitaets_score', nach)
+    ki = f"{latenz.konfidenz * 100:.0f}%-KI"
+
+    print(f"TAIL-LATENZ UND QUALITÄTSVERTEILUNG (Bootstrap-{ki}):")
+    print("=" * 118)
+    print(f"{'Gruppe':<35} {'n':>7} {'Lat. p50':>9} {'p95':>9} {'p99':>9} {'p99 ' + ki:>19} "
+          f"{'Qual. Ø':>8} {'p5':>7} {'min':>7} {'Ø ' + ki:>15}")
+    print("-" * 118)
+    p99_ki = latenz.perzentile_ki[:, latenz.perzentile.index(99)]
+    for i, gruppe in enumerate(latenz.gruppen):
+        latenz_ki = f"{p99_ki[i, 0]:.1f}–{p99_ki[i, 1]:.1f}"
+        qualitaet_ki = f"{qualitaet.mittel_ki[i, 0] * 100:.1f}–{qualitaet.mittel_ki[i, 1] * 100:.1f}%"
+        print(f"{' / '.join(gruppe):<35} {latenz.anzahl[i]:>7} {latenz.perzentil(50)[i]:>9.1f} "
+              f"{latenz.perzentil(95)[i]:>9.1f} {latenz.perzentil(99)[i]:>9.1f} "
+              f"{latenz_ki:>19} "
+              f"{qualitaet.mittel[i] * 100:>7.1f}% {qualitaet.perzentil(5)[i] * 100:>6.1f}% "
+              f"{qualitaet.minimum[i] * 100:>6.1f}% {qualitaet_ki:>15}")
+    print()
+    return latenz, qualitaet
+
+
+def verteilungen_visualisieren(latenz: 'Verteilung', qualitaet: 'Verteilung', pfad: str):
+    """
+    Latenz-CDF (log. Achse, p95/p99 markiert) und Qualitäts-Boxplot je Gruppe als PNG.
+    Beide zeichnen vorberechnete Perzentile (ax.bxp), nie die Rohwerte – auch bei
+    Millionen Zeilen schnell.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Nicht-interaktives Backend (kein Fenster)
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from .verteilung import CDF_PERZENTILE
+
+    namen = [KURZLABELS.get(' / '.join(g), ' / '.join(g)) for g in latenz.gruppen]
+    farben = [FARBEN[i % len(FARBEN)] for i in range(len(namen))]
+    anteile = np.asarray(CDF_PERZENTILE) / 100
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle('Verteilungen: Tail-Latenz und Qualität', fontsize=16, fontweight='bold')
+
+    # --- 1. Latenz-CDF ---
+    for i, (name, farbe) in enumerate(zip(namen, farben)):
+        ax1.plot(latenz.cdf[i], anteile, color=farbe, linewidth=2, label=name)
+    ax1.set_xscale('log')
+    for p in (95, 99):
+        ax1.axhline(y=p / 100, color='grey', linestyle='--', alpha=0.5)
+        ax1.text(ax1.get_xlim()[0], p / 100, f' p{p}', va='bottom', fontsize=9, color='grey')
+    ax1.set_xlabel('Latenz (ms)', fontweight='bold')
+    ax1.set_ylabel('Anteil der Anfragen', fontweight='bold')
+    ax1.set_title('Latenz-CDF', fontweight='bold', fontsize=12)
+    ax1.set_ylim(0, 1.01)
+    ax1.grid(True, which='both', alpha=0.3)
+    ax1.legend(fontsize=9, loc='lower right')
+
+    # --- 2. Qualitäts-Boxplot (Whisker p5–p95, Punkt: schlechtester Wert) ---
+    statistiken = [{
+        'label': name, 'mean': qualitaet.mittel[i] * 100,
+        'med': qualitaet.perzentil(50)[i] * 100,
+        'q1': qualitaet.perzentil(25)[i] * 100, 'q3': qualitaet.perzentil(75)[i] * 100,
+        'whislo': qualitaet.perzentil(5)[i] * 100, 'whishi': qualitaet.perzentil(95)[i] * 100,
+        'fliers': [qualitaet.minimum[i] * 100],
+    } for i, name in enumerate(namen)]
+    boxen = ax2.bxp(statistiken, showmeans=True, patch_artist=True)
+    for box, farbe in zip(boxen['boxes'], farben):
+        box.set_facecolor(farbe)
+        box.set_alpha(0.7)
+    ax2.set_ylabel('Qualität (%)', fontweight='bold')
+    ax2.set_title('Qualität je Strategie (Whisker p5–p95, Punkt: Minimum)', fontweight='bold', fontsize=12)
+    ax2.grid(True, axis='y', alpha=0.3)
+    ax2.tick_params(axis='x', labelsize=10)
+
+    plt.tight_layout(rect=[0, 0, 1, 0.94])
+    plt.savefig(pfad, dpi=150, bbox_inches='tight')
+    plt.close('all')
+    print(f"✅ Verteilungen gespeichert: {os.path.basename(pfad)}")
+
+
+def berechne_kosten(tokens):
+    """Kosten einer Anfrage mit tokens Eingabe-Tokens beim aktiven LLM-Modell."""
+    return get_llm_modell().kosten_euro(tokens)
+
+
+def kostenanalyse(ergebnisse: Union['ErgebnisSpeicher', List[ExperimentResult]],
+                  modell: Union[str, LLMModell, None] = None):
+    """
+    Kosten mit höherer Präzision neu berechnen (Preise von modell, Standard: aktives
+    LLM-Modell) und pro 1K/1M Anfragen ausgeben, dazu je Modell der Preistabelle.
+    """
+    speicher = _speicher(ergebnisse)
+    if not isinstance(modell, LLMModell):
+        modell = get_llm_modell(modell)
+
+    # Kosten für alle Ergebnisse neu berechnen (eine Spalte, vektorisiert);
+    # Ausgabe-Tokens kosten je Anfrage gleich viel
+    speicher.kosten_neu_berechnen(modell.eingabe_euro_pro_1k, modell.kosten_euro(0))
+    df = speicher.als_dataframe()
+
+    # Kostenanalyse
+    print(f"KOSTENANALYSE (pro 1000 Anfragen, {modell.name}):")
+    print("=" * 80)
+    print(f"{'Strategie':<35} {'Kosten/1K':<15} {'Einsparung':<15}")
+    print("-" * 80)
+
+    namen, mittel = speicher.mittelwerte('strategie', ('kosten_euro',))
+    kosten_pro_1k = dict(zip(namen, mittel['kosten_euro'] * 1000))
+    baseline_kosten = kosten_pro_1k[BASELINE]
+
+    for strategie in kosten_pro_1k:
+        if strategie == BASELINE:
+            print(f"{strategie:<35} {kosten_pro_1k[strategie]:.4f} €{'':<10} {'(Referenz)':<15}")
+        else:
+            einsparung = (1 - kosten_pro_1k[strategie] / baseline_kosten) * 100
+            print(f"{strategie:<35} {kosten_pro_1k[strategie]:.4f} €{'':<10} {einsparung:>6.1f}%")
+
+    print("\n")
+
+    # Kosten pro 1 Million Anfragen
+    print("KOSTENANALYSE (pro 1 Million Anfragen):")
+    print("=" * 80)
+    print(f"{'Strategie':<35} {'Kosten/1M':<15} {'Einsparung':<15}")
+    print("-" * 80)
+
+    for strategie in kosten_pro_1k:
+        kosten_1m = kosten_pro_1k[strategie] * 1000
+        if strategie == BASELINE:
+            print(f"{strategie:<35} {kosten_1m:.2f} €{'':<10} {'(Referenz)':<15}")
+        else:
+            einsparung = (1 - kosten_1m / (baseline_kosten * 1000)) * 100
+            print(f"{strategie:<35} {kosten_1m:.2f} €{'':<10} {einsparung:>6.1f}%")
+
+    print("\n")
+
+    # Dieselben Token-Zahlen zu den Preisen aller Modelle der Preistabelle
+    tabelle = preistabelle()
+    print("KOSTEN JE MODELL (pro 1 Million Anfragen, inkl. erwarteter Ausgabe-Tokens):")
+    print("=" * 80)
+    print(f"{'Strategie':<35}" + "".join(f" {name:>14}" for name in tabelle))
+    print("-" * 80)
+    namen, mittel = speicher.mittelwerte('strategie', ('komprimierte_tokens',))
+    for strategie, tokens in zip(namen, mittel['komprimierte_tokens'].tolist()):
+        print(f"{strategie:<35}" + "".join(f" {m.kosten_euro(tokens) * 1e6:>12.2f} €" for m in tabelle.values()))
+
+    print("\n")
+
+    # Zusammenfassung der Ergebnisse für die Präsentation
+    print("ZUSAMMENFASSUNG DER EXPERIMENT-ERGEBNISSE:")
+    print("=" * 100)
+    zusammenfassung = speicher.mittelwerte_dataframe(2)
+    print(zusammenfassung.to_string())
+    return df
+
+
+def finale_ergebnisse(ergebnisse: Union['ErgebnisSpeicher', List[ExperimentResult]],
+                      strategie_namen: List[str], pfad: str):
+    """
+    Mittelwerte je Strategie ausgeben und als experiment_daten.json speichern.
+    Jeder Strategie-Eintrag behält die bisherigen Mittelwert-Schlüssel und ergänzt
+    - 'verteilung': {'latenz_ms', 'qualitaet_prozent'} mit anzahl, mittel, min, max,
+      p1 … p99, Bootstrap-Intervallen (*_ki95: [unten, oben]) und 'cdf'
+    - 'szenarien': {Szenario: dieselben Kennzahlen je Szenario, ohne 'cdf'}
+    """
+    speicher = _speicher(ergebnisse)
+
+    # Finale Zusammenfassung für die Präsentation
+    print("=" * 100)
+    print("FINALE EXPERIMENT-ERGEBNISSE: Token-Minimierungsstrategien")
+    print("=" * 100)
+
+    namen, mittel = speicher.mittelwerte('strategie')
+    zeile = {name: i for i, name in enumerate(namen)}
+    ergebnisse_dict = {}
+    for strategie in strategie_namen:
+        i = zeile[strategie]
+        ergebnisse_dict[strategie] = {
+            'original_tokens': mittel['original_tokens'][i],
+            'komprimierte_tokens': mittel['komprimierte_tokens'][i],
+            'kompressionsrate': mittel['kompressionsrate'][i],
+            'latenz_ms': mittel['latenz_ms'][i],
+            'kosten_euro': mittel['kosten_euro'][i],
+            'qualitaet': mittel['qualitaets_score'][i]
+        }
+
+    # Verteilungen je Strategie und je (Strategie, Szenario) aus allen Zeilen
+    verteilungen = {
+        'latenz_ms': (speicher.verteilung('latenz_ms'),
+                      speicher.verteilung('latenz_ms', ('strategie', 'szenario'))),
+        'qualitaet_prozent': (speicher.verteilung('qualitaets_score'),
+                              speicher.verteilung('qualitaets_score', ('strategie', 'szenario'))),
+    }
+    je_strategie = {name: gesamt.als_dict(100 if name == 'qualitaet_prozent' else 1)
+                    for name, (gesamt, _) in verteilungen.items()}
+    je_szenario = {strategie: {} for strategie in strategie_namen}
+    for name, (_, v) in verteilungen.items():
+        eintraege = v.als_dict(100 if name == 'qualitaet_prozent' else 1, cdf=False).values()
+        for (strategie, szenario), werte in zip(v.gruppen, eintraege):
+            if strategie in je_szenario:
+                je_szenario[strategie].setdefault(szenario, {})[name] = werte
+
+    # Ausgabe
+    for strategie, daten in ergebnisse_dict.items():
+        print(f"\n📊 {strategie}")
+        print("-" * 80)
+        print(f"  Original Tokens:        {daten['original_tokens']:.0f}")
+        print(f"  Komprimierte Tokens:    {daten['komprimierte_tokens']:.0f}")
+        print(f"  Kompressionsrate:       {daten['kompressionsrate']:.2f}x")
+        print(f"  Latenz:                 {daten['latenz_ms']:.1f} ms")
+        latenz = je_strategie['latenz_ms'][strategie]
+        print(f"  Latenz p95 / p99:       {latenz['p95']:.1f} / {latenz['p99']:.1f} ms")
+        print(f"  Kosten pro Anfrage:     {daten['kosten_euro']:.6f} €")
+        print(f"  Kosten pro 1K Anfragen: {daten['kosten_euro'] * 1000:.4f} €")
+        print(f"  Qualität:               {daten['qualitaet'] * 100:.0f}%")
+        qualitaet = je_strategie['qualitaet_prozent'][strategie]
+        print(f"  Qualität p5 / Minimum:  {qualitaet['p5']:.0f}% / {qualitaet['min']:.0f}%")
+
+    # Speichere die Ergebnisse für die Präsentation
+    export_daten = {}
+    for strategie, daten in ergebnisse_dict.items():
+        export_daten[strategie] = {
+            'original_tokens': float(daten['original_tokens']),
+            'komprimierte_tokens': float(daten['komprimierte_tokens']),
+            'kompressionsrate': float(daten['kompressionsrate']),
+            'latenz_ms': float(daten['latenz_ms']),
+            'kosten_euro_pro_anfrage': float(daten['kosten_euro']),
+            'kosten_euro_pro_1k': float(daten['kosten_euro'] * 1000),
+            'kosten_euro_pro_1m': float(daten['kosten_euro'] * 1000000),
+            'qualitaet_prozent': float(daten['qualitaet'] * 100),
+            'verteilung': {name: werte[strategie] for name, werte in je_strategie.items()},
+            'szenarien': je_szenario[strategie],
+        }
+
+    with open(pfad, 'w', encoding='utf-8') as f:
+        json.dump(export_daten, f, indent=2, ensure_ascii=False)
+
+    print(f"\n✅ Experiment-Daten gespeichert: {os.path.basename(pfad)}")
+    return export_daten
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+Strategie 4: Chunking mit Überlappung, in-memory, als Streaming-Variante und
+satzausgerichtet mit Worker-Pool für sehr lange Dokumente.
+"""
+import os
+import re
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .dokument import Document, dokument_analysieren
+from .instrumentierung import stufe
+from .segmentierung import ABKUERZUNGEN, saetze_zerlegen
+from .tokenizer import get_encoder, token_anzahl, tokenisieren
+
+# =============================================================================
+# Strategie 4: Chunking mit Überlappung (LongLLMLingua / lange Kontexte)
+# =============================================================================
+# Lange Dokumente werden in Chunks mit Überlappung geteilt; pro Chunk wird
+# eine kurze Repräsentation erzeugt (Anfang + Ende des Chunks oder zentrale
+# Sätze), um Kontextverlust in der Mitte zu mindern. Die Repräsentationen
+# werden konkateniert – so bleibt eine dokumentweite Übersicht erhalten.
+# =============================================================================
+
+def kompression_chunking(
+    prompt: Union[str, Document],
+    chunk_groesse: int = 100,
+    overlap: int = 20,
+    saetze_pro_chunk: int = 3,
+) -> str:
+    """
+    Chunking mit Überlappung:
+    - Prompt in Token-Chunks (chunk_groesse) mit Überlappung (overlap) zerlegen
+    - Pro Chunk: erste und letzte Sätze bzw. bis zu saetze_pro_chunk Sätze behalten
+    - Alle Chunk-Repräsentationen aneinanderhängen (kein Verlust „welcher Teil wo stand“)
+    Ein übergebenes Document liefert die Token-Folge (keine erneute Tokenisierung).
+    """
+    _chunk_parameter_pruefen(chunk_groesse, overlap)
+    encoder = get_encoder()
+    if isinstance(prompt, Document):
+        prompt, tokens = prompt.text, prompt.tokens.tolist()
+    else:
+        with stufe('tokenisierung'):
+            tokens = tokenisieren(prompt)
+    if len(tokens) <= chunk_groesse:
+        return prompt
+
+    bereiche = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + chunk_groesse, len(tokens))
+        bereiche.append((start, end))
+        start += chunk_groesse - overlap
+        if end == len(tokens):
+            break
+    with stufe('dekodierung'):
+        chunk_texte = [encoder.decode(tokens[a:b]) for a, b in bereiche]
+    chunks = [_chunk_repraesentation(t, saetze_pro_chunk) for t in chunk_texte]
+    return '\n\n'.join(f"[Abschnitt {i+1}/{len(chunks)}] {c}" for i, c in enumerate(chunks))
+
+
+def _chunk_parameter_pruefen(chunk_groesse: int, overlap: int) -> None:
+    """Wie sweep.konfigurationen: 0 <= overlap < chunk_groesse, sonst käme das Chunking nicht voran."""
+    if not 0 <= overlap < chunk_groesse:
+        raise ValueError(f"Erwartet 0 <= overlap < chunk_groesse: overlap={overlap}, chunk_groesse={chunk_groesse}")
+
+
+def _chunk_repraesentation(chunk_text: str, saetze_pro_chunk: int) -> str:
+    """Erster Satz + letzte (saetze_pro_chunk - 1) Sätze eines Chunks."""
+    saetze = saetze_zerlegen(chunk_text)
+    if len(saetze) <= saetze_pro_chunk:
+        return chunk_text
+    return ' '.join(saetze[:1] + saetze[-saetze_pro_chunk+1:] if saetze_pro_chunk > 1 else saetze[:1])
+
+
+# --- Streaming-Variante für sehr große Eingaben (begrenzter Speicher) ---
+
+# Ab dieser Restlänge ohne sicheren Schnittpunkt wird hart geschnitten
+MAX_UNSTABILER_REST = 1 << 16
+
+
+def _stabiler_schnitt(text: str) -> int:
+    """
+    Letzte Position, an der inkrementell tokenisiert werden darf: ein Leerzeichen
+    direkt nach einem Buchstaben/einer Ziffer. Dort endet in cl100k immer ein
+    Pre-Tokenizer-Stück, die Tokens links davon hängen nicht vom Folgetext ab.
+    """
+    i = text.rfind(' ')
+    while i > 0:
+        if text[i - 1].isalnum():
+            return i
+        i = text.rfind(' ', 0, i)
+    return 0
+
+
+def textbloecke_aus_datei(pfad, block_bytes: int = 1 << 20, encoding: str = 'utf-8'):
+    """
+    Liest eine Datei per mmap blockweise als Text (inkrementelles Dekodieren,
+    Mehrbyte-Zeichen an Blockgrenzen bleiben intakt). Zeilenenden unverändert.
+    """
+    import codecs
+    import mmap
+    with open(pfad, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            for pos in range(0, len(mm), block_bytes):
+                yield decoder.decode(mm[pos:pos + block_bytes])
+            yield decoder.decode(b'', final=True)
+
+
+def _textbloecke(quelle, block_zeichen: int):
+    if isinstance(quelle, str):
+        yield quelle
+    elif isinstance(quelle, os.PathLike):
+        yield from textbloecke_aus_datei(quelle, block_bytes=block_zeichen)
+    elif hasattr(quelle, 'read'):
+        while True:
+            block = quelle.read(block_zeichen)
+            if not block:
+                break
+            yield block
+    else:
+        yield from quelle
+
+
+def kompression_chunking_stream(
+    quelle,
+    chunk_groesse: int = 100,
+    overlap: int = 20,
+    saetze_pro_chunk: int = 3,
+    kopfzeile: bool = True,
+    block_zeichen: int = 1 << 16,
+):
+    """
+    Streaming-Chunking mit begrenztem Speicher für sehr große Dokumente:
+    - quelle: Text, Dateiobjekt, Iterator über Textblöcke oder Pfad (os.PathLike, per mmap)
+    - Tokenisierung blockweise, das overlap-Fenster wird zwischen Chunks mitgeführt
+    - Liefert "[Abschnitt i] …" fortlaufend; die Gesamtzahl ist beim Streamen
+      unbekannt, daher ohne "/n" (kopfzeile=False: nur die Repräsentationen)
+    - Passt die gesamte Eingabe in einen Chunk, wird sie unverändert geliefert
+    Spitzenspeicher hängt nur von chunk_groesse und block_zeichen ab.
+    """
+    _chunk_parameter_pruefen(chunk_groesse, overlap)
+    schritt = chunk_groesse - overlap
+    encoder = get_encoder()
+    puffer: List[int] = []  # Tokens ab Beginn des nächsten Chunks
+    rest = ''               # noch nicht sicher tokenisierbarer Textrest
+    nummer = 0
+
+    def abschnitt(tokens):
+        nonlocal nummer
+        nummer += 1
+        with stufe('dekodierung'):
+            text = encoder.decode(tokens)
+        rep = _chunk_repraesentation(text, saetze_pro_chunk)
+        return f"[Abschnitt {nummer}] {rep}" if kopfzeile else rep
+
+    for block in _textbloecke(quelle, block_zeichen):
+        rest += block
+        schnitt = _stabiler_schnitt(rest)
+        if schnitt == 0:
+            if len(rest) < MAX_UNSTABILER_REST:
+                continue
+            schnitt = len(rest)  # kein Schnittpunkt: hart schneiden (Tokens an der Grenze können abweichen)
+        with stufe('tokenisierung'):
+            puffer.extend(tokenisieren(rest[:schnitt]))
+        rest = rest[schnitt:]
+        # Chunk nur ausgeben, wenn sicher noch Tokens folgen (sonst ist es der letzte)
+        while len(puffer) > chunk_groesse:
+            yield abschnitt(puffer[:chunk_groesse])
+            del puffer[:schritt]
+
+    if rest:
+        with stufe('tokenisierung'):
+            puffer.extend(tokenisieren(rest))
+    if nummer == 0 and len(puffer) <= chunk_groesse:
+        if puffer:
+            yield encoder.decode(puffer)
+        return
+    while len(puffer) > chunk_groesse:
+        yield abschnitt(puffer[:chunk_groesse])
+        del puffer[:schritt]
+    yield abschnitt(puffer)
+
+
+# --- Satzausgerichtete Variante mit Worker-Pool (Dokumente mit 100K+ Tokens) ---
+
+SEGMENT_ZEICHEN = 1 << 16  # Analyse-Einheit der Worker (unabhängig von der Worker-Zahl)
+AUSWAHL = ('rand', 'centrality')
+_SATZENDE = re.compile(r'[.!?]\s')
+
+
+def _segment_grenzen(text: str, segment_zeichen: int) -> List[int]:
+    """
+    Schnittstellen (Zeichenpositionen) etwa alle segment_zeichen, jeweils am ersten
+    Satzende danach, das auch die Segmentierung des ganzen Texts als Grenze sieht
+    ([.!?] + Leerraum, keine Abkürzung). Die Sätze der Segmente sind damit genau
+    die Sätze des ganzen Texts.
+    """
+    grenzen = [0]
+    pos = segment_zeichen
+    while pos < len(text):
+        for m in _SATZENDE.finditer(text, pos):
+            if not text.endswith(tuple(ABKUERZUNGEN), 0, m.start() + 1):
+                grenzen.append(m.start() + 1)
+                break
+        else:
+            break
+        pos = grenzen[-1] + segment_zeichen
+    return grenzen + [len(text)]
+
+
+def _segment_analysieren(segment: str, letztes: bool = True) -> Tuple[List[str], List[int]]:
+    """
+    Sätze und Token-Anzahl je Satz eines Segments (läuft im Worker). Vor einer
+    Schnittstelle endet der letzte Satz ohne sein Satzzeichen, wie mitten im Text;
+    seine Tokens werden dann ohne das Satzzeichen neu gezählt.
+    """
+    doc = dokument_analysieren(segment)
+    saetze = doc.saetze
+    laengen = doc.satz_token_laengen.tolist()
+    if not letztes and saetze:
+        saetze[-1] = saetze[-1][:-1]
+        laengen[-1] = token_anzahl(saetze[-1])
+    return saetze, laengen
+
+
+def _chunk_bereiche(laengen: Sequence[int], chunk_groesse: int, overlap: int,
+                    toleranz: float) -> List[Tuple[int, int]]:
+    """
+    Chunks als Satzbereiche [a, b): Ende an der Satzgrenze, die chunk_groesse Tokens
+    ab Chunk-Beginn am nächsten liegt (bevorzugt im Fenster ± toleranz · chunk_groesse;
+    ein zu langer Satz bildet allein einen Chunk). Der nächste Chunk beginnt an der
+    Satzgrenze etwa overlap Tokens vor dem Ende, mindestens einen Satz weiter, und
+    endet mindestens einen Satz nach dem vorigen.
+    """
+    import numpy as np
+    kumuliert = np.concatenate(([0], np.cumsum(laengen, dtype=np.int64)))
+    n = len(laengen)
+    spiel = toleranz * chunk_groesse
+    bereiche = []
+    a, min_ende = 0, 1
+    while a < n:
+        ziel = kumuliert[a] + chunk_groesse
+        if kumuliert[n] <= ziel + spiel:
+            b = n
+        else:
+            lo = max(int(np.searchsorted(kumuliert, ziel - spiel, side='left')), min_ende)
+            hi = int(np.searchsorted(kumuliert, ziel + spiel, side='right'))
+            if lo < hi:
+                b = lo + int(np.argmin(np.abs(kumuliert[lo:hi] - ziel)))
+            else:  # keine Grenze im Fenster: die nähere davor oder danach
+                vor = int(np.searchsorted(kumuliert, ziel, side='right')) - 1
+                b = vor if ziel - kumuliert[vor] <= kumuliert[vor + 1] - ziel else vor + 1
+                b = max(b, min_ende)
+        bereiche.append((a, b))
+        min_ende = b + 1
+        if b == n:
+            break
+        if overlap <= 0:
+            a = b
+            continue
+        kandidaten = np.arange(a + 1, b + 1)
+        a = int(kandidaten[np.argmin(np.abs(kumuliert[kandidaten] - (kumuliert[b] - overlap)))])
+    return bereiche
+
+
+def _rand_auswahl(saetze: List[str], saetze_pro_chunk: int) -> str:
+    """Erster Satz + letzte (saetze_pro_chunk - 1) Sätze, wie _chunk_repraesentation."""
+    if len(saetze) <= saetze_pro_chunk:
+        return ' '.join(saetze)
+    return ' '.join(saetze[:1] + saetze[-saetze_pro_chunk+1:] if saetze_pro_chunk > 1 else saetze[:1])
+
+
+def _chunks_darstellen(aufgabe) -> List[str]:
+    """Repräsentationen einer Gruppe von Chunks (läuft im Worker)."""
+    chunks, embeddings, saetze_pro_chunk = aufgabe
+    if embeddings is None:
+        return [_rand_auswahl(saetze, saetze_pro_chunk) for saetze in chunks]
+    import numpy as np
+    ergebnisse = []
+    for saetze, emb in zip(chunks, embeddings):
+        if len(saetze) <= saetze_pro_chunk:
+            ergebnisse.append(' '.join(saetze))
+            continue
+        zentrum = emb.mean(axis=0)
+        scores = (emb @ zentrum) / (np.linalg.norm(emb, axis=1) * np.linalg.norm(zentrum) + 1e-9)
+        behalten = np.sort(np.argsort(-scores, kind='stable')[:saetze_pro_chunk])
+        ergebnisse.append(' '.join(saetze[i] for i in behalten.tolist()))
+    return ergebnisse
+
+
+def _encoder_init():
+    tokenisieren("warm-up")
+
+
+def kompression_chunking_saetze(
+    prompt: str,
+    chunk_groesse: int = 100,
+    overlap: int = 20,
+    saetze_pro_chunk: int = 3,
+    toleranz: float = 0.25,
+    auswahl: str = 'rand',
+    modus: str = 'prozesse',
+    worker: Optional[int] = None,
+    segment_zeichen: int = SEGMENT_ZEICHEN,
+) -> str:
+    """
+    Chunking an Satzgrenzen statt an rohen Token-Grenzen:
+    - Text in Segmente von etwa segment_zeichen an sicheren Satzenden teilen; die
+      Worker segmentieren und tokenisieren je ein Segment (keine Dekodierung von
+      Token-Fragmenten, kein erneutes Segmentieren je Chunk)
+    - Chunk-Grenzen aus den kumulierten Token-Längen der Sätze (_chunk_bereiche)
+    - Repräsentation je Chunk im Worker-Pool: 'rand' (erster und letzte Sätze)
+      oder 'centrality' (saetze_pro_chunk Sätze nah am Chunk-Mittel; Embeddings
+      einmal gebündelt im aufrufenden Prozess)
+    - modus 'seriell', 'threads' oder 'prozesse'; das Ergebnis hängt nicht von
+      Modus und Worker-Zahl ab und bleibt in Dokumentreihenfolge
+    """
+    if auswahl not in AUSWAHL:
+        raise ValueError(f"Unbekannte Auswahl: {auswahl!r} ({', '.join(AUSWAHL)})")
+    from .runner import MODI
+    if modus not in MODI:
+        raise ValueError(f"Unbekannter Modus: {modus!r} ({', '.join(MODI)})")
+    _chunk_parameter_pruefen(chunk_groesse, overlap)
+    grenzen = _segment_grenzen(prompt, segment_zeichen)
+    segmente = [prompt[a:b] for a, b in zip(grenzen, grenzen[1:])]
+    worker = 1 if modus == 'seriell' else min(worker or os.cpu_count() or 1, max(len(segmente), 1))
+
+    if worker == 1:
+        pool = None
+        abbilden = map
+    else:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        pool = (ProcessPoolExecutor(max_workers=worker, initializer=_encoder_init) if modus == 'prozesse'
+                else ThreadPoolExecutor(max_workers=worker))
+        abbilden = pool.map
+    try:
+        with stufe('segmentierung'):
+            analysen = list(abbilden(_segment_analysieren, segmente,
+                                     [i == len(segmente) - 1 for i in range(len(segmente))]))
+        saetze = [s for satz_liste, _ in analysen for s in satz_liste]
+        laengen = [n for _, laengen_liste in analysen for n in laengen_liste]
+        if sum(laengen) <= chunk_groesse:
+            return prompt
+        bereiche = _chunk_bereiche(laengen, chunk_groesse, overlap, toleranz)
+
+        embeddings = None
+        if auswahl == 'centrality':
+            from .embedding import get_embedding_dienst
+            import numpy as np
+            embeddings = np.asarray(get_embedding_dienst().encode(saetze))
+        # Gruppen zusammenhängender Chunks je Aufgabe (weniger Übertragungen als je Chunk)
+        gruppe = max(1, -(-len(bereiche) // (4 * worker)))
+        aufgaben = [([saetze[a:b] for a, b in bereiche[i:i + gruppe]],
+                     None if embeddings is None else [embeddings[a:b] for a, b in bereiche[i:i + gruppe]],
+                     saetze_pro_chunk)
+                    for i in range(0, len(bereiche), gruppe)]
+        with stufe('auswahl'):
+            chunks = [c for teil in abbilden(_chunks_darstellen, aufgaben) for c in teil]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return '\n\n'.join(f"[Abschnitt {i+1}/{len(chunks)}] {c}" for i, c in enumerate(chunks))
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Strategie 5: Entfernen nahezu doppelter Sätze über MinHash/LSH (ohne Modell).
+Laufzeit etwa linear in der Satzanzahl: jeder Satz wird einmal gehasht, Paare
+werden nur innerhalb gemeinsamer LSH-Fächer verglichen.
+"""
+from functools import lru_cache
+from typing import Iterator, List, Tuple, Union
+
+import numpy as np
+
+from .dokument import Document
+from .instrumentierung import stufe
+from .segmentierung import satz_spans, text_normalisieren
+
+# =============================================================================
+# Strategie 5: Near-Duplicate-Entfernung (MinHash + Locality-Sensitive Hashing)
+# =============================================================================
+# Lange Kontexte (zusammengeführte Dokumente, Chat-Verläufe, Log-Auszüge)
+# wiederholen Sätze oft wörtlich oder mit kleinen Abweichungen. Ähnlichkeit =
+# Jaccard der Zeichen-Shingles zweier Sätze; MinHash-Signaturen schätzen sie,
+# LSH-Bänder liefern die Kandidatenpaare. Behalten wird jeweils das erste
+# Vorkommen an seiner ursprünglichen Position.
+# =============================================================================
+
+_P = np.uint64(1_000_003)
+_MISCHEN = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT = np.uint64(32)
+KANDIDATEN_RECALL = 0.95  # Mindest-Kollisionswahrscheinlichkeit eines Paars genau an der Schwelle
+MAX_SHINGLE = 64           # Obergrenzen für Anfrageparameter: Hash-Zeit wächst linear mit shingle,
+MAX_PERMUTATIONEN = 1024   # Zeit und Speicher der Signaturen linear mit permutationen
+
+
+def kompression_duplikate(
+    prompt: Union[str, Document],
+    schwelle: float = 0.8,
+    shingle: int = 5,
+    permutationen: int = 128,
+    seed: int = 0,
+) -> str:
+    """
+    Entfernt Sätze, die einem früheren Satz nahezu gleichen:
+    - Sätze in Zeichen-Shingles der Länge shingle zerlegen (Kleinschreibung)
+    - Jaccard-Ähnlichkeit ≥ schwelle zu einem früheren Satz → Satz entfällt
+    - Reihenfolge und erstes Vorkommen bleiben erhalten, behaltene Sätze samt
+      Satzzeichen (Abschnitt bis zum nächsten Satzanfang im normalisierten Text)
+    Ohne Duplikate wird der Prompt unverändert zurückgegeben (Formatierung bleibt).
+    """
+    if isinstance(prompt, Document):
+        text, text_norm, spans = prompt.text, prompt.text_norm, prompt.spans.tolist()
+    else:
+        text, text_norm = prompt, text_normalisieren(prompt)
+        spans = satz_spans(text_norm)
+    duplikat = duplikate_finden([text_norm[a:b] for a, b in spans], schwelle, shingle, permutationen, seed)
+    if not duplikat.any():
+        return text
+    anfaenge = [a for a, _ in spans[1:]] + [len(text_norm)]
+    return ' '.join(text_norm[a:ende].rstrip() for (a, _), ende, d in zip(spans, anfaenge, duplikat.tolist())
+                    if not d)
+
+
+def duplikate_finden(
+    saetze: List[str],
+    schwelle: float = 0.8,
+    shingle: int = 5,
+    permutationen: int = 128,
+    seed: int = 0,
+    block: int = 512,
+) -> np.ndarray:
+    """
+    Maske (bool je Satz): True, wenn ein früherer Satz nahezu gleich ist.
+    - wörtliche Wiederholungen (nach Kleinschreibung) per Dictionary, exakt
+    - übrige Sätze: MinHash-Signaturen, LSH-Bänder passend zu schwelle; je Band
+      wird ein Satz mit dem ersten und dem vorigen Satz seines Fachs verglichen,
+      entschieden wird über die geschätzte Jaccard-Ähnlichkeit der Signaturen
+    Probabilistisch: Paare nahe der Schwelle (Schätzfehler ≈ 0.03 bei 128
+    Permutationen) können abweichend eingestuft werden.
+    """
+    if not 0.0 < schwelle <= 1.0:
+        raise ValueError(f"schwelle muss in (0, 1] liegen: {schwelle}")
+    if not 1 <= shingle <= MAX_SHINGLE:
+        raise ValueError(f"shingle muss in [1, {MAX_SHINGLE}] liegen: {shingle}")
+    if not 1 <= permutationen <= MAX_PERMUTATIONEN:
+        raise ValueError(f"permutationen muss in [1, {MAX_PERMUTATIONEN}] liegen: {permutationen}")
+    duplikat = np.zeros(len(saetze), dtype=bool)
+    erstes = {}
+    eindeutig, texte = [], []
+    for i, s in enumerate(saetze):
+        k = s.lower()
+        if k in erstes:
+            duplikat[i] = True
+        else:
+            erstes[k] = i
+            eindeutig.append(i)
+            texte.append(k)
+    if len(eindeutig) < 2 or schwelle == 1.0:
+        return duplikat
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, permutationen, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, permutationen, dtype=np.uint64)
+    with stufe('minhash'):
+        signaturen = np.concatenate([_signaturen(texte[von:von + block], shingle, a, b)
+                                     for von in range(0, len(texte), block)])
+    mindest_gleich = int(np.ceil(schwelle * permutationen - 1e-9))  # gleiche Signatur-Stellen
+    erkannt = np.zeros(len(texte), dtype=bool)
+    with stufe('lsh'):
+        for spaeter, frueher in _kandidaten(signaturen, *_lsh_parameter(schwelle, permutationen)):
+            offen = ~erkannt[spaeter]  # schon erkannte Duplikate nicht erneut prüfen
+            spaeter, frueher = spaeter[offen], frueher[offen]
+            for von in range(0, len(spaeter), 1 << 14):
+                i, j = spaeter[von:von + (1 << 14)], frueher[von:von + (1 << 14)]
+                gleich = np.count_nonzero(signaturen[i] == signaturen[j], axis=1)
+                erkannt[i[gleich >= mindest_gleich]] = True
+    duplikat[np.asarray(eindeutig)[erkannt]] = True
+    return duplikat
+
+
+def _signaturen(texte: List[str], shingle: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """MinHash-Signaturen (len(texte) × permutationen, uint32) eines Blocks kleingeschriebener Texte."""
+    codes = [np.frombuffer((' ' + t + ' ').ljust(shingle).encode('utf-32-le'), dtype=np.uint32)
+             for t in texte]
+    laengen = np.fromiter((len(c) for c in codes), dtype=np.int64, count=len(codes))
+    zeichen = np.concatenate(codes).astype(np.uint64)
+    # Shingle-Anfänge: alle Positionen, an denen ein Shingle noch in den eigenen Text passt
+    anzahl = laengen - shingle + 1
+    text_start = np.cumsum(laengen) - laengen
+    anfang = np.repeat(text_start - np.cumsum(anzahl) + anzahl, anzahl) + np.arange(anzahl.sum())
+    h = np.zeros(len(anfang), dtype=np.uint64)
+    for k in range(shingle):
+        h = h * _P + zeichen[anfang + k]
+    h *= _MISCHEN
+    gruppen = np.cumsum(anzahl) - anzahl
+
+    # je Permutation Multiply-Shift-Hash (a·h + b) >> 32, Minimum je Text; in-place
+    # in einem Puffer statt einer (Shingles × Permutationen)-Matrix
+    ergebnis = np.empty((len(texte), len(a)), dtype=np.uint32)
+    werte = np.empty_like(h)
+    for k in range(len(a)):
+        np.multiply(h, a[k], out=werte)
+        werte += b[k]
+        werte >>= _SHIFT
+        ergebnis[:, k] = np.minimum.reduceat(werte, gruppen)
+    return ergebnis
+
+
+@lru_cache(maxsize=None)
+def _lsh_parameter(schwelle: float, permutationen: int) -> Tuple[int, int]:
+    """
+    (Bänder, Zeilen je Band): möglichst viele Zeilen (wenige Zufallskandidaten),
+    solange ein Paar mit Ähnlichkeit schwelle mit Wahrscheinlichkeit
+    1 − (1 − schwelle^zeilen)^baender ≥ KANDIDATEN_RECALL in einem Band kollidiert.
+    Falsche Kandidaten kosten nur einen Signaturvergleich, übersehene sind verloren.
+    """
+    for zeilen in range(permutationen, 0, -1):
+        baender = permutationen // zeilen
+        if 1.0 - (1.0 - schwelle ** zeilen) ** baender >= KANDIDATEN_RECALL:
+            return baender, zeilen
+    return permutationen, 1
+
+
+def _kandidaten(signaturen: np.ndarray, baender: int, zeilen: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Je Band: Paare (späterer Satz, früherer Satz) mit gleichem Fach."""
+    n = len(signaturen)
+    for band in range(baender):
+        teil = signaturen[:, band * zeilen:(band + 1) * zeilen].astype(np.uint64)
+        schluessel = np.zeros(n, dtype=np.uint64)
+        for spalte in teil.T:
+            schluessel = (schluessel ^ spalte) * _MISCHEN
+        ordnung = np.argsort(schluessel, kind='stable')  # im Fach aufsteigende Satznummern
+        sortiert = schluessel[ordnung]
+        gleich_vorher = np.flatnonzero(sortiert[1:] == sortiert[:-1]) + 1
+        if not len(gleich_vorher):
+            continue
+        neues_fach = np.ones(n, dtype=bool)
+        neues_fach[gleich_vorher] = False
+        fach_erstes = ordnung[np.flatnonzero(neues_fach)][np.cumsum(neues_fach) - 1]
+        spaeter = ordnung[gleich_vorher]
+        yield spaeter, ordnung[gleich_vorher - 1]
+        erstes = fach_erstes[gleich_vorher]
+        weiter_zurueck = erstes != ordnung[gleich_vorher - 1]
+        yield spaeter[weiter_zurueck], erstes[weiter_zurueck]
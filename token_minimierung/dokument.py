@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Dokument-Analyse: einmal segmentieren und tokenisieren, von allen Strategien nutzbar.
+numpy und tiktoken werden erst beim Analysieren geladen.
+"""
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Union
+
+from .instrumentierung import stufe
+from .segmentierung import satz_spans, text_normalisieren
+from .tokenizer import get_token_zaehler, token_byte_tabelle, tokenisieren, tokenisieren_viele
+
+_MEHRFACH_LEERRAUM = re.compile(r'\s{2,}')
+
+
+@dataclass
+class Document:
+    """
+    Einmal analysierter Prompt, den alle Strategien direkt verarbeiten können:
+    - spans: Satzgrenzen (n × 2) im normalisierten Text, keine Teilstring-Kopien
+    - tokens: vollständige Token-Folge des Originals (numpy uint32)
+    - token_bereiche: Token-Indexbereich (n × 2) je Satz, aus den Token-Offsets;
+      ein Token gehört zu dem Satz, in dem sein letztes Zeichen liegt
+    """
+    text: str
+    text_norm: str
+    spans: 'np.ndarray'
+    tokens: 'np.ndarray'
+    token_bereiche: 'np.ndarray'
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def satz(self, i: int) -> str:
+        a, b = self.spans[i]
+        return self.text_norm[a:b]
+
+    @cached_property
+    def saetze(self) -> List[str]:
+        """Satz-Strings (erst bei Bedarf erzeugt, z. B. für Embeddings und Ausgabe)."""
+        return [self.text_norm[a:b] for a, b in self.spans.tolist()]
+
+    @cached_property
+    def satz_token_laengen(self) -> 'np.ndarray':
+        """Token-Anzahl je Satz per Array-Slicing (keine erneute Tokenisierung)."""
+        return self.token_bereiche[:, 1] - self.token_bereiche[:, 0]
+
+    @property
+    def token_anzahl(self) -> int:
+        return len(self.tokens)
+
+
+def _dokument_aufbauen(text: str, tokens: List[int]) -> Document:
+    import numpy as np
+    get_token_zaehler().eintragen(text, len(tokens))  # spätere Zählungen des Originals sind Treffer
+    text_norm = text_normalisieren(text)
+    spans = np.array(satz_spans(text_norm), dtype=np.int64).reshape(-1, 2)
+    token_arr = np.array(tokens, dtype=np.uint32)
+
+    if not text_norm or not len(token_arr):
+        return Document(text, text_norm, spans, token_arr, np.zeros_like(spans))
+
+    # Position jedes normalisierten Zeichens im Original (Leerraum-Läufe → erstes Zeichen)
+    gestrippt = text.strip()
+    fuehrend = len(text) - len(text.lstrip())
+    behalten = np.ones(len(gestrippt), dtype=bool)
+    for m in _MEHRFACH_LEERRAUM.finditer(gestrippt):
+        behalten[m.start() + 1:m.end()] = False
+    norm_zu_orig = np.flatnonzero(behalten) + fuehrend
+
+    # Letztes Zeichen jedes Tokens im Original (über Byte-Offsets, UTF-8-sicher)
+    roh = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    zeichen_von_byte = np.cumsum((roh & 0xC0) != 0x80) - 1
+    byte_enden = np.cumsum(token_byte_tabelle()[token_arr])
+    token_letztes_zeichen = zeichen_von_byte[np.clip(byte_enden - 1, 0, len(roh) - 1)]
+
+    orig_start = norm_zu_orig[spans[:, 0]]
+    orig_ende = norm_zu_orig[np.maximum(spans[:, 1] - 1, spans[:, 0])] + 1
+    token_bereiche = np.stack([
+        np.searchsorted(token_letztes_zeichen, orig_start, side='left'),
+        np.searchsorted(token_letztes_zeichen, orig_ende, side='left'),
+    ], axis=1)
+    return Document(text, text_norm, spans, token_arr, token_bereiche)
+
+
+def dokument_analysieren(text: str) -> Document:
+    """Segmentiert und tokenisiert einen Prompt in einem Durchgang."""
+    with stufe('tokenisierung'):
+        tokens = tokenisieren(text)
+    with stufe('dokument'):
+        return _dokument_aufbauen(text, tokens)
+
+
+def dokumente_analysieren(texte: List[str]) -> List[Document]:
+    """Wie dokument_analysieren, Tokenisierung gebündelt über tokenisieren_viele."""
+    texte = list(texte)
+    with stufe('tokenisierung'):
+        tokens = tokenisieren_viele(texte)
+    with stufe('dokument'):
+        return [_dokument_aufbauen(t, tok) for t, tok in zip(texte, tokens)]
+
+
+def als_dokument(prompt: Union[str, Document]) -> Document:
+    return prompt if isinstance(prompt, Document) else dokument_analysieren(prompt)
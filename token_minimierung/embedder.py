@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Austauschbare Embedding-Backends hinter dem EmbeddingDienst.
+Ein Embedder bildet eine Liste von Texten auf eine (n × dim)-Matrix ab; welches
+Backend der Dienst lädt, bestimmt EMBEDDING_BACKEND (Umgebungsvariable):
+- 'sentence-transformers' (Standard): SentenceTransformer, Modell-Download nötig
+- 'ngram': reines numpy, gehashte Zeichen-n-Gramme (sublineare Gewichtung) mit
+  dünner Zufallsprojektion – deterministisch, ohne Download, startet in
+  Millisekunden (Offline-CI, schnelle Läufe)
+Weitere Backends lassen sich mit embedder_registrieren ergänzen.
+"""
+from typing import Callable, Dict, List, Protocol, Sequence, Union
+
+import numpy as np
+
+
+class Embedder(Protocol):
+    def encode(self, texte: List[str], batch_size: int = 64) -> np.ndarray:
+        ...
+
+
+# Backend-Name → (Standard-Modellname, Fabrik: Modellname → Embedder)
+_BACKENDS: Dict[str, tuple] = {}
+
+
+def embedder_registrieren(name: str, standard_modell: str, fabrik: Callable[[str], Embedder]):
+    """Macht ein Backend unter name verfügbar (EMBEDDING_BACKEND=name)."""
+    _BACKENDS[name] = (standard_modell, fabrik)
+
+
+def backends() -> List[str]:
+    return list(_BACKENDS)
+
+
+def standard_modell(backend: str) -> str:
+    return _backend(backend)[0]
+
+
+def embedder_laden(backend: str, modell_name: str) -> Embedder:
+    return _backend(backend)[1](modell_name)
+
+
+def _backend(name: str) -> tuple:
+    if name not in _BACKENDS:
+        raise ValueError(f"Unbekanntes Embedding-Backend: {name!r} ({', '.join(_BACKENDS)})")
+    return _BACKENDS[name]
+
+
+def _sentence_transformer(modell_name: str) -> Embedder:
+    try:
+        from sentence_transformers import SentenceTransformer
+    except Exception as e:
+        raise RuntimeError(
+            "Für Embeddings wird sentence-transformers benötigt. "
+            "Installation: pip install sentence-transformers "
+            "(oder ohne Modell: EMBEDDING_BACKEND=ngram)"
+        ) from e
+    return SentenceTransformer(modell_name)
+
+
+class NgramEmbedder:
+    """
+    Zeichen-n-Gramme (Kleinschreibung, Wortränder als Leerzeichen) werden per
+    Polynom-Hash identifiziert und je Text gezählt; Gewicht = log1p(Anzahl).
+    Eine dünne Zufallsprojektion legt jedes n-Gramm mit ±Gewicht auf
+    projektionen der dim Dimensionen (Fach und Vorzeichen aus dem Hash, kein
+    Vokabular, keine Matrix). Ausgabe L2-normiert.
+    Vektorisiert über einen Block von Texten; jeder Text wird unabhängig vom
+    Rest des Blocks in fester Reihenfolge summiert, gleiche Parameter ergeben
+    daher bitgleiche Vektoren – prozessübergreifend, einzeln wie im Batch.
+    """
+
+    _P = np.uint64(1_000_003)
+    _MISCHEN = np.uint64(0x9E3779B97F4A7C15)
+    _HASH_BITS = 44  # Hash-Bits je n-Gramm, darüber die Textnummer im Block
+
+    def __init__(self, dim: int = 384, ngramme: Sequence[int] = (3, 4, 5), projektionen: int = 4,
+                 seed: int = 0, block: int = 1024):
+        self.dim = dim
+        self.ngramme = tuple(ngramme)
+        self.block = block
+        rng = np.random.default_rng(seed)
+        self._faktoren = rng.integers(1, 2**63, projektionen, dtype=np.uint64) | np.uint64(1)
+
+    def _ngramme(self, texte: List[str]):
+        """Eindeutige (Text, n-Gramm-Hash) des Blocks, sortiert nach Text, mit Anzahl."""
+        codes = [np.frombuffer((' ' + t.lower() + ' ').encode('utf-32-le'), dtype=np.uint32) for t in texte]
+        zeichen = np.concatenate(codes).astype(np.uint64)
+        text_id = np.repeat(np.arange(len(texte), dtype=np.uint64), [len(c) for c in codes])
+        maske = np.uint64((1 << self._HASH_BITS) - 1)
+        schluessel = [np.zeros(0, dtype=np.uint64)]
+        for n in self.ngramme:
+            m = len(zeichen) - n + 1
+            if m <= 0:
+                continue
+            h = np.full(m, n, dtype=np.uint64)
+            for j in range(n):
+                h = h * self._P + zeichen[j:j + m]
+            gueltig = text_id[:m] == text_id[n - 1:n - 1 + m]  # n-Gramm innerhalb eines Texts
+            h = (h[gueltig] * self._MISCHEN) >> np.uint64(64 - self._HASH_BITS)
+            schluessel.append((text_id[:m][gueltig] << np.uint64(self._HASH_BITS)) | (h & maske))
+        eindeutig, anzahl = np.unique(np.concatenate(schluessel), return_counts=True)
+        return (eindeutig >> np.uint64(self._HASH_BITS)).astype(np.int64), eindeutig & maske, anzahl
+
+    def encode(self, texte: Union[str, List[str]], batch_size: int = 64, **_) -> np.ndarray:
+        einzeln = isinstance(texte, str)
+        texte = [texte] if einzeln else list(texte)
+        ergebnis = np.zeros((len(texte), self.dim), dtype=np.float32)
+        for von in range(0, len(texte), self.block):
+            teil = texte[von:von + self.block]
+            text, h, anzahl = self._ngramme(teil)
+            gewicht = np.log1p(anzahl)
+            summe = np.zeros(len(teil) * self.dim)
+            basis = text * self.dim
+            for faktor in self._faktoren:
+                g = h * faktor
+                # obere 24 Hash-Bits auf [0, 2·dim) skaliert: Fach = Hälfte, Vorzeichen = Rest
+                fach = (((g >> np.uint64(40)) * np.uint64(self.dim)) >> np.uint64(23)).astype(np.int64)
+                vorzeichen = np.where(fach & 1, -gewicht, gewicht)
+                summe += np.bincount(basis + (fach >> 1), weights=vorzeichen, minlength=len(summe))
+            ergebnis[von:von + len(teil)] = summe.reshape(len(teil), self.dim)
+        ergebnis /= np.maximum(np.linalg.norm(ergebnis, axis=1, keepdims=True), 1e-12)
+        return ergebnis[0] if einzeln else ergebnis
+
+
+embedder_registrieren('sentence-transformers', 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',
+                      _sentence_transformer)
+embedder_registrieren('ngram', 'ngram-3-5-d384', lambda modell_name: NgramEmbedder())
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsamer Embedding-Dienst für Strategien und Qualitätsmetrik.
+Ein einziges geladenes Modell (Backend per EMBEDDING_BACKEND, siehe embedder.py;
+Standard paraphrase-multilingual-MiniLM-L12-v2) statt je einer Kopie pro Modul,
+dazu ein inhaltsadressierter Cache:
+- In-Process-LRU, Schlüssel = Hash des normalisierten Texts
+- Optionaler Festplattenspeicher (memory-mapped float32-Matrix + Index-Journal)
+  mit Verdrängung nach Größe, damit Embeddings auch über Läufe und Prozesse
+  hinweg nur einmal berechnet werden.
+Die Schnittstelle entspricht SentenceTransformer.encode (str → 1-D, Liste → 2-D).
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl  # Dateisperre für parallelen Zugriff (nur POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .embedder import embedder_laden, standard_modell
+from .instrumentierung import stufe, zaehlen
+
+# Embedding-Backend: 'sentence-transformers' (Standard) oder 'ngram' (ohne Modell-Download)
+EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND', 'sentence-transformers')
+MODELL_NAME = standard_modell('sentence-transformers')
+
+# Optionaler Festplatten-Cache: Verzeichnis per Umgebungsvariable aktivieren
+EMBEDDING_CACHE_PFAD = os.environ.get('EMBEDDING_CACHE_PFAD')
+
+_LEERRAUM = re.compile(r'\s+')
+
+
+def text_normalisieren(text: str) -> str:
+    """Unicode-NFC, Leerraum zusammenfassen, Ränder trimmen."""
+    return _LEERRAUM.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def text_schluessel(text: str) -> str:
+    """Inhaltsadresse eines (bereits normalisierten) Texts."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class _DiskSpeicher:
+    """
+    Persistenter Embedding-Speicher: feste Matrix (kapazitaet × dim) als
+    memory-mapped Datei, dazu ein Journal (index.log, nur angehängt) mit
+    Zeilen „Schlüssel<TAB>Zeile“ (Zeile −1 = verdrängt). Die Reihenfolge im
+    Journal ist die Zugriffsreihenfolge; ist die Kapazität erreicht, werden die
+    am längsten ungenutzten Zeilen überschrieben (LRU nach Größe).
+    - Jeder Prozess liest nur die neu angehängten Journalzeilen nach
+    - Neue Zeilen aus Hochwassermarke bzw. Freiliste, Verdrängen in O(1) je Eintrag
+    - Das Journal wird neu geschrieben, wenn es ein Vielfaches des Index lang ist
+    """
+
+    def __init__(self, pfad: str, modell_name: str, dim: int, kapazitaet: int):
+        self.pfad = pfad
+        os.makedirs(self.pfad, exist_ok=True)
+        self.dim = dim
+        self.kapazitaet = kapazitaet
+        self._matrix_pfad = os.path.join(self.pfad, 'embeddings.f32')
+        self._journal_pfad = os.path.join(self.pfad, 'index.log')
+        self._lock_pfad = os.path.join(self.pfad, '.lock')
+        meta_pfad = os.path.join(self.pfad, 'meta.json')
+        if not os.path.exists(self._matrix_pfad):
+            np.memmap(self._matrix_pfad, dtype=np.float32, mode='w+', shape=(kapazitaet, dim)).flush()
+            with open(meta_pfad, 'w', encoding='utf-8') as f:
+                json.dump({'modell': modell_name, 'dim': dim, 'kapazitaet': kapazitaet}, f)
+        self._matrix = np.memmap(self._matrix_pfad, dtype=np.float32, mode='r+', shape=(kapazitaet, dim))
+        self._index: 'OrderedDict[str, int]' = OrderedDict()  # Schlüssel → Zeile, ältester Zugriff zuerst
+        self._frei: set = set()  # verdrängte, nicht wieder belegte Zeilen
+        self._hoch = 0            # Zeilen ab hier wurden nie belegt
+        self._journal_zeilen = 0
+        self._journal_stand = None  # (Inode, Byte-Position) des zuletzt gelesenen Journals
+        self._benutzt = set()  # gelesene Schlüssel, der Zugriff wird beim Schreiben nachgetragen
+        self._thread_lock = threading.Lock()  # Index im Speicher; flock trennt nur Prozesse
+        alt_index_pfad = os.path.join(self.pfad, 'index.json')
+        if os.path.exists(alt_index_pfad) and not os.path.exists(self._journal_pfad):
+            with self._sperren():
+                self._altindex_uebernehmen(alt_index_pfad)
+        with self._sperren(exklusiv=False):
+            self._journal_laden()
+
+    @classmethod
+    def oeffnen(cls, pfad: str, modell_name: str, dim: Optional[int], kapazitaet: int) -> Optional['_DiskSpeicher']:
+        """Öffnet einen vorhandenen Speicher oder legt ihn an, sobald die Dimension bekannt ist."""
+        pfad = os.path.join(pfad, text_schluessel(modell_name)[:12])
+        meta_pfad = os.path.join(pfad, 'meta.json')
+        if os.path.exists(meta_pfad):
+            with open(meta_pfad, encoding='utf-8') as f:
+                meta = json.load(f)
+            return cls(pfad, modell_name, meta['dim'], meta['kapazitaet'])
+        if dim is None:
+            return None
+        return cls(pfad, modell_name, dim, kapazitaet)
+
+    def _altindex_uebernehmen(self, alt_index_pfad: str):
+        """Früheren JSON-Index (Schlüssel → [Zeile, letzter Zugriff]) ins Journal überführen."""
+        if os.path.exists(self._journal_pfad):
+            return  # ein anderer Prozess war schneller
+        with open(alt_index_pfad, encoding='utf-8') as f:
+            alt = json.load(f)
+        for k, (zeile, _) in sorted(alt.items(), key=lambda e: e[1][1]):
+            self._anwenden(k, zeile)
+        self._frei = set(range(self._hoch)).difference(self._index.values())
+        self._journal_neu_schreiben()
+        os.remove(alt_index_pfad)
+
+    def _anwenden(self, k: str, zeile: int):
+        alt = self._index.pop(k, None)
+        if zeile < 0:
+            if alt is not None:
+                self._frei.add(alt)
+            return
+        self._index[k] = zeile
+        self._frei.discard(zeile)
+        if zeile >= self._hoch:
+            self._hoch = zeile + 1
+
+    def _journal_laden(self):
+        """Neue Journalzeilen übernehmen (unter Sperre); nach dem Neuschreiben von vorn."""
+        try:
+            stat = os.stat(self._journal_pfad)
+        except OSError:
+            return
+        inode, position = self._journal_stand or (None, 0)
+        if inode != stat.st_ino or stat.st_size < position:
+            self._index.clear()
+            self._frei, self._hoch, self._journal_zeilen, position = set(), 0, 0, 0
+        von_vorn = position == 0
+        if stat.st_size > position:
+            with open(self._journal_pfad, 'rb') as f:
+                f.seek(position)
+                neu = f.read()
+            for zeile in neu.decode('utf-8').splitlines():
+                k, _, nummer = zeile.partition('\t')
+                self._anwenden(k, int(nummer))
+                self._journal_zeilen += 1
+            position += len(neu)
+        if von_vorn:
+            # ein verdichtetes Journal nennt nur belegte Zeilen: Lücken unter der Hochwassermarke sind frei
+            self._frei = set(range(self._hoch)).difference(self._index.values())
+        self._journal_stand = (stat.st_ino, position)
+
+    def _journal_anhaengen(self, zeilen: List[Tuple[str, int]]):
+        if self._journal_zeilen + len(zeilen) > 4 * len(self._index) + 1024:
+            self._journal_neu_schreiben()
+            return
+        daten = ''.join(f'{k}\t{z}\n' for k, z in zeilen).encode('utf-8')
+        with open(self._journal_pfad, 'ab') as f:
+            f.write(daten)
+            position = f.tell()
+        self._journal_zeilen += len(zeilen)
+        self._journal_stand = (os.stat(self._journal_pfad).st_ino, position)
+
+    def _journal_neu_schreiben(self):
+        """Journal auf den aktuellen Index verdichten (atomar per os.replace)."""
+        tmp = self._journal_pfad + f'.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(''.join(f'{k}\t{z}\n' for k, z in self._index.items()).encode('utf-8'))
+            position = f.tell()
+        os.replace(tmp, self._journal_pfad)
+        self._journal_zeilen = len(self._index)
+        self._journal_stand = (os.stat(self._journal_pfad).st_ino, position)
+
+    @contextmanager
+    def _sperren(self, exklusiv: bool = True):
+        with self._thread_lock, open(self._lock_pfad, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exklusiv else fcntl.LOCK_SH)
+            yield
+
+    def holen(self, schluessel: List[str]) -> Dict[str, np.ndarray]:
+        # geteilte Sperre: kein anderer Prozess kann während des Kopierens verdrängen
+        with self._sperren(exklusiv=False):
+            self._journal_laden()
+            gefunden = {}
+            for k in schluessel:
+                zeile = self._index.get(k)
+                if zeile is not None:
+                    gefunden[k] = np.array(self._matrix[zeile])
+                    self._benutzt.add(k)
+        return gefunden
+
+    def speichern(self, eintraege: Dict[str, np.ndarray]):
+        if not eintraege:
+            return
+        with self._sperren():
+            self._journal_laden()
+            journal = []
+            for k in self._benutzt:
+                if k in self._index:
+                    self._index.move_to_end(k)
+                    journal.append((k, self._index[k]))
+            self._benutzt.clear()
+            neu = [k for k in eintraege if k not in self._index][:self.kapazitaet]
+            for k in neu:
+                if self._frei:
+                    zeile = self._frei.pop()
+                elif self._hoch < self.kapazitaet:
+                    zeile, self._hoch = self._hoch, self._hoch + 1
+                else:  # voll: am längsten ungenutzten Eintrag verdrängen
+                    alt, zeile = self._index.popitem(last=False)
+                    journal.append((alt, -1))
+                self._matrix[zeile] = eintraege[k]
+                self._index[k] = zeile
+                journal.append((k, zeile))
+            self._matrix.flush()  # erst die Daten, dann der Journaleintrag
+            self._journal_anhaengen(journal)
+
+    def __len__(self):
+        return len(self._index)
+
+
+class EmbeddingDienst:
+    """
+    Geteiltes Embedding-Modell mit zweistufigem Cache (LRU im Speicher,
+    optional memory-mapped auf der Festplatte). Jeder eindeutige Text wird
+    höchstens einmal durch das Modell geschickt.
+    """
+
+    def __init__(
+        self,
+        modell_name: Optional[str] = None,
+        max_eintraege: int = 100_000,
+        speicher_pfad: Optional[str] = None,
+        max_speicher_eintraege: int = 1_000_000,
+        backend: Optional[str] = None,
+    ):
+        self.backend = backend or EMBEDDING_BACKEND
+        self.modell_name = modell_name or standard_modell(self.backend)
+        self.max_eintraege = max_eintraege
+        self.speicher_pfad = speicher_pfad
+        self.max_speicher_eintraege = max_speicher_eintraege
+        self._modell = None
+        self._disk: Optional[_DiskSpeicher] = None
+        self._lru: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()       # LRU und Zähler (encode läuft auch aus Worker-Threads)
+        self._lade_lock = threading.Lock()  # Modell und Festplattenspeicher nur einmal öffnen
+        self.treffer = 0
+        self.disk_treffer = 0
+        self.fehlschlaege = 0
+
+    @property
+    def kennung(self) -> str:
+        """Backend und Modell; trennt Festplatten-Caches verschiedener Embedder."""
+        if self.backend == 'sentence-transformers':
+            return self.modell_name  # wie bisher, vorhandene Caches bleiben gültig
+        return f'{self.backend}:{self.modell_name}'
+
+    @property
+    def modell(self):
+        """Lazy-Load des Embedding-Backends (nur bei Bedarf, einmal pro Prozess)."""
+        if self._modell is None:
+            with self._lade_lock:
+                if self._modell is None:
+                    self._modell = embedder_laden(self.backend, self.modell_name)
+        return self._modell
+
+    def _disk_speicher(self, dim: Optional[int] = None) -> Optional[_DiskSpeicher]:
+        if self.speicher_pfad and self._disk is None:
+            with self._lade_lock:
+                if self._disk is None:
+                    self._disk = _DiskSpeicher.oeffnen(
+                        self.speicher_pfad, self.kennung, dim, self.max_speicher_eintraege
+                    )
+        return self._disk
+
+    def _lru_ablegen(self, k: str, vektor: np.ndarray):
+        # nur unter self._lock aufrufen
+        self._lru[k] = vektor
+        self._lru.move_to_end(k)
+        while len(self._lru) > self.max_eintraege:
+            self._lru.popitem(last=False)
+
+    def encode(
+        self,
+        texte: Union[str, List[str]],
+        normalize_embeddings: bool = False,
+        batch_size: int = 64,
+    ) -> np.ndarray:
+        """Embeddings für einen Text (1-D) oder eine Liste von Texten (2-D)."""
+        with stufe('embedding'):
+            return self._encode(texte, normalize_embeddings, batch_size)
+
+    def _encode(self, texte, normalize_embeddings: bool, batch_size: int) -> np.ndarray:
+        einzeln = isinstance(texte, str)
+        if einzeln:
+            texte = [texte]
+        normalisiert = [text_normalisieren(t) for t in texte]
+        schluessel = [text_schluessel(t) for t in normalisiert]
+
+        vektoren: Dict[str, np.ndarray] = {}
+        offen: Dict[str, str] = {}
+        with self._lock:
+            for k, t in zip(schluessel, normalisiert):
+                if k in vektoren or k in offen:
+                    continue
+                v = self._lru.get(k)
+                if v is not None:
+                    self._lru.move_to_end(k)
+                    vektoren[k] = v
+                    self.treffer += 1
+                else:
+                    offen[k] = t
+
+        disk = self._disk_speicher() if offen else None
+        if disk is not None:
+            von_disk = disk.holen(list(offen))
+            with self._lock:
+                for k, v in von_disk.items():
+                    vektoren[k] = v
+                    self._lru_ablegen(k, v)
+                    del offen[k]
+                self.disk_treffer += len(von_disk)
+
+        if offen:
+            with self._lock:
+                self.fehlschlaege += len(offen)
+            zaehlen('embedding_modell_texte', len(offen))
+            with stufe('modell'):  # Modellaufruf außerhalb der Sperre
+                neu = np.asarray(self.modell.encode(list(offen.values()), batch_size=batch_size), dtype=np.float32)
+            neue_eintraege = dict(zip(offen, neu))
+            with self._lock:
+                for k, v in neue_eintraege.items():
+                    vektoren[k] = v
+                    self._lru_ablegen(k, v)
+            disk = self._disk_speicher(neu.shape[1])
+            if disk is not None:
+                disk.speichern(neue_eintraege)
+
+        ergebnis = np.stack([vektoren[k] for k in schluessel]) if schluessel else np.zeros((0, 0), np.float32)
+        if normalize_embeddings and len(ergebnis):
+            ergebnis = ergebnis / np.maximum(np.linalg.norm(ergebnis, axis=1, keepdims=True), 1e-12)
+        return ergebnis[0] if einzeln else ergebnis
+
+    def leeren(self):
+        """Leert den In-Process-Cache (Festplattenspeicher bleibt erhalten)."""
+        with self._lock:
+            self._lru.clear()
+
+    def statistik(self) -> dict:
+        """Treffer-/Fehlschlagzähler des Caches."""
+        anfragen = self.treffer + self.disk_treffer + self.fehlschlaege
+        return {
+            'treffer': self.treffer,
+            'disk_treffer': self.disk_treffer,
+            'fehlschlaege': self.fehlschlaege,
+            'trefferquote': (self.treffer + self.disk_treffer) / anfragen if anfragen else 0.0,
+            'eintraege_speicher': len(self._lru),
+            'eintraege_disk': len(self._disk) if self._disk is not None else 0,
+        }
+
+
+_dienst: Optional[EmbeddingDienst] = None
+
+
+def get_embedding_dienst() -> EmbeddingDienst:
+    """Prozessweiter Embedding-Dienst (ein Modell für alle Module)."""
+    global _dienst
+    if _dienst is None:
+        _dienst = EmbeddingDienst(speicher_pfad=EMBEDDING_CACHE_PFAD)
+    return _dienst
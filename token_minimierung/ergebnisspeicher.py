@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Spaltenorientierter Ergebnisspeicher für Experiment-Zellen.
+- Eine numpy-Strukturmatrix, an die nur angehängt wird (Kapazität wächst geometrisch)
+- Strategie, Szenario und Parameter als Kategorie-Codes (int32) mit Namenslisten –
+  kein Rückschluss über original_tokens und kein erneutes Tokenisieren
+- Aggregation (Mittelwerte je Gruppe) per np.bincount, Kostenneuberechnung
+  vektorisiert in der Spalte; Auswertung und Plots lesen Sichten statt Kopien
+- verteilung(): Perzentile und Bootstrap-Intervalle je Gruppe aus allen Zeilen
+  (verteilung.py), nicht nur Mittelwerte
+"""
+import json
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .experiment import ExperimentResult
+from .verteilung import BOOTSTRAP, KONFIDENZ, PERZENTILE, Verteilung, verteilung_berechnen
+
+KATEGORIEN = ('strategie', 'szenario', 'parameter')
+KENNZAHLEN = ('original_tokens', 'komprimierte_tokens', 'latenz_ms',
+              'qualitaets_score', 'kosten_euro', 'kompressionsrate')
+DTYPE = np.dtype([
+    ('strategie', np.int32),
+    ('szenario', np.int32),
+    ('parameter', np.int32),
+    ('original_tokens', np.int64),
+    ('komprimierte_tokens', np.int64),
+    ('latenz_ms', np.float64),
+    ('qualitaets_score', np.float64),
+    ('kosten_euro', np.float64),
+    ('kompressionsrate', np.float64),
+])
+# Spaltennamen der Auswertungs-DataFrames (Qualität in Prozent)
+DATAFRAME_SPALTEN = {
+    'original_tokens': 'Original Tokens',
+    'komprimierte_tokens': 'Komprimierte Tokens',
+    'kompressionsrate': 'Kompressionsrate',
+    'latenz_ms': 'Latenz (ms)',
+    'kosten_euro': 'Kosten (€)',
+    'qualitaets_score': 'Qualität (%)',
+}
+
+
+def _parameter_schluessel(parameter: dict) -> str:
+    return json.dumps(parameter or {}, sort_keys=True, ensure_ascii=False)
+
+
+class ErgebnisSpeicher:
+    """Append-only Spaltenspeicher; zeilen() liefert bei Bedarf wieder ExperimentResult-Objekte."""
+
+    def __init__(self, kapazitaet: int = 1024):
+        self._daten = np.zeros(max(1, kapazitaet), dtype=DTYPE)
+        self._n = 0
+        self._namen: Dict[str, List[str]] = {k: [] for k in KATEGORIEN}
+        self._codes: Dict[str, Dict[str, int]] = {k: {} for k in KATEGORIEN}
+
+    @classmethod
+    def aus_ergebnissen(cls, ergebnisse: Iterable[ExperimentResult]) -> 'ErgebnisSpeicher':
+        ergebnisse = list(ergebnisse)
+        speicher = cls(len(ergebnisse))
+        speicher.erweitern(ergebnisse)
+        return speicher
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def daten(self) -> np.ndarray:
+        """Sicht auf die belegten Zeilen (keine Kopie)."""
+        return self._daten[:self._n]
+
+    def spalte(self, name: str) -> np.ndarray:
+        return self._daten[name][:self._n]
+
+    def namen(self, kategorie: str) -> List[str]:
+        """Namen zu den Codes einer Kategorie-Spalte (Index = Code)."""
+        return self._namen[kategorie]
+
+    def _code(self, kategorie: str, wert: str) -> int:
+        codes = self._codes[kategorie]
+        code = codes.get(wert)
+        if code is None:
+            code = codes[wert] = len(self._namen[kategorie])
+            self._namen[kategorie].append(wert)
+        return code
+
+    def _codes_fuer(self, kategorie: str, werte: Union[str, Sequence[str]], anzahl: int) -> np.ndarray:
+        if isinstance(werte, str):
+            return np.full(anzahl, self._code(kategorie, werte), dtype=np.int32)
+        for wert in dict.fromkeys(werte):  # neue Namen in Reihenfolge des Auftretens
+            self._code(kategorie, wert)
+        return np.fromiter(map(self._codes[kategorie].__getitem__, werte), dtype=np.int32, count=anzahl)
+
+    def _platz(self, anzahl: int):
+        bedarf = self._n + anzahl
+        if bedarf > len(self._daten):
+            neu = np.zeros(max(bedarf, 2 * len(self._daten)), dtype=DTYPE)
+            neu[:self._n] = self._daten[:self._n]
+            self._daten = neu
+
+    def anhaengen(self, ergebnis: ExperimentResult):
+        self.erweitern([ergebnis])
+
+    def erweitern(self, ergebnisse: Iterable[ExperimentResult]):
+        zeilen = [
+            (self._code('strategie', r.strategie), self._code('szenario', r.szenario),
+             self._code('parameter', _parameter_schluessel(r.parameter)),
+             r.original_tokens, r.komprimierte_tokens, r.latenz_ms, r.qualitaets_score,
+             r.kosten_euro, r.kompressionsrate)
+            for r in ergebnisse
+        ]
+        self._platz(len(zeilen))
+        self._daten[self._n:self._n + len(zeilen)] = np.array(zeilen, dtype=DTYPE)
+        self._n += len(zeilen)
+
+    def spalten_anhaengen(self, strategie, szenario, parameter: Union[dict, Sequence[dict]] = None,
+                          **kennzahlen):
+        """
+        Viele Zeilen auf einmal: Kennzahlen als gleich lange Arrays, Strategie/Szenario
+        als ein Name oder eine Namensliste, Parameter als ein dict oder eine dict-Liste.
+        """
+        anzahl = len(kennzahlen['original_tokens'])
+        self._platz(anzahl)
+        block = self._daten[self._n:self._n + anzahl]
+        block['strategie'] = self._codes_fuer('strategie', strategie, anzahl)
+        block['szenario'] = self._codes_fuer('szenario', szenario, anzahl)
+        if parameter is None or isinstance(parameter, dict):
+            block['parameter'] = self._code('parameter', _parameter_schluessel(parameter))
+        else:
+            block['parameter'] = self._codes_fuer(
+                'parameter', [_parameter_schluessel(p) for p in parameter], anzahl)
+        for name in KENNZAHLEN:
+            block[name] = kennzahlen[name]
+        self._n += anzahl
+
+    def zeilen(self) -> Iterator[ExperimentResult]:
+        strategien, szenarien, parameter = (self._namen[k] for k in KATEGORIEN)
+        for z in self.daten.tolist():
+            yield ExperimentResult(
+                strategie=strategien[z[0]], original_tokens=z[3], komprimierte_tokens=z[4],
+                latenz_ms=z[5], qualitaets_score=z[6], kosten_euro=z[7], kompressionsrate=z[8],
+                szenario=szenarien[z[1]], parameter=json.loads(parameter[z[2]]),
+            )
+
+    def mittelwerte(self, nach: str = 'strategie',
+                    kennzahlen: Sequence[str] = KENNZAHLEN) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """
+        Mittelwert je Gruppe (np.bincount, ein Durchlauf pro Kennzahl).
+        Gruppen alphabetisch wie pandas groupby; nur belegte Gruppen.
+        """
+        codes = self.spalte(nach)
+        anzahl_gruppen = len(self._namen[nach])
+        anzahl = np.bincount(codes, minlength=anzahl_gruppen)
+        belegt = np.flatnonzero(anzahl)
+        reihenfolge = belegt[np.argsort([self._namen[nach][i] for i in belegt], kind='stable')]
+        mittel = {}
+        for name in kennzahlen:
+            summen = np.bincount(codes, weights=self.spalte(name), minlength=anzahl_gruppen)
+            mittel[name] = summen[reihenfolge] / anzahl[reihenfolge]
+        return [self._namen[nach][i] for i in reihenfolge], mittel
+
+    def verteilung(self, kennzahl: str, nach: Union[str, Sequence[str]] = 'strategie',
+                   perzentile: Sequence[float] = PERZENTILE, bootstrap: int = BOOTSTRAP,
+                   konfidenz: float = KONFIDENZ, seed: int = 0) -> Verteilung:
+        """
+        Perzentile, Bootstrap-Intervalle und CDF einer Kennzahl je Gruppe; nach ist eine
+        Kategorie oder ein Tupel (z. B. ('strategie', 'szenario')). Gruppen alphabetisch
+        wie mittelwerte(), nur belegte.
+        """
+        nach = (nach,) if isinstance(nach, str) else tuple(nach)
+        groessen = [len(self._namen[k]) for k in nach]
+        kombiniert = np.zeros(self._n, dtype=np.int64)
+        for kategorie, groesse in zip(nach, groessen):
+            kombiniert = kombiniert * groesse + self.spalte(kategorie)
+        belegt = np.flatnonzero(np.bincount(kombiniert, minlength=int(np.prod(groessen))))
+        namen = [tuple(self._namen[k][c] for k, c in zip(nach, np.unravel_index(i, groessen)))
+                 for i in belegt.tolist()]
+        reihenfolge = sorted(range(len(belegt)), key=namen.__getitem__)
+        neuer_code = np.empty(int(np.prod(groessen)), dtype=np.int64)
+        neuer_code[belegt[reihenfolge]] = np.arange(len(belegt))
+        return verteilung_berechnen(neuer_code[kombiniert], self.spalte(kennzahl),
+                                    [namen[i] for i in reihenfolge], kennzahl, nach,
+                                    perzentile, bootstrap, konfidenz, seed=seed)
+
+    def als_dataframe(self):
+        """Eine Zeile pro Zelle mit den Spalten der Auswertung (pandas erst hier geladen)."""
+        import pandas as pd
+        daten = {
+            'Strategie': np.asarray(self._namen['strategie'], dtype=object)[self.spalte('strategie')],
+            'Szenario': np.asarray(self._namen['szenario'], dtype=object)[self.spalte('szenario')],
+        }
+        for name, titel in DATAFRAME_SPALTEN.items():
+            daten[titel] = self.spalte(name) * 100 if name == 'qualitaets_score' else self.spalte(name)
+        return pd.DataFrame(daten)
+
+    def mittelwerte_dataframe(self, nachkommastellen: int = 4):
+        """Mittelwerte je Strategie als DataFrame (Index 'Strategie'), wie groupby().mean().round()."""
+        import pandas as pd
+        namen, mittel = self.mittelwerte('strategie', tuple(DATAFRAME_SPALTEN))
+        mittel['qualitaets_score'] = mittel['qualitaets_score'] * 100
+        df = pd.DataFrame({titel: mittel[name] for name, titel in DATAFRAME_SPALTEN.items()},
+                          index=pd.Index(namen, name='Strategie'))
+        return df.round(nachkommastellen)
+
+    def kosten_neu_berechnen(self, preis_pro_1k_tokens: float, fix_euro: float = 0.0):
+        """Kostenspalte aus komprimierte_tokens neu berechnen (vektorisiert, in place); fix_euro je Anfrage."""
+        kosten = self._daten['kosten_euro'][:self._n]
+        np.multiply(self.spalte('komprimierte_tokens') / 1000, preis_pro_1k_tokens, out=kosten)
+        if fix_euro:
+            kosten += fix_euro
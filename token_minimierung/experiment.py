@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Experiment-Definition: Test-Prompts, Strategie-Konfiguration und Messung
+einer einzelnen Zelle (Prompt × Strategie).
+"""
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Optional, Tuple
+
+from .instrumentierung import stufe, zaehlen
+from .llm_modell import get_llm_modell
+from .tokenizer import token_anzahl
+
+
+@dataclass
+class ExperimentResult:
+    strategie: str
+    original_tokens: int
+    komprimierte_tokens: int
+    latenz_ms: float
+    qualitaets_score: float
+    kosten_euro: float
+    kompressionsrate: float
+    szenario: str = ''
+    parameter: dict = field(default_factory=dict)
+    latenz_gecacht: bool = False  # True: latenz_ms stammt aus einem früheren Lauf (Zellen-Cache)
+
+# Test-Prompts für verschiedene Szenarien
+TEST_PROMPTS = {
+    "kundensupport": """
+Sehr geehrte Damen und Herren,
+
+ich habe ein Problem mit meiner letzten Bestellung. Ich habe am 15. Januar 2024 die Produkte XYZ-123 und ABC-456 bestellt. 
+Die Bestellnummer lautet ORD-2024-001598. Das Paket wurde laut Tracking am 18. Januar zugestellt, aber ich habe nur 
+das Produkt XYZ-123 erhalten. Das Produkt ABC-456 fehlt komplett. 
+
+Ich habe bereits zweimal versucht, den Kundenservice telefonisch zu erreichen, aber wurde nach 20 Minuten Warteschleife 
+immer wieder getrennt. Das ist sehr frustrierend, da ich das fehlende Produkt dringend für ein Projekt benötige.
+
+Können Sie bitte überprüfen, was mit meiner Bestellung passiert ist? Ich erwarte entweder die sofortige Zusendung 
+des fehlenden Produkts oder eine vollständige Rückerstattung des Betrags für ABC-456 in Höhe von 89,99 €.
+
+Mit freundlichen Grüßen
+Max Mustermann
+Kundennummer: KDN-78432
+Telefon: +49 170 1234567
+Email: max.mustermann@email.de
+""",
+    "dokumentenzusammenfassung": """
+Der vorliegende Bericht analysiert die Marktentwicklung im Bereich erneuerbarer Energien für das Geschäftsjahr 2023. 
+Die globalen Investitionen in erneuerbare Energien erreichten einen neuen Höchststand von 1,8 Billionen US-Dollar, 
+was einem Anstieg von 17% gegenüber dem Vorjahr entspricht. 
+
+Solarenergie dominierte mit einem Anteil von 73% an allen neu installierten erneuerbaren Kapazitäten. 
+Windenergie folgte mit 21%, während Wasserkraft, Geothermie und andere Technologien die verbleibenden 6% ausmachten. 
+
+Die Kosten für Solarmodule sind um weitere 12% gesunken, was die Wirtschaftlichkeit zusätzlich verbessert hat. 
+In Europa verzeichnete Deutschland mit 14,6 GW neu installierter PV-Leistung den höchsten Zuwachs. 
+China blieb mit 216 GW neu installierter Leistung der weltweit größte Markt.
+
+Herausforderungen bestehen weiterhin in der Netzintegration, Speicherkapazitäten und regulatorischen Rahmenbedingungen. 
+Die durchschnittliche Genehmigungszeit für Windenergieprojekte liegt in Deutschland immer noch bei 4,2 Jahren.
+
+Für 2024 wird ein weiteres Wachstum von 15-20% erwartet, getrieben durch verbesserte Wirtschaftlichkeit und 
+verschärfte Klimaziele. Die EU hat ihr Ziel für 2030 auf 42,5% erneuerbare Energien angehoben.
+""",
+    "code_review": """
+Bitte analysiere den folgenden Python-Code und identifiziere mögliche Verbesserungen:
+
+```python
+def berechne_gesamtsumme(daten):
+    summe = 0
+    for i in range(len(daten)):
+        if daten[i]['typ'] == 'einnahme':
+            summe = summe + daten[i]['betrag']
+        elif daten[i]['typ'] == 'ausgabe':
+            summe = summe - daten[i]['betrag']
+    return summe
+
+def verarbeite_datei(dateipfad):
+    with open(dateipfad, 'r') as f:
+        inhalt = f.read()
+    daten = json.loads(inhalt)
+    ergebnis = berechne_gesamtsumme(daten)
+    print("Ergebnis:", ergebnis)
+    return ergebnis
+```
+
+Der Code soll finanzielle Transaktionen verarbeiten und die Gesamtsumme berechnen. 
+Er liest Daten aus einer JSON-Datei und unterscheidet zwischen Einnahmen und Ausgaben.
+"""
+}
+
+
+# Strategien als Daten (Anzeigename, Funktionsname, kwargs), damit auch
+# Worker-Prozesse des parallelen Runners sie auflösen können
+StrategieSpec = Tuple[str, Optional[str], dict]
+
+STRATEGIEN = [
+    ("Baseline (keine Kompression)", None, {}),
+    ("Manuelle Prompt-Kompression", "kompression_manuell", {}),
+    ("Strukturierte Kompression", "kompression_strukturiert", {}),
+    # greedy wie in den veröffentlichten Ergebnissen; optimal (Rucksack, auswahl.py) als eigene Strategie
+    ("Token-Budget (100 Tokens)", "kompression_token_budget", {"ziel_tokens": 100, "verfahren": "greedy"}),
+    ("Token-Budget optimal (100 Tokens)", "kompression_token_budget", {"ziel_tokens": 100, "verfahren": "optimal"}),
+    ("Chunking (100 Tokens)", "kompression_chunking", {"chunk_groesse": 100, "overlap": 20}),
+]
+
+
+def strategie_funktion(funktionsname: Optional[str], kwargs: dict):
+    """Löst eine Strategie-Spezifikation zu einer Funktion prompt → komprimiert auf."""
+    if funktionsname is None:
+        return _baseline
+    import token_minimierung
+    return partial(getattr(token_minimierung, funktionsname), **kwargs)
+
+
+def _baseline(prompt: str) -> str:
+    return prompt
+
+
+def gesamt_latenz_ms(kompressions_zeit: float, komprimierte_tokens: int) -> float:
+    # Latenz: gemessene Kompressionszeit + modellierte LLM-Latenz des aktiven Modells
+    # (llm_modell.py; Standard wie OpenAI-typisch ~2 ms/Input-Token + Basislatenz 50 ms)
+    return kompressions_zeit + get_llm_modell().latenz_ms(komprimierte_tokens)
+
+
+def run_experiment(
+    prompt_name: str,
+    prompt_text: str,
+    strategie_func,
+    strategie_name: str,
+    qualitaets_fn=None,
+    parameter: Optional[dict] = None,
+) -> ExperimentResult:
+    """
+    Führt ein einzelnes Experiment durch und misst alle relevanten Metriken.
+    Qualität wird maschinell über semantische Ähnlichkeit (Embedding) ermittelt,
+    sofern qualitaets_fn übergeben wird; sonst 1.0 (nur bei Baseline sinnvoll).
+    Szenario (prompt_name) und Strategie-Parameter werden im Ergebnis mitgeführt.
+    """
+    original_tokens = token_anzahl(prompt_text)  # gecacht: je Prompt einmal für alle Strategien
+
+    start_time = time.perf_counter()
+    with stufe(strategie_name):
+        komprimierter_prompt = strategie_func(prompt_text)
+    kompressions_zeit = (time.perf_counter() - start_time) * 1000  # ms
+
+    komprimierte_tokens = token_anzahl(komprimierter_prompt)
+    kompressionsrate = original_tokens / max(komprimierte_tokens, 1)
+
+    gesamt_latenz = gesamt_latenz_ms(kompressions_zeit, komprimierte_tokens)
+
+    # Kosten laut Preistabelle (Standard: GPT-3.5 Turbo, ~0,00138 €/1K Input)
+    kosten = get_llm_modell().kosten_euro(komprimierte_tokens)
+
+    # Qualität: maschinell über Embedding-Similarität (keine Schätzung)
+    if qualitaets_fn is not None:
+        with stufe('bewertung'):
+            qualitaet = qualitaets_fn(prompt_text, komprimierter_prompt)
+    else:
+        qualitaet = 1.0
+    zaehlen('experimente')
+
+    return ExperimentResult(
+        strategie=strategie_name,
+        original_tokens=original_tokens,
+        komprimierte_tokens=komprimierte_tokens,
+        latenz_ms=gesamt_latenz,
+        qualitaets_score=qualitaet,
+        kosten_euro=kosten,
+        kompressionsrate=kompressionsrate,
+        szenario=prompt_name,
+        parameter=dict(parameter or {}),
+    )
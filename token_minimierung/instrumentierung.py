@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentierung der Kompressions-Pipeline (nur Standardbibliothek).
+- stufe(name): benannte Pipeline-Stufe mit Zeitmessung (Kontextmanager), z. B.
+  segmentierung, tokenisierung, embedding, centrality, scoring, auswahl, dekodierung,
+  qualitaet;
+  verschachtelte Stufen ergeben Pfade wie "Strukturierte Kompression/embedding/modell"
+- zaehlen(name, n): Zähler (Sätze, Tokens, Modell-Texte …)
+- HdrHistogramm: Latenzen mit fester relativer Genauigkeit (log-lineare Buckets)
+- Export: prometheus() (Textformat, Summary je Pfad) und als_dict()/als_json()
+- profilieren(): Sampling-Profiler für einen einzelnen Lauf (gefaltete Stacks,
+  Proben je Stufe)
+Abgeschaltet (Standard; INSTRUMENTIERUNG=1 schaltet ein) liefert stufe() einen
+geteilten leeren Kontextmanager und zaehlen() kehrt sofort zurück.
+"""
+import contextlib
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+INSTRUMENTIERUNG = os.environ.get('INSTRUMENTIERUNG', '').lower() not in ('', '0', 'aus', 'nein')
+QUANTILE = {0.5: 'p50', 0.9: 'p90', 0.99: 'p99', 0.999: 'p999'}  # Quantil → Schlüssel in als_dict()
+
+_aktiv = INSTRUMENTIERUNG
+# offene Stufen je Thread (Thread-ID → Namen); jeder Thread ändert nur seine eigene Liste,
+# der Profiler liest die Listen fremder Threads
+_stapel: Dict[int, List[str]] = {}
+
+
+class HdrHistogramm:
+    """
+    Histogramm ganzzahliger Werte (hier Nanosekunden) mit signifikante_stellen
+    Dezimalstellen Genauigkeit, wie HdrHistogram: Werte unter 2^bits exakt, darüber
+    je Zweierpotenz 2^(bits−1) gleich breite Buckets (relativer Fehler ≤ 2^−(bits−1)).
+    Speicher wächst nur mit den belegten Buckets, beobachten() ist O(1).
+    """
+
+    def __init__(self, signifikante_stellen: int = 2):
+        self.bits = (2 * 10 ** signifikante_stellen - 1).bit_length()
+        self._unter = 1 << self.bits
+        self._halb = self._unter >> 1
+        self.buckets: Dict[int, int] = {}
+        self.anzahl = 0
+        self.summe = 0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+
+    def _index(self, wert: int) -> int:
+        if wert < self._unter:
+            return wert
+        shift = wert.bit_length() - self.bits
+        return self._unter + (shift - 1) * self._halb + (wert >> shift) - self._halb
+
+    def _untergrenze(self, index: int) -> int:
+        if index < self._unter:
+            return index
+        shift, rest = divmod(index - self._unter, self._halb)
+        return (rest + self._halb) << (shift + 1)
+
+    def beobachten(self, wert: int):
+        wert = max(int(wert), 0)
+        i = self._index(wert)
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        self.anzahl += 1
+        self.summe += wert
+        if self.minimum is None or wert < self.minimum:
+            self.minimum = wert
+        if self.maximum is None or wert > self.maximum:
+            self.maximum = wert
+
+    def zusammenfuehren(self, andere: 'HdrHistogramm'):
+        """Addiert ein Histogramm gleicher Genauigkeit (z. B. aus einem anderen Worker)."""
+        if andere.bits != self.bits:
+            raise ValueError("Histogramme mit unterschiedlicher Genauigkeit")
+        for i, n in andere.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + n
+        self.anzahl += andere.anzahl
+        self.summe += andere.summe
+        for wert in (andere.minimum, andere.maximum):
+            if wert is not None:
+                self.minimum = wert if self.minimum is None else min(self.minimum, wert)
+                self.maximum = wert if self.maximum is None else max(self.maximum, wert)
+
+    def perzentil(self, q: float) -> int:
+        """Wert, unter dem der Anteil q der Beobachtungen liegt (Bucket-Mitte, durch min/max begrenzt)."""
+        if not self.anzahl:
+            return 0
+        rang = max(1, math.ceil(q * self.anzahl - 1e-9))
+        kumuliert = 0
+        for i in sorted(self.buckets):
+            kumuliert += self.buckets[i]
+            if kumuliert >= rang:
+                unten = self._untergrenze(i)
+                oben = self._untergrenze(i + 1)
+                return min(max((unten + oben - 1) // 2, self.minimum), self.maximum)
+        return self.maximum
+
+    @property
+    def mittelwert(self) -> float:
+        return self.summe / self.anzahl if self.anzahl else 0.0
+
+    def als_dict(self, einheit: float = 1e-6) -> dict:
+        """Kennzahlen in Millisekunden (einheit: Faktor ns → ms) und belegte Buckets [[Untergrenze ns, Anzahl]]."""
+        return {
+            'anzahl': self.anzahl,
+            'summe_ms': self.summe * einheit,
+            'min_ms': (self.minimum or 0) * einheit,
+            'max_ms': (self.maximum or 0) * einheit,
+            'mittel_ms': self.mittelwert * einheit,
+            **{f'{name}_ms': self.perzentil(q) * einheit for q, name in QUANTILE.items()},
+            'buckets': [[self._untergrenze(i), n] for i, n in sorted(self.buckets.items())],
+        }
+
+
+class Instrumentierung:
+    """Sammelt Stufen-Histogramme (je Pfad) und Zähler, thread-sicher."""
+
+    def __init__(self, signifikante_stellen: int = 2):
+        self.signifikante_stellen = signifikante_stellen
+        self.histogramme: Dict[str, HdrHistogramm] = {}
+        self.zaehler: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def beobachten(self, pfad: str, dauer_ns: int):
+        with self._lock:
+            h = self.histogramme.get(pfad)
+            if h is None:
+                h = self.histogramme[pfad] = HdrHistogramm(self.signifikante_stellen)
+            h.beobachten(dauer_ns)
+
+    def zaehlen(self, name: str, n: int = 1):
+        with self._lock:
+            self.zaehler[name] = self.zaehler.get(name, 0) + n
+
+    def zuruecksetzen(self):
+        with self._lock:
+            self.histogramme.clear()
+            self.zaehler.clear()
+
+    def als_dict(self) -> dict:
+        with self._lock:
+            return {
+                'stufen': {pfad: h.als_dict() for pfad, h in sorted(self.histogramme.items())},
+                'zaehler': dict(sorted(self.zaehler.items())),
+            }
+
+    def als_json(self, **kwargs) -> str:
+        import json
+        return json.dumps(self.als_dict(), ensure_ascii=False, **kwargs)
+
+    def prometheus(self) -> str:
+        """Prometheus-Textformat: Summary je Stufenpfad (Sekunden), Zähler als counter."""
+        zeilen = ['# TYPE kompression_stufe_sekunden summary']
+        with self._lock:
+            for pfad, h in sorted(self.histogramme.items()):
+                labels = f'pfad="{_label(pfad)}",stufe="{_label(pfad.rsplit("/", 1)[-1])}"'
+                for q in QUANTILE:
+                    zeilen.append(f'kompression_stufe_sekunden{{{labels},quantile="{q}"}} '
+                                  f'{h.perzentil(q) / 1e9:.9f}')
+                zeilen.append(f'kompression_stufe_sekunden_sum{{{labels}}} {h.summe / 1e9:.9f}')
+                zeilen.append(f'kompression_stufe_sekunden_count{{{labels}}} {h.anzahl}')
+            zeilen.append('# TYPE kompression_ereignisse_total counter')
+            for name, n in sorted(self.zaehler.items()):
+                zeilen.append(f'kompression_ereignisse_total{{name="{_label(name)}"}} {n}')
+        return '\n'.join(zeilen) + '\n'
+
+    def bericht(self, min_anteil: float = 0.0) -> str:
+        """Tabelle je Pfad: Anzahl, Summe, Mittel, p50/p99/max in ms; min_anteil blendet kleine Pfade aus."""
+        daten = self.als_dict()['stufen']
+        gesamt = sum(d['summe_ms'] for p, d in daten.items() if '/' not in p) or 1.0
+        zeilen = [f"{'Stufe':<55} {'Anzahl':>8} {'Summe ms':>10} {'Mittel':>8} {'p50':>8} {'p99':>8} {'max':>8}"]
+        for pfad, d in sorted(daten.items(), key=lambda e: e[0].split('/')):  # Unterstufen unter ihrer Stufe
+            if d['summe_ms'] / gesamt < min_anteil:
+                continue
+            tiefe = pfad.count('/')
+            name = '  ' * tiefe + pfad.rsplit('/', 1)[-1]
+            zeilen.append(f"{name[:55]:<55} {d['anzahl']:>8} {d['summe_ms']:>10.1f} {d['mittel_ms']:>8.3f} "
+                          f"{d['p50_ms']:>8.3f} {d['p99_ms']:>8.3f} {d['max_ms']:>8.3f}")
+        return '\n'.join(zeilen)
+
+
+def _label(wert: str) -> str:
+    return wert.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_instrumentierung = Instrumentierung()
+
+
+def get_instrumentierung() -> Instrumentierung:
+    """Prozessweite Sammlung (alle Module schreiben hierhin)."""
+    return _instrumentierung
+
+
+def aktiv() -> bool:
+    return _aktiv
+
+
+def aktivieren(an: bool = True) -> bool:
+    """Schaltet die Instrumentierung ein oder aus; liefert den vorherigen Zustand."""
+    global _aktiv
+    vorher, _aktiv = _aktiv, an
+    return vorher
+
+
+class _Leer:
+    """Geteilter Kontextmanager für abgeschaltete Stufen (billiger als contextlib.nullcontext)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, wert, tb):
+        return False
+
+
+_LEER = _Leer()
+
+
+class _Stufe:
+    __slots__ = ('name', 'start', 'liste')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        liste = _stapel.get(threading.get_ident())
+        if liste is None:
+            liste = _stapel.setdefault(threading.get_ident(), [])
+        liste.append(self.name)
+        self.liste = liste
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        dauer = time.perf_counter_ns() - self.start
+        pfad = '/'.join(self.liste)
+        self.liste.pop()
+        _instrumentierung.beobachten(pfad, dauer)
+        return False
+
+
+def stufe(name: str):
+    """Zeitmessung einer Stufe `with stufe('embedding'): …`; abgeschaltet ein geteilter leerer Kontext."""
+    if not _aktiv:
+        return _LEER
+    return _Stufe(name)
+
+
+def zaehlen(name: str, n: int = 1):
+    if _aktiv:
+        _instrumentierung.zaehlen(name, n)
+
+
+# --- Sampling-Profiler ---
+
+class Profil:
+    """
+    Ergebnis von profilieren(): Proben je gefaltetem Stack (äußerster Rahmen zuerst,
+    Format von flamegraph.pl/speedscope) und je offenem Stufenpfad.
+    Bewusst keine dataclass: das Modul liegt im Importpfad des regelbasierten Kompressors.
+    """
+
+    def __init__(self, intervall_s: float):
+        self.intervall_s = intervall_s
+        self.proben = 0
+        self.dauer_s = 0.0
+        self.stapel: Counter = Counter()
+        self.stufen: Counter = Counter()
+
+    def gefaltet(self) -> str:
+        return ''.join(f'{s} {n}\n' for s, n in self.stapel.most_common())
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Funktionen mit den meisten Proben als innerster Rahmen."""
+        innen = Counter()
+        for s, anzahl in self.stapel.items():
+            innen[s.rsplit(';', 1)[-1]] += anzahl
+        return innen.most_common(n)
+
+
+def _rahmen_name(rahmen) -> str:
+    code = rahmen.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+@contextlib.contextmanager
+def profilieren(intervall_s: float = 0.005, stufen: bool = True, alle_threads: bool = False,
+                max_tiefe: int = 64):
+    """
+    Sampling-Profiler für einen einzelnen Lauf: ein Hintergrund-Thread liest alle
+    intervall_s den Python-Stack des aufrufenden Threads (alle_threads=True: aller
+    übrigen Threads, z. B. für den Runner im Modus 'threads'; wartende Threads zählen mit).
+    stufen=True schaltet die Instrumentierung für die Dauer ein, damit jede Probe
+    ihrer offenen Stufe zugeordnet wird. Proben sind durch das GIL-Umschaltintervall
+    (sys.getswitchinterval, 5 ms) begrenzt; Code in C-Erweiterungen ohne GIL zählt
+    für den aufrufenden Python-Rahmen.
+
+        with profilieren() as profil:
+            run_experiment(...)
+        print(profil.top())
+    """
+    profil = Profil(intervall_s)
+    vorher = aktivieren(True) if stufen else _aktiv
+    stopp = threading.Event()
+    ziel = None if alle_threads else threading.get_ident()
+
+    def abtasten():
+        eigene_id = threading.get_ident()
+        while not stopp.wait(intervall_s):
+            for tid, rahmen in sys._current_frames().items():
+                if tid == eigene_id or (ziel is not None and tid != ziel):
+                    continue
+                namen = []
+                while rahmen is not None and len(namen) < max_tiefe:
+                    namen.append(_rahmen_name(rahmen))
+                    rahmen = rahmen.f_back
+                profil.stapel[';'.join(reversed(namen))] += 1
+                offen = _stapel.get(tid)
+                profil.stufen['/'.join(offen) if offen else '(ohne Stufe)'] += 1
+                profil.proben += 1
+
+    thread = threading.Thread(target=abtasten, name='profiler', daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    try:
+        yield profil
+    finally:
+        stopp.set()
+        thread.join()
+        profil.dauer_s = time.perf_counter() - start
+        if stufen:
+            aktivieren(vorher)
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Inhaltsadressierter Cache für komprimierte Texte über Aufrufe, Anfragen und
+Prozesse hinweg (wiederkehrende Wissensbasis-Dokumente, System-Prompts).
+- Schlüssel = Hash des Eingabetexts, Funktionsname, Parameter und Version
+  (Quelltext der Strategie und Modellkennungen wie im Zellen-Cache)
+- Speicherstufe: LRU, begrenzt nach Einträgen und Bytes
+- Optionale Festplattenstufe (KOMPRESSIONS_CACHE_PFAD): eine JSON-Datei je
+  Eintrag, atomar geschrieben; Verdrängung nach Anzahl (LRU über mtime, beim
+  Lesen aktualisiert) und optional nach Alter (ttl_s, für beide Stufen)
+- abschnitte=True komprimiert und cacht je Absatz: ändert sich ein Absatz,
+  werden nur dessen Darstellungen neu berechnet
+Die Statistik zählt Treffer je Stufe sowie die dadurch nicht erneut
+komprimierten Eingabe-Bytes, Rechenzeit und die eingesparten Tokens.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Optionale Festplattenstufe: Verzeichnis per Umgebungsvariable aktivieren
+KOMPRESSIONS_CACHE_PFAD = os.environ.get('KOMPRESSIONS_CACHE_PFAD')
+
+_ABSATZ = re.compile(r'\n[ \t]*\n\s*')
+_VERDRAENGEN_AUF = 0.9  # Festplattenstufe: bei Überlauf auf diesen Anteil der Kapazität kürzen
+
+
+@dataclass
+class CacheEintrag:
+    text: str
+    erstellt: float
+    rechenzeit_ms: float
+    eingabe_bytes: int
+    tokens_vorher: int = -1   # -1: nicht gezählt (tokens_zaehlen=False)
+    tokens_nachher: int = -1
+
+
+@lru_cache(maxsize=None)
+def _version(funktionsname: str) -> str:
+    from .zellen_cache import _hash, modell_kennung, quellcode_hash
+    return _hash({'quelle': quellcode_hash(funktionsname), 'modell': modell_kennung()})
+
+
+def _funktion(funktionsname: str):
+    import token_minimierung
+    return getattr(token_minimierung, funktionsname)
+
+
+def absaetze(text: str) -> List[str]:
+    """Nicht-leere Absätze (durch Leerzeilen getrennt)."""
+    return [a for a in _ABSATZ.split(text) if a.strip()]
+
+
+class _DateiSpeicher:
+    """
+    Festplattenstufe: pfad/<2 Zeichen>/<Schlüssel>.json je Eintrag; die
+    Änderungszeit der Datei gilt als letzter Zugriff. Mehrere Prozesse dürfen
+    gleichzeitig lesen und schreiben (os.replace ist atomar).
+    """
+
+    def __init__(self, pfad: str, max_eintraege: int):
+        self.pfad = pfad
+        self.max_eintraege = max_eintraege
+        os.makedirs(self.pfad, exist_ok=True)
+        self._anzahl: Optional[int] = None  # beim ersten Schreiben gezählt, danach mitgeführt
+
+    def _datei(self, k: str) -> str:
+        return os.path.join(self.pfad, k[:2], k + '.json')
+
+    def holen(self, k: str) -> Optional[CacheEintrag]:
+        datei = self._datei(k)
+        try:
+            with open(datei, encoding='utf-8') as f:
+                eintrag = CacheEintrag(**json.load(f))
+            os.utime(datei)
+        except (OSError, ValueError, TypeError):
+            return None
+        return eintrag
+
+    def entfernen(self, k: str):
+        try:
+            os.remove(self._datei(k))
+        except OSError:
+            pass
+
+    def speichern(self, k: str, eintrag: CacheEintrag) -> int:
+        """Schreibt den Eintrag; liefert die Anzahl verdrängter Einträge."""
+        datei = self._datei(k)
+        os.makedirs(os.path.dirname(datei), exist_ok=True)
+        tmp = f'{datei}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(asdict(eintrag), f, ensure_ascii=False)
+        os.replace(tmp, datei)
+        self._anzahl = len(self._dateien()) if self._anzahl is None else self._anzahl + 1
+        return self._verdraengen() if self._anzahl > self.max_eintraege else 0
+
+    def _dateien(self) -> List[Tuple[float, str]]:
+        dateien = []
+        for unter in os.scandir(self.pfad):
+            if unter.is_dir():
+                for e in os.scandir(unter.path):
+                    if e.name.endswith('.json'):
+                        try:
+                            dateien.append((e.stat().st_mtime, e.path))
+                        except OSError:
+                            pass  # gleichzeitig verdrängt
+        return dateien
+
+    def _verdraengen(self) -> int:
+        dateien = sorted(self._dateien())
+        ueberschuss = max(len(dateien) - int(self.max_eintraege * _VERDRAENGEN_AUF), 0)
+        for _, datei in dateien[:ueberschuss]:
+            try:
+                os.remove(datei)
+            except OSError:
+                pass
+        self._anzahl = len(dateien) - ueberschuss
+        return ueberschuss
+
+    def __len__(self):
+        if self._anzahl is None:
+            self._anzahl = len(self._dateien())
+        return self._anzahl
+
+
+class KompressionsCache:
+    """
+    Zweistufiger Cache komprimierter Texte, thread-sicher. komprimieren()
+    liefert dasselbe Ergebnis wie der direkte Strategie-Aufruf (bzw. je Absatz
+    bei abschnitte=True), rechnet aber jede Eingabe nur einmal.
+    """
+
+    def __init__(
+        self,
+        max_eintraege: int = 10_000,
+        max_bytes: int = 64 << 20,
+        speicher_pfad: Optional[str] = None,
+        max_disk_eintraege: int = 100_000,
+        ttl_s: Optional[float] = None,
+        tokens_zaehlen: bool = True,
+    ):
+        self.max_eintraege = max_eintraege
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.tokens_zaehlen = tokens_zaehlen
+        self._disk = _DateiSpeicher(speicher_pfad, max_disk_eintraege) if speicher_pfad else None
+        self._lru: 'OrderedDict[str, Tuple[CacheEintrag, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.treffer = 0
+        self.disk_treffer = 0
+        self.fehlschlaege = 0
+        self.abgelaufen = 0
+        self.verdraengt = 0
+        self.gesparte_bytes = 0
+        self.gesparte_ms = 0.0
+        self.gesparte_tokens = 0
+
+    @property
+    def mit_festplatte(self) -> bool:
+        return self._disk is not None
+
+    @staticmethod
+    def schluessel(prompt: str, funktionsname: str, parameter: Optional[dict] = None) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(json.dumps([funktionsname, parameter or {}, _version(funktionsname)], sort_keys=True).encode())
+        h.update(b'\0' + prompt.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def _gueltig(self, eintrag: CacheEintrag) -> bool:
+        return self.ttl_s is None or time.time() - eintrag.erstellt <= self.ttl_s
+
+    def _lru_ablegen(self, k: str, eintrag: CacheEintrag):
+        # nur unter self._lock aufrufen
+        if k in self._lru:
+            self._bytes -= self._lru.pop(k)[1]
+        groesse = len(eintrag.text.encode('utf-8', 'surrogatepass'))
+        self._lru[k] = (eintrag, groesse)
+        self._bytes += groesse
+        while self._lru and (len(self._lru) > self.max_eintraege or self._bytes > self.max_bytes):
+            self._bytes -= self._lru.popitem(last=False)[1][1]
+            self.verdraengt += 1
+
+    def _treffer_zaehlen(self, eintrag: CacheEintrag):
+        # nur unter self._lock aufrufen
+        self.gesparte_bytes += eintrag.eingabe_bytes
+        self.gesparte_ms += eintrag.rechenzeit_ms
+        if eintrag.tokens_vorher >= 0:
+            self.gesparte_tokens += eintrag.tokens_vorher - eintrag.tokens_nachher
+
+    def holen(self, k: str) -> Optional[CacheEintrag]:
+        """Eintrag aus der Speicher-, sonst der Festplattenstufe; None bei Fehlschlag."""
+        with self._lock:
+            gefunden = self._lru.get(k)
+            if gefunden is not None:
+                if self._gueltig(gefunden[0]):
+                    self._lru.move_to_end(k)
+                    self.treffer += 1
+                    self._treffer_zaehlen(gefunden[0])
+                    return gefunden[0]
+                self._bytes -= self._lru.pop(k)[1]
+                self.abgelaufen += 1
+            if self._disk is None:
+                self.fehlschlaege += 1
+                return None
+        eintrag = self._disk.holen(k)
+        abgelaufen = eintrag is not None and not self._gueltig(eintrag)
+        if abgelaufen:
+            self._disk.entfernen(k)
+            eintrag = None
+        with self._lock:
+            self.abgelaufen += abgelaufen
+            if eintrag is None:
+                self.fehlschlaege += 1
+                return None
+            self.disk_treffer += 1
+            self._treffer_zaehlen(eintrag)
+            self._lru_ablegen(k, eintrag)
+        return eintrag
+
+    def ablegen(self, k: str, prompt: str, komprimiert: str, rechenzeit_ms: float) -> CacheEintrag:
+        eintrag = CacheEintrag(komprimiert, time.time(), rechenzeit_ms, len(prompt.encode('utf-8', 'surrogatepass')))
+        if self.tokens_zaehlen:
+            from .tokenizer import token_anzahlen
+            eintrag.tokens_vorher, eintrag.tokens_nachher = token_anzahlen([prompt, komprimiert])
+        with self._lock:
+            self._lru_ablegen(k, eintrag)
+        if self._disk is not None:
+            verdraengt = self._disk.speichern(k, eintrag)
+            with self._lock:
+                self.verdraengt += verdraengt
+        return eintrag
+
+    def _einzeln(self, prompt: str, funktionsname: str, parameter: dict) -> str:
+        k = self.schluessel(prompt, funktionsname, parameter)
+        eintrag = self.holen(k)
+        if eintrag is not None:
+            return eintrag.text
+        start = time.perf_counter()
+        komprimiert = _funktion(funktionsname)(prompt, **parameter)
+        self.ablegen(k, prompt, komprimiert, (time.perf_counter() - start) * 1000)
+        return komprimiert
+
+    def komprimieren(self, prompt: str, funktionsname: str, parameter: Optional[dict] = None,
+                     abschnitte: bool = False) -> str:
+        """
+        Komprimiert prompt mit der Strategie funktionsname (z. B. 'kompression_chunking').
+        abschnitte=True: jeder Absatz wird einzeln komprimiert und gecacht, die
+        Ergebnisse durch Leerzeilen verbunden – geänderte Dokumente rechnen nur
+        die geänderten Absätze neu (Ergebnis = Strategie je Absatz, nicht über
+        das ganze Dokument).
+        """
+        parameter = parameter or {}
+        if not abschnitte:
+            return self._einzeln(prompt, funktionsname, parameter)
+        teile = absaetze(prompt)
+        if len(teile) <= 1:
+            return self._einzeln(prompt, funktionsname, parameter)
+        return '\n\n'.join(self._einzeln(t, funktionsname, parameter) for t in teile)
+
+    def leeren(self):
+        """Leert die Speicherstufe (Festplattenstufe bleibt erhalten)."""
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+
+    def statistik(self) -> dict:
+        anfragen = self.treffer + self.disk_treffer + self.fehlschlaege
+        return {
+            'treffer': self.treffer,
+            'disk_treffer': self.disk_treffer,
+            'fehlschlaege': self.fehlschlaege,
+            'trefferquote': (self.treffer + self.disk_treffer) / anfragen if anfragen else 0.0,
+            'abgelaufen': self.abgelaufen,
+            'verdraengt': self.verdraengt,
+            'eintraege_speicher': len(self._lru),
+            'bytes_speicher': self._bytes,
+            'eintraege_disk': len(self._disk) if self._disk is not None else 0,
+            'gesparte_bytes': self.gesparte_bytes,
+            'gesparte_s': self.gesparte_ms / 1000,
+            'gesparte_tokens': self.gesparte_tokens,
+        }
+
+
+_cache: Optional[KompressionsCache] = None
+
+
+def get_kompressions_cache() -> KompressionsCache:
+    """Prozessweiter Cache; Festplattenstufe aus KOMPRESSIONS_CACHE_PFAD."""
+    global _cache
+    if _cache is None:
+        _cache = KompressionsCache(speicher_pfad=KOMPRESSIONS_CACHE_PFAD)
+    return _cache
+
+
+def komprimieren_gecacht(prompt: str, funktionsname: str, abschnitte: bool = False, **parameter) -> str:
+    """Strategie-Aufruf über den prozessweiten Cache."""
+    return get_kompressions_cache().komprimieren(prompt, funktionsname, parameter, abschnitte)
@@ -0,0 +1,549 @@
+# -*- coding: utf-8 -*-
+"""
+Lokaler Kompressionsdienst (asyncio, HTTP/1.1 über TCP oder Unix-Socket),
+nur Standardbibliothek – kein Web-Framework nötig.
+- POST /komprimieren  {"strategie": "strukturiert", "prompt": "...", "parameter": {...}}
+  → {"komprimiert": "...", "strategie": ..., "batch_groesse": n, "gecacht": false, "dauer_ms": ...}
+- GET /metrics (Prometheus-Textformat), GET /gesund
+- Embedding-Strategien (strukturiert, token_budget mit relevanz_gewicht > 0) laufen
+  über einen Mikro-Batcher: gleichzeitige Anfragen werden bis max_batch oder bis
+  zur Frist max_wartezeit_ms gesammelt und mit einem Modellaufruf bedient; während
+  ein Batch rechnet, sammelt sich der nächste (dynamische Batch-Größe)
+- Rechenarbeit läuft in Executoren (Modell: ein Thread; übrige Strategien: Threads
+  oder Prozesse), die Event-Loop blockiert nie
+- Begrenzte Warteschlangen: ist sie voll, antwortet der Dienst sofort mit 429
+  und Retry-After (Backpressure statt wachsender Latenz)
+- Optional (--cache): wiederkehrende Prompts aus dem KompressionsCache
+  (kompressions_cache.py), ohne Warteschlange und Executor
+- Optional (--instrumentierung oder INSTRUMENTIERUNG=1): /metrics enthält die
+  Stufen-Latenzen (instrumentierung.py) der Threads dieses Prozesses
+
+Start: python -m token_minimierung.kompressionsdienst --port 8080
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import time
+from bisect import bisect_left
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Tuple, get_args
+
+from . import instrumentierung
+from .kompressions_cache import KOMPRESSIONS_CACHE_PFAD, KompressionsCache
+from .tokenizer import tokenisieren
+
+# Kurzname → Funktionsname (beide werden als "strategie" akzeptiert)
+DIENST_STRATEGIEN = {
+    'manuell': 'kompression_manuell',
+    'strukturiert': 'kompression_strukturiert',
+    'token_budget': 'kompression_token_budget',
+    'chunking': 'kompression_chunking',
+    'duplikate': 'kompression_duplikate',
+}
+MAX_KOERPER_BYTES = 8 << 20
+_JSON_TYPEN = (bool, int, float, str)
+LATENZ_GRENZEN = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_GRENZEN = (1, 2, 4, 8, 16, 32, 64, 128)
+_STATUS_TEXTE = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                 413: 'Payload Too Large', 429: 'Too Many Requests', 500: 'Internal Server Error',
+                 503: 'Service Unavailable'}
+
+
+class Ueberlastet(Exception):
+    """Warteschlange voll – wird als 429 beantwortet."""
+
+
+class UngueltigeAnfrage(ValueError):
+    """Fehlerhafte Anfrage – wird als 400 beantwortet."""
+
+
+class _KopfFehler(Exception):
+    """
+    Ungültiger Content-Length (400) oder zu großer Körper (413); der Körper
+    bleibt ungelesen, die Verbindung wird danach geschlossen.
+    """
+
+    def __init__(self, status: int, meldung: str):
+        super().__init__(meldung)
+        self.status = status
+
+
+def _funktion(funktionsname: str):
+    import token_minimierung
+    return getattr(token_minimierung, funktionsname)
+
+
+def _braucht_embeddings(funktionsname: str, parameter: dict) -> bool:
+    if funktionsname == 'kompression_strukturiert':
+        return True
+    return funktionsname == 'kompression_token_budget' and parameter.get('relevanz_gewicht', 0.0) > 0
+
+
+@lru_cache(maxsize=None)
+def _parameter_namen(funktionsname: str) -> Tuple[str, ...]:
+    return tuple(inspect.signature(_funktion(funktionsname)).parameters)[1:]
+
+
+@lru_cache(maxsize=None)
+def _parameter_typen(funktionsname: str) -> Dict[str, Tuple[type, ...]]:
+    """Zulässige JSON-Typen je Parameter: Typ des Standardwerts, bei Standard None aus der Annotation."""
+    typen = {}
+    for p in list(inspect.signature(_funktion(funktionsname)).parameters.values())[1:]:
+        if isinstance(p.default, _JSON_TYPEN):
+            typen[p.name] = (type(p.default),)
+        elif p.default is None:
+            erlaubt = tuple(t for t in get_args(p.annotation) if t in _JSON_TYPEN)
+            if erlaubt:
+                typen[p.name] = erlaubt + (type(None),)
+    return typen
+
+
+def _typ_passt(wert, typ: type) -> bool:
+    if typ is bool or isinstance(wert, bool):  # bool ist in Python eine Unterklasse von int
+        return typ is bool and isinstance(wert, bool)
+    if typ is float:
+        return isinstance(wert, (int, float))
+    return isinstance(wert, typ)
+
+
+def anfrage_pruefen(daten) -> Tuple[str, str, dict]:
+    """(Funktionsname, Prompt, Parameter) aus dem JSON-Körper; UngueltigeAnfrage bei Fehlern."""
+    if not isinstance(daten, dict):
+        raise UngueltigeAnfrage("JSON-Objekt erwartet")
+    strategie = daten.get('strategie')
+    funktionsname = DIENST_STRATEGIEN.get(strategie, strategie)
+    if funktionsname not in DIENST_STRATEGIEN.values():
+        raise UngueltigeAnfrage(f"Unbekannte Strategie: {strategie!r} ({', '.join(DIENST_STRATEGIEN)})")
+    prompt = daten.get('prompt')
+    if not isinstance(prompt, str):
+        raise UngueltigeAnfrage("'prompt' muss ein String sein")
+    parameter = daten.get('parameter') or {}
+    if not isinstance(parameter, dict):
+        raise UngueltigeAnfrage("'parameter' muss ein Objekt sein")
+    erlaubt = _parameter_namen(funktionsname)
+    unbekannt = set(parameter) - set(erlaubt)
+    if unbekannt:
+        raise UngueltigeAnfrage(f"Unbekannte Parameter für {funktionsname}: {', '.join(sorted(unbekannt))} "
+                                f"(erlaubt: {', '.join(erlaubt)})")
+    typen = _parameter_typen(funktionsname)
+    for name, wert in parameter.items():
+        if name in typen and not any(_typ_passt(wert, t) for t in typen[name]):
+            erwartet = ' oder '.join('null' if t is type(None) else t.__name__ for t in typen[name])
+            raise UngueltigeAnfrage(f"Parameter {name!r} muss vom Typ {erwartet} sein, nicht {type(wert).__name__}")
+    return funktionsname, prompt, parameter
+
+
+# --- Rechenarbeit (läuft in Executoren) ---
+
+def _embedding_gruppe(funktionsname: str, prompts: List[str], parameter: dict) -> List[str]:
+    """Ein Batch gleicher Strategie und Parameter; alle Satz-Embeddings in einem Modellaufruf."""
+    if funktionsname == 'kompression_strukturiert':
+        return _funktion('kompression_strukturiert_batch')(prompts, **parameter)
+    from .dokument import dokumente_analysieren
+    from .embedding import get_embedding_dienst
+    docs = dokumente_analysieren(prompts)
+    get_embedding_dienst().encode([s for d in docs for s in d.saetze])  # danach nur Cache-Treffer
+    funktion = _funktion(funktionsname)
+    return [funktion(d, **parameter) for d in docs]
+
+
+def _embedding_batch(gruppen: List[Tuple[str, List[str], dict]]) -> List[object]:
+    ergebnisse = []
+    for funktionsname, prompts, parameter in gruppen:
+        try:
+            ergebnisse.append(_embedding_gruppe(funktionsname, prompts, parameter))
+        except Exception as e:  # Fehler nur für die betroffene Gruppe
+            ergebnisse.append(e)
+    return ergebnisse
+
+
+def _einzeln(funktionsname: str, prompt: str, parameter: dict) -> str:
+    return _funktion(funktionsname)(prompt, **parameter)
+
+
+def _modell_init():
+    from .runner import _worker_init
+    _worker_init()
+
+
+def _cpu_init():
+    tokenisieren("warm-up")
+
+
+# --- Metriken ---
+
+class Histogramm:
+    """Kumulatives Histogramm mit festen Obergrenzen (Prometheus-Buckets, le = ≤)."""
+
+    def __init__(self, grenzen):
+        self.grenzen = grenzen
+        self.zaehler = [0] * (len(grenzen) + 1)
+        self.summe = 0.0
+        self.anzahl = 0
+
+    def beobachten(self, wert: float):
+        self.zaehler[bisect_left(self.grenzen, wert)] += 1
+        self.summe += wert
+        self.anzahl += 1
+
+    def prometheus(self, name: str, labels: str = '') -> List[str]:
+        zeilen, kumuliert = [], 0
+        for grenze, n in zip(list(self.grenzen) + ['+Inf'], self.zaehler):
+            kumuliert += n
+            zeilen.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="{grenze}"}} {kumuliert}')
+        suffix = f'{{{labels}}}' if labels else ''
+        zeilen.append(f'{name}_sum{suffix} {self.summe}')
+        zeilen.append(f'{name}_count{suffix} {self.anzahl}')
+        return zeilen
+
+
+class Metriken:
+    def __init__(self):
+        self.anfragen: Dict[Tuple[str, int], int] = {}
+        self.latenzen: Dict[str, Histogramm] = {}
+        self.batch_groessen = Histogramm(BATCH_GRENZEN)
+        self.start = time.time()
+
+    def anfrage(self, strategie: str, status: int, dauer_s: float):
+        self.anfragen[(strategie, status)] = self.anfragen.get((strategie, status), 0) + 1
+        if status == 200:
+            self.latenzen.setdefault(strategie, Histogramm(LATENZ_GRENZEN)).beobachten(dauer_s)
+
+    def prometheus(self, warteschlangen: Dict[str, int], cache: Optional[dict] = None) -> str:
+        zeilen = ['# TYPE kompression_anfragen_total counter']
+        for (strategie, status), n in sorted(self.anfragen.items()):
+            zeilen.append(f'kompression_anfragen_total{{strategie="{strategie}",status="{status}"}} {n}')
+        zeilen.append('# TYPE kompression_latenz_sekunden histogram')
+        for strategie, h in sorted(self.latenzen.items()):
+            zeilen.extend(h.prometheus('kompression_latenz_sekunden', f'strategie="{strategie}"'))
+        zeilen.append('# TYPE kompression_batch_groesse histogram')
+        zeilen.extend(self.batch_groessen.prometheus('kompression_batch_groesse'))
+        zeilen.append('# TYPE kompression_warteschlange gauge')
+        for name, n in warteschlangen.items():
+            zeilen.append(f'kompression_warteschlange{{art="{name}"}} {n}')
+        if cache is not None:
+            zeilen.append('# TYPE kompression_cache_anfragen_total counter')
+            for ergebnis in ('treffer', 'disk_treffer', 'fehlschlaege'):
+                zeilen.append(f'kompression_cache_anfragen_total{{ergebnis="{ergebnis}"}} {cache[ergebnis]}')
+            zeilen.append('# TYPE kompression_cache_gespart_bytes_total counter')
+            zeilen.append(f'kompression_cache_gespart_bytes_total {cache["gesparte_bytes"]}')
+            zeilen.append('# TYPE kompression_cache_eintraege gauge')
+            zeilen.append(f'kompression_cache_eintraege {cache["eintraege_speicher"]}')
+        zeilen.append('# TYPE kompression_laufzeit_sekunden gauge')
+        zeilen.append(f'kompression_laufzeit_sekunden {time.time() - self.start:.3f}')
+        return '\n'.join(zeilen) + '\n'
+
+
+# --- Mikro-Batcher ---
+
+class Mikrobatcher:
+    """
+    Sammelt Anfragen für Embedding-Strategien in einer begrenzten Warteschlange.
+    Ein Verbraucher nimmt die erste Anfrage, wartet höchstens max_wartezeit_ms auf
+    weitere (bis max_batch), gruppiert nach Strategie und Parametern und rechnet
+    den Batch im Modell-Executor.
+    """
+
+    def __init__(self, executor: Executor, metriken: Metriken, max_batch: int = 64,
+                 max_wartezeit_ms: float = 5.0, max_warteschlange: int = 1024):
+        self.executor = executor
+        self.metriken = metriken
+        self.max_batch = max_batch
+        self.max_wartezeit = max_wartezeit_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_warteschlange)
+        self._verbraucher: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def starten(self):
+        self._verbraucher = asyncio.get_running_loop().create_task(self._verarbeiten())
+
+    async def stoppen(self):
+        if self._verbraucher is not None:
+            self._verbraucher.cancel()
+            try:
+                await self._verbraucher
+            except asyncio.CancelledError:
+                pass
+
+    async def einreichen(self, funktionsname: str, prompt: str, parameter: dict) -> Tuple[str, int]:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((funktionsname, prompt, parameter, future, time.monotonic()))
+        except asyncio.QueueFull:
+            raise Ueberlastet() from None
+        return await future
+
+    async def _verarbeiten(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Frist ab Eingang der ersten Anfrage: wer schon während des vorigen Batches
+            # gewartet hat, wird nicht noch einmal aufgehalten
+            frist = loop.time() + self.max_wartezeit - (time.monotonic() - batch[0][4])
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                rest = frist - loop.time()
+                if rest <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), rest))
+                except asyncio.TimeoutError:
+                    break
+            await self._batch_ausfuehren(batch)
+
+    async def _batch_ausfuehren(self, batch):
+        batch = [eintrag for eintrag in batch if not eintrag[3].done()]  # abgebrochene Clients
+        if not batch:
+            return
+        gruppen: Dict[tuple, list] = {}
+        for eintrag in batch:
+            schluessel = (eintrag[0], json.dumps(eintrag[2], sort_keys=True))
+            gruppen.setdefault(schluessel, []).append(eintrag)
+        auftraege = [(eintraege[0][0], [e[1] for e in eintraege], eintraege[0][2])
+                     for eintraege in gruppen.values()]
+        self.metriken.batch_groessen.beobachten(len(batch))
+        try:
+            ergebnisse = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _embedding_batch, auftraege)
+        except Exception as e:
+            ergebnisse = [e] * len(auftraege)
+        for eintraege, ergebnis in zip(gruppen.values(), ergebnisse):
+            for i, (_, _, _, future, _) in enumerate(eintraege):
+                if future.done():
+                    continue
+                if isinstance(ergebnis, Exception):
+                    future.set_exception(ergebnis)
+                else:
+                    future.set_result((ergebnis[i], len(batch)))
+
+
+# --- Dienst ---
+
+class Kompressionsdienst:
+    """HTTP-Dienst über asyncio-Streams; start_tcp/start_unix liefern den asyncio-Server."""
+
+    def __init__(self, max_batch: int = 64, max_wartezeit_ms: float = 5.0,
+                 max_warteschlange: int = 1024, cpu_worker: Optional[int] = None,
+                 cpu_modus: str = 'threads', vorwaermen: bool = True,
+                 cache: Optional[KompressionsCache] = None):
+        if cpu_modus not in ('threads', 'prozesse'):
+            raise ValueError(f"Unbekannter cpu_modus: {cpu_modus!r} (threads, prozesse)")
+        self.metriken = Metriken()
+        self.max_warteschlange = max_warteschlange
+        self.vorwaermen = vorwaermen
+        self.cache = cache
+        cpu_worker = cpu_worker or os.cpu_count() or 1
+        self._modell_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='modell')
+        if cpu_modus == 'prozesse':
+            self._cpu_executor = ProcessPoolExecutor(max_workers=cpu_worker, initializer=_cpu_init)
+        else:
+            self._cpu_executor = ThreadPoolExecutor(max_workers=cpu_worker, thread_name_prefix='cpu')
+        self._batch_parameter = (max_batch, max_wartezeit_ms, max_warteschlange)
+        self.batcher: Optional[Mikrobatcher] = None
+        self._cpu_laufend = 0
+
+    async def _starten(self):
+        if self.batcher is None:
+            loop = asyncio.get_running_loop()
+            if self.vorwaermen:
+                await loop.run_in_executor(self._modell_executor, _modell_init)
+            self.batcher = Mikrobatcher(self._modell_executor, self.metriken, *self._batch_parameter)
+            self.batcher.starten()
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 8080):
+        await self._starten()
+        return await asyncio.start_server(self._verbindung, host, port)
+
+    async def start_unix(self, pfad: str):
+        await self._starten()
+        return await asyncio.start_unix_server(self._verbindung, pfad)
+
+    async def schliessen(self):
+        if self.batcher is not None:
+            await self.batcher.stoppen()
+        self._modell_executor.shutdown(wait=False)
+        self._cpu_executor.shutdown(wait=False)
+
+    async def komprimieren(self, funktionsname: str, prompt: str, parameter: dict) -> Tuple[str, int]:
+        """(komprimierter Text, Batch-Größe – 0 bei Cache-Treffer); Ueberlastet bei voller Warteschlange."""
+        if self.cache is None:
+            return await self._rechnen(funktionsname, prompt, parameter)
+        loop = asyncio.get_running_loop()
+        k = self.cache.schluessel(prompt, funktionsname, parameter)
+        if self.cache.mit_festplatte:
+            eintrag = await loop.run_in_executor(None, self.cache.holen, k)
+        else:
+            eintrag = self.cache.holen(k)
+        if eintrag is not None:
+            return eintrag.text, 0
+        start = time.perf_counter()
+        ergebnis = await self._rechnen(funktionsname, prompt, parameter)
+        # Token-Zählung und Festplatte nicht in der Event-Loop
+        await loop.run_in_executor(None, self.cache.ablegen, k, prompt, ergebnis[0],
+                                   (time.perf_counter() - start) * 1000)
+        return ergebnis
+
+    async def _rechnen(self, funktionsname: str, prompt: str, parameter: dict) -> Tuple[str, int]:
+        if _braucht_embeddings(funktionsname, parameter):
+            return await self.batcher.einreichen(funktionsname, prompt, parameter)
+        if self._cpu_laufend >= self.max_warteschlange:
+            raise Ueberlastet()
+        self._cpu_laufend += 1
+        try:
+            ergebnis = await asyncio.get_running_loop().run_in_executor(
+                self._cpu_executor, partial(_einzeln, funktionsname, prompt, parameter))
+        finally:
+            self._cpu_laufend -= 1
+        return ergebnis, 1
+
+    async def _verbindung(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    anfrage = await _anfrage_lesen(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except _KopfFehler as e:
+                    writer.write(_antwort(*_fehler(e.status, str(e)), offen=False))
+                    await writer.drain()
+                    break
+                if anfrage is None:
+                    break
+                methode, pfad, kopf, koerper = anfrage
+                status, inhalt, art, zusatz = await self._bearbeiten(methode, pfad, koerper)
+                offen = kopf.get('connection', '').lower() != 'close'
+                writer.write(_antwort(status, inhalt, art, zusatz, offen))
+                await writer.drain()
+                if not offen:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _bearbeiten(self, methode: str, pfad: str, koerper: bytes):
+        if pfad == '/metrics':
+            warteschlangen = {'embedding': len(self.batcher), 'cpu': self._cpu_laufend}
+            cache = self.cache.statistik() if self.cache is not None else None
+            text = self.metriken.prometheus(warteschlangen, cache)
+            if instrumentierung.aktiv():
+                text += instrumentierung.get_instrumentierung().prometheus()
+            return 200, text.encode(), 'text/plain; version=0.0.4', {}
+        if pfad == '/gesund':
+            return 200, b'{"status": "ok"}', 'application/json', {}
+        if pfad != '/komprimieren':
+            return _fehler(404, f"Unbekannter Pfad: {pfad}")
+        if methode != 'POST':
+            return _fehler(405, "Nur POST")
+        start = time.perf_counter()
+        strategie = 'unbekannt'
+        try:
+            funktionsname, prompt, parameter = anfrage_pruefen(json.loads(koerper or b'null'))
+            strategie = funktionsname
+            komprimiert, batch_groesse = await self.komprimieren(funktionsname, prompt, parameter)
+        except (ValueError, TypeError) as e:  # UngueltigeAnfrage, JSON-Fehler, ungültige Parameterwerte
+            self.metriken.anfrage(strategie, 400, 0.0)
+            return _fehler(400, str(e))
+        except Ueberlastet:
+            self.metriken.anfrage(strategie, 429, 0.0)
+            return _fehler(429, "Warteschlange voll", {'Retry-After': '1'})
+        except Exception as e:
+            self.metriken.anfrage(strategie, 500, 0.0)
+            return _fehler(500, f"{type(e).__name__}: {e}")
+        dauer = time.perf_counter() - start
+        self.metriken.anfrage(strategie, 200, dauer)
+        antwort = {'komprimiert': komprimiert, 'strategie': strategie,
+                   'batch_groesse': batch_groesse, 'gecacht': batch_groesse == 0, 'dauer_ms': dauer * 1000}
+        return 200, json.dumps(antwort, ensure_ascii=False).encode(), 'application/json', {}
+
+
+# --- HTTP/1.1 (minimal: Content-Length, Keep-Alive) ---
+
+async def _anfrage_lesen(reader: asyncio.StreamReader):
+    zeile = await reader.readline()
+    if not zeile:
+        return None
+    teile = zeile.decode('latin-1').split()
+    if len(teile) < 2:
+        return None
+    methode, pfad = teile[0].upper(), teile[1].split('?', 1)[0]
+    kopf = {}
+    while True:
+        zeile = await reader.readline()
+        if zeile in (b'\r\n', b'\n', b''):
+            break
+        name, _, wert = zeile.decode('latin-1').partition(':')
+        kopf[name.strip().lower()] = wert.strip()
+    wert = kopf.get('content-length') or '0'
+    if not (wert.isascii() and wert.isdigit()):
+        raise _KopfFehler(400, f"Ungültiger Content-Length: {wert!r}")
+    laenge = int(wert)
+    if laenge > MAX_KOERPER_BYTES:
+        raise _KopfFehler(413, f"Körper größer als {MAX_KOERPER_BYTES} Bytes")
+    koerper = await reader.readexactly(laenge) if laenge else b''
+    return methode, pfad, kopf, koerper
+
+
+def _fehler(status: int, meldung: str, zusatz: Optional[dict] = None):
+    return status, json.dumps({'fehler': meldung}, ensure_ascii=False).encode(), 'application/json', zusatz or {}
+
+
+def _antwort(status: int, inhalt: bytes, art: str, zusatz: dict, offen: bool) -> bytes:
+    kopf = [f'HTTP/1.1 {status} {_STATUS_TEXTE.get(status, "")}',
+            f'Content-Type: {art}',
+            f'Content-Length: {len(inhalt)}',
+            f'Connection: {"keep-alive" if offen else "close"}']
+    kopf.extend(f'{k}: {v}' for k, v in zusatz.items())
+    return ('\r\n'.join(kopf) + '\r\n\r\n').encode('latin-1') + inhalt
+
+
+async def _dienen(args):
+    dienst = Kompressionsdienst(max_batch=args.max_batch, max_wartezeit_ms=args.max_wartezeit_ms,
+                                max_warteschlange=args.max_warteschlange, cpu_worker=args.cpu_worker,
+                                cpu_modus=args.cpu_modus,
+                                cache=KompressionsCache(speicher_pfad=args.cache_pfad) if args.cache else None)
+    if args.unix:
+        server = await dienst.start_unix(args.unix)
+        print(f"Kompressionsdienst auf unix:{args.unix}")
+    else:
+        server = await dienst.start_tcp(args.host, args.port)
+        print(f"Kompressionsdienst auf http://{args.host}:{args.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await dienst.schliessen()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Kompressionsdienst mit Mikro-Batching")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', help="Unix-Socket-Pfad statt TCP")
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wartezeit-ms', type=float, default=5.0)
+    parser.add_argument('--max-warteschlange', type=int, default=1024)
+    parser.add_argument('--cpu-worker', type=int, default=None)
+    parser.add_argument('--cpu-modus', choices=('threads', 'prozesse'), default='threads')
+    parser.add_argument('--cache', action='store_true', help="Ergebnisse wiederkehrender Prompts cachen")
+    parser.add_argument('--cache-pfad', default=KOMPRESSIONS_CACHE_PFAD,
+                        help="Festplattenstufe des Caches (Standard: KOMPRESSIONS_CACHE_PFAD)")
+    parser.add_argument('--instrumentierung', action='store_true', help="Stufen-Latenzen unter /metrics")
+    args = parser.parse_args()
+    if args.instrumentierung:
+        instrumentierung.aktivieren()
+    try:
+        asyncio.run(_dienen(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
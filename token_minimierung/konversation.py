@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Inkrementelle Kompression von Gesprächsverläufen (Multi-Turn-Chat).
+Statt den wachsenden Verlauf bei jedem Turn als neuen Prompt zu behandeln
+(erneut segmentieren, tokenisieren, embedden – quadratisch über die Sitzung),
+hält Konversation je Satz Text, Turn, Token-Anzahl, Embedding und Norm; ein
+neuer Turn verarbeitet nur seine eigenen Sätze:
+- Zentrum: laufende Summe der Embeddings (float64), beim Anhängen aktualisiert
+- Auswahl wie kompression_strukturiert (Centrality zum Zentrum, Budget
+  ziel_tokens bzw. ziel_anteil der Gesamt-Tokens, mindestens min_saetze)
+- zustand()/aus_zustand(): JSON-fähiger Zustand (Embeddings base64-kodiert),
+  um ihn zwischen Anfragen abzulegen
+"""
+import base64
+from typing import List, Optional
+
+import numpy as np
+
+from .segmentierung import saetze_zerlegen
+from .tokenizer import token_anzahlen
+
+_ZUSTAND_VERSION = 1
+
+
+def _embedding_dienst():
+    from .embedding import get_embedding_dienst
+    return get_embedding_dienst()
+
+
+def _kodieren(a: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(a).tobytes()).decode('ascii')
+
+
+def _dekodieren(text: str, dtype, form) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(text), dtype=dtype).reshape(form).copy()
+
+
+class Konversation:
+    """
+    Zustand eines Gesprächs für die strukturierte Kompression. anhaengen() kostet
+    nur die Sätze des neuen Turns; komprimiert() wählt über alle Sätze (ein
+    Skalarprodukt je Satz, keine Modell- oder Tokenizer-Aufrufe).
+    """
+
+    def __init__(self, ziel_tokens: Optional[int] = None, ziel_anteil: float = 0.45, min_saetze: int = 2):
+        self.ziel_tokens = ziel_tokens
+        self.ziel_anteil = ziel_anteil
+        self.min_saetze = min_saetze
+        self.saetze: List[str] = []
+        self.rollen: List[str] = []  # je Turn
+        # je Satz, mit Kapazität ≥ len(saetze) (verdoppelt bei Bedarf, Anhängen amortisiert O(neue Sätze))
+        self._turn = np.zeros(0, dtype=np.int32)
+        self._laengen = np.zeros(0, dtype=np.int64)
+        self._normen = np.zeros(0, dtype=np.float64)
+        self._emb = np.zeros((0, 0), dtype=np.float32)
+        self._summe = np.zeros(0, dtype=np.float64)
+        self.token_gesamt = 0
+        self.kennung = _embedding_dienst().kennung
+
+    def __len__(self) -> int:
+        return len(self.saetze)
+
+    @property
+    def turns(self) -> int:
+        return len(self.rollen)
+
+    def _platz(self, neu: int, dim: int):
+        n = len(self.saetze)
+        if not n:
+            self._summe = np.zeros(dim, dtype=np.float64)
+        if n + neu <= len(self._laengen):
+            return
+        kapazitaet = max(64, 2 * len(self._laengen), n + neu)
+
+        def vergroessern(a: np.ndarray) -> np.ndarray:
+            groesser = np.zeros((kapazitaet,) + a.shape[1:], dtype=a.dtype)
+            groesser[:n] = a[:n]
+            return groesser
+        self._turn, self._laengen, self._normen = map(vergroessern, (self._turn, self._laengen, self._normen))
+        self._emb = vergroessern(self._emb if n else np.zeros((0, dim), dtype=np.float32))
+
+    def anhaengen(self, text: str, rolle: str = 'user'):
+        """Segmentiert, zählt und embeddet nur die Sätze des neuen Turns."""
+        saetze = [s for s in saetze_zerlegen(text) if s]
+        turn = len(self.rollen)
+        self.rollen.append(rolle)
+        if not saetze:
+            return
+        laengen = np.asarray(token_anzahlen(saetze), dtype=np.int64)
+        emb = np.asarray(_embedding_dienst().encode(saetze), dtype=np.float32)
+        self._platz(len(saetze), emb.shape[1])
+        n, m = len(self.saetze), len(saetze)
+        self._emb[n:n + m] = emb
+        self._normen[n:n + m] = np.linalg.norm(emb, axis=1)
+        self._laengen[n:n + m] = laengen
+        self._turn[n:n + m] = turn
+        self._summe += emb.sum(axis=0, dtype=np.float64)
+        self.saetze.extend(saetze)
+        self.token_gesamt += int(laengen.sum())
+
+    def scores(self) -> np.ndarray:
+        """Centrality je Satz: Cosinus zum Mittelwert aller bisherigen Satz-Embeddings."""
+        n = len(self.saetze)
+        if not n:
+            return np.zeros(0)
+        zentrum = self._summe / n
+        return (self._emb[:n] @ zentrum) / (self._normen[:n] * np.linalg.norm(zentrum) + 1e-9)
+
+    def auswahl(self) -> np.ndarray:
+        """
+        Indizes der behaltenen Sätze in Originalreihenfolge (Regeln wie _auswahl_nach_centrality,
+        bei gleichem Score der frühere Satz zuerst). Die Token-Anzahlen stammen aus der
+        Zählung je Satz beim Anhängen; kompression_strukturiert auf dem ganzen Verlauf zählt
+        im Zusammenhang, an Satzgrenzen können sie abweichen – das Ergebnis nähert eine
+        vollständige Neuberechnung daher nur an.
+        """
+        n = len(self.saetze)
+        if n <= self.min_saetze:
+            return np.arange(n)
+        ziel = self.ziel_tokens if self.ziel_tokens is not None else max(50, int(self.token_gesamt * self.ziel_anteil))
+        reihenfolge = np.argsort(-self.scores(), kind='stable')
+        # kumulierte Kosten (je Satz + 1 Trennzeichen) in Score-Reihenfolge; der erste
+        # Satz über dem Budget beendet die Auswahl, min_saetze gelten immer
+        kumuliert = np.cumsum(self._laengen[:n][reihenfolge] + 1)
+        anzahl = max(int(np.searchsorted(kumuliert, ziel, side='right')), min(self.min_saetze, n))
+        return np.sort(reihenfolge[:anzahl])
+
+    def komprimiert(self) -> str:
+        """Komprimierter Verlauf (ausgewählte Sätze, durch Leerzeichen verbunden)."""
+        return ' '.join(self.saetze[i] for i in self.auswahl().tolist())
+
+    def turn_saetze(self, turn: int) -> List[str]:
+        return [self.saetze[i] for i in np.flatnonzero(self._turn[:len(self.saetze)] == turn).tolist()]
+
+    def zustand(self) -> dict:
+        """JSON-fähiger Zustand (Embeddings und Zähler base64-kodiert)."""
+        n = len(self.saetze)
+        return {
+            'version': _ZUSTAND_VERSION,
+            'kennung': self.kennung,
+            'ziel_tokens': self.ziel_tokens,
+            'ziel_anteil': self.ziel_anteil,
+            'min_saetze': self.min_saetze,
+            'saetze': self.saetze,
+            'rollen': self.rollen,
+            'turn': _kodieren(self._turn[:n]),
+            'laengen': _kodieren(self._laengen[:n]),
+            'dim': int(self._emb.shape[1]),
+            'embeddings': _kodieren(self._emb[:n]),
+            'summe': _kodieren(self._summe),
+        }
+
+    @classmethod
+    def aus_zustand(cls, zustand: dict) -> 'Konversation':
+        """Stellt eine Konversation aus zustand() wieder her; ValueError bei anderem Embedding-Modell."""
+        if zustand.get('version') != _ZUSTAND_VERSION:
+            raise ValueError(f"Unbekannte Zustandsversion: {zustand.get('version')!r}")
+        k = cls(zustand['ziel_tokens'], zustand['ziel_anteil'], zustand['min_saetze'])
+        if zustand['kennung'] != k.kennung:
+            raise ValueError(f"Zustand stammt von {zustand['kennung']!r}, aktiv ist {k.kennung!r}")
+        k.saetze = list(zustand['saetze'])
+        k.rollen = list(zustand['rollen'])
+        n = len(k.saetze)
+        k._turn = _dekodieren(zustand['turn'], np.int32, (n,))
+        k._laengen = _dekodieren(zustand['laengen'], np.int64, (n,))
+        k.token_gesamt = int(k._laengen.sum())
+        k._emb = _dekodieren(zustand['embeddings'], np.float32, (n, zustand['dim']))
+        k._summe = _dekodieren(zustand['summe'], np.float64, (-1,))
+        k._normen = np.linalg.norm(k._emb, axis=1).astype(np.float64)
+        return k
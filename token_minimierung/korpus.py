@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+Korpus-Experimente: große Mengen realer (anonymisierter) Tickets und Dokumente
+statt der drei TEST_PROMPTS.
+- Korpus: liest JSONL- oder Text-Shards per mmap und liefert Datensätze (id,
+  szenario, text) einzeln und lazy; Stichprobe (Anteil über Hash der id, oder
+  Reservoir mit fester Anzahl), Filter nach Längen-Bucket, Aufteilung in Shards
+  nach Byte-Bereichen (shard(i, n): jeder Datensatz gehört genau einem Shard)
+- korpus_ausfuehren: alle Strategien je Datensatz, Qualität blockweise gebündelt,
+  Worker rechnen je einen Shard; Ergebnis ist ein KorpusAggregat (laufende Summen
+  je Szenario, Längen-Bucket und Strategie), keine Ergebnisliste
+Speicher hängt nicht von der Korpusgröße ab: ein Datensatz bzw. ein Block im
+Speicher, gelesene Seiten der Abbildung werden freigegeben (madvise).
+Aufruf: python -m token_minimierung.korpus tickets-*.jsonl --anteil 0.01 --modus prozesse
+"""
+import hashlib
+import json
+import mmap
+import os
+import random
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .ergebnisspeicher import DATAFRAME_SPALTEN
+from .experiment import ExperimentResult, StrategieSpec, run_experiment, strategie_funktion
+from .instrumentierung import stufe
+from .tokenizer import token_anzahl
+
+FORMATE = ('jsonl', 'zeile', 'absatz')
+# Längen-Buckets nach Token-Anzahl: Name → [von, bis)
+LAENGEN_BUCKETS = {
+    'kurz': (0, 256),
+    'mittel': (256, 1024),
+    'lang': (1024, 4096),
+    'sehr_lang': (4096, None),
+}
+FREIGABE_BYTES = 64 << 20  # gelesene Seiten der Abbildung in Schritten dieser Größe freigeben
+BLOCK_GROESSE = 64         # Datensätze je Qualitäts-Batch in korpus_ausfuehren
+
+
+@dataclass
+class Datensatz:
+    id: str
+    szenario: str
+    text: str
+    tokens: int = -1  # nur gezählt, wenn nach Bucket gefiltert wird
+
+
+def laengen_bucket(tokens: int) -> str:
+    for name, (von, bis) in LAENGEN_BUCKETS.items():
+        if tokens >= von and (bis is None or tokens < bis):
+            return name
+    return 'kurz'
+
+
+def _format(pfad: str, format: Optional[str]) -> str:
+    if format is not None:
+        if format not in FORMATE:
+            raise ValueError(f"Unbekanntes Format: {format!r} ({', '.join(FORMATE)})")
+        return format
+    return 'jsonl' if pfad.endswith(('.jsonl', '.ndjson')) else 'absatz'
+
+
+def _zeilen(mm, von: int, bis: int) -> Iterator[Tuple[int, int]]:
+    """(Anfang, Ende) aller Zeilen, die in [von, bis) beginnen."""
+    pos = von
+    if pos > 0 and mm[pos - 1] != 0x0A:  # mitten in einer Zeile: gehört zum vorigen Bereich
+        pos = mm.find(b'\n', pos)
+        if pos < 0:
+            return
+        pos += 1
+    while pos < bis:
+        ende = mm.find(b'\n', pos)
+        if ende < 0:
+            ende = len(mm)
+        yield pos, ende
+        pos = ende + 1
+
+
+def _leer(mm, anfang: int, ende: int) -> bool:
+    return not mm[anfang:ende].strip()
+
+
+def _absaetze(mm, von: int, bis: int) -> Iterator[Tuple[int, int]]:
+    """
+    (Anfang, Ende) aller Absätze (durch Leerzeilen getrennte Zeilenfolgen), die in
+    [von, bis) beginnen; ein Absatz wird bis zu seinem Ende gelesen, auch über bis hinaus.
+    """
+    zeilen = _zeilen(mm, von, len(mm))
+    zeile = next(zeilen, None)
+    if zeile is not None and zeile[0] > 0 and not _leer(mm, *zeile):
+        vorige = mm.rfind(b'\n', 0, zeile[0] - 1) + 1
+        if not _leer(mm, vorige, zeile[0] - 1):  # Fortsetzung eines früher begonnenen Absatzes
+            while zeile is not None and not _leer(mm, *zeile):
+                zeile = next(zeilen, None)
+    while zeile is not None:
+        while zeile is not None and _leer(mm, *zeile):
+            zeile = next(zeilen, None)
+        if zeile is None or zeile[0] >= bis:
+            return
+        anfang = ende = zeile[0]
+        while zeile is not None and not _leer(mm, *zeile):
+            ende = zeile[1]
+            zeile = next(zeilen, None)
+        yield anfang, ende
+
+
+class Korpus:
+    """
+    Lazy über eine oder mehrere Shard-Dateien iterierbarer Korpus. Formate:
+    - 'jsonl' (Endung .jsonl/.ndjson): ein Objekt je Zeile mit text_feld, optional
+      id_feld und szenario_feld; ungültige Zeilen werden übersprungen und gezählt
+    - 'absatz' (sonst): Datensätze durch Leerzeilen getrennt; 'zeile': ein Datensatz je Zeile
+    Fehlende ids: "datei:byte-offset"; fehlendes Szenario: szenario bzw. Dateiname
+    ohne Endung. Der Korpus hält nur seine Konfiguration (picklebar für Prozess-Worker).
+    """
+
+    def __init__(
+        self,
+        pfade: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]],
+        format: Optional[str] = None,
+        text_feld: str = 'text',
+        id_feld: str = 'id',
+        szenario_feld: str = 'szenario',
+        szenario: Optional[str] = None,
+        anteil: float = 1.0,
+        buckets: Optional[Sequence[str]] = None,
+        max_anzahl: Optional[int] = None,
+        seed: int = 0,
+        encoding: str = 'utf-8',
+    ):
+        if isinstance(pfade, (str, os.PathLike)):
+            pfade = [pfade]
+        self.pfade = [os.fspath(p) for p in pfade]
+        self.formate = [_format(p, format) for p in self.pfade]
+        if not 0.0 < anteil <= 1.0:
+            raise ValueError(f"anteil muss in (0, 1] liegen: {anteil}")
+        unbekannt = set(buckets or ()) - set(LAENGEN_BUCKETS)
+        if unbekannt:
+            raise ValueError(f"Unbekannte Buckets: {sorted(unbekannt)} ({', '.join(LAENGEN_BUCKETS)})")
+        self.text_feld, self.id_feld, self.szenario_feld = text_feld, id_feld, szenario_feld
+        self.szenario = szenario
+        self.anteil = anteil
+        self.buckets = frozenset(buckets) if buckets else None
+        self.max_anzahl = max_anzahl
+        self.seed = seed
+        self.encoding = encoding
+        self.shard_index, self.shard_anzahl = 0, 1
+        self.fehlerhaft = 0  # übersprungene Zeilen (ungültiges JSON, kein Text) dieser Instanz
+
+    def shard(self, index: int, anzahl: int) -> 'Korpus':
+        """
+        Teilkorpus index von anzahl: zusammenhängender Byte-Bereich über alle Dateien,
+        ein Datensatz gehört zu dem Bereich, in dem er beginnt. Shards eines Shards
+        teilen dessen Bereich weiter. max_anzahl wird als Quote auf die Shards verteilt:
+        zusammen liefern sie höchstens max_anzahl Datensätze (weniger, wenn ein Shard
+        seine Quote nicht füllt).
+        """
+        if not 0 <= index < anzahl:
+            raise ValueError(f"Shard {index} von {anzahl}")
+        teil = Korpus.__new__(Korpus)
+        teil.__dict__.update(self.__dict__)
+        teil.shard_index = self.shard_index * anzahl + index
+        teil.shard_anzahl = self.shard_anzahl * anzahl
+        if self.max_anzahl is not None:
+            teil.max_anzahl = self.max_anzahl * (index + 1) // anzahl - self.max_anzahl * index // anzahl
+        teil.fehlerhaft = 0
+        return teil
+
+    def _in_stichprobe(self, kennung: str) -> bool:
+        if self.anteil >= 1.0:
+            return True
+        h = hashlib.blake2b(f'{self.seed}:{kennung}'.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+        return int.from_bytes(h, 'little') < self.anteil * 2 ** 64
+
+    def __iter__(self) -> Iterator[Datensatz]:
+        groessen = [os.path.getsize(p) for p in self.pfade]
+        gesamt = sum(groessen)
+        von = gesamt * self.shard_index // self.shard_anzahl
+        bis = gesamt * (self.shard_index + 1) // self.shard_anzahl
+        if self.max_anzahl is not None and self.max_anzahl <= 0:
+            return
+        anzahl = 0
+        offset = 0
+        for pfad, format, groesse in zip(self.pfade, self.formate, groessen):
+            a, b = max(von - offset, 0), min(bis - offset, groesse)
+            offset += groesse
+            if a >= b:
+                continue
+            for datensatz in self._datei(pfad, format, a, b):
+                if self.buckets is not None:
+                    datensatz.tokens = token_anzahl(datensatz.text)
+                    if laengen_bucket(datensatz.tokens) not in self.buckets:
+                        continue
+                yield datensatz
+                anzahl += 1
+                if self.max_anzahl is not None and anzahl >= self.max_anzahl:
+                    return
+
+    def _datei(self, pfad: str, format: str, von: int, bis: int) -> Iterator[Datensatz]:
+        name = os.path.basename(pfad)
+        standard_szenario = self.szenario or name.split('.', 1)[0]
+        with open(pfad, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bereiche = _absaetze(mm, von, bis) if format == 'absatz' else _zeilen(mm, von, bis)
+            freigegeben = von - von % mmap.PAGESIZE
+            for anfang, ende in bereiche:
+                if ende - freigegeben > FREIGABE_BYTES and hasattr(mm, 'madvise'):
+                    grenze = anfang - anfang % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_DONTNEED, freigegeben, grenze - freigegeben)
+                    freigegeben = grenze
+                kennung = f'{name}:{anfang}'
+                if format != 'jsonl':
+                    if self._in_stichprobe(kennung):
+                        text = mm[anfang:ende].decode(self.encoding).rstrip('\r')
+                        if text.strip():
+                            yield Datensatz(kennung, standard_szenario, text)
+                    continue
+                zeile = mm[anfang:ende]
+                if not zeile.strip():
+                    continue
+                try:
+                    objekt = json.loads(zeile)
+                    text = objekt[self.text_feld]
+                except (ValueError, KeyError, TypeError):
+                    self.fehlerhaft += 1
+                    continue
+                if not isinstance(text, str) or not text.strip():
+                    self.fehlerhaft += 1
+                    continue
+                kennung = str(objekt.get(self.id_feld, kennung))
+                if self._in_stichprobe(kennung):
+                    yield Datensatz(kennung, str(objekt.get(self.szenario_feld) or standard_szenario), text)
+
+    def stichprobe(self, anzahl: int, seed: int = 0) -> List[Datensatz]:
+        """Gleichverteilte Stichprobe fester Größe in einem Durchlauf (Reservoir, Speicher O(anzahl))."""
+        rnd = random.Random(seed)
+        reservoir: List[Datensatz] = []
+        for i, datensatz in enumerate(self):
+            if i < anzahl:
+                reservoir.append(datensatz)
+            else:
+                j = rnd.randrange(i + 1)
+                if j < anzahl:
+                    reservoir[j] = datensatz
+        return reservoir
+
+
+# --- Ausführung und Aggregation ---
+
+_KENNZAHLEN = tuple(DATAFRAME_SPALTEN)
+
+
+class KorpusAggregat:
+    """
+    Laufende Summen je (Szenario, Längen-Bucket, Strategie): Speicher wächst mit der
+    Zahl der Gruppen, nicht mit der Zahl der Datensätze. Mittelwerte wie
+    ErgebnisSpeicher.mittelwerte_dataframe (Index 'Strategie', gleiche Spalten).
+    """
+
+    def __init__(self):
+        self.summen: Dict[Tuple[str, str, str], np.ndarray] = {}
+        self.anzahlen: Dict[Tuple[str, str, str], int] = {}
+        self.datensaetze = 0
+        self.rechenzeit_s = 0.0
+
+    def hinzufuegen(self, ergebnis: ExperimentResult):
+        schluessel = (ergebnis.szenario, laengen_bucket(ergebnis.original_tokens), ergebnis.strategie)
+        werte = np.array([getattr(ergebnis, k) for k in _KENNZAHLEN], dtype=np.float64)
+        if schluessel in self.summen:
+            self.summen[schluessel] += werte
+            self.anzahlen[schluessel] += 1
+        else:
+            self.summen[schluessel] = werte
+            self.anzahlen[schluessel] = 1
+
+    def zusammenfuehren(self, anderes: 'KorpusAggregat'):
+        for schluessel, werte in anderes.summen.items():
+            if schluessel in self.summen:
+                self.summen[schluessel] += werte
+                self.anzahlen[schluessel] += anderes.anzahlen[schluessel]
+            else:
+                self.summen[schluessel] = werte.copy()
+                self.anzahlen[schluessel] = anderes.anzahlen[schluessel]
+        self.datensaetze += anderes.datensaetze
+        self.rechenzeit_s += anderes.rechenzeit_s
+
+    @property
+    def szenarien(self) -> List[str]:
+        return sorted({s for s, _, _ in self.summen})
+
+    def mittelwerte(self, szenario: Optional[str] = None,
+                    bucket: Optional[str] = None) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """Strategien (alphabetisch) und Mittelwert je Kennzahl, optional nur ein Szenario/Bucket."""
+        summen: Dict[str, np.ndarray] = {}
+        anzahlen: Dict[str, int] = {}
+        for (s, b, strategie), werte in self.summen.items():
+            if (szenario is None or s == szenario) and (bucket is None or b == bucket):
+                summen[strategie] = summen.get(strategie, 0) + werte
+                anzahlen[strategie] = anzahlen.get(strategie, 0) + self.anzahlen[s, b, strategie]
+        namen = sorted(summen)
+        matrix = np.array([summen[n] / anzahlen[n] for n in namen]).reshape(len(namen), len(_KENNZAHLEN))
+        return namen, {k: matrix[:, i] for i, k in enumerate(_KENNZAHLEN)}
+
+    def mittelwerte_dataframe(self, szenario: Optional[str] = None, bucket: Optional[str] = None,
+                              nachkommastellen: int = 4):
+        """Wie agg_stats der Auswertung: Index 'Strategie', Spalten der Auswertung, Qualität in Prozent."""
+        import pandas as pd
+        namen, mittel = self.mittelwerte(szenario, bucket)
+        mittel['qualitaets_score'] = mittel['qualitaets_score'] * 100
+        df = pd.DataFrame({titel: mittel[name] for name, titel in DATAFRAME_SPALTEN.items()},
+                          index=pd.Index(namen, name='Strategie'))
+        return df.round(nachkommastellen)
+
+    def je_szenario(self, nachkommastellen: int = 4) -> dict:
+        """Szenario → agg_stats-DataFrame."""
+        return {s: self.mittelwerte_dataframe(s, nachkommastellen=nachkommastellen) for s in self.szenarien}
+
+    def anzahl(self, szenario: Optional[str] = None, bucket: Optional[str] = None) -> int:
+        """Datensätze (je Strategie gleich viele Zellen) eines Szenarios/Buckets."""
+        je_strategie: Dict[str, int] = {}
+        for (s, b, strategie), n in self.anzahlen.items():
+            if (szenario is None or s == szenario) and (bucket is None or b == bucket):
+                je_strategie[strategie] = je_strategie.get(strategie, 0) + n
+        return max(je_strategie.values(), default=0)
+
+
+def _shard_ausfuehren(korpus: Korpus, strategien: List[StrategieSpec], block_groesse: int,
+                      melden_alle: int) -> KorpusAggregat:
+    """Ein Shard: je Block alle Strategien je Datensatz, Qualität des Blocks in einem qualitaet_paare-Aufruf."""
+    from .qualitaet import qualitaet_paare
+    from .runner import _vormerken
+    funktionen = [(name, strategie_funktion(f, kw), f is None, kw) for name, f, kw in strategien]
+    aggregat = KorpusAggregat()
+    start = time.perf_counter()
+    block: List[Datensatz] = []
+
+    def block_rechnen():
+        ergebnisse, paare = [], []
+        for datensatz in block:
+            for name, funktion, baseline, kwargs in funktionen:
+                if not baseline:
+                    funktion = partial(_vormerken, funktion, paare, len(ergebnisse))
+                ergebnisse.append(run_experiment(datensatz.szenario, datensatz.text, funktion, name,
+                                                 parameter=kwargs))
+        if paare:
+            with stufe('bewertung'):
+                qualitaeten = qualitaet_paare((o, k) for _, o, k in paare)
+            for (zelle, _, _), q in zip(paare, qualitaeten.tolist()):
+                ergebnisse[zelle].qualitaets_score = q
+        for ergebnis in ergebnisse:
+            aggregat.hinzufuegen(ergebnis)
+        aggregat.datensaetze += len(block)
+        if melden_alle and aggregat.datensaetze % melden_alle < len(block):
+            dauer = time.perf_counter() - start
+            print(f"  [Shard {korpus.shard_index + 1}/{korpus.shard_anzahl}] {aggregat.datensaetze} Datensätze, "
+                  f"{aggregat.datensaetze / max(dauer, 1e-9):.1f}/s")
+        block.clear()
+
+    for datensatz in korpus:
+        block.append(datensatz)
+        if len(block) >= block_groesse:
+            block_rechnen()
+    if block:
+        block_rechnen()
+    aggregat.rechenzeit_s = time.perf_counter() - start
+    return aggregat
+
+
+def _shard_im_worker(korpus: Korpus, strategien: List[StrategieSpec], block_groesse: int, melden_alle: int):
+    return _shard_ausfuehren(korpus, strategien, block_groesse, melden_alle)
+
+
+def korpus_ausfuehren(
+    korpus: Korpus,
+    strategien: List[StrategieSpec],
+    modus: str = "seriell",
+    worker: Optional[int] = None,
+    block_groesse: int = BLOCK_GROESSE,
+    melden_alle: int = 10_000,
+) -> KorpusAggregat:
+    """
+    Führt alle Strategien über den Korpus aus (Modi wie experimente_ausfuehren).
+    Jeder Worker liest seinen Shard selbst aus den Dateien – zwischen Prozessen
+    werden nur Konfiguration und Aggregate übertragen, keine Texte.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from .runner import MODI, _worker_init
+    if modus not in MODI:
+        raise ValueError(f"Unbekannter Modus: {modus!r} ({', '.join(MODI)})")
+    start = time.perf_counter()
+    if modus == "seriell":
+        worker = 1
+        _worker_init()
+        aggregat = _shard_ausfuehren(korpus, strategien, block_groesse, melden_alle)
+    else:
+        worker = worker or os.cpu_count() or 1
+        if modus == "threads":
+            _worker_init()
+            pool = ThreadPoolExecutor(max_workers=worker)
+        else:
+            pool = ProcessPoolExecutor(max_workers=worker, initializer=_worker_init)
+        aggregat = KorpusAggregat()
+        with pool:
+            futures = [pool.submit(_shard_im_worker, korpus.shard(i, worker), strategien, block_groesse, melden_alle)
+                       for i in range(worker)]
+            for future in futures:
+                aggregat.zusammenfuehren(future.result())
+    dauer = time.perf_counter() - start
+    print(f"Korpus ({modus}, {worker} Worker): {aggregat.datensaetze} Datensätze × {len(strategien)} Strategien "
+          f"in {dauer:.2f} s ({aggregat.datensaetze / max(dauer, 1e-9):.1f} Datensätze/s)")
+    return aggregat
+
+
+def main():
+    import argparse
+    from .experiment import STRATEGIEN
+    parser = argparse.ArgumentParser(description="Strategien über einen JSONL-/Text-Korpus auswerten")
+    parser.add_argument('pfade', nargs='+')
+    parser.add_argument('--format', choices=FORMATE)
+    parser.add_argument('--text-feld', default='text')
+    parser.add_argument('--szenario-feld', default='szenario')
+    parser.add_argument('--anteil', type=float, default=1.0, help="Stichprobenanteil (über Hash der id)")
+    parser.add_argument('--buckets', help=f"Längen-Buckets, kommagetrennt ({', '.join(LAENGEN_BUCKETS)})")
+    parser.add_argument('--max-anzahl', type=int, help="höchstens so viele Datensätze insgesamt (auf die Worker verteilt)")
+    parser.add_argument('--modus', choices=('seriell', 'threads', 'prozesse'), default='seriell')
+    parser.add_argument('--worker', type=int)
+    args = parser.parse_args()
+    korpus = Korpus(args.pfade, format=args.format, text_feld=args.text_feld, szenario_feld=args.szenario_feld,
+                    anteil=args.anteil, buckets=args.buckets.split(',') if args.buckets else None,
+                    max_anzahl=args.max_anzahl)
+    aggregat = korpus_ausfuehren(korpus, STRATEGIEN, modus=args.modus, worker=args.worker)
+    for szenario, df in aggregat.je_szenario().items():
+        print(f"\n📋 Szenario: {szenario} ({aggregat.anzahl(szenario)} Datensätze)")
+        print(df.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Latenz- und Kostenmodell des nachgelagerten LLM-Aufrufs, austauschbar je Modell.
+- LLMModell: Preise je 1K Eingabe-/Ausgabe-Token (€) und Latenz aus Basislatenz,
+  Prefill (ms je Eingabe-Token) und Decode (ms je Ausgabe-Token)
+- PREISTABELLE: mitgelieferte Modelle; LLM_PREISTABELLE (Pfad zu einer JSON-Datei
+  {"name": {"eingabe_euro_pro_1k": ..., ...}}) ergänzt oder überschreibt Einträge
+- Aktives Modell: LLM_MODELL (Standard gpt-3.5-turbo) oder llm_modell_setzen();
+  der Standard rechnet wie bisher 50 ms + 2 ms je Eingabe-Token, 0,00138 €/1K,
+  ohne Ausgabe-Tokens
+Nur Standardbibliothek; die Latenzwerte sind Richtwerte, keine Messungen.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Dict, Optional, Union
+
+STANDARD_MODELL = 'gpt-3.5-turbo'
+
+
+@dataclass(frozen=True)
+class LLMModell:
+    name: str
+    eingabe_euro_pro_1k: float
+    ausgabe_euro_pro_1k: float = 0.0
+    basis_ms: float = 50.0            # Netz, Scheduling, erstes Token
+    prefill_ms_pro_token: float = 2.0
+    decode_ms_pro_token: float = 0.0
+    ausgabe_tokens: int = 0           # erwartete Antwortlänge, wenn nicht angegeben
+
+    def latenz_ms(self, eingabe_tokens: int, ausgabe_tokens: Optional[int] = None) -> float:
+        if ausgabe_tokens is None:
+            ausgabe_tokens = self.ausgabe_tokens
+        return self.basis_ms + eingabe_tokens * self.prefill_ms_pro_token + ausgabe_tokens * self.decode_ms_pro_token
+
+    def kosten_euro(self, eingabe_tokens: int, ausgabe_tokens: Optional[int] = None) -> float:
+        if ausgabe_tokens is None:
+            ausgabe_tokens = self.ausgabe_tokens
+        return (eingabe_tokens / 1000) * self.eingabe_euro_pro_1k + (ausgabe_tokens / 1000) * self.ausgabe_euro_pro_1k
+
+    @property
+    def kennung(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+# Listenpreise (Stand 2024) in USD, umgerechnet mit ~0,92 €/$
+PREISTABELLE: Dict[str, LLMModell] = {m.name: m for m in (
+    # wie bisher: nur Eingabe-Tokens, lineare Prefill-Latenz
+    LLMModell('gpt-3.5-turbo', 0.00138, 0.00184),
+    LLMModell('gpt-4o-mini', 0.000138, 0.000552, basis_ms=300.0, prefill_ms_pro_token=0.2,
+              decode_ms_pro_token=12.0, ausgabe_tokens=150),
+    LLMModell('gpt-4o', 0.0023, 0.0092, basis_ms=400.0, prefill_ms_pro_token=0.3,
+              decode_ms_pro_token=15.0, ausgabe_tokens=150),
+    LLMModell('lokal-8b', 0.0, 0.0, basis_ms=20.0, prefill_ms_pro_token=0.5,
+              decode_ms_pro_token=25.0, ausgabe_tokens=150),
+)}
+
+_tabelle: Optional[Dict[str, LLMModell]] = None
+_aktiv: Optional[LLMModell] = None
+
+
+def preistabelle() -> Dict[str, LLMModell]:
+    """PREISTABELLE, ergänzt um LLM_PREISTABELLE (einmal gelesen)."""
+    global _tabelle
+    if _tabelle is None:
+        tabelle = dict(PREISTABELLE)
+        pfad = os.environ.get('LLM_PREISTABELLE')
+        if pfad:
+            with open(pfad, encoding='utf-8') as f:
+                eintraege = json.load(f)
+            erlaubt = {f.name for f in fields(LLMModell)} - {'name'}
+            for name, werte in eintraege.items():
+                unbekannt = set(werte) - erlaubt
+                if unbekannt:
+                    raise ValueError(f"{pfad}: unbekannte Felder für {name!r}: {', '.join(sorted(unbekannt))}")
+                tabelle[name] = replace(tabelle[name], **werte) if name in tabelle else LLMModell(name, **werte)
+        _tabelle = tabelle
+    return _tabelle
+
+
+def get_llm_modell(name: Optional[str] = None) -> LLMModell:
+    """Modell aus der Preistabelle; ohne Namen das aktive (LLM_MODELL)."""
+    global _aktiv
+    if name is None:
+        if _aktiv is None:
+            _aktiv = get_llm_modell(os.environ.get('LLM_MODELL', STANDARD_MODELL))
+        return _aktiv
+    try:
+        return preistabelle()[name]
+    except KeyError:
+        raise ValueError(f"Unbekanntes LLM-Modell: {name!r} ({', '.join(preistabelle())})") from None
+
+
+def llm_modell_setzen(modell: Union[str, LLMModell, None]) -> LLMModell:
+    """Setzt das aktive Modell (None: wieder aus LLM_MODELL); liefert das vorherige."""
+    global _aktiv
+    vorher = get_llm_modell()
+    _aktiv = get_llm_modell(modell) if isinstance(modell, str) else modell
+    return vorher
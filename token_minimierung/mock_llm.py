@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+Lokaler Mock-LLM-Endpunkt (asyncio, HTTP/1.1 wie der Kompressionsdienst) und
+Lastgenerator, um die Wirkung der Kompression unter Last zu messen statt nur
+über die lineare Latenzformel.
+- MockLLM: POST /v1/completions {"prompt": "...", "max_tokens": n} → simulierte
+  Antwortzeit aus dem LLMModell (Basislatenz + Prefill je Eingabe-Token + Decode
+  je Ausgabe-Token), höchstens max_parallel Anfragen gleichzeitig (die übrigen
+  warten: Warteschlangenzeit), Warteschlange voll → 503, Rate-Limits (Anfragen/s,
+  Eingabe-Tokens/min, Token-Bucket) → 429 mit Retry-After; GET /metrics, /gesund
+- zeitfaktor < 1 lässt die simulierte Zeit schneller laufen (Zeitraffer); alle
+  gemeldeten Zeiten und Raten sind in simulierter Zeit
+- last_erzeugen: offene Last mit Poisson-Ankünften bei Ziel-QPS; die Latenz zählt
+  ab dem geplanten Sendezeitpunkt (keine Coordinated Omission)
+- last_vergleich: komprimiert die Prompts je Strategie und schickt sie mit
+  denselben Ankunftszeiten an einen frischen Mock-Endpunkt → p50/p99 und Durchsatz
+
+Start: python -m token_minimierung.mock_llm --port 8090 --modell gpt-4o-mini
+Vergleich: python -m token_minimierung.mock_llm --vergleich 5,10,20 --zeitfaktor 0.1
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from .experiment import StrategieSpec, strategie_funktion
+from .instrumentierung import HdrHistogramm
+from .kompressionsdienst import _anfrage_lesen, _antwort, _fehler, _KopfFehler
+from .llm_modell import LLMModell, get_llm_modell
+from .tokenizer import token_anzahl
+
+MAX_PARALLEL = 8
+MAX_WARTESCHLANGE = 256
+
+
+class _Eimer:
+    """Token-Bucket: rate Einheiten je Sekunde (simulierte Zeit), höchstens kapazitaet angespart."""
+
+    def __init__(self, rate: float, kapazitaet: float):
+        self.rate = rate
+        self.kapazitaet = kapazitaet
+        self.stand = kapazitaet
+        self.zeit: Optional[float] = None
+
+    def wartezeit(self, menge: float, jetzt: float) -> float:
+        """Bis jetzt auffüllen; 0.0, wenn menge verfügbar ist, sonst Wartezeit in Sekunden bis dahin."""
+        if self.zeit is not None:
+            self.stand = min(self.kapazitaet, self.stand + (jetzt - self.zeit) * self.rate)
+        self.zeit = jetzt
+        return max(menge - self.stand, 0.0) / self.rate
+
+    def abbuchen(self, menge: float):
+        self.stand -= menge
+
+
+class Abgelehnt(Exception):
+    def __init__(self, status: int, meldung: str, retry_after_s: float = 1.0):
+        super().__init__(meldung)
+        self.status = status
+        self.retry_after_s = retry_after_s
+
+
+class MockLLM:
+    """Simulierter LLM-Endpunkt; start_tcp liefert den asyncio-Server."""
+
+    def __init__(self, modell: Union[str, LLMModell, None] = None, max_parallel: int = MAX_PARALLEL,
+                 max_warteschlange: int = MAX_WARTESCHLANGE, anfragen_pro_s: Optional[float] = None,
+                 tokens_pro_min: Optional[float] = None, zeitfaktor: float = 1.0):
+        self.modell = modell if isinstance(modell, LLMModell) else get_llm_modell(modell)
+        self.max_parallel = max_parallel
+        self.max_warteschlange = max_warteschlange
+        self.zeitfaktor = zeitfaktor
+        self._anfragen_eimer = _Eimer(anfragen_pro_s, anfragen_pro_s) if anfragen_pro_s else None
+        self._token_eimer = _Eimer(tokens_pro_min / 60, tokens_pro_min) if tokens_pro_min else None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.laufend = 0
+        self.wartend = 0
+        self.zaehler = {'erfolgreich': 0, 'rate_limit': 0, 'ueberlastet': 0, 'fehler': 0,
+                        'eingabe_tokens': 0, 'ausgabe_tokens': 0}
+        self.wartezeit_s = 0.0
+
+    def _jetzt(self) -> float:
+        return time.perf_counter() / self.zeitfaktor
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 8090):
+        self._slots = asyncio.Semaphore(self.max_parallel)
+        return await asyncio.start_server(self._verbindung, host, port)
+
+    async def antworten(self, eingabe_tokens: int, ausgabe_tokens: Optional[int] = None) -> dict:
+        """Simuliert einen Aufruf; Abgelehnt bei Rate-Limit (429) oder voller Warteschlange (503)."""
+        if ausgabe_tokens is None:
+            ausgabe_tokens = self.modell.ausgabe_tokens
+        jetzt = self._jetzt()
+        # Erst alle Limits prüfen, abgebucht wird nur bei Annahme: eine abgelehnte
+        # Anfrage verbraucht kein Kontingent
+        eimer = [(e, menge, art) for e, menge, art in ((self._anfragen_eimer, 1, 'Anfragen'),
+                                                       (self._token_eimer, eingabe_tokens, 'Tokens'))
+                 if e is not None]
+        warten, art = max(((e.wartezeit(menge, jetzt), art) for e, menge, art in eimer), default=(0.0, ''))
+        if warten:
+            self.zaehler['rate_limit'] += 1
+            raise Abgelehnt(429, f"Rate-Limit ({art}) überschritten", warten)
+        if self.laufend >= self.max_parallel and self.wartend >= self.max_warteschlange:
+            self.zaehler['ueberlastet'] += 1
+            raise Abgelehnt(503, "Modell ausgelastet")
+        for e, menge, _ in eimer:
+            e.abbuchen(menge)
+        self.wartend += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.wartend -= 1
+        self.laufend += 1
+        try:
+            wartezeit = self._jetzt() - jetzt
+            prefill_ms = self.modell.basis_ms + eingabe_tokens * self.modell.prefill_ms_pro_token
+            decode_ms = ausgabe_tokens * self.modell.decode_ms_pro_token
+            await asyncio.sleep((prefill_ms + decode_ms) / 1000 * self.zeitfaktor)
+        finally:
+            self.laufend -= 1
+            self._slots.release()
+        self.zaehler['erfolgreich'] += 1
+        self.zaehler['eingabe_tokens'] += eingabe_tokens
+        self.zaehler['ausgabe_tokens'] += ausgabe_tokens
+        self.wartezeit_s += wartezeit
+        return {'eingabe_tokens': eingabe_tokens, 'ausgabe_tokens': ausgabe_tokens,
+                'warteschlange_ms': wartezeit * 1000, 'prefill_ms': prefill_ms, 'decode_ms': decode_ms,
+                'kosten_euro': self.modell.kosten_euro(eingabe_tokens, ausgabe_tokens), 'modell': self.modell.name}
+
+    def prometheus(self) -> str:
+        zeilen = ['# TYPE mock_llm_anfragen_total counter']
+        for ergebnis in ('erfolgreich', 'rate_limit', 'ueberlastet', 'fehler'):
+            zeilen.append(f'mock_llm_anfragen_total{{ergebnis="{ergebnis}"}} {self.zaehler[ergebnis]}')
+        zeilen.append('# TYPE mock_llm_tokens_total counter')
+        for art in ('eingabe', 'ausgabe'):
+            zeilen.append(f'mock_llm_tokens_total{{art="{art}"}} {self.zaehler[art + "_tokens"]}')
+        zeilen += ['# TYPE mock_llm_wartezeit_sekunden_total counter',
+                   f'mock_llm_wartezeit_sekunden_total {self.wartezeit_s:.6f}',
+                   '# TYPE mock_llm_laufend gauge', f'mock_llm_laufend {self.laufend}',
+                   '# TYPE mock_llm_wartend gauge', f'mock_llm_wartend {self.wartend}']
+        return '\n'.join(zeilen) + '\n'
+
+    async def _verbindung(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    anfrage = await _anfrage_lesen(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except _KopfFehler as e:
+                    writer.write(_antwort(*_fehler(e.status, str(e)), offen=False))
+                    await writer.drain()
+                    break
+                if anfrage is None:
+                    break
+                methode, pfad, kopf, koerper = anfrage
+                status, inhalt, art, zusatz = await self._bearbeiten(methode, pfad, koerper)
+                offen = kopf.get('connection', '').lower() != 'close'
+                writer.write(_antwort(status, inhalt, art, zusatz, offen))
+                await writer.drain()
+                if not offen:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _bearbeiten(self, methode: str, pfad: str, koerper: bytes):
+        if pfad == '/metrics':
+            return 200, self.prometheus().encode(), 'text/plain; version=0.0.4', {}
+        if pfad == '/gesund':
+            return 200, b'{"status": "ok"}', 'application/json', {}
+        if pfad != '/v1/completions':
+            return _fehler(404, f"Unbekannter Pfad: {pfad}")
+        if methode != 'POST':
+            return _fehler(405, "Nur POST")
+        try:
+            daten = json.loads(koerper or b'null')
+            if not isinstance(daten, dict) or not isinstance(daten.get('prompt'), str):
+                raise ValueError("'prompt' muss ein String sein")
+            ausgabe_tokens = daten.get('max_tokens')
+            if ausgabe_tokens is not None and (not isinstance(ausgabe_tokens, int) or ausgabe_tokens < 0):
+                raise ValueError("'max_tokens' muss eine nicht-negative Ganzzahl sein")
+        except ValueError as e:
+            self.zaehler['fehler'] += 1
+            return _fehler(400, str(e))
+        try:
+            antwort = await self.antworten(token_anzahl(daten['prompt']), ausgabe_tokens)
+        except Abgelehnt as e:
+            return _fehler(e.status, str(e), {'Retry-After': str(max(1, round(e.retry_after_s)))})
+        return 200, json.dumps(antwort).encode(), 'application/json', {}
+
+
+# --- Lastgenerator ---
+
+@dataclass
+class LastErgebnis:
+    strategie: str
+    qps: float
+    anfragen: int
+    erfolgreich: int
+    abgelehnt: int            # 429 und 503
+    dauer_s: float            # erste Sendung bis letzte Antwort (simulierte Zeit)
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    warteschlange_ms: float   # mittlere Wartezeit im Endpunkt (erfolgreiche Anfragen)
+    eingabe_tokens: float     # Mittel je erfolgreicher Anfrage
+    kosten_euro: float        # Summe der erfolgreichen Anfragen
+
+    @property
+    def durchsatz(self) -> float:
+        """Erfolgreiche Antworten je Sekunde."""
+        return self.erfolgreich / self.dauer_s if self.dauer_s else 0.0
+
+
+def ankunftszeiten(qps: float, anzahl: int, seed: int = 0) -> List[float]:
+    """Poisson-Prozess: Sendezeitpunkte (s ab Start) mit exponentialverteilten Abständen."""
+    rnd = random.Random(seed)
+    zeiten, t = [], 0.0
+    for _ in range(anzahl):
+        t += rnd.expovariate(qps)
+        zeiten.append(t)
+    return zeiten
+
+
+async def _lesen(reader: asyncio.StreamReader):
+    status = int((await reader.readline()).split()[1])
+    laenge = 0
+    while True:
+        zeile = await reader.readline()
+        if zeile in (b'\r\n', b''):
+            break
+        if zeile.lower().startswith(b'content-length:'):
+            laenge = int(zeile.split(b':')[1])
+    return status, await reader.readexactly(laenge)
+
+
+async def last_erzeugen(host: str, port: int, texte: Sequence[str], qps: float, anzahl: int,
+                        strategie: str = '', seed: int = 0, zeitfaktor: float = 1.0,
+                        max_tokens: Optional[int] = None, max_verbindungen: int = 512) -> LastErgebnis:
+    """
+    Schickt anzahl Anfragen (texte reihum) mit Poisson-Ankünften bei qps (simulierte
+    Zeit) und misst die Ende-zu-Ende-Latenz ab dem geplanten Sendezeitpunkt.
+    """
+    loop = asyncio.get_running_loop()
+    frei: List[tuple] = []
+    verbindungen = asyncio.Semaphore(max_verbindungen)
+    latenzen = HdrHistogramm()
+    summen = {'erfolgreich': 0, 'abgelehnt': 0, 'warteschlange_ms': 0.0, 'eingabe_tokens': 0, 'kosten_euro': 0.0}
+    koerper = []
+    for text in texte:
+        daten = {'prompt': text} if max_tokens is None else {'prompt': text, 'max_tokens': max_tokens}
+        inhalt = json.dumps(daten, ensure_ascii=False).encode()
+        koerper.append(b'POST /v1/completions HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: '
+                       + str(len(inhalt)).encode() + b'\r\n\r\n' + inhalt)
+
+    async def senden(i: int, geplant: float):
+        await asyncio.sleep(max(0.0, geplant - loop.time()))
+        async with verbindungen:
+            verbindung = frei.pop() if frei else await asyncio.open_connection(host, port)
+            reader, writer = verbindung
+            writer.write(koerper[i % len(koerper)])
+            await writer.drain()
+            status, inhalt = await _lesen(reader)
+            frei.append(verbindung)
+        latenzen_ns = (loop.time() - geplant) / zeitfaktor * 1e9
+        if status == 200:
+            antwort = json.loads(inhalt)
+            latenzen.beobachten(latenzen_ns)
+            summen['erfolgreich'] += 1
+            summen['warteschlange_ms'] += antwort['warteschlange_ms']
+            summen['eingabe_tokens'] += antwort['eingabe_tokens']
+            summen['kosten_euro'] += antwort['kosten_euro']
+        elif status in (429, 503):
+            summen['abgelehnt'] += 1
+        else:
+            raise RuntimeError(f"Mock-LLM antwortet {status}: {inhalt[:200]!r}")
+
+    start = loop.time() + 0.01
+    zeiten = ankunftszeiten(qps, anzahl, seed)
+    try:
+        await asyncio.gather(*(senden(i, start + t * zeitfaktor) for i, t in enumerate(zeiten)))
+    finally:
+        for _, writer in frei:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for _, writer in frei), return_exceptions=True)
+    n = max(summen['erfolgreich'], 1)
+    return LastErgebnis(
+        strategie=strategie, qps=qps, anfragen=anzahl, erfolgreich=summen['erfolgreich'],
+        abgelehnt=summen['abgelehnt'], dauer_s=(loop.time() - start) / zeitfaktor,
+        p50_ms=latenzen.perzentil(0.5) / 1e6, p90_ms=latenzen.perzentil(0.9) / 1e6,
+        p99_ms=latenzen.perzentil(0.99) / 1e6, warteschlange_ms=summen['warteschlange_ms'] / n,
+        eingabe_tokens=summen['eingabe_tokens'] / n, kosten_euro=summen['kosten_euro'],
+    )
+
+
+async def _vergleichen(texte_je_strategie: Dict[str, List[str]], qps: float, anzahl: int, seed: int,
+                       zeitfaktor: float, max_tokens: Optional[int], mock_parameter: dict) -> List[LastErgebnis]:
+    ergebnisse = []
+    for strategie, texte in texte_je_strategie.items():
+        mock = MockLLM(zeitfaktor=zeitfaktor, **mock_parameter)  # je Strategie leere Warteschlange und Eimer
+        server = await mock.start_tcp('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            ergebnisse.append(await last_erzeugen('127.0.0.1', port, texte, qps, anzahl, strategie,
+                                                  seed, zeitfaktor, max_tokens))
+        finally:
+            server.close()
+            await server.wait_closed()
+    return ergebnisse
+
+
+def last_vergleich(
+    prompts: Dict[str, str],
+    strategien: List[StrategieSpec],
+    qps: float,
+    anzahl: int = 200,
+    modell: Union[str, LLMModell, None] = None,
+    max_parallel: int = MAX_PARALLEL,
+    max_warteschlange: int = MAX_WARTESCHLANGE,
+    anfragen_pro_s: Optional[float] = None,
+    tokens_pro_min: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    zeitfaktor: float = 1.0,
+    seed: int = 0,
+) -> List[LastErgebnis]:
+    """
+    Je Strategie: alle Prompts einmal komprimieren, dann anzahl Anfragen (Prompts
+    reihum) bei qps an einen frischen MockLLM. Alle Strategien sehen dieselben
+    Ankunftszeiten (gleicher seed), Unterschiede kommen nur aus den Token-Zahlen.
+    """
+    texte = {name: [strategie_funktion(f, kw)(t) for t in prompts.values()] for name, f, kw in strategien}
+    mock_parameter = dict(modell=modell, max_parallel=max_parallel, max_warteschlange=max_warteschlange,
+                          anfragen_pro_s=anfragen_pro_s, tokens_pro_min=tokens_pro_min)
+    return asyncio.run(_vergleichen(texte, qps, anzahl, seed, zeitfaktor, max_tokens, mock_parameter))
+
+
+def last_tabelle(ergebnisse: List[LastErgebnis]) -> str:
+    zeilen = [f"{'Strategie':<32} {'QPS':>6} {'Tokens':>7} {'p50 ms':>9} {'p99 ms':>9} {'Warten ms':>10} "
+              f"{'Antw./s':>8} {'abgelehnt':>10}"]
+    for e in ergebnisse:
+        zeilen.append(f"{e.strategie:<32} {e.qps:>6.1f} {e.eingabe_tokens:>7.0f} {e.p50_ms:>9.0f} {e.p99_ms:>9.0f} "
+                      f"{e.warteschlange_ms:>10.0f} {e.durchsatz:>8.2f} {e.abgelehnt:>10}")
+    return '\n'.join(zeilen)
+
+
+async def _dienen(args):
+    mock = MockLLM(args.modell, args.max_parallel, args.max_warteschlange, args.anfragen_pro_s,
+                   args.tokens_pro_min, args.zeitfaktor)
+    server = await mock.start_tcp(args.host, args.port)
+    print(f"Mock-LLM ({mock.modell.name}) auf http://{args.host}:{args.port}/v1/completions")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock-LLM-Endpunkt mit Warteschlange und Rate-Limits")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--modell', help="Eintrag der Preistabelle (Standard: LLM_MODELL)")
+    parser.add_argument('--max-parallel', type=int, default=MAX_PARALLEL)
+    parser.add_argument('--max-warteschlange', type=int, default=MAX_WARTESCHLANGE)
+    parser.add_argument('--anfragen-pro-s', type=float)
+    parser.add_argument('--tokens-pro-min', type=float)
+    parser.add_argument('--zeitfaktor', type=float, default=1.0, help="< 1: simulierte Zeit im Zeitraffer")
+    parser.add_argument('--vergleich', help="QPS-Werte, kommagetrennt: Strategien über TEST_PROMPTS vergleichen")
+    parser.add_argument('--anzahl', type=int, default=200, help="Anfragen je Strategie und QPS (--vergleich)")
+    args = parser.parse_args()
+    if args.vergleich:
+        from .experiment import STRATEGIEN, TEST_PROMPTS
+        for qps in (float(q) for q in args.vergleich.split(',')):
+            ergebnisse = last_vergleich(TEST_PROMPTS, STRATEGIEN, qps, args.anzahl, args.modell, args.max_parallel,
+                                        args.max_warteschlange, args.anfragen_pro_s, args.tokens_pro_min,
+                                        zeitfaktor=args.zeitfaktor)
+            print(f"\n{qps:g} QPS:\n{last_tabelle(ergebnisse)}")
+        return
+    try:
+        asyncio.run(_dienen(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Maschinelle Qualitätsbewertung.
+Qualität = semantische Ähnlichkeit zwischen Original- und Kompressions-Prompt
+(Cosine Similarity der Embeddings). Keine Schätzung mehr – wissenschaftlich
+reproduzierbare Metrik (vgl. BERTScore, Semantic Similarity in Summarization).
+- qualitaet_paare: viele (Original, Kompression)-Paare, jeder eindeutige Text
+  einmal eingebettet, alle Cosinus-Werte als eine Matrixoperation
+- erhalt_metriken: billige Kennzahlen ohne Modell (Inhaltswort-Recall, Erhalt
+  von Zahlen, IDs und Beträgen), z. B. als Vorfilter vor der Embedding-Metrik
+"""
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from .embedding import get_embedding_dienst
+from .instrumentierung import stufe
+from .regelbasiert import STOPWORDS_DE_EN
+
+_WORT = re.compile(r'\w+')
+# Zusammenhängende Zeichenfolge mit Ziffer (ORD-2024-001598, 14,6, 17%), optional mit Währung
+_ENTITAET = re.compile(r'(\S*\d\S*)(?:\s?(€|%|EUR\b|USD\b|\$))?')
+_RAND = '.,;:!?()[]{}"\'«»„“'
+_STOPPWOERTER = frozenset(w.lower() for w in STOPWORDS_DE_EN)
+
+
+def _get_qualitaets_model():
+    """Derselbe Embedding-Dienst wie in den Strategien (ein Modell, gemeinsamer Cache)."""
+    return get_embedding_dienst()
+
+
+def qualitaet_semantische_aehnlichkeit(original: str, komprimiert: str) -> float:
+    """
+    Maschinelle Qualitätsbewertung: Cosine Similarity der Satz-Embeddings.
+    Wert in [0, 1]; höher = mehr semantische Information des Originals
+    im komprimierten Text erhalten (wissenschaftlich etablierte Metrik).
+    """
+    return float(qualitaet_paare([(original, komprimiert)])[0])
+
+
+def qualitaet_paare(paare: Iterable[Tuple[str, str]], batch_size: int = 256) -> np.ndarray:
+    """
+    Qualität vieler (Original, Kompression)-Paare: jeder eindeutige Text wird
+    einmal eingebettet (ein Modellaufruf, Originale mehrerer Strategien also nur
+    einmal), die Cosinus-Werte aller Paare ergeben sich als zeilenweises
+    Skalarprodukt. Leere Texte haben Qualität 0.
+    """
+    with stufe('qualitaet'):
+        return _qualitaet_paare(paare, batch_size)
+
+
+def _qualitaet_paare(paare: Iterable[Tuple[str, str]], batch_size: int) -> np.ndarray:
+    paare = [(o.strip(), k.strip()) for o, k in paare]
+    qualitaeten = np.zeros(len(paare))
+    aktiv = [i for i, (o, k) in enumerate(paare) if o and k]
+    if not aktiv:
+        return qualitaeten
+    index = {}
+    for i in aktiv:
+        for t in paare[i]:
+            index.setdefault(t, len(index))
+    emb = _get_qualitaets_model().encode(list(index), normalize_embeddings=True, batch_size=batch_size)
+    emb = emb / (np.linalg.norm(emb, axis=1, keepdims=True) + 1e-9)
+    orig = np.fromiter((index[paare[i][0]] for i in aktiv), dtype=np.int64, count=len(aktiv))
+    komp = np.fromiter((index[paare[i][1]] for i in aktiv), dtype=np.int64, count=len(aktiv))
+    qualitaeten[aktiv] = np.einsum('ij,ij->i', emb[orig], emb[komp])
+    # Rohes Cosine-Similarity [0,1] – wissenschaftlich transparenter,
+    # da Textembeddings gleicher Domäne stets positiv korrelieren.
+    # Werte: 1.0 = identisch, 0.0 = keinerlei semantische Überlappung
+    return np.clip(qualitaeten, 0.0, 1.0)
+
+
+def qualitaet_semantische_aehnlichkeit_batch(original: str, komprimierte: List[str]) -> np.ndarray:
+    """Wie qualitaet_semantische_aehnlichkeit für viele komprimierte Fassungen desselben Originals."""
+    return qualitaet_paare((original, k) for k in komprimierte)
+
+
+# --- Billige Erhalt-Metriken (ohne Modell) ---
+
+def inhaltswoerter(text: str) -> List[str]:
+    """Kleingeschriebene Wörter ohne Stoppwörter."""
+    return [w for w in _WORT.findall(text.lower()) if w not in _STOPPWOERTER]
+
+
+def entitaeten(text: str) -> List[str]:
+    """Zahlen, IDs und Beträge, z. B. 'ORD-2024-001598', '89,99€', '17%'."""
+    ergebnis = []
+    for m in _ENTITAET.finditer(text):
+        kern = m.group(1).strip(_RAND)
+        if kern:
+            ergebnis.append(kern + (m.group(2) or ''))
+    return ergebnis
+
+
+def _erhalt(original: List[str], komprimierte: List[List[str]]) -> np.ndarray:
+    """Anteil der eindeutigen Original-Elemente, die in jeder Fassung vorkommen (1.0 ohne Elemente)."""
+    vokabular = {w: i for i, w in enumerate(dict.fromkeys(original))}
+    if not vokabular:
+        return np.ones(len(komprimierte))
+    zeilen, spalten = [], []
+    for z, elemente in enumerate(komprimierte):
+        ids = [vokabular[e] for e in elemente if e in vokabular]
+        zeilen.extend([z] * len(ids))
+        spalten.extend(ids)
+    v = len(vokabular)
+    paare = np.unique(np.asarray(zeilen, dtype=np.int64) * v + np.asarray(spalten, dtype=np.int64))
+    return np.bincount(paare // v, minlength=len(komprimierte)) / v
+
+
+@dataclass
+class ErhaltMetriken:
+    token_recall: np.ndarray        # Anteil erhaltener Inhaltswörter des Originals
+    entitaeten_erhalt: np.ndarray   # Anteil erhaltener Zahlen/IDs/Beträge
+
+    def minimum(self) -> np.ndarray:
+        return np.minimum(self.token_recall, self.entitaeten_erhalt)
+
+
+def erhalt_metriken(original: str, komprimierte: List[str]) -> ErhaltMetriken:
+    """
+    Billige Erhalt-Kennzahlen vieler Fassungen eines Originals (kein Modell,
+    keine Tokenisierung): je eindeutiger Fassung einmal Regex, danach Zählung
+    über Vokabular-Indizes für alle Fassungen gemeinsam.
+    """
+    with stufe('erhalt'):
+        return _erhalt_metriken(original, list(komprimierte))
+
+
+def _erhalt_metriken(original: str, komprimierte: List[str]) -> ErhaltMetriken:
+    eindeutig = {k: i for i, k in enumerate(dict.fromkeys(komprimierte))}
+    zuordnung = np.fromiter((eindeutig[k] for k in komprimierte), dtype=np.int64, count=len(komprimierte))
+    return ErhaltMetriken(
+        token_recall=_erhalt(inhaltswoerter(original), [inhaltswoerter(k) for k in eindeutig])[zuordnung],
+        entitaeten_erhalt=_erhalt(entitaeten(original), [entitaeten(k) for k in eindeutig])[zuordnung],
+    )
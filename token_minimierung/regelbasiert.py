@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Strategie 1: Regelbasierte Kompression (ohne ML).
+Hängt nur von der Standardbibliothek ab – kein tiktoken, numpy oder Modell –
+und ist damit in Millisekunden importierbar.
+Die Regeln (Floskeln, Stoppwörter) bilden einen Regelsatz je Sprache, der einmal
+kompiliert wird. Lange Texte kosten nur so wenige Durchläufe wie nötig: die
+Grußformel wird nur am Textende gesucht, mit Stoppwort-Filter entfallen die
+Leerraum-Durchläufe (die Wörter werden ohnehin mit ' ' verbunden), und lower()
+läuft einmal über den ganzen Text statt einmal pro Wort.
+"""
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from itertools import repeat
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .instrumentierung import stufe
+
+# Stoppwörter / Floskeln (regelbasiert entfernbar)
+ANREDEN_DE_EN = (
+    r'Sehr\s+geehrte\s+Damen\s+und\s+Herren,?', r'Dear\s+(Sir|Madam),?', r'Hi\s+,?',
+    r'Hallo\s*,?', r'Guten\s+Tag\s*,?',
+)
+GRUSSFORMELN_DE_EN = (
+    r'Mit\s+freundlichen\s+Grüßen', r'Best\s+regards', r'Kind\s+regards', r'Viele\s+Grüße',
+    r'Sincerely,?',
+)
+# Wie re.sub(r'[ \t]+', ' ', …), ohne jedes einzelne Leerzeichen zu ersetzen
+_LEERZEICHEN_ZU_KUERZEN = re.compile(r'[ \t]{2,}|\t')
+_MEHRFACHE_ZEILEN = re.compile(r'\n{3,}')
+
+# Optionale Stoppwörter (häufige Füllwörter, die semantisch wenig tragen)
+STOPWORDS_DE_EN = {
+    'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einer', 'eines',
+    'und', 'oder', 'aber', 'dass', 'daß', 'ist', 'sind', 'war', 'waren', 'wird', 'werden',
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'für', 'von', 'zu', 'mit', 'bei', 'nach', 'aus', 'auf', 'über', 'unter',
+    'for', 'of', 'to', 'with', 'by', 'from', 'on', 'at', 'in', 'as',
+    'ich', 'wir', 'sie', 'es', 'er', 'sie', 'Sie', 'man',
+    'haben', 'hat', 'hatte', 'haben', 'has', 'have', 'had',
+    'können', 'müssen', 'sollen', 'will', 'wollen', 'may', 'must', 'should', 'would',
+}
+
+
+@lru_cache(maxsize=None)
+def _leerraum_und_punkt() -> str:
+    """Alle Zeichen von [.\\s] als str.rstrip-Argument (Leerraum liegt unterhalb U+3001)."""
+    return '.' + ''.join(c for c in map(chr, range(0x3001)) if c.isspace())
+
+
+@dataclass(frozen=True)
+class Regelsatz:
+    """
+    Regeln für eine Sprache (oder Sprachmischung):
+    - anreden / grussformeln: Regex-Alternativen, am Textanfang bzw. -ende entfernt;
+      eine Grußformel umfasst höchstens grussformel_max_woerter Wörter
+    - stoppwoerter: kleingeschriebene Füllwörter, entfernt ab mehr als min_woerter Wörtern
+    - satzzeichen: werden vor dem Stoppwort-Vergleich an den Wortenden abgeschnitten
+    Die kompilierten Regeln werden beim ersten Gebrauch erzeugt und zwischengespeichert.
+    """
+    name: str
+    anreden: Tuple[str, ...] = ()
+    grussformeln: Tuple[str, ...] = ()
+    stoppwoerter: FrozenSet[str] = field(default_factory=frozenset)
+    satzzeichen: str = '.,;:!?()"\'-'
+    min_woerter: int = 30
+    grussformel_max_woerter: int = 16
+
+    @cached_property
+    def anrede_muster(self) -> Optional['re.Pattern']:
+        if not self.anreden:
+            return None
+        return re.compile(r'^(' + '|'.join(self.anreden) + r')\s*', re.IGNORECASE)
+
+    @cached_property
+    def gruss_muster(self) -> Optional['re.Pattern']:
+        if not self.grussformeln:
+            return None
+        return re.compile(r'\s*(' + '|'.join(self.grussformeln) + r')\s*[.\s]*$', re.IGNORECASE)
+
+    @cached_property
+    def _stoppwoerter_klein(self) -> FrozenSet[str]:
+        # Nur kleingeschriebene Einträge können einem lower()-Wort entsprechen
+        return frozenset(w for w in self.stoppwoerter if w == w.lower())
+
+    def floskeln_entfernen(self, text: str) -> str:
+        """
+        Anrede (am Anfang verankert, kostet nichts) und Grußformel entfernen.
+        Die Grußformel endet vor einem Rest aus [.\\s]; gesucht wird daher nur ab den
+        letzten grussformel_max_woerter Wörtern davor statt über den ganzen Text –
+        jeder frühere Treffer müsste mehr Wörter umfassen. Ergebnis wie gruss_muster.sub.
+        """
+        if self.anrede_muster is not None:
+            text = self.anrede_muster.sub('', text)
+        if self.gruss_muster is None:
+            return text
+        kern = text.rstrip(_leerraum_und_punkt())
+        kopf = kern.rsplit(None, self.grussformel_max_woerter)
+        start = len(kopf[0]) if len(kopf) > self.grussformel_max_woerter else 0
+        treffer = self.gruss_muster.search(text, start)
+        return text[:treffer.start()] + text[treffer.end():] if treffer else text
+
+    def stoppwoerter_entfernen(self, text: str) -> str:
+        """Wörter per Leerraum trennen, Stoppwörter (ab min_woerter) weglassen, mit ' ' verbinden."""
+        woerter = text.split()
+        if len(woerter) <= self.min_woerter or not self.stoppwoerter:
+            return ' '.join(woerter)
+        stoppwoerter = self._stoppwoerter_klein
+        # lower() auf dem ganzen Text liefert dieselben Wörter wie lower() je Wort
+        normiert = map(str.strip, text.lower().split(), repeat(self.satzzeichen))
+        return ' '.join([w for w, w_norm in zip(woerter, normiert) if w_norm not in stoppwoerter])
+
+
+STANDARD_REGELSATZ = Regelsatz(
+    name='de_en',
+    anreden=ANREDEN_DE_EN,
+    grussformeln=GRUSSFORMELN_DE_EN,
+    stoppwoerter=frozenset(STOPWORDS_DE_EN),
+)
+
+# Registrierte Regelsätze (weitere Sprachen per regelsatz_registrieren)
+REGELSAETZE: Dict[str, Regelsatz] = {STANDARD_REGELSATZ.name: STANDARD_REGELSATZ}
+
+
+def regelsatz_registrieren(regelsatz: Regelsatz) -> Regelsatz:
+    REGELSAETZE[regelsatz.name] = regelsatz
+    return regelsatz
+
+
+def _regelsatz(regelsatz: Union[str, Regelsatz, None]) -> Regelsatz:
+    if regelsatz is None:
+        return STANDARD_REGELSATZ
+    if isinstance(regelsatz, str):
+        try:
+            return REGELSAETZE[regelsatz]
+        except KeyError:
+            raise ValueError(f"Unbekannter Regelsatz: {regelsatz!r} ({', '.join(REGELSAETZE)})") from None
+    return regelsatz
+
+
+# =============================================================================
+# Strategie 1: Regelbasierte Kompression (ohne ML)
+# =============================================================================
+# Begründung: In Produktionssystemen oft erste Wahl – keine Laufzeit-Abhängigkeit
+# von Modellen, deterministisch, gut erklärbar. Entfernt Floskeln, Redundanzen
+# und optional Füllwörter (vgl. klassische Text-Normalisierung / Preprocessing).
+# =============================================================================
+
+def _komprimieren(prompt: str, stopwords_entfernen: bool, regeln: Regelsatz) -> str:
+    if not prompt or not prompt.strip():
+        return prompt
+    with stufe('regeln'):
+        text = regeln.floskeln_entfernen(prompt.strip())
+        if stopwords_entfernen:
+            # Wörter werden mit ' ' verbunden – das ersetzt die Leerraum-Normalisierung
+            return regeln.stoppwoerter_entfernen(text)
+        text = _LEERZEICHEN_ZU_KUERZEN.sub(' ', text)
+        return _MEHRFACHE_ZEILEN.sub('\n\n', text).strip()
+
+
+def kompression_manuell(
+    prompt: Union[str, 'Document'],
+    stopwords_entfernen: bool = True,
+    regelsatz: Union[str, Regelsatz, None] = None,
+) -> str:
+    """
+    Allgemeine regelbasierte Kompression:
+    - Entfernen von Anrede und Grußformel (regex-basiert)
+    - Mehrfache Leerzeichen/Zeilen auf ein Zeichen reduzieren
+    - Optional: Füllwörter entfernen (Stoppwortliste, nur in Texten mit mehr als 30 Wörtern)
+    - Keine prompt-spezifischen Regeln – funktioniert für beliebige Texte;
+      regelsatz wählt die Sprachregeln (Name oder Regelsatz, Standard 'de_en').
+    """
+    prompt = getattr(prompt, 'text', prompt)  # Document ohne Import des Dokument-Moduls
+    return _komprimieren(prompt, stopwords_entfernen, _regelsatz(regelsatz))
+
+
+def kompression_manuell_batch(
+    prompts: Iterable[Union[str, 'Document']],
+    stopwords_entfernen: bool = True,
+    regelsatz: Union[str, Regelsatz, None] = None,
+) -> List[str]:
+    """Wie kompression_manuell für viele Prompts; der Regelsatz wird nur einmal aufgelöst."""
+    regeln = _regelsatz(regelsatz)
+    return [_komprimieren(getattr(p, 'text', p), stopwords_entfernen, regeln) for p in prompts]
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive Strategiewahl je Prompt: Token-Budget und Qualitätsuntergrenze mit
+möglichst wenig Rechenaufwand erreichen, statt vorab eine Strategie festzulegen.
+- merkmale(): billige Kennzahlen ohne Modell (Tokens, Sätze, Code-Blöcke,
+  Struktur-Zeilen wie Listen/„Feld: Wert“, Floskeln, angefragter Anteil)
+- Vorhersage je Kandidat aus aufgezeichneten Ergebnissen (Merkmale, Strategie,
+  Qualität, Ausgabe-Anteil, Rechenzeit): k nächste Nachbarn, gewichtet mit einem
+  Prior je Kandidat, damit der Router auch ohne Daten entscheidet
+- Entscheidung: Kandidaten nach vorhergesagter Rechenzeit; modellfreie werden
+  ausprobiert (Budget über tokenizer.im_budget geprüft: Schätzung, exakt gezählt
+  nur im Unsicherheitsband), Embedding-Strategien nur, wenn die billigen Budget
+  oder Qualität verfehlen
+- Code-Blöcke (```…```) bleiben unverändert, komprimiert wird nur der Fließtext
+- lernen(): alle Kandidaten auf Beispiel-Prompts messen; zustand()/aus_zustand()
+  bzw. ROUTER_ZUSTAND_PFAD legen die Beobachtungen ab
+"""
+import json
+import math
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .experiment import strategie_funktion
+from .instrumentierung import stufe
+from .regelbasiert import ANREDEN_DE_EN, GRUSSFORMELN_DE_EN
+from .segmentierung import satz_spans, text_normalisieren
+from .tokenizer import im_budget, token_anzahl
+
+_ZUSTAND_VERSION = 1
+ROUTER_ZUSTAND_PFAD = os.environ.get('ROUTER_ZUSTAND_PFAD')
+
+_CODE_BLOCK = re.compile(r'```.*?(?:```|\Z)', re.DOTALL)
+_ANREDE = re.compile(r'^\s*(?:' + '|'.join(ANREDEN_DE_EN) + ')', re.IGNORECASE)
+_GRUSS = re.compile('|'.join(GRUSSFORMELN_DE_EN), re.IGNORECASE)
+_STRUKTUR_ZEILE = re.compile(r'^\s*(?:[-*•]\s|\d+[.)]\s|#{1,6}\s|[\w .()/-]{1,30}:\s*\S)')
+
+# Skalen der Merkmale für die Nachbarsuche (eine Einheit ≈ deutlicher Unterschied)
+MERKMAL_SKALEN = (0.5, 0.5, 0.1, 0.1, 1.0, 0.1)
+
+
+@dataclass(frozen=True)
+class Merkmale:
+    tokens: int
+    saetze: int
+    code_bloecke: int
+    code_anteil: float       # Zeichenanteil in Code-Blöcken
+    struktur_anteil: float   # Anteil der Zeilen mit Listen-/Überschrift-/„Feld: Wert“-Muster
+    floskeln: int            # Anrede/Grußformel (0–2)
+    ziel_anteil: float       # angefragtes Budget / tokens (≤ 1)
+
+    @property
+    def vektor(self) -> Tuple[float, ...]:
+        return (math.log1p(self.tokens), math.log1p(self.saetze), self.code_anteil,
+                self.struktur_anteil, float(self.floskeln), self.ziel_anteil)
+
+
+def merkmale(prompt: str, ziel_tokens: Optional[int] = None) -> Merkmale:
+    """Billige Merkmale eines Prompts (Regex und gecachte Token-Zählung, kein Modell)."""
+    with stufe('merkmale'):
+        tokens = token_anzahl(prompt)
+        code = [m.group() for m in _CODE_BLOCK.finditer(prompt)]
+        zeilen = [z for z in prompt.splitlines() if z.strip()]
+        struktur = sum(1 for z in zeilen if _STRUKTUR_ZEILE.match(z))
+        return Merkmale(
+            tokens=tokens,
+            saetze=len(satz_spans(text_normalisieren(_CODE_BLOCK.sub(' ', prompt)))),
+            code_bloecke=len(code),
+            code_anteil=sum(map(len, code)) / max(len(prompt), 1),
+            struktur_anteil=struktur / max(len(zeilen), 1),
+            floskeln=int(bool(_ANREDE.match(prompt))) + int(bool(_GRUSS.search(prompt))),
+            ziel_anteil=min(1.0, (ziel_tokens if ziel_tokens is not None else tokens) / max(tokens, 1)),
+        )
+
+
+@dataclass(frozen=True)
+class Kandidat:
+    """
+    Strategie mit Prior: anteil = erwartete Ausgabe-/Eingabe-Tokens (None: folgt dem
+    Budget über budget_parameter), verlust = Qualitätsverlust je entferntem Token-Anteil,
+    ms_pro_1k = Rechenzeit je 1K Eingabe-Tokens; modell: braucht Embeddings.
+    """
+    name: str
+    funktionsname: Optional[str]
+    kwargs: dict = field(default_factory=dict)
+    budget_parameter: Optional[str] = None   # 'ziel_tokens' oder 'ziel_anteil'
+    modell: bool = False
+    anteil: Optional[float] = 1.0
+    verlust: float = 0.0
+    ms_pro_1k: float = 0.0
+
+
+# Chunking fehlt bewusst: es hängt Chunk-Repräsentationen an und spart hier kaum Tokens
+KANDIDATEN = (
+    Kandidat('Baseline', None),
+    Kandidat('Manuell', 'kompression_manuell', anteil=0.85, verlust=0.2, ms_pro_1k=0.5),
+    Kandidat('Token-Budget', 'kompression_token_budget', budget_parameter='ziel_tokens', anteil=None,
+             verlust=0.45, ms_pro_1k=5.0),
+    Kandidat('Strukturiert', 'kompression_strukturiert', budget_parameter='ziel_anteil', modell=True,
+             anteil=None, verlust=0.22, ms_pro_1k=300.0),
+)
+
+
+@dataclass
+class Vorhersage:
+    qualitaet: float
+    anteil: float
+    rechen_ms: float
+    beobachtungen: int
+
+
+@dataclass
+class Entscheidung:
+    kandidat: str
+    text: str
+    merkmale: Merkmale
+    vorhersagen: Dict[str, Vorhersage]
+    ausprobiert: List[str]     # in dieser Reihenfolge ausgeführte Kandidaten
+    rechen_ms: float           # Merkmale + alle ausgeführten Kandidaten
+    budget_erreicht: bool
+
+
+def _teile(prompt: str) -> List[Tuple[bool, str]]:
+    """(ist_code, Text) in Dokumentreihenfolge; aneinandergehängt wieder der Prompt."""
+    teile, pos = [], 0
+    for m in _CODE_BLOCK.finditer(prompt):
+        if m.start() > pos:
+            teile.append((False, prompt[pos:m.start()]))
+        teile.append((True, m.group()))
+        pos = m.end()
+    if pos < len(prompt):
+        teile.append((False, prompt[pos:]))
+    return teile
+
+
+def _ausfuehren(kandidat: Kandidat, prompt: str, ziel_tokens: int, m: Merkmale) -> str:
+    """
+    Kandidat auf den Prompt anwenden; mit Code-Blöcken nur auf die Fließtext-Teile,
+    Leerraum zwischen Fließtext und Code bleibt wie im Original.
+    """
+    def anwenden(text: str, budget: int, tokens: int) -> str:
+        kwargs = dict(kandidat.kwargs)
+        if kandidat.budget_parameter == 'ziel_tokens':
+            kwargs['ziel_tokens'] = budget
+        elif kandidat.budget_parameter == 'ziel_anteil':
+            kwargs['ziel_anteil'] = min(1.0, budget / max(tokens, 1))
+        return strategie_funktion(kandidat.funktionsname, kwargs)(text)
+
+    if not m.code_bloecke or kandidat.funktionsname is None:
+        return anwenden(prompt, ziel_tokens, m.tokens)
+    teile = _teile(prompt)
+    laengen = [token_anzahl(t if code else t.strip()) for code, t in teile]
+    code_tokens = sum(n for (code, _), n in zip(teile, laengen) if code)
+    text_tokens = max(sum(laengen) - code_tokens, 1)
+    text_budget = ziel_tokens - code_tokens
+    if text_budget <= 0:
+        # schon der Code sprengt das Budget: Fließtext (meist die Anweisung) nur anteilig kürzen
+        text_budget = text_tokens * m.ziel_anteil
+
+    def fliesstext(t: str, n: int) -> str:
+        kern = t.strip()
+        if not kern:
+            return t
+        links, rechts = t[:len(t) - len(t.lstrip())], t[len(t.rstrip()):]
+        return links + anwenden(kern, max(1, round(text_budget * n / text_tokens)), n) + rechts
+
+    return ''.join(t if code else fliesstext(t, n) for (code, t), n in zip(teile, laengen))
+
+
+class StrategieRouter:
+    """
+    Wählt je Prompt den billigsten Kandidaten, der Budget und Qualitätsuntergrenze
+    (vorhergesagt) einhält; sonst den mit der besten vorhergesagten Qualität im Budget.
+    """
+
+    def __init__(self, kandidaten: Sequence[Kandidat] = KANDIDATEN, nachbarn: int = 8,
+                 prior_gewicht: float = 0.5):
+        self.kandidaten = {k.name: k for k in kandidaten}
+        self.nachbarn = nachbarn
+        self.prior_gewicht = prior_gewicht
+        # je Kandidat: Liste von (Merkmalsvektor, Qualität, Ausgabe-Anteil, ms je 1K Tokens);
+        # bei Kandidaten mit Budget-Parameter Ausgabe-Anteil relativ zum angefragten Anteil
+        self.beobachtungen: Dict[str, List[tuple]] = {name: [] for name in self.kandidaten}
+        self._matrizen: Dict[str, tuple] = {}  # je Kandidat ((Liste, Anzahl), Merkmale skaliert, Werte)
+
+    def beobachten(self, m: Merkmale, kandidat: str, qualitaet: float, ausgabe_tokens: int, rechen_ms: float):
+        """Ein gemessenes Ergebnis aufzeichnen (aus lernen() oder aus dem Betrieb)."""
+        anteil = ausgabe_tokens / max(m.tokens, 1) / self._bezug(self.kandidaten[kandidat], m)
+        self.beobachtungen[kandidat].append(
+            (m.vektor, float(qualitaet), anteil, rechen_ms / max(m.tokens, 1) * 1000))
+
+    @staticmethod
+    def _bezug(kandidat: Kandidat, m: Merkmale) -> float:
+        return max(m.ziel_anteil, 1e-6) if kandidat.budget_parameter else 1.0
+
+    def _prior(self, kandidat: Kandidat, m: Merkmale) -> Tuple[float, float, float]:
+        anteil = m.ziel_anteil if kandidat.anteil is None else kandidat.anteil
+        if m.code_bloecke and kandidat.funktionsname is not None:  # Code bleibt unverändert
+            anteil = m.code_anteil + (1 - m.code_anteil) * anteil
+        return 1 - kandidat.verlust * (1 - anteil), anteil / self._bezug(kandidat, m), kandidat.ms_pro_1k
+
+    def _matrix(self, name: str):
+        """Beobachtungen als Arrays, neu aufgebaut erst, wenn neue hinzugekommen sind."""
+        import numpy as np
+        daten = self.beobachtungen[name]
+        zwischen = self._matrizen.get(name)
+        if zwischen is None or zwischen[0] != (id(daten), len(daten)):
+            zwischen = ((id(daten), len(daten)), np.array([d[0] for d in daten]) / MERKMAL_SKALEN,
+                        np.array([d[1:] for d in daten]))
+            self._matrizen[name] = zwischen
+        return zwischen[1], zwischen[2]
+
+    def vorhersagen(self, m: Merkmale) -> Dict[str, Vorhersage]:
+        """Qualität, Ausgabe-Anteil und Rechenzeit je Kandidat (k-NN über Beobachtungen plus Prior)."""
+        import numpy as np
+        x = np.asarray(m.vektor) / MERKMAL_SKALEN
+        ergebnis = {}
+        for name, kandidat in self.kandidaten.items():
+            prior = np.asarray(self._prior(kandidat, m))
+            daten = self.beobachtungen[name]
+            if daten:
+                merkmals_matrix, werte = self._matrix(name)
+                abstand = np.linalg.norm(merkmals_matrix - x, axis=1)
+                naechste = np.argsort(abstand, kind='stable')[:self.nachbarn]
+                gewichte = 1 / (1 + abstand[naechste])
+                schaetzung = (gewichte @ werte[naechste] + self.prior_gewicht * prior) / \
+                    (gewichte.sum() + self.prior_gewicht)
+            else:
+                schaetzung = prior
+            if name == 'Baseline':
+                schaetzung = np.array([1.0, 1.0, 0.0])
+            ergebnis[name] = Vorhersage(float(schaetzung[0]), float(schaetzung[1]) * self._bezug(kandidat, m),
+                                        float(schaetzung[2]) * m.tokens / 1000, len(daten))
+        return ergebnis
+
+    def entscheiden(self, prompt: str, ziel_tokens: Optional[int] = None, ziel_anteil: float = 0.6,
+                    min_qualitaet: float = 0.85) -> Entscheidung:
+        """
+        Budget: ziel_tokens oder ziel_anteil der Prompt-Tokens. Modellfreie Kandidaten
+        werden ausgeführt und per im_budget geprüft (exakt gezählt nur, wenn die Schätzung
+        nicht eindeutig ist); ein Embedding-Kandidat nur, wenn er nach Vorhersage Budget
+        und Untergrenze einhält oder im Rückfall. Hält keine Vorhersage das Budget, werden
+        vor dem Rückfall alle Kandidaten ausgeführt. Code-Blöcke bleiben wörtlich erhalten:
+        sind sie allein länger als das Budget, kann keine Ausgabe es einhalten – dann die
+        kürzeste, mit budget_erreicht=False.
+        """
+        start = time.perf_counter()
+        tokens = token_anzahl(prompt)
+        if ziel_tokens is None:
+            ziel_tokens = max(1, int(tokens * ziel_anteil))
+        m = merkmale(prompt, ziel_tokens)
+        vorhersagen = self.vorhersagen(m)
+        reihenfolge = sorted(self.kandidaten, key=lambda n: vorhersagen[n].rechen_ms)
+        ausprobiert, ausgaben = [], {}
+
+        def ergebnis(name: str, text: str, erreicht: bool) -> Entscheidung:
+            return Entscheidung(name, text, m, vorhersagen, ausprobiert,
+                                (time.perf_counter() - start) * 1000, erreicht)
+
+        def passend(namen: List[str]) -> List[str]:
+            """Kandidaten, deren Ausgabe ins Budget passt."""
+            return [n for n, ok in zip(namen, im_budget([ausgaben[n] for n in namen], ziel_tokens)) if ok]
+
+        def ausfuehren(name: str) -> str:
+            if name not in ausgaben:
+                ausprobiert.append(name)
+                with stufe(f'router/{name}'):
+                    ausgaben[name] = _ausfuehren(self.kandidaten[name], prompt, ziel_tokens, m)
+            return ausgaben[name]
+
+        for name in reihenfolge:
+            v = vorhersagen[name]
+            if v.qualitaet < min_qualitaet:
+                continue
+            if self.kandidaten[name].modell:
+                if v.anteil * m.tokens <= ziel_tokens * 1.05:
+                    ausfuehren(name)
+                    return ergebnis(name, ausgaben[name], bool(passend([name])))
+            else:
+                ausfuehren(name)
+                if passend([name]):
+                    return ergebnis(name, ausgaben[name], True)
+
+        # Rückfall: beste vorhergesagte Qualität unter den Kandidaten im Budget
+        def beste(namen: List[str]) -> str:
+            return max(namen, key=lambda n: (vorhersagen[n].qualitaet, -vorhersagen[n].rechen_ms))
+
+        vorhergesagt = [n for n in self.kandidaten
+                        if n not in ausgaben and vorhersagen[n].anteil * m.tokens <= ziel_tokens * 1.05]
+        kandidaten = passend(list(ausgaben)) + vorhergesagt
+        if kandidaten:
+            name = beste(kandidaten)
+            ausfuehren(name)
+            if passend([name]):
+                return ergebnis(name, ausgaben[name], True)
+        # keine Vorhersage trifft: alle übrigen Kandidaten (auch Embedding) messen,
+        # erst ohne Ausgabe im Budget die kürzeste
+        for name in reihenfolge:
+            ausfuehren(name)
+        kandidaten = passend(list(ausgaben))
+        if kandidaten:
+            name = beste(kandidaten)
+            return ergebnis(name, ausgaben[name], True)
+        name = min(ausgaben, key=lambda n: token_anzahl(ausgaben[n]))
+        return ergebnis(name, ausgaben[name], False)
+
+    def komprimieren(self, prompt: str, ziel_tokens: Optional[int] = None, ziel_anteil: float = 0.6,
+                     min_qualitaet: float = 0.85) -> str:
+        return self.entscheiden(prompt, ziel_tokens, ziel_anteil, min_qualitaet).text
+
+    def lernen(self, prompts: Iterable[str], ziel_anteile: Sequence[float] = (0.1, 0.2, 0.4, 0.6, 0.8),
+               qualitaets_fn: Optional[Callable[[List[Tuple[str, str]]], Sequence[float]]] = None) -> int:
+        """
+        Alle Kandidaten auf jedem Prompt und Budget messen (Rechenzeit, Ausgabe-Tokens),
+        Qualität gebündelt über qualitaets_fn (Standard: qualitaet_paare); liefert die
+        Zahl neuer Beobachtungen.
+        """
+        if qualitaets_fn is None:
+            from .qualitaet import qualitaet_paare as qualitaets_fn
+        if any(k.modell for k in self.kandidaten.values()):
+            # Modell vorab laden: das einmalige Laden ist keine Rechenzeit je Prompt
+            from .embedding import get_embedding_dienst
+            get_embedding_dienst().modell
+        messungen, paare = [], []
+        for prompt in prompts:
+            tokens = token_anzahl(prompt)
+            for anteil in ziel_anteile:
+                ziel_tokens = max(1, int(tokens * anteil))
+                m = merkmale(prompt, ziel_tokens)
+                for name, kandidat in self.kandidaten.items():
+                    start = time.perf_counter()
+                    text = _ausfuehren(kandidat, prompt, ziel_tokens, m)
+                    messungen.append((m, name, token_anzahl(text), (time.perf_counter() - start) * 1000))
+                    paare.append((prompt, text))
+        for (m, name, ausgabe_tokens, rechen_ms), qualitaet in zip(messungen, qualitaets_fn(paare)):
+            self.beobachten(m, name, qualitaet, ausgabe_tokens, rechen_ms)
+        return len(messungen)
+
+    def zustand(self) -> dict:
+        """JSON-fähige Beobachtungen je Kandidat."""
+        return {'version': _ZUSTAND_VERSION,
+                'beobachtungen': {name: [list(d[0]) + list(d[1:]) for d in daten]
+                                  for name, daten in self.beobachtungen.items()}}
+
+    @classmethod
+    def aus_zustand(cls, zustand: dict, kandidaten: Sequence[Kandidat] = KANDIDATEN, **kwargs) -> 'StrategieRouter':
+        if zustand.get('version') != _ZUSTAND_VERSION:
+            raise ValueError(f"Unbekannte Zustandsversion: {zustand.get('version')!r}")
+        router = cls(kandidaten, **kwargs)
+        dim = len(MERKMAL_SKALEN)
+        for name, daten in zustand['beobachtungen'].items():
+            if name in router.beobachtungen:
+                router.beobachtungen[name] = [(tuple(z[:dim]), *z[dim:]) for z in daten]
+        return router
+
+
+_router: Optional[StrategieRouter] = None
+
+
+def get_router() -> StrategieRouter:
+    """Prozessweiter Router; Beobachtungen aus ROUTER_ZUSTAND_PFAD, falls gesetzt."""
+    global _router
+    if _router is None:
+        if ROUTER_ZUSTAND_PFAD and os.path.exists(ROUTER_ZUSTAND_PFAD):
+            with open(ROUTER_ZUSTAND_PFAD, encoding='utf-8') as f:
+                _router = StrategieRouter.aus_zustand(json.load(f))
+        else:
+            _router = StrategieRouter()
+    return _router
+
+
+def kompression_adaptiv(prompt: str, ziel_tokens: Optional[int] = None, ziel_anteil: float = 0.6,
+                        min_qualitaet: float = 0.85) -> str:
+    """Strategie-Schnittstelle: der Router wählt je Prompt (siehe StrategieRouter.entscheiden)."""
+    return get_router().komprimieren(getattr(prompt, 'text', prompt), ziel_tokens, ziel_anteil, min_qualitaet)
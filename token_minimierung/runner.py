@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Paralleler Experiment-Runner über Prompts × Strategien.
+Modi: 'seriell', 'threads' (ThreadPool, ein gemeinsames Modell im Prozess) und
+'prozesse' (ProcessPool, jeder Worker lädt Tokenizer und Embedding-Modell einmal
+im Initializer). Die Arbeit wird pro Prompt verteilt, damit das Original-Embedding
+im Cache des Workers bleibt, der alle Strategien dieses Prompts rechnet.
+Die Ergebnisse kommen in deterministischer Reihenfolge (Prompt, dann Strategie)
+zurück und stimmen bis auf die gemessene Kompressionszeit mit dem seriellen Lauf überein.
+Die Qualität wird je Prompt gebündelt bewertet (Stufe 'bewertung'); ihre Dauer
+wird je Prompt berichtet und nicht den Zellen zugeschlagen.
+Mit einem ZellenCache werden bereits gerechnete Zellen vorab geladen; verteilt
+werden nur die fehlenden Zellen, ihre Ergebnisse danach gesammelt gespeichert.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from .embedding import get_embedding_dienst
+from .experiment import ExperimentResult, StrategieSpec, run_experiment, strategie_funktion
+from .instrumentierung import stufe
+from .qualitaet import qualitaet_paare
+from .tokenizer import tokenisieren
+from .zellen_cache import ZellenCache
+
+MODI = ("seriell", "threads", "prozesse")
+
+
+def _worker_init():
+    """Initializer: Tokenizer und Embedding-Modell einmal pro Worker laden."""
+    tokenisieren("warm-up")
+    get_embedding_dienst().modell
+
+
+def _vormerken(komprimieren, paare: list, zelle: int, text: str) -> str:
+    """Komprimiert und merkt (Zelle, Original, Ausgabe) für die gebündelte Bewertung vor."""
+    komprimiert = komprimieren(text)
+    paare.append((zelle, text, komprimiert))
+    return komprimiert
+
+
+def _prompt_ausfuehren(prompt_name: str, prompt_text: str,
+                       strategien: List[StrategieSpec]) -> Tuple[List[Tuple[ExperimentResult, float]], float]:
+    """
+    Alle Strategien für einen Prompt (ein Shard). Liefert je Zelle Ergebnis und
+    Rechenzeit (ms, ohne Qualität) sowie die Dauer der Bewertung (ms): die Qualität
+    aller Zellen wird danach gemeinsam bewertet (qualitaet_paare: das Original
+    einmal eingebettet).
+    """
+    ergebnisse, paare = [], []
+    for strategie_name, funktionsname, kwargs in strategien:
+        funktion = strategie_funktion(funktionsname, kwargs)
+        if funktionsname is not None:  # Baseline: Qualität 1.0 (Original = Komprimiert)
+            funktion = partial(_vormerken, funktion, paare, len(ergebnisse))
+        start = time.perf_counter()
+        ergebnis = run_experiment(prompt_name, prompt_text, funktion, strategie_name, parameter=kwargs)
+        ergebnisse.append((ergebnis, (time.perf_counter() - start) * 1000))
+
+    bewertung_ms = 0.0
+    if paare:
+        start = time.perf_counter()
+        with stufe('bewertung'):
+            qualitaeten = qualitaet_paare((o, k) for _, o, k in paare)
+        bewertung_ms = (time.perf_counter() - start) * 1000
+        for (zelle, _, _), q in zip(paare, qualitaeten.tolist()):
+            ergebnisse[zelle][0].qualitaets_score = q
+    return ergebnisse, bewertung_ms
+
+
+def _prompt_im_worker(prompt_name: str, prompt_text: str, strategien: List[StrategieSpec]):
+    ergebnisse = _prompt_ausfuehren(prompt_name, prompt_text, strategien)
+    return ergebnisse, os.getpid(), get_embedding_dienst().statistik()
+
+
+def experimente_ausfuehren(
+    prompts: Dict[str, str],
+    strategien: List[StrategieSpec],
+    modus: str = "seriell",
+    worker: Optional[int] = None,
+    fortschritt: bool = True,
+    zellen_cache: Optional[ZellenCache] = None,
+) -> List[ExperimentResult]:
+    """
+    Führt alle Zellen (Prompt × Strategie) aus und liefert die Ergebnisse
+    in der Reihenfolge prompts × strategien. Mit zellen_cache werden nur
+    neue oder veraltete Zellen gerechnet, die übrigen geladen.
+    """
+    if modus not in MODI:
+        raise ValueError(f"Unbekannter Modus: {modus!r} ({', '.join(MODI)})")
+    eintraege = list(prompts.items())
+    worker = worker or os.cpu_count() or 1
+    zellen: List[List[Optional[ExperimentResult]]] = [[None] * len(strategien) for _ in eintraege]
+    if zellen_cache is not None:
+        for i, (name, text) in enumerate(eintraege):
+            for j, strategie in enumerate(strategien):
+                zellen[i][j] = zellen_cache.holen(name, text, strategie)
+    # Je Prompt die noch zu rechnenden Strategien (Indizes); Prompts ohne offene Zellen entfallen
+    offen = {i: [j for j, r in enumerate(zeile) if r is None] for i, zeile in enumerate(zellen)}
+    offen = {i: js for i, js in offen.items() if js}
+    anzahl_offen = sum(len(js) for js in offen.values())
+    gerechnet = []  # (prompt_text, strategie, ergebnis, rechenzeit_ms) für den Zellen-Cache
+    bewertung_ms: List[float] = []  # gebündelte Qualitätsbewertung je gerechnetem Prompt
+    worker_cache: Dict[int, dict] = {}
+    start = time.perf_counter()
+
+    def melden(fertig: int, zellen_fertig: int):
+        if fortschritt:
+            dauer = time.perf_counter() - start
+            print(f"  [{fertig}/{len(offen)} Prompts] {zellen_fertig} Zellen, "
+                  f"{zellen_fertig / max(dauer, 1e-9):.1f} Zellen/s")
+
+    def uebernehmen(i: int, ausgabe: Tuple[List[Tuple[ExperimentResult, float]], float]):
+        ergebnisse, dauer_ms = ausgabe
+        bewertung_ms.append(dauer_ms)
+        for j, (ergebnis, rechenzeit_ms) in zip(offen[i], ergebnisse):
+            zellen[i][j] = ergebnis
+            gerechnet.append((eintraege[i][1], strategien[j], ergebnis, rechenzeit_ms))
+
+    if modus == "seriell":
+        if offen:
+            _worker_init()  # Modell vor der ersten Messung laden (idempotent)
+        for fertig, i in enumerate(offen, 1):
+            name, text = eintraege[i]
+            uebernehmen(i, _prompt_ausfuehren(name, text, [strategien[j] for j in offen[i]]))
+            melden(fertig, len(gerechnet))
+    elif offen:
+        if modus == "threads":
+            # Ein Modell im Prozess, von allen Threads geteilt: einmal vorab laden
+            _worker_init()
+            pool = ThreadPoolExecutor(max_workers=worker)
+            aufgabe = _prompt_ausfuehren
+        else:
+            pool = ProcessPoolExecutor(max_workers=worker, initializer=_worker_init)
+            aufgabe = _prompt_im_worker
+        with pool:
+            futures = {pool.submit(aufgabe, *eintraege[i], [strategien[j] for j in offen[i]]): i
+                       for i in offen}
+            for fertig, future in enumerate(as_completed(futures), 1):
+                ergebnis = future.result()
+                if modus == "prozesse":
+                    ergebnis, pid, statistik = ergebnis
+                    worker_cache[pid] = statistik
+                uebernehmen(futures[future], ergebnis)
+                melden(fertig, len(gerechnet))
+
+    dauer = time.perf_counter() - start
+    print(f"Runner ({modus}, {1 if modus == 'seriell' else worker} Worker): {anzahl_offen} Zellen in "
+          f"{dauer:.2f} s ({anzahl_offen / max(dauer, 1e-9):.1f} Zellen/s)")
+    if bewertung_ms:
+        print(f"Qualitätsbewertung (gebündelt je Prompt): {sum(bewertung_ms) / len(bewertung_ms):.1f} ms "
+              f"je Prompt, {sum(bewertung_ms) / 1000:.2f} s über {len(bewertung_ms)} Prompts")
+    if worker_cache:
+        treffer = sum(s["treffer"] + s["disk_treffer"] for s in worker_cache.values())
+        fehlschlaege = sum(s["fehlschlaege"] for s in worker_cache.values())
+        print(f"Embedding-Cache (Summe über {len(worker_cache)} Worker): "
+              f"{treffer} Treffer, {fehlschlaege} Fehlschläge")
+    if zellen_cache is not None:
+        zellen_cache.speichern(gerechnet)
+
+    return [r for zeile in zellen for r in zeile]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Satzsegmentierung für alle Strategien (nur Standardbibliothek).
+Sätze werden als (start, ende)-Spans im whitespace-normalisierten Text bestimmt;
+saetze_zerlegen liefert daraus die Satz-Strings.
+"""
+import re
+from typing import List, Tuple
+
+from .instrumentierung import stufe
+
+# Abkürzungen, deren Punkt kein Satzende ist (z.B. "Nr.", "z.B.")
+ABKUERZUNGEN = ['Nr.', 'z.B.', 'bzw.', 'u.a.', 'etc.', 'evtl.']
+_SATZ_GRENZE = re.compile(r'[.!?]\s+|\n+')
+_LEERRAUM = re.compile(r'\s+')
+# Platzhalter für geschützte Punkte: ein Zeichen, damit Positionen erhalten bleiben
+_GESCHUETZTER_PUNKT = '\uE000'
+
+
+def text_normalisieren(text: str) -> str:
+    return _LEERRAUM.sub(' ', text.strip())
+
+
+def satz_spans(text_norm: str) -> List[Tuple[int, int]]:
+    """Satzgrenzen als (start, ende)-Paare im normalisierten Text (keine Teilstrings)."""
+    with stufe('segmentierung'):
+        return _satz_spans(text_norm)
+
+
+def _satz_spans(text_norm: str) -> List[Tuple[int, int]]:
+    arbeit = text_norm
+    for abbr in ABKUERZUNGEN:
+        arbeit = arbeit.replace(abbr, abbr.replace('.', _GESCHUETZTER_PUNKT))
+    spans = []
+    start = 0
+    for m in _SATZ_GRENZE.finditer(arbeit):
+        spans.append((start, m.start()))
+        start = m.end()
+    spans.append((start, len(arbeit)))
+    ergebnis = []
+    for a, b in spans:
+        while a < b and text_norm[a].isspace():
+            a += 1
+        while b > a and text_norm[b - 1].isspace():
+            b -= 1
+        if a < b:
+            ergebnis.append((a, b))
+    return ergebnis if ergebnis else [(0, len(text_norm))]
+
+
+def saetze_zerlegen(text: str) -> List[str]:
+    """Zerlegt Text in Sätze (Punkt, Ausrufe-, Fragezeichen, Zeilenumbruch)."""
+    text = text_normalisieren(text)
+    return [text[a:b] for a, b in satz_spans(text)]
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Strategie 2: Strukturierte Kompression über Embedding-Centrality (einzeln und als Batch).
+"""
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .dokument import Document, als_dokument, dokumente_analysieren
+from .instrumentierung import stufe
+from .tokenizer import token_anzahlen
+
+# =============================================================================
+# Strategie 2: Strukturierte Kompression (LLMLingua-/LongLLMLingua-inspiriert)
+# =============================================================================
+# Idee: Nur „wichtige“ Teile behalten. LLMLingua nutzt ein kleines Modell zur
+# Token-Importanz; wir approximieren das durch Satz-Embeddings und Centrality:
+# Sätze, die dem Dokument-Durchschnitt (oder dem ersten Satz) semantisch am
+# nächsten sind, gelten als zentral und werden behalten (vgl. Extractive
+# Summarization). So bleibt die Bedeutung erhalten, ohne task-spezifisches Training.
+# =============================================================================
+
+def _get_embedding_model():
+    """
+    Gemeinsamer Embedding-Dienst (embedding.py): ein geladenes Modell für
+    Strategien und Qualitätsmetrik, Embeddings werden inhaltsadressiert gecacht.
+    """
+    from .embedding import get_embedding_dienst
+    return get_embedding_dienst()
+
+
+def kompression_strukturiert(
+    prompt: Union[str, Document],
+    ziel_anteil: float = 0.45,
+    min_saetze: int = 2,
+) -> str:
+    """
+    Strukturierte Kompression durch semantische Centrality:
+    - Text in Sätze zerlegen, jeden Satz embedden
+    - Wichtigkeit = Ähnlichkeit zum mittleren Dokument-Vektor (Centrality)
+    - Behalte die wichtigsten Sätze bis ca. ziel_anteil der Original-Token-Anzahl
+    """
+    doc = als_dokument(prompt)
+    if len(doc) <= min_saetze:
+        return doc.text
+
+    model = _get_embedding_model()
+    embeddings = model.encode(doc.saetze)
+    scores = _centrality_scores(embeddings)
+    ziel_tokens = max(50, int(doc.token_anzahl * ziel_anteil))
+    return _auswahl_nach_centrality(
+        doc.saetze, scores, ziel_tokens, min_saetze, token_laengen=doc.satz_token_laengen
+    )
+
+
+def _centrality_scores(embeddings):
+    """Cosine-Ähnlichkeit jedes Satz-Embeddings zum Dokument-Mittelwert (vektorisiert)."""
+    with stufe('centrality'):
+        embeddings = np.asarray(embeddings)
+        zentrum = np.mean(embeddings, axis=0)
+        normen = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(zentrum) + 1e-9
+        return (embeddings @ zentrum) / normen
+
+
+def _auswahl_nach_centrality(
+    saetze: List[str],
+    scores,
+    ziel_tokens: int,
+    min_saetze: int,
+    token_laengen: Optional[List[int]] = None,
+) -> str:
+    """Wählt Sätze nach absteigendem Score bis ziel_tokens; Ausgabe in Originalreihenfolge."""
+    if token_laengen is None:
+        token_laengen = token_anzahlen(saetze)
+    with stufe('auswahl'):
+        # Nach Wichtigkeit sortieren (höchster Score zuerst)
+        reihenfolge = np.argsort(-scores)
+        gewaehlt = []
+        akt_tokens = 0
+        for idx in reihenfolge:
+            s = saetze[idx]
+            t_len = token_laengen[idx]
+            neue_tokens = akt_tokens + t_len + 1
+            if neue_tokens <= ziel_tokens or len(gewaehlt) < min_saetze:
+                gewaehlt.append((idx, s))
+                akt_tokens = neue_tokens
+            else:
+                break
+        gewaehlt.sort(key=lambda x: x[0])
+        return ' '.join(s for _, s in gewaehlt)
+
+
+def kompression_strukturiert_batch(
+    prompts: List[Union[str, Document]],
+    ziel_anteil: float = 0.45,
+    min_saetze: int = 2,
+    batch_size: int = 256,
+) -> List[str]:
+    """
+    Batch-Variante von kompression_strukturiert für viele Prompts:
+    - Alle Prompts segmentieren, sämtliche Sätze in einem Modellaufruf embedden
+      (große, gepaddete Batches statt eines kleinen Forward-Passes pro Prompt)
+    - Centrality pro Dokument als Matrixoperation über Segment-Offsets
+    - Tokenisierung gebündelt über dokumente_analysieren (encoder.encode_batch)
+    Ergebnis ist Satz für Satz identisch zu kompression_strukturiert(p) für jedes p.
+    """
+    prompts = list(prompts)
+    offen = [i for i, p in enumerate(prompts) if not isinstance(p, Document)]
+    docs = list(prompts)
+    for i, doc in zip(offen, dokumente_analysieren([prompts[i] for i in offen])):
+        docs[i] = doc
+    ergebnisse = [doc.text for doc in docs]
+    aktiv = [i for i, doc in enumerate(docs) if len(doc) > min_saetze]
+    if not aktiv:
+        return ergebnisse
+
+    alle_saetze = []
+    offsets = [0]
+    for i in aktiv:
+        alle_saetze.extend(docs[i].saetze)
+        offsets.append(len(alle_saetze))
+
+    model = _get_embedding_model()
+    embeddings = model.encode(alle_saetze, batch_size=batch_size)
+
+    for k, i in enumerate(aktiv):
+        a, b = offsets[k], offsets[k + 1]
+        scores = _centrality_scores(embeddings[a:b])
+        ziel_tokens = max(50, int(docs[i].token_anzahl * ziel_anteil))
+        ergebnisse[i] = _auswahl_nach_centrality(
+            docs[i].saetze, scores, ziel_tokens, min_saetze, token_laengen=docs[i].satz_token_laengen
+        )
+    return ergebnisse
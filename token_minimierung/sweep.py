@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Parameter-Sweep über die Strategien und Pareto-Front je Szenario
+(Kompressionsrate ↑, Qualität ↑, Latenz ↓).
+- Parameterräume als Raster (Listen, range, bereich()) je Strategie; das
+  kartesische Produkt ergibt die Konfigurationen
+- Jedes Szenario wird einmal analysiert (Document: Sätze, Tokens), Satz-Embeddings
+  liegen im gemeinsamen Embedding-Cache – je Konfiguration ändert sich nur die Auswahl
+- Kompression parallel (wie runner.py: seriell, threads, prozesse), verteilt in
+  Blöcken von Konfigurationen je Szenario und Strategie
+- Dedup: Konfigurationen mit gleicher Ausgabe haben dieselbe Rate und Qualität –
+  bewertet wird jede eindeutige Ausgabe nur einmal, gebündelt in einem
+  Modellaufruf je Szenario (zwei mit Dominanz-Pruning); alle bewerteten Zellen bleiben Punkte
+- Optionaler Vorfilter (min_erhalt): Ausgaben mit zu geringem Erhalt von
+  Inhaltswörtern oder Zahlen/IDs (erhalt_metriken, ohne Modell) werden gar
+  nicht erst eingebettet und fehlen in Punkten und Front
+- Dominanz-Pruning: zuerst werden die Ausgaben bewertet, die in Rate und Latenz
+  nicht dominiert sind; eine übrige Ausgabe, die ein bewerteter Punkt in Rate und
+  Latenz dominiert und dessen Qualität die Obergrenze (qualitaet_obergrenze,
+  Standard 1.0 = höchste mögliche Qualität) erreicht, kann nicht auf die Front
+  und wird nicht bewertet (fehlt in den Punkten)
+"""
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .auswertung import berechne_kosten
+from .dokument import Document, dokument_analysieren
+from .experiment import ExperimentResult, gesamt_latenz_ms
+from .qualitaet import erhalt_metriken, qualitaet_semantische_aehnlichkeit_batch
+from .runner import MODI, _worker_init
+from .tokenizer import token_anzahl, token_anzahlen
+
+# Parameterraum einer Strategie: (Anzeigename, Funktionsname, {Parameter: Werte})
+ParameterRaum = Tuple[str, str, Dict[str, Sequence]]
+
+BLOCK_GROESSE = 256  # Konfigurationen je Aufgabe im Pool
+DOKUMENT_CACHE = 32  # analysierte Szenarien je Prozess (LRU)
+# Identische Texte ergeben nach der Normierung 1 − O(1e-9) statt genau 1.0
+_QUALITAET_TOLERANZ = 1e-6
+
+
+def bereich(von: float, bis: float, schritte: int) -> List[float]:
+    """Gleichmäßiges Raster von..bis (inklusive), gerundet gegen Gleitkomma-Rauschen."""
+    return [round(float(x), 10) for x in np.linspace(von, bis, schritte)]
+
+
+STANDARD_RAEUME: List[ParameterRaum] = [
+    ("Manuelle Prompt-Kompression", "kompression_manuell",
+     {"stopwords_entfernen": [False, True]}),
+    ("Strukturierte Kompression", "kompression_strukturiert",
+     {"ziel_anteil": bereich(0.1, 0.9, 17), "min_saetze": [1, 2, 3]}),
+    ("Token-Budget", "kompression_token_budget",
+     {"ziel_tokens": range(20, 401, 20), "position_weight": [True, False],
+      "relevanz_gewicht": bereich(0.0, 1.0, 5)}),
+    ("Chunking", "kompression_chunking",
+     {"chunk_groesse": range(50, 301, 50), "overlap": range(0, 61, 20), "saetze_pro_chunk": [1, 2, 3, 4]}),
+]
+
+
+def konfigurationen(raum: ParameterRaum) -> List[dict]:
+    """Kartesisches Produkt der Parameterwerte; ungültige Kombinationen entfallen."""
+    _, funktionsname, parameter = raum
+    namen = list(parameter)
+    ergebnis = []
+    for werte in itertools.product(*(list(parameter[n]) for n in namen)):
+        kwargs = dict(zip(namen, werte))
+        if funktionsname == "kompression_chunking" and \
+                kwargs.get("overlap", 20) >= kwargs.get("chunk_groesse", 100):
+            continue  # kein Fortschritt zwischen Chunks
+        ergebnis.append(kwargs)
+    return ergebnis
+
+
+# --- Worker: ein Document je Szenario, Token-Zählung je eindeutiger Ausgabe ---
+
+@lru_cache(maxsize=DOKUMENT_CACHE)
+def _dokument(text: str) -> Document:
+    return dokument_analysieren(text)
+
+
+def _block_ausfuehren(prompt_text: str, funktionsname: str,
+                      block: List[dict]) -> List[Tuple[str, int, float]]:
+    """Komprimiert mit jeder Konfiguration: (Ausgabe, Tokens der Ausgabe, Kompressionszeit ms)."""
+    import token_minimierung
+    funktion = getattr(token_minimierung, funktionsname)
+    doc = _dokument(prompt_text)
+    ausgaben, zeiten = [], []
+    for kwargs in block:
+        start = time.perf_counter()
+        ausgaben.append(funktion(doc, **kwargs))
+        zeiten.append((time.perf_counter() - start) * 1000)
+    return list(zip(ausgaben, token_anzahlen(ausgaben), zeiten))
+
+
+# --- Pareto-Front ---
+
+def pareto_maske(kompressionsrate, qualitaet, latenz) -> np.ndarray:
+    """
+    Nicht dominierte Punkte (Rate und Qualität maximal, Latenz minimal).
+    Nach Rate absteigend sortiert muss jeder Punkt nur gegen die bisherige
+    Front geprüft werden; von exakt gleichen Punkten bleibt der erste.
+    """
+    rate = np.asarray(kompressionsrate, dtype=float)
+    q = np.asarray(qualitaet, dtype=float)
+    lat = np.asarray(latenz, dtype=float)
+    reihenfolge = np.lexsort((lat, -q, -rate))
+    maske = np.zeros(len(rate), dtype=bool)
+    front_q = np.empty(len(rate))
+    front_lat = np.empty(len(rate))
+    k = 0
+    for i in reihenfolge.tolist():
+        # Alle Front-Punkte haben Rate ≥ rate[i]; dominiert, wenn einer auch q ≥ und lat ≤ hat
+        if k and np.any((front_q[:k] >= q[i]) & (front_lat[:k] <= lat[i])):
+            continue
+        maske[i] = True
+        front_q[k], front_lat[k] = q[i], lat[i]
+        k += 1
+    return maske
+
+
+def _dominanz_pruning(rate: np.ndarray, latenz: np.ndarray, bewerten, obergrenze: float) -> Dict[int, float]:
+    """
+    Bewertet in zwei Runden (je ein Aufruf bewerten(indizes) → Qualitäten): erst die
+    in Rate und Latenz nicht dominierten Ausgaben, dann alle übrigen außer denen,
+    die ein bewerteter Punkt mit Qualität ≥ obergrenze in Rate und Latenz (in
+    einer davon echt) dominiert. Liefert Index → Qualität der bewerteten Ausgaben.
+    """
+    erste = np.flatnonzero(pareto_maske(rate, np.zeros(len(rate)), latenz))
+    qualitaet = dict(zip(erste.tolist(), bewerten(erste.tolist())))
+    uebrig = np.setdiff1d(np.arange(len(rate)), erste)
+    for j in (j for j, q in qualitaet.items() if q >= obergrenze - _QUALITAET_TOLERANZ):
+        dominiert = (rate[j] >= rate[uebrig]) & (latenz[j] <= latenz[uebrig]) & \
+                    ((rate[j] > rate[uebrig]) | (latenz[j] < latenz[uebrig]))
+        uebrig = uebrig[~dominiert]
+    qualitaet.update(zip(uebrig.tolist(), bewerten(uebrig.tolist())))
+    return qualitaet
+
+
+@dataclass
+class SweepErgebnis:
+    punkte: List[ExperimentResult]                  # jede Konfiguration × Szenario
+    front: Dict[str, List[ExperimentResult]]        # Pareto-Front je Szenario (nach Rate)
+    statistik: Dict[str, float] = field(default_factory=dict)
+
+
+def parameter_sweep(
+    prompts: Dict[str, str],
+    raeume: Optional[List[ParameterRaum]] = None,
+    modus: str = "seriell",
+    worker: Optional[int] = None,
+    block_groesse: int = BLOCK_GROESSE,
+    fortschritt: bool = True,
+    min_erhalt: Optional[float] = None,
+    qualitaet_obergrenze: Optional[float] = 1.0,
+) -> SweepErgebnis:
+    """
+    Führt alle Konfigurationen aller Parameterräume auf allen Prompts aus und
+    bestimmt die Pareto-Front je Szenario. Latenz wie in run_experiment
+    (gemessene Kompressionszeit + modellierte LLM-Latenz); parallel gemessene
+    Zeiten enthalten die Konkurrenz der Worker. Mit min_erhalt werden nur
+    Ausgaben bewertet, deren Inhaltswort-Recall und Zahlen-/ID-Erhalt beide
+    mindestens min_erhalt betragen. Ausgaben, die nicht auf die Front kommen
+    können, weil ein Punkt mit Qualität ≥ qualitaet_obergrenze sie in Rate und
+    Latenz dominiert, werden nicht bewertet; None bewertet alle Ausgaben.
+    Eine Obergrenze unter 1.0 spart mehr Bewertungen, die Front ist dann aber
+    nur exakt, wenn keine so verworfene Ausgabe besser als die Obergrenze wäre.
+    """
+    if modus not in MODI:
+        raise ValueError(f"Unbekannter Modus: {modus!r} ({', '.join(MODI)})")
+    raeume = STANDARD_RAEUME if raeume is None else raeume
+    worker = worker or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    # Aufgaben: (Szenario, Raum, Block von Konfigurationen)
+    aufgaben = []
+    for name, text in prompts.items():
+        for raum in raeume:
+            konfig = konfigurationen(raum)
+            for von in range(0, len(konfig), block_groesse):
+                aufgaben.append((name, text, raum, konfig[von:von + block_groesse]))
+    anzahl = sum(len(a[3]) for a in aufgaben)
+    if fortschritt:
+        print(f"Sweep: {anzahl} Zellen ({len(prompts)} Szenarien, {len(aufgaben)} Blöcke, {modus})")
+
+    if modus == "seriell":
+        _worker_init()
+        roh = [_block_ausfuehren(text, raum[1], block) for _, text, raum, block in aufgaben]
+    else:
+        if modus == "threads":
+            _worker_init()
+            pool = ThreadPoolExecutor(max_workers=worker)
+        else:
+            pool = ProcessPoolExecutor(max_workers=worker, initializer=_worker_init)
+        with pool:
+            roh = list(pool.map(_block_ausfuehren, *zip(*((t, r[1], b) for _, t, r, b in aufgaben))))
+    kompressions_dauer = time.perf_counter() - start
+
+    # Je Szenario: Original-Tokens einmal, Qualität je eindeutiger Ausgabe gebündelt
+    punkte: List[ExperimentResult] = []
+    front: Dict[str, List[ExperimentResult]] = {}
+    bewertet = vorgefiltert = dominiert = 0
+    for name, text in prompts.items():
+        original_tokens = token_anzahl(text)
+        zellen = [(raum, kwargs, *z) for (n, _, raum, block), ergebnisse in zip(aufgaben, roh) if n == name
+                  for kwargs, z in zip(block, ergebnisse)]
+        # Dedup: gleiche Ausgabe ⇒ gleiche Rate und Qualität, bewertet wird jede Ausgabe genau einmal
+        ausgaben = list(dict.fromkeys(z[2] for z in zellen))
+        if min_erhalt is not None:
+            erhalt = erhalt_metriken(text, ausgaben).minimum()
+            ausgaben = [a for a, e in zip(ausgaben, erhalt.tolist()) if e >= min_erhalt]
+            behalten = set(ausgaben)
+            vorgefiltert += len(zellen)
+            zellen = [z for z in zellen if z[2] in behalten]
+            vorgefiltert -= len(zellen)
+        if qualitaet_obergrenze is None:
+            qualitaet = dict(zip(ausgaben, qualitaet_semantische_aehnlichkeit_batch(text, ausgaben).tolist()))
+        else:
+            # Je Ausgabe Rate und kürzeste Latenz ihrer Zellen (gleiche Ausgabe ⇒ gleiche Tokens)
+            position = {a: i for i, a in enumerate(ausgaben)}
+            rate = np.zeros(len(ausgaben))
+            latenz = np.full(len(ausgaben), np.inf)
+            for _, _, ausgabe, tokens, zeit in zellen:
+                i = position[ausgabe]
+                rate[i] = original_tokens / max(tokens, 1)
+                latenz[i] = min(latenz[i], gesamt_latenz_ms(zeit, tokens))
+
+            def bewerten(ids):
+                return qualitaet_semantische_aehnlichkeit_batch(text, [ausgaben[i] for i in ids]).tolist()
+            qualitaet = {ausgaben[i]: q for i, q in
+                         _dominanz_pruning(rate, latenz, bewerten, qualitaet_obergrenze).items()}
+            dominiert += len(zellen)
+            zellen = [z for z in zellen if z[2] in qualitaet]
+            dominiert -= len(zellen)
+        bewertet += len(qualitaet)
+        szenario_punkte = []
+        for (strategie, _, _), kwargs, ausgabe, tokens, zeit in zellen:
+            szenario_punkte.append(ExperimentResult(
+                strategie=strategie,
+                original_tokens=original_tokens,
+                komprimierte_tokens=tokens,
+                latenz_ms=gesamt_latenz_ms(zeit, tokens),
+                qualitaets_score=qualitaet[ausgabe],
+                kosten_euro=berechne_kosten(tokens),
+                kompressionsrate=original_tokens / max(tokens, 1),
+                szenario=name,
+                parameter=kwargs,
+            ))
+        maske = pareto_maske([p.kompressionsrate for p in szenario_punkte],
+                             [p.qualitaets_score for p in szenario_punkte],
+                             [p.latenz_ms for p in szenario_punkte])
+        front[name] = sorted((p for p, m in zip(szenario_punkte, maske) if m),
+                             key=lambda p: p.kompressionsrate)
+        punkte.extend(szenario_punkte)
+
+    dauer = time.perf_counter() - start
+    statistik = {
+        'zellen': anzahl,
+        'bewertete_ausgaben': bewertet,
+        'vorgefiltert': vorgefiltert,
+        'dominiert': dominiert,
+        'dedupliziert': anzahl - vorgefiltert - dominiert - bewertet,
+        'front_punkte': sum(len(f) for f in front.values()),
+        'kompression_s': kompressions_dauer,
+        'gesamt_s': dauer,
+    }
+    if fortschritt:
+        print(f"Sweep: {anzahl} Zellen in {dauer:.1f} s ({anzahl / max(dauer, 1e-9):.0f} Zellen/s), "
+              f"{bewertet} eindeutige Ausgaben bewertet, {vorgefiltert} vorgefiltert, {dominiert} dominiert, "
+              f"{statistik['dedupliziert']} Zellen mit doppelter Ausgabe, "
+              f"{statistik['front_punkte']} Punkte auf den Pareto-Fronten")
+    return SweepErgebnis(punkte, front, statistik)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Strategie 3: Token-Budget mit positionsbasierter (optional relevanzgewichteter) Satzauswahl.
+"""
+from typing import Union
+
+import numpy as np
+
+from .auswahl import budget_auswahl, greedy_auswahl, positions_scores
+from .dokument import Document, als_dokument
+from .instrumentierung import stufe
+from .tokenizer import get_encoder, token_anzahl
+
+VERFAHREN = ("optimal", "greedy")
+
+# =============================================================================
+# Strategie 3: Token-Budget (Selective Context / Lost in the Middle)
+# =============================================================================
+# Selective Context wählt Kontext nach Relevanz; „Lost in the Middle“ zeigt,
+# dass mittlere Passagen von LLMs schlechter genutzt werden. Daher: festes
+# Token-Budget, Sätze nach Position gewichten (Anfang + Ende bevorzugt) und
+# optional nach Centrality, dann die Score-Summe unter dem Budget maximieren.
+# =============================================================================
+
+def satz_scores(doc: Document, position_weight: bool = True, relevanz_gewicht: float = 0.0) -> np.ndarray:
+    """
+    Score je Satz im Bereich [1, 2]:
+    - Positionsgewicht U-förmig (bzw. konstant 1 ohne position_weight)
+    - mit relevanz_gewicht > 0 gemischt mit der Centrality (Cosine zum
+      Dokument-Mittelwert, auf [1, 2] abgebildet) aus dem Embedding-Modell
+    """
+    with stufe('scoring'):
+        scores = positions_scores(len(doc), position_weight)
+        if relevanz_gewicht > 0:
+            from .strukturiert import _centrality_scores, _get_embedding_model
+            centrality = _centrality_scores(_get_embedding_model().encode(doc.saetze))
+            scores = (1 - relevanz_gewicht) * scores + relevanz_gewicht * (1.5 + centrality / 2)
+        return scores
+
+
+def kompression_token_budget(
+    prompt: Union[str, Document],
+    ziel_tokens: int = 100,
+    position_weight: bool = True,
+    relevanz_gewicht: float = 0.0,
+    verfahren: str = "optimal",
+) -> str:
+    """
+    Kompression mit festem Token-Budget:
+    - Sätze werden nach Position bewertet (Anfang und Ende höher, „Lost in the Middle“),
+      optional zusätzlich nach Relevanz (relevanz_gewicht, Centrality)
+    - verfahren='optimal': maximale Score-Summe, Ausgabe hat höchstens ziel_tokens Tokens
+    - verfahren='greedy': bisherige Auswahl (höchste Bewertung zuerst, kann überziehen)
+    """
+    if verfahren not in VERFAHREN:
+        raise ValueError(f"Unbekanntes Verfahren: {verfahren!r} ({', '.join(VERFAHREN)})")
+    doc = als_dokument(prompt)
+    prompt = doc.text
+    saetze = doc.saetze
+    if not saetze:
+        with stufe('dekodierung'):
+            return prompt[: get_encoder().decode(doc.tokens[:ziel_tokens].tolist()).rfind(' ') or ziel_tokens]
+    n = len(saetze)
+    if n == 1:
+        if doc.token_anzahl <= ziel_tokens:
+            return prompt
+        with stufe('dekodierung'):
+            return get_encoder().decode(doc.tokens[:ziel_tokens].tolist())
+
+    scores = satz_scores(doc, position_weight, relevanz_gewicht)
+    kosten = doc.satz_token_laengen
+    if verfahren == "greedy":
+        with stufe('auswahl'):
+            return ' '.join(saetze[i] for i in greedy_auswahl(scores, kosten, ziel_tokens).indizes.tolist())
+
+    # Satz-Tokens stammen aus dem Gesamttext; die verbundene Ausgabe kann an den
+    # Nahtstellen anders tokenisieren. Daher nachprüfen und bei Überschreitung
+    # das Budget um den Überhang senken, bis die Ausgabe passt.
+    budget = ziel_tokens
+    while budget > 0:
+        with stufe('auswahl'):
+            auswahl = budget_auswahl(scores, kosten, budget)
+        ergebnis = ' '.join(saetze[i] for i in auswahl.indizes.tolist())
+        ueberhang = token_anzahl(ergebnis) - ziel_tokens
+        if ueberhang <= 0:
+            if ergebnis:
+                return ergebnis
+            break
+        budget -= ueberhang
+    # Kein Satz passt ins Budget: bestbewerteten Satz auf ziel_tokens kürzen
+    a, b = doc.token_bereiche[int(np.argmax(scores))]
+    laenge = min(b - a, ziel_tokens)
+    while laenge > 0:
+        with stufe('dekodierung'):
+            ergebnis = get_encoder().decode(doc.tokens[a:a + laenge].tolist()).strip()
+        ueberhang = token_anzahl(ergebnis) - ziel_tokens
+        if ueberhang <= 0:
+            return ergebnis
+        laenge -= ueberhang
+    return ''
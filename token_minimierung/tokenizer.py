@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Token-Zählung (OpenAI-kompatibel, GPT-4/GPT-3.5 Turbo).
+tiktoken wird erst beim ersten Zugriff geladen – der Import dieses Moduls ist billig.
+- tokenisieren / tokenisieren_viele: Token-IDs über encode_ordinary; alle Module
+  tokenisieren Prompts hierüber, damit Sondertoken-Text keine Ausnahme auslöst
+- token_anzahl / token_anzahlen: exakte Anzahl über einen prozessweiten LRU-Cache
+  (Schlüssel = Hash des Texts); fehlende Texte gebündelt über encode_ordinary_batch
+- TokenSchaetzer: Schätzung aus Zeichen, Wörtern, Ziffern, Satzzeichen und
+  Nicht-ASCII-Zeichen, gegen den Encoder kalibriert (deutsche und englische Prosa,
+  Zahlen, Code, CJK), mit gemessenen Fehlergrenzen plus Sicherheitszuschlag – für
+  Budget-Vorfilter ohne Tokenisierung (im_budget, u. a. in router.entscheiden)
+"""
+import hashlib
+import os
+import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .instrumentierung import stufe, zaehlen
+
+MODELL = "gpt-3.5-turbo"
+
+# Größe des Zähl-Caches (Einträge); 0 schaltet ihn ab
+TOKEN_CACHE_GROESSE = int(os.environ.get('TOKEN_CACHE_GROESSE', '100000'))
+BATCH_SCHWELLE = 32   # ab so vielen fehlenden Texten lohnt der Thread-Pool von encode_ordinary_batch
+BATCH_THREADS = min(8, os.cpu_count() or 1)  # tiktoken gibt beim Kodieren den GIL frei
+SCHAETZER_MARGE = 0.1  # Zuschlag auf die gemessenen Faktoren, für Texte außerhalb der Kalibrierung
+
+_encoder = None
+_token_byte_laengen = None
+
+
+def get_encoder():
+    """Lazy-Load des tiktoken-Encoders (einmal pro Prozess)."""
+    global _encoder
+    if _encoder is None:
+        import tiktoken
+        _encoder = tiktoken.encoding_for_model(MODELL)
+    return _encoder
+
+
+def tokenisieren(text: str) -> List[int]:
+    """Token-IDs eines Texts; Text wie "<|endoftext|>" gilt als gewöhnlicher Text."""
+    return get_encoder().encode_ordinary(text)
+
+
+def tokenisieren_viele(texte: Sequence[str], threads: int = BATCH_THREADS) -> List[List[int]]:
+    """Wie tokenisieren für viele Texte, gebündelt über encode_ordinary_batch."""
+    return get_encoder().encode_ordinary_batch(list(texte), num_threads=threads)
+
+
+def _schluessel(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class TokenZaehler:
+    """
+    Exakte Token-Anzahlen mit begrenztem LRU-Cache, thread-sicher.
+    Gezählt wird mit encode_ordinary: Text wie "<|endoftext|>" zählt als
+    gewöhnlicher Text statt eine Ausnahme auszulösen.
+    """
+
+    def __init__(self, max_eintraege: int = TOKEN_CACHE_GROESSE):
+        self.max_eintraege = max_eintraege
+        self._lru: 'OrderedDict[bytes, int]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.treffer = 0
+        self.fehlschlaege = 0
+
+    def _ablegen(self, k: bytes, anzahl: int):
+        # nur unter self._lock aufrufen
+        self._lru[k] = anzahl
+        self._lru.move_to_end(k)
+        while len(self._lru) > self.max_eintraege:
+            self._lru.popitem(last=False)
+
+    def eintragen(self, text: str, anzahl: int):
+        """Bereits bekannte Anzahl übernehmen (z. B. aus einer Dokument-Analyse)."""
+        if self.max_eintraege:
+            k = _schluessel(text)
+            with self._lock:
+                self._ablegen(k, anzahl)
+
+    def anzahl(self, text: str) -> int:
+        if not self.max_eintraege:
+            self.fehlschlaege += 1
+            return len(get_encoder().encode_ordinary(text))
+        k = _schluessel(text)
+        with self._lock:
+            anzahl = self._lru.get(k)
+            if anzahl is not None:
+                self._lru.move_to_end(k)
+                self.treffer += 1
+                return anzahl
+        with stufe('tokenisierung'):
+            anzahl = len(get_encoder().encode_ordinary(text))
+        zaehlen('tokenisierte_texte')
+        with self._lock:
+            self.fehlschlaege += 1
+            self._ablegen(k, anzahl)
+        return anzahl
+
+    def anzahlen(self, texte: Iterable[str], threads: int = BATCH_THREADS) -> List[int]:
+        """Anzahlen für viele Texte; Cache-Fehlschläge einmal je Text, gebündelt tokenisiert."""
+        texte = list(texte)
+        schluessel = [_schluessel(t) for t in texte]
+        bekannt: Dict[bytes, int] = {}
+        offen: Dict[bytes, str] = {}
+        with self._lock:
+            for k, t in zip(schluessel, texte):
+                if k in bekannt or k in offen:
+                    continue
+                anzahl = self._lru.get(k)
+                if anzahl is not None:
+                    self._lru.move_to_end(k)
+                    bekannt[k] = anzahl
+                    self.treffer += 1
+                else:
+                    offen[k] = t
+        if offen:
+            encoder = get_encoder()
+            with stufe('tokenisierung'):
+                if len(offen) >= BATCH_SCHWELLE and threads > 1:
+                    tokens = encoder.encode_ordinary_batch(list(offen.values()), num_threads=threads)
+                else:
+                    tokens = [encoder.encode_ordinary(t) for t in offen.values()]
+            zaehlen('tokenisierte_texte', len(offen))
+            neu = dict(zip(offen, map(len, tokens)))
+            bekannt.update(neu)
+            with self._lock:
+                self.fehlschlaege += len(neu)
+                if self.max_eintraege:
+                    for k, anzahl in neu.items():
+                        self._ablegen(k, anzahl)
+        return [bekannt[k] for k in schluessel]
+
+    def leeren(self):
+        with self._lock:
+            self._lru.clear()
+
+    def statistik(self) -> dict:
+        anfragen = self.treffer + self.fehlschlaege
+        return {
+            'treffer': self.treffer,
+            'fehlschlaege': self.fehlschlaege,
+            'trefferquote': self.treffer / anfragen if anfragen else 0.0,
+            'eintraege': len(self._lru),
+        }
+
+
+_zaehler: Optional[TokenZaehler] = None
+
+
+def get_token_zaehler() -> TokenZaehler:
+    """Prozessweiter Zähler (ein Cache für alle Module)."""
+    global _zaehler
+    if _zaehler is None:
+        _zaehler = TokenZaehler()
+    return _zaehler
+
+
+def token_anzahl(text: str) -> int:
+    """Exakte Token-Anzahl eines Texts (gecacht)."""
+    return get_token_zaehler().anzahl(text)
+
+
+def token_anzahlen(texte: Iterable[str]) -> List[int]:
+    """Exakte Token-Anzahlen vieler Texte (gecacht, Fehlschläge gebündelt)."""
+    return get_token_zaehler().anzahlen(texte)
+
+
+# --- Schätzung ohne Tokenisierung ---
+
+_SATZZEICHEN = b'!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~\n\t'
+_byte_klassen = None
+
+
+def _klassen_tabelle():
+    """
+    Klasse je Byte-Wert: 0 sonst, 1 Leerzeichen, 2 Ziffer, 3 Satzzeichen, Startbyte
+    eines Nicht-ASCII-Zeichens mit 4 zwei, 5 drei (CJK), 6 vier Bytes (Emoji).
+    """
+    global _byte_klassen
+    if _byte_klassen is None:
+        import numpy as np
+        tabelle = np.zeros(256, dtype=np.int64)
+        tabelle[ord(' ')] = 1
+        tabelle[ord('0'):ord('9') + 1] = 2
+        tabelle[list(_SATZZEICHEN)] = 3
+        tabelle[0xC0:0xE0], tabelle[0xE0:0xF0], tabelle[0xF0:] = 4, 5, 6
+        _byte_klassen = tabelle
+    return _byte_klassen
+
+
+def _merkmale(texte: Sequence[str]):
+    """
+    Je Text: Zeichen, Leerzeichen (≈ Wörter), Ziffern, ASCII-Satzzeichen und
+    Zeilenumbrüche (Code, Tabellen), Nicht-ASCII-Zeichen (Umlaute usw.), davon
+    zusätzliche Bytes breiter Zeichen (≥ 3 Bytes: CJK, Emoji), 1. Gezählt wird
+    mit einem bincount über die UTF-8-Bytes aller Texte.
+    """
+    import numpy as np
+    kodiert = [t.encode('utf-8', 'surrogatepass') for t in texte]
+    roh = np.frombuffer(b''.join(kodiert), dtype=np.uint8)
+    schluessel = np.repeat(np.arange(len(texte)) * 7, [len(k) for k in kodiert]) + _klassen_tabelle()[roh]
+    klassen = np.bincount(schluessel, minlength=len(texte) * 7).reshape(len(texte), 7)
+    m = np.ones((len(texte), 7))
+    m[:, 0] = [len(t) for t in texte]
+    m[:, 1:4] = klassen[:, 1:4]
+    m[:, 4] = klassen[:, 4:].sum(axis=1)
+    m[:, 5] = klassen[:, 5] + 2 * klassen[:, 6]
+    return m
+
+
+@dataclass
+class TokenSchaetzer:
+    """
+    Lineares Modell Tokens ≈ Merkmale · koeffizienten, per kleinsten Quadraten
+    gegen den echten Encoder kalibriert. faktor_unten/faktor_oben sind das
+    kleinste/größte Verhältnis exakt/geschätzt auf den Kalibriertexten; grenzen()
+    weitet sie um marge. Empirische, keine garantierten Grenzen; fehler enthält
+    Quantile des relativen Fehlers.
+    """
+    koeffizienten: List[float]
+    faktor_unten: float
+    faktor_oben: float
+    fehler: Dict[str, float] = field(default_factory=dict)
+    marge: float = SCHAETZER_MARGE
+
+    def schaetzen_viele(self, texte: Sequence[str]) -> 'np.ndarray':
+        import numpy as np
+        return np.maximum(_merkmale(texte) @ np.asarray(self.koeffizienten), 1.0)
+
+    def schaetzen(self, text: str) -> float:
+        return float(self.schaetzen_viele([text])[0])
+
+    def grenzen(self, texte: Sequence[str]):
+        """(untere, obere) Grenze je Text aus Schätzung, Kalibrierfaktoren und marge."""
+        import numpy as np
+        schaetzung = self.schaetzen_viele(texte)
+        return (np.floor(schaetzung * self.faktor_unten * (1 - self.marge)),
+                np.ceil(schaetzung * self.faktor_oben * (1 + self.marge)))
+
+
+def schaetzer_kalibrieren(texte: Sequence[str]) -> TokenSchaetzer:
+    """Passt den Schätzer an exakte Anzahlen an und misst dessen Fehler auf denselben Texten."""
+    import numpy as np
+    texte = [t for t in texte if t]
+    if len(texte) < 4:
+        raise ValueError("Zum Kalibrieren werden mindestens 4 nicht-leere Texte benötigt")
+    m = _merkmale(texte)
+    exakt = np.asarray(token_anzahlen(texte), dtype=float)
+    koeffizienten = np.linalg.lstsq(m, exakt, rcond=None)[0]
+    schaetzung = np.maximum(m @ koeffizienten, 1.0)
+    verhaeltnis = exakt / schaetzung
+    relativ = np.abs(exakt - schaetzung) / np.maximum(exakt, 1.0)
+    return TokenSchaetzer(
+        koeffizienten=koeffizienten.tolist(),
+        faktor_unten=float(verhaeltnis.min()),
+        faktor_oben=float(verhaeltnis.max()),
+        fehler={
+            'texte': len(texte),
+            'p50': float(np.percentile(relativ, 50)),
+            'p95': float(np.percentile(relativ, 95)),
+            'max': float(relativ.max()),
+        },
+    )
+
+
+_schaetzer: Optional[TokenSchaetzer] = None
+
+
+# Kalibrier-Bausteine neben den (deutschen) Test-Prompts: Textarten mit anderem
+# Verhältnis Zeichen/Token
+_KALIBRIER_BAUSTEINE = {
+    'englisch': [
+        "Please summarize the attached quarterly report in three bullet points.",
+        "The deployment failed because the database migration timed out after 30 seconds.",
+        "Thanks in advance for your help, I really appreciate it!",
+    ],
+    'zahlen': [
+        "Rechnung Nr. 2024-00815 vom 15.03.2024: 3 × 19,99 EUR = 59,97 EUR.",
+        "IBAN DE89 3704 0044 0532 0130 00, BIC COBADEFFXXX",
+        "Messwerte: 0.0012, 3.14159, 2718281828, -45.5e-3, 1e10, 99.9%",
+        "ID;Menge;Preis\n4711;3;19,99\n4712;12;4,50\n4713;1;1299,00",
+        "Tel. +49 (0)30 123456-78, PLZ 10115, Version 1.2.3-rc4",
+    ],
+    'code': [
+        "def token_anzahl(text: str) -> int:\n    return len(get_encoder().encode_ordinary(text))",
+        "for (let i = 0; i < items.length; i++) { total += items[i].price * items[i].qty; }",
+        "SELECT kunde_id, SUM(betrag) FROM rechnungen WHERE datum >= '2024-01-01' GROUP BY kunde_id;",
+        "{\"strategie\": \"chunking\", \"parameter\": {\"chunk_groesse\": 100, \"overlap\": 20}}",
+        "if [ -z \"$PFAD\" ]; then echo \"PFAD fehlt\" >&2; exit 1; fi",
+    ],
+    'cjk': [
+        "请用三句话总结这份季度报告。",
+        "数据库迁移在三十秒后超时，因此部署失败。",
+        "添付の報告書を三つの要点にまとめてください。",
+        "데이터베이스 마이그레이션이 시간 초과되었습니다.",
+    ],
+    'sonstiges': [
+        "Siehe https://example.com/api/v2/dokumente?seite=3&sortierung=datum#abschnitt-4",
+        "✅ Erledigt 🎉 – nächster Schritt: 🚀 Release",
+        "- Punkt eins\n- Punkt zwei\n  - Unterpunkt\n\n## Überschrift\n\n> Zitat",
+        "Straße, Größe, Äpfel, Übergänge und Öffnungszeiten: Grüße aus Köln!",
+    ],
+}
+
+
+def _kalibrier_texte(anzahl_mischungen: int = 300, seed: int = 0) -> List[str]:
+    """Sätze, Abschnitte und ganze Test-Prompts, jede Textart einzeln und zufällig gemischt."""
+    from .experiment import TEST_PROMPTS
+    from .segmentierung import saetze_zerlegen
+    texte = [b for liste in _KALIBRIER_BAUSTEINE.values() for b in liste]
+    texte.extend('\n'.join(liste) for liste in _KALIBRIER_BAUSTEINE.values())
+    for prompt in TEST_PROMPTS.values():
+        saetze = saetze_zerlegen(prompt)
+        texte.extend(saetze)
+        texte.extend(' '.join(saetze[i:i + 4]) for i in range(0, len(saetze), 2))
+        texte.append(prompt)
+    rnd = random.Random(seed)
+    vorrat = list(texte)
+    for _ in range(anzahl_mischungen):
+        teile = rnd.choices(vorrat, k=rnd.randint(2, 8))
+        texte.append(rnd.choice([' ', '\n', '\n\n']).join(teile))
+    return texte
+
+
+def get_schaetzer() -> TokenSchaetzer:
+    """Auf gemischten Kalibriertexten (_kalibrier_texte) kalibrierter Schätzer (einmal pro Prozess)."""
+    global _schaetzer
+    if _schaetzer is None:
+        _schaetzer = schaetzer_kalibrieren(_kalibrier_texte())
+    return _schaetzer
+
+
+def im_budget(texte: Sequence[str], budget: int, schaetzer: Optional[TokenSchaetzer] = None) -> 'np.ndarray':
+    """
+    Passt jeder Text in budget Tokens? Eindeutige Fälle entscheidet die Schätzung
+    (obere Grenze ≤ budget bzw. untere Grenze > budget), nur Texte im
+    Unsicherheitsband werden exakt gezählt.
+    """
+    import numpy as np
+    schaetzer = schaetzer or get_schaetzer()
+    texte = list(texte)
+    unten, oben = schaetzer.grenzen(texte)
+    ergebnis = oben <= budget
+    unklar = np.flatnonzero(~ergebnis & (unten <= budget))
+    if len(unklar):
+        exakt = np.asarray(token_anzahlen([texte[i] for i in unklar.tolist()]))
+        ergebnis[unklar] = exakt <= budget
+    return ergebnis
+
+
+def token_byte_tabelle():
+    """Byte-Länge jedes Tokens im Vokabular (einmalig aufgebaut, für Offset-Berechnung)."""
+    global _token_byte_laengen
+    if _token_byte_laengen is None:
+        import numpy as np
+        encoder = get_encoder()
+        tabelle = np.zeros(encoder.n_vocab, dtype=np.int64)
+        for i in range(encoder.n_vocab):
+            try:
+                tabelle[i] = len(encoder.decode_single_token_bytes(i))
+            except Exception:
+                pass  # Lücken im Vokabular
+        _token_byte_laengen = tabelle
+    return _token_byte_laengen
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Verteilungen statt nur Mittelwerten: Perzentile und Bootstrap-Konfidenzintervalle
+je Gruppe (Strategie, Szenario …), vektorisiert über alle Gruppen.
+- Ein Sortierlauf (Radix nach Gruppe, dann je Gruppe nach Wert); Perzentile aller
+  Gruppen per Indexarithmetik, linear interpoliert wie np.percentile
+- Bootstrap über Multinomial-Zählungen auf höchstens `klassen` Rangklassen je Gruppe
+  (gleich viele Werte je Klasse, Klassenwert = Mittel): Aufwand je Gruppe
+  O(n + bootstrap · klassen), bis `klassen` Werte je Gruppe exakt
+- Verteilung.als_dict(): Kennzahlen, Intervalle und CDF-Stützstellen für den JSON-Export
+Nur numpy.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+PERZENTILE = (1, 5, 25, 50, 75, 95, 99)
+# Stützstellen der CDF im Export und in den Plots (dichter im oberen Rand)
+CDF_PERZENTILE = tuple(np.concatenate((np.arange(0, 99, 1.0), np.arange(99, 100.01, 0.1))).round(1).tolist())
+BOOTSTRAP = 1000
+KONFIDENZ = 0.95
+KLASSEN = 1024
+
+
+@dataclass
+class Verteilung:
+    """Verteilung einer Kennzahl je Gruppe (Zeilen in Reihenfolge von gruppen)."""
+    kennzahl: str
+    nach: Tuple[str, ...]
+    gruppen: List[Tuple[str, ...]]
+    perzentile: Tuple[float, ...]
+    anzahl: np.ndarray          # (G,)
+    mittel: np.ndarray          # (G,)
+    minimum: np.ndarray         # (G,)
+    maximum: np.ndarray         # (G,)
+    werte: np.ndarray           # (G, P) Perzentile
+    cdf: np.ndarray             # (G, len(CDF_PERZENTILE))
+    konfidenz: float
+    mittel_ki: np.ndarray       # (G, 2), NaN ohne Bootstrap
+    perzentile_ki: np.ndarray   # (G, P, 2)
+
+    def perzentil(self, p: float) -> np.ndarray:
+        return self.werte[:, self.perzentile.index(p)]
+
+    def als_dict(self, faktor: float = 1.0, cdf: bool = True) -> Dict[str, dict]:
+        """Je Gruppe (Namen mit ' / ' verbunden) ein JSON-fähiges dict; faktor skaliert die Werte."""
+        ki = f"ki{round(self.konfidenz * 100):d}"
+        ergebnis = {}
+        for i, gruppe in enumerate(self.gruppen):
+            eintrag = {
+                'anzahl': int(self.anzahl[i]),
+                'mittel': float(self.mittel[i] * faktor),
+                f'mittel_{ki}': (self.mittel_ki[i] * faktor).tolist(),
+                'min': float(self.minimum[i] * faktor),
+                'max': float(self.maximum[i] * faktor),
+            }
+            for j, p in enumerate(self.perzentile):
+                name = f"p{p:g}".replace('.', '_')
+                eintrag[name] = float(self.werte[i, j] * faktor)
+                eintrag[f'{name}_{ki}'] = (self.perzentile_ki[i, j] * faktor).tolist()
+            if cdf:
+                eintrag['cdf'] = {'perzentile': list(CDF_PERZENTILE), 'werte': (self.cdf[i] * faktor).tolist()}
+            ergebnis[' / '.join(gruppe)] = eintrag
+        return ergebnis
+
+
+def _sortieren(codes: np.ndarray, werte: np.ndarray, anzahl_gruppen: int):
+    """Werte nach Gruppe, innerhalb der Gruppe aufsteigend; Anzahl und Startindex je Gruppe."""
+    anzahl = np.bincount(codes, minlength=anzahl_gruppen)
+    start = np.concatenate(([0], np.cumsum(anzahl)[:-1]))
+    if anzahl_gruppen > 1 << 16:
+        return werte[np.lexsort((werte, codes))], anzahl, start
+    # stabile Sortierung kleiner Codes ist eine Radix-Sortierung (O(n)), danach jede
+    # Gruppe für sich – um ein Vielfaches schneller als lexsort über (Gruppe, Wert)
+    sortiert = werte[np.argsort(codes.astype(np.uint16), kind='stable')]
+    for a, n in zip(start.tolist(), anzahl.tolist()):
+        sortiert[a:a + n].sort()
+    return sortiert, anzahl, start
+
+
+def _perzentile_sortiert(sortiert: np.ndarray, anzahl: np.ndarray, start: np.ndarray,
+                         perzentile: Sequence[float]) -> np.ndarray:
+    """(G, P) Perzentile aller Gruppen auf einmal (lineare Interpolation wie np.percentile)."""
+    letzter = np.maximum(anzahl - 1, 0)[:, None]
+    position = np.asarray(perzentile, dtype=np.float64)[None, :] / 100 * letzter
+    unten = np.floor(position).astype(np.int64)
+    oben = np.minimum(unten + 1, letzter)
+    a = sortiert[start[:, None] + unten]
+    b = sortiert[start[:, None] + oben]
+    return a + (b - a) * (position - unten)
+
+
+def _klassen(werte: np.ndarray, klassen: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sortierte Werte einer Gruppe → (Klassenwerte, Anzahl je Klasse), gleich viele Werte je Klasse."""
+    if len(werte) <= klassen:
+        return werte, np.ones(len(werte), dtype=np.int64)
+    grenzen = np.linspace(0, len(werte), klassen + 1).astype(np.int64)
+    anzahl = np.diff(grenzen)
+    return np.add.reduceat(werte, grenzen[:-1]) / anzahl, anzahl
+
+
+def _bootstrap(werte: np.ndarray, perzentile: Sequence[float], bootstrap: int, konfidenz: float,
+               klassen: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Perzentil-Intervalle für Mittelwert (2,) und Perzentile (P, 2) einer sortierten Gruppe."""
+    n = len(werte)
+    klassenwerte, gewichte = _klassen(werte, klassen)
+    zaehlungen = rng.multinomial(n, gewichte / n, size=bootstrap)          # (B, K)
+    mittel = zaehlungen @ klassenwerte / n
+    kumuliert = np.cumsum(zaehlungen, axis=1)
+    raenge = np.rint(np.asarray(perzentile, dtype=np.float64) / 100 * (n - 1)).astype(np.int64)
+    # Klasse, in der der Rang der Stichprobe liegt: erste mit kumulierter Anzahl > Rang
+    klasse = (kumuliert[:, None, :] <= raenge[None, :, None]).sum(axis=2)  # (B, P)
+    stichproben_perzentile = klassenwerte[np.minimum(klasse, len(klassenwerte) - 1)]
+    grenzen = (100 * (1 - konfidenz) / 2, 100 * (1 + konfidenz) / 2)
+    return np.percentile(mittel, grenzen), np.percentile(stichproben_perzentile, grenzen, axis=0).T
+
+
+def verteilung_berechnen(codes: np.ndarray, werte: np.ndarray, gruppen: List[Tuple[str, ...]],
+                         kennzahl: str = '', nach: Tuple[str, ...] = (),
+                         perzentile: Sequence[float] = PERZENTILE, bootstrap: int = BOOTSTRAP,
+                         konfidenz: float = KONFIDENZ, klassen: int = KLASSEN, seed: int = 0) -> Verteilung:
+    """
+    Verteilung von werte je Gruppe; codes (int, 0 … len(gruppen)−1) ordnet jeden Wert
+    einer Gruppe zu, jede Gruppe braucht mindestens einen Wert. bootstrap=0 lässt die
+    Konfidenzintervalle weg (NaN). Gleicher seed → gleiche Intervalle.
+    """
+    perzentile = tuple(perzentile)
+    werte = np.asarray(werte, dtype=np.float64)
+    sortiert, anzahl, start = _sortieren(np.asarray(codes, dtype=np.int64), werte, len(gruppen))
+    if len(gruppen) and not anzahl.all():
+        raise ValueError(f"Gruppen ohne Werte: {[gruppen[i] for i in np.flatnonzero(anzahl == 0)]}")
+    mittel = np.add.reduceat(sortiert, start) / anzahl if len(gruppen) else np.zeros(0)
+    alle = _perzentile_sortiert(sortiert, anzahl, start, perzentile + CDF_PERZENTILE)
+
+    mittel_ki = np.full((len(gruppen), 2), np.nan)
+    perzentile_ki = np.full((len(gruppen), len(perzentile), 2), np.nan)
+    if bootstrap:
+        rng = np.random.default_rng(seed)
+        for i in range(len(gruppen)):
+            mittel_ki[i], perzentile_ki[i] = _bootstrap(sortiert[start[i]:start[i] + anzahl[i]], perzentile,
+                                                        bootstrap, konfidenz, klassen, rng)
+    return Verteilung(
+        kennzahl=kennzahl, nach=tuple(nach), gruppen=list(gruppen), perzentile=perzentile,
+        anzahl=anzahl, mittel=mittel, minimum=sortiert[start] if len(gruppen) else np.zeros(0),
+        maximum=sortiert[start + anzahl - 1] if len(gruppen) else np.zeros(0),
+        werte=alle[:, :len(perzentile)], cdf=alle[:, len(perzentile):], konfidenz=konfidenz,
+        mittel_ki=mittel_ki, perzentile_ki=perzentile_ki,
+    )
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Persistenter Cache für Experiment-Zellen (Prompt × Strategie), damit ein erneuter
+Lauf nur neue oder ungültig gewordene Zellen rechnet.
+- Zelle = Hash des Prompt-Inhalts, Strategiename, Funktionsname und kwargs
+- Version = Hash des Quelltexts der Strategie (Modul samt relativ importierter
+  Paketmodule, dazu experiment.py und qualitaet.py für die Messung) und der
+  Modellkennungen (Embedding-Modell, Tokenizer, Paketversionen, aktives LLM-Modell
+  für Latenz und Kosten)
+- Passt die Version nicht mehr, gilt die Zelle als veraltet und wird neu gerechnet
+- Gespeichert als JSON-Index im Cache-Verzeichnis (atomar ersetzt, Dateisperre)
+Die Latenz einer geladenen Zelle ist der Messwert des früheren Laufs und wird
+als latenz_gecacht markiert – oder auf Wunsch neu gemessen (nur die Kompression).
+"""
+import ast
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, replace
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import fcntl  # Dateisperre für parallele Läufe (nur POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .embedding import get_embedding_dienst
+from .experiment import ExperimentResult, StrategieSpec, gesamt_latenz_ms, strategie_funktion
+from .llm_modell import get_llm_modell
+from .tokenizer import MODELL as TOKENIZER_MODELL
+
+# Optionaler Zellen-Cache: Verzeichnis per Umgebungsvariable aktivieren;
+# ZELLEN_CACHE_LATENZ=messen misst die Kompressionszeit geladener Zellen neu
+ZELLEN_CACHE_PFAD = os.environ.get('ZELLEN_CACHE_PFAD')
+ZELLEN_CACHE_LATENZ = os.environ.get('ZELLEN_CACHE_LATENZ', 'cache')
+
+_PAKET = os.path.dirname(os.path.abspath(__file__))
+# Module, die jede Zelle misst (Token-Zählung, Latenz, Kosten, Qualität)
+_MESS_MODULE = ('experiment', 'qualitaet')
+
+
+def _hash(daten) -> str:
+    roh = daten if isinstance(daten, bytes) else json.dumps(daten, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(roh, digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _abhaengigkeiten(modul: str) -> frozenset:
+    """Das Modul und alle per relativem Import erreichbaren Paketmodule."""
+    gefunden = set()
+    offen = [modul]
+    while offen:
+        name = offen.pop()
+        pfad = os.path.join(_PAKET, name + '.py')
+        if name in gefunden or not os.path.exists(pfad):
+            continue
+        gefunden.add(name)
+        with open(pfad, 'rb') as f:
+            baum = ast.parse(f.read())
+        for knoten in ast.walk(baum):
+            if isinstance(knoten, ast.ImportFrom) and knoten.level == 1:
+                if knoten.module:
+                    offen.append(knoten.module.split('.')[0])
+                else:
+                    offen.extend(a.name for a in knoten.names)
+    return frozenset(gefunden)
+
+
+@lru_cache(maxsize=None)
+def quellcode_hash(funktionsname: Optional[str]) -> str:
+    """Hash über den Quelltext aller Module, von denen das Ergebnis der Strategie abhängt."""
+    from . import _EXPORTE
+    module = set()
+    for modul in _MESS_MODULE + ((_EXPORTE[funktionsname],) if funktionsname else ()):
+        module |= _abhaengigkeiten(modul)
+    h = hashlib.blake2b(digest_size=16)
+    for name in sorted(module):
+        with open(os.path.join(_PAKET, name + '.py'), 'rb') as f:
+            h.update(name.encode() + b'\0' + f.read().replace(b'\r\n', b'\n') + b'\0')
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def modell_kennung() -> dict:
+    """Modelle und Bibliotheksversionen, die Token-Zahlen und Embeddings bestimmen."""
+    from importlib.metadata import PackageNotFoundError, version
+    kennung = {'embedding': get_embedding_dienst().kennung, 'tokenizer': TOKENIZER_MODELL}
+    for paket in ('tiktoken', 'sentence-transformers'):
+        try:
+            kennung[paket] = version(paket)
+        except PackageNotFoundError:
+            kennung[paket] = None
+    return kennung
+
+
+class ZellenCache:
+    """
+    Zellen-Ergebnisse auf der Festplatte. holen() liefert ein ExperimentResult
+    oder None; speichern() schreibt neue Ergebnisse gesammelt am Ende eines Laufs.
+    """
+
+    def __init__(self, pfad: str, latenz_neu_messen: bool = False):
+        self.pfad = pfad
+        self.latenz_neu_messen = latenz_neu_messen
+        os.makedirs(self.pfad, exist_ok=True)
+        self._index_pfad = os.path.join(self.pfad, 'zellen.json')
+        self._lock_pfad = os.path.join(self.pfad, '.lock')
+        self._index: Dict[str, dict] = {}
+        if os.path.exists(self._index_pfad):
+            with open(self._index_pfad, encoding='utf-8') as f:
+                self._index = json.load(f)
+        self.treffer = 0
+        self.neu = 0
+        self.veraltet = 0
+        self.gesparte_ms = 0.0
+
+    @staticmethod
+    def zellen_schluessel(prompt_text: str, strategie: StrategieSpec) -> str:
+        name, funktionsname, kwargs = strategie
+        return _hash({'prompt': _hash(prompt_text.encode('utf-8')), 'strategie': name,
+                      'funktion': funktionsname, 'kwargs': kwargs})
+
+    @staticmethod
+    def version(strategie: StrategieSpec) -> str:
+        return _hash({'quelle': quellcode_hash(strategie[1]), 'modell': modell_kennung(),
+                      'llm': get_llm_modell().kennung})
+
+    def holen(self, prompt_name: str, prompt_text: str, strategie: StrategieSpec) -> Optional[ExperimentResult]:
+        eintrag = self._index.get(self.zellen_schluessel(prompt_text, strategie))
+        if eintrag is None:
+            self.neu += 1
+            return None
+        if eintrag['version'] != self.version(strategie):
+            self.veraltet += 1
+            return None
+        self.treffer += 1
+        self.gesparte_ms += eintrag['rechenzeit_ms']
+        ergebnis = ExperimentResult(**eintrag['ergebnis'])
+        ergebnis = replace(ergebnis, strategie=strategie[0], szenario=prompt_name, latenz_gecacht=True)
+        if self.latenz_neu_messen:
+            ergebnis = self._latenz_messen(ergebnis, prompt_text, strategie)
+        return ergebnis
+
+    @staticmethod
+    def _latenz_messen(ergebnis: ExperimentResult, prompt_text: str, strategie: StrategieSpec) -> ExperimentResult:
+        """Nur die Kompression erneut ausführen; Tokens und Qualität bleiben aus dem Cache."""
+        funktion = strategie_funktion(strategie[1], strategie[2])
+        start = time.perf_counter()
+        funktion(prompt_text)
+        kompressions_zeit = (time.perf_counter() - start) * 1000
+        return replace(ergebnis, latenz_gecacht=False,
+                       latenz_ms=gesamt_latenz_ms(kompressions_zeit, ergebnis.komprimierte_tokens))
+
+    def speichern(self, zellen: List[tuple]):
+        """zellen: (prompt_text, strategie, ergebnis, rechenzeit_ms) – ein Schreibvorgang je Lauf."""
+        if not zellen:
+            return
+        neue_eintraege = {
+            self.zellen_schluessel(text, strategie): {
+                'version': self.version(strategie),
+                'rechenzeit_ms': rechenzeit_ms,
+                'ergebnis': {k: v for k, v in asdict(ergebnis).items() if k != 'latenz_gecacht'},
+            }
+            for text, strategie, ergebnis, rechenzeit_ms in zellen
+        }
+        sperre = open(self._lock_pfad, 'a')
+        try:
+            if fcntl is not None:
+                fcntl.flock(sperre, fcntl.LOCK_EX)
+            # Einträge paralleler Läufe übernehmen, dann atomar ersetzen
+            if os.path.exists(self._index_pfad):
+                with open(self._index_pfad, encoding='utf-8') as f:
+                    self._index = json.load(f)
+            self._index.update(neue_eintraege)
+            tmp = self._index_pfad + f'.{os.getpid()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, ensure_ascii=False)
+            os.replace(tmp, self._index_pfad)
+        finally:
+            sperre.close()
+
+    def __len__(self):
+        return len(self._index)
+
+    def statistik(self) -> dict:
+        anfragen = self.treffer + self.neu + self.veraltet
+        return {
+            'treffer': self.treffer,
+            'neu': self.neu,
+            'veraltet': self.veraltet,
+            'trefferquote': self.treffer / anfragen if anfragen else 0.0,
+            'gesparte_s': self.gesparte_ms / 1000,
+            'eintraege': len(self._index),
+        }
+
+
+def get_zellen_cache() -> Optional[ZellenCache]:
+    """Zellen-Cache aus ZELLEN_CACHE_PFAD, sonst None (jede Zelle wird gerechnet)."""
+    if not ZELLEN_CACHE_PFAD:
+        return None
+    return ZellenCache(ZELLEN_CACHE_PFAD, latenz_neu_messen=ZELLEN_CACHE_LATENZ == 'messen')